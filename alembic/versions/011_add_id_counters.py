@@ -0,0 +1,63 @@
+"""add id_counters table for business ID allocation
+
+Revision ID: 011_add_id_counters
+Revises: 010_expand_department
+Create Date: 2026-10-16
+
+One row per prefix (CT, U, AB, OB) holding the last allocated number, seeded
+from the highest existing contract_id / user_id / vendor_id.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+revision = "011_add_id_counters"
+down_revision = "010_expand_department"
+branch_labels = None
+depends_on = None
+
+# prefix -> (table, business ID column)
+_ID_SOURCES = {
+    "CT": ("contracts", "contract_id"),
+    "U": ("users", "user_id"),
+    "AB": ("vendors", "vendor_id"),
+    "OB": ("vendors", "vendor_id"),
+}
+
+
+def _highest_existing(bind, table, column, prefix):
+    """Highest numeric suffix among IDs like '<prefix><n>' (0 if none)."""
+    highest = 0
+    rows = bind.execute(
+        sa.text(f"SELECT {column} FROM {table} WHERE {column} LIKE :pattern"),
+        {"pattern": f"{prefix}%"},
+    ).fetchall()
+    for (business_id,) in rows:
+        suffix = (business_id or "")[len(prefix):]
+        if suffix.isdigit():
+            highest = max(highest, int(suffix))
+    return highest
+
+
+def upgrade() -> None:
+    id_counters = op.create_table(
+        "id_counters",
+        sa.Column("prefix", sa.String(10), primary_key=True),
+        sa.Column("last_value", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+
+    bind = op.get_bind()
+    existing_tables = set(inspect(bind).get_table_names())
+    seed_rows = []
+    for prefix, (table, column) in _ID_SOURCES.items():
+        last_value = 0
+        if table in existing_tables:
+            last_value = _highest_existing(bind, table, column, prefix)
+        seed_rows.append({"prefix": prefix, "last_value": last_value})
+    op.bulk_insert(id_counters, seed_rows)
+
+
+def downgrade() -> None:
+    op.drop_table("id_counters")
@@ -0,0 +1,75 @@
+"""add indexes for contract workflow filters
+
+Revision ID: 012_workflow_indexes
+Revises: 011_add_id_counters
+Create Date: 2026-10-16
+
+Covers the foreign keys and predicates every dashboard and list filters on:
+- contracts: vendor_id, the three owner columns, (status, end_date)
+- contracts: end_date for active contracts only (partial / filtered index on
+  PostgreSQL, MSSQL and SQLite)
+- contract_updates: (contract_id, status, created_at)
+- contract_documents.contract_id, termination_documents.contract_id
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+revision = "012_workflow_indexes"
+down_revision = "011_add_id_counters"
+branch_labels = None
+depends_on = None
+
+_ACTIVE_ONLY = sa.text("status = 'Active'")
+
+# (index name, table, columns, extra create_index kwargs)
+_INDEXES = [
+    ("ix_contracts_vendor_id", "contracts", ["vendor_id"], {}),
+    ("ix_contracts_contract_owner_id", "contracts", ["contract_owner_id"], {}),
+    ("ix_contracts_contract_owner_backup_id", "contracts", ["contract_owner_backup_id"], {}),
+    ("ix_contracts_contract_owner_manager_id", "contracts", ["contract_owner_manager_id"], {}),
+    ("ix_contracts_status_end_date", "contracts", ["status", "end_date"], {}),
+    (
+        "ix_contracts_active_end_date",
+        "contracts",
+        ["end_date"],
+        {
+            "postgresql_where": _ACTIVE_ONLY,
+            "mssql_where": _ACTIVE_ONLY,
+            "sqlite_where": _ACTIVE_ONLY,
+        },
+    ),
+    (
+        "ix_contract_updates_contract_status_created",
+        "contract_updates",
+        ["contract_id", "status", "created_at"],
+        {},
+    ),
+    ("ix_contract_documents_contract_id", "contract_documents", ["contract_id"], {}),
+    ("ix_termination_documents_contract_id", "termination_documents", ["contract_id"], {}),
+]
+
+
+def _existing_indexes(inspector, table_name):
+    return {ix["name"] for ix in inspector.get_indexes(table_name)}
+
+
+def upgrade() -> None:
+    inspector = inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+    for name, table_name, columns, kwargs in _INDEXES:
+        if table_name not in tables:
+            continue
+        # Skip indexes created by hand on existing databases
+        if name in _existing_indexes(inspector, table_name):
+            continue
+        op.create_index(name, table_name, columns, unique=False, **kwargs)
+
+
+def downgrade() -> None:
+    inspector = inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+    for name, table_name, _, _ in reversed(_INDEXES):
+        if table_name in tables and name in _existing_indexes(inspector, table_name):
+            op.drop_index(name, table_name=table_name)
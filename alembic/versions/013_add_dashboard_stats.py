@@ -0,0 +1,42 @@
+"""add dashboard_stats read model
+
+Revision ID: 013_dashboard_stats
+Revises: 012_workflow_indexes
+Create Date: 2026-10-16
+
+Contract counters per (status, department, currency) maintained by
+DashboardStatsService. The table starts empty; the first dashboard read
+builds it.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "013_dashboard_stats"
+down_revision = "012_workflow_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "dashboard_stats",
+        sa.Column("id", sa.Integer(), primary_key=True, index=True),
+        sa.Column("status", sa.String(50), nullable=False),
+        sa.Column("department", sa.String(128), nullable=False),
+        sa.Column("currency", sa.String(10), nullable=False),
+        sa.Column("total", sa.Integer(), nullable=False),
+        sa.Column("amount", sa.Numeric(18, 2), nullable=False),
+        sa.Column("current", sa.Integer(), nullable=False),
+        sa.Column("current_amount", sa.Numeric(18, 2), nullable=False),
+        sa.Column("expiring_30", sa.Integer(), nullable=False),
+        sa.Column("expiring_60", sa.Integer(), nullable=False),
+        sa.Column("expiring_90", sa.Integer(), nullable=False),
+        sa.Column("computed_for", sa.Date(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.UniqueConstraint("status", "department", "currency", name="uq_dashboard_stats_group"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("dashboard_stats")
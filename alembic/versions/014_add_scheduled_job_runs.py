@@ -0,0 +1,37 @@
+"""add scheduled_job_runs audit table
+
+Revision ID: 014_scheduled_job_runs
+Revises: 013_dashboard_stats
+Create Date: 2026-10-16
+
+One row per run of a scheduled background job (the contract expiry sweep),
+with its outcome and affected row count; the health endpoint reports the
+latest run.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "014_scheduled_job_runs"
+down_revision = "013_dashboard_stats"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "scheduled_job_runs",
+        sa.Column("id", sa.Integer(), primary_key=True, index=True),
+        sa.Column("job_name", sa.String(100), nullable=False),
+        sa.Column("status", sa.String(20), nullable=False),
+        sa.Column("affected_count", sa.Integer(), nullable=False),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("started_at", sa.DateTime(), nullable=False),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_scheduled_job_runs_job_name", "scheduled_job_runs", ["job_name"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_scheduled_job_runs_job_name", table_name="scheduled_job_runs")
+    op.drop_table("scheduled_job_runs")
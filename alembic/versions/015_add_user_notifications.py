@@ -0,0 +1,52 @@
+"""add user_notifications inbox table
+
+Revision ID: 015_user_notifications
+Revises: 014_scheduled_job_runs
+Create Date: 2026-10-16
+
+Persisted notification inbox with read/unread state. Rows are written by the
+daily notification refresh job and on ContractUpdate status changes, so the
+header badge is a single indexed COUNT instead of recomputing notifications
+on every page load.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "015_user_notifications"
+down_revision = "014_scheduled_job_runs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "user_notifications",
+        sa.Column("id", sa.Integer(), primary_key=True, index=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("type", sa.String(50), nullable=False),
+        sa.Column("dedupe_key", sa.String(100), nullable=False),
+        sa.Column("title", sa.String(255), nullable=False),
+        sa.Column("message", sa.Text(), nullable=False),
+        sa.Column("link", sa.String(255), nullable=True),
+        sa.Column("priority", sa.String(10), nullable=False),
+        sa.Column("contract_id", sa.Integer(), sa.ForeignKey("contracts.id", ondelete="CASCADE"), nullable=True),
+        sa.Column(
+            "contract_update_id",
+            sa.Integer(),
+            sa.ForeignKey("contract_updates.id", ondelete="CASCADE"),
+            nullable=True,
+        ),
+        sa.Column("is_read", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column("read_at", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.UniqueConstraint("user_id", "dedupe_key", name="uq_user_notifications_user_dedupe"),
+    )
+    op.create_index("ix_user_notifications_user_read", "user_notifications", ["user_id", "is_read"])
+    op.create_index("ix_user_notifications_user_created", "user_notifications", ["user_id", "created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_user_notifications_user_created", table_name="user_notifications")
+    op.drop_index("ix_user_notifications_user_read", table_name="user_notifications")
+    op.drop_table("user_notifications")
@@ -0,0 +1,142 @@
+"""add search_documents index table
+
+Revision ID: 016_search_documents
+Revises: 015_user_notifications
+Create Date: 2026-10-16
+
+Denormalized search text per contract / vendor, maintained on write by
+app.services.search_index. On PostgreSQL a generated tsvector column with a
+GIN index serves word-prefix queries and a pg_trgm GIN index serves substring
+matches, replacing ILIKE '%term%' across the contracts/vendors/users joins.
+Existing rows are backfilled here.
+"""
+import re
+from collections import defaultdict
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "016_search_documents"
+down_revision = "015_user_notifications"
+branch_labels = None
+depends_on = None
+
+_WORD = re.compile(r"\w+")
+
+search_documents = sa.table(
+    "search_documents",
+    sa.column("entity_type", sa.String),
+    sa.column("entity_id", sa.Integer),
+    sa.column("content", sa.Text),
+    sa.column("updated_at", sa.DateTime),
+)
+contracts = sa.table(
+    "contracts",
+    sa.column("id", sa.Integer),
+    sa.column("contract_id", sa.String),
+    sa.column("contract_description", sa.String),
+    sa.column("vendor_id", sa.Integer),
+    sa.column("contract_owner_id", sa.Integer),
+)
+vendors = sa.table(
+    "vendors",
+    sa.column("id", sa.Integer),
+    sa.column("vendor_id", sa.String),
+    sa.column("vendor_name", sa.String),
+    sa.column("vendor_contact_person", sa.String),
+)
+vendor_emails = sa.table(
+    "vendor_emails",
+    sa.column("vendor_id", sa.Integer),
+    sa.column("email", sa.String),
+)
+users = sa.table(
+    "users",
+    sa.column("id", sa.Integer),
+    sa.column("first_name", sa.String),
+    sa.column("last_name", sa.String),
+)
+
+
+def _normalize(*values) -> str:
+    # Same as app.services.search_index.normalize
+    return " ".join(word for value in values if value for word in _WORD.findall(str(value).lower()))
+
+
+def _backfill(bind) -> None:
+    now = datetime.utcnow()
+    rows = bind.execute(
+        sa.select(
+            contracts.c.id,
+            contracts.c.contract_id,
+            contracts.c.contract_description,
+            vendors.c.vendor_name,
+            users.c.first_name,
+            users.c.last_name,
+        )
+        .select_from(contracts)
+        .outerjoin(vendors, contracts.c.vendor_id == vendors.c.id)
+        .outerjoin(users, contracts.c.contract_owner_id == users.c.id)
+    )
+    documents = [
+        {
+            "entity_type": "contract",
+            "entity_id": row.id,
+            "content": _normalize(row.contract_id, row.contract_description, row.vendor_name, row.first_name, row.last_name),
+            "updated_at": now,
+        }
+        for row in rows
+    ]
+
+    emails_by_vendor = defaultdict(list)
+    for vendor_id, email in bind.execute(sa.select(vendor_emails.c.vendor_id, vendor_emails.c.email)):
+        emails_by_vendor[vendor_id].append(email)
+    for row in bind.execute(
+        sa.select(vendors.c.id, vendors.c.vendor_id, vendors.c.vendor_name, vendors.c.vendor_contact_person)
+    ):
+        documents.append({
+            "entity_type": "vendor",
+            "entity_id": row.id,
+            "content": _normalize(row.vendor_id, row.vendor_name, row.vendor_contact_person, *emails_by_vendor[row.id]),
+            "updated_at": now,
+        })
+
+    if documents:
+        op.bulk_insert(search_documents, documents)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    op.create_table(
+        "search_documents",
+        sa.Column("id", sa.Integer(), primary_key=True, index=True),
+        sa.Column("entity_type", sa.String(20), nullable=False),
+        sa.Column("entity_id", sa.Integer(), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.UniqueConstraint("entity_type", "entity_id", name="uq_search_documents_entity"),
+    )
+
+    if bind.dialect.name == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute(
+            "ALTER TABLE search_documents ADD COLUMN content_tsv tsvector "
+            "GENERATED ALWAYS AS (to_tsvector('simple', content)) STORED"
+        )
+        op.execute("CREATE INDEX ix_search_documents_content_tsv ON search_documents USING gin (content_tsv)")
+        op.execute(
+            "CREATE INDEX ix_search_documents_content_trgm ON search_documents USING gin (content gin_trgm_ops)"
+        )
+
+    _backfill(bind)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_search_documents_content_trgm")
+        op.execute("DROP INDEX IF EXISTS ix_search_documents_content_tsv")
+    op.drop_table("search_documents")
@@ -0,0 +1,125 @@
+"""add content-addressed document store
+
+Revision ID: 017_document_store
+Revises: 016_search_documents
+Create Date: 2026-10-17
+
+stored_blobs holds one row per distinct document file (by SHA-256) with the
+number of contract / termination / vendor document rows referencing it, and
+each document table gets a sha256 column. Existing files are hashed and
+hardlinked into uploads/blobs (copied where hardlinks are not possible) and
+rows are repointed at the blob, so identical documents share one file. The old
+per-entity paths are left in place (as hardlinks they use no extra space) since
+files cannot be restored if the migration transaction rolls back; they are no
+longer referenced and can be deleted. Rows whose file is missing keep sha256 NULL.
+"""
+import hashlib
+import os
+import shutil
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "017_document_store"
+down_revision = "016_search_documents"
+branch_labels = None
+depends_on = None
+
+DOCUMENT_TABLES = ("contract_documents", "termination_documents", "vendor_documents")
+
+# Same layout as app.services.document_store.blob_path
+BLOB_DIR = os.path.join("uploads", "blobs")
+CHUNK_SIZE = 64 * 1024
+
+stored_blobs = sa.table(
+    "stored_blobs",
+    sa.column("sha256", sa.String),
+    sa.column("file_path", sa.String),
+    sa.column("file_size", sa.Integer),
+    sa.column("ref_count", sa.Integer),
+    sa.column("created_at", sa.DateTime),
+)
+
+
+def _document_table(name):
+    return sa.table(
+        name,
+        sa.column("id", sa.Integer),
+        sa.column("file_path", sa.String),
+        sa.column("sha256", sa.String),
+    )
+
+
+def _sha256(file_path):
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as stream:
+        for chunk in iter(lambda: stream.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _link_or_copy(source, target):
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    temp_path = f"{target}.part"
+    try:
+        os.link(source, temp_path)
+    except OSError:
+        shutil.copyfile(source, temp_path)
+    os.replace(temp_path, target)
+
+
+def _backfill(bind):
+    blobs = {}
+    for name in DOCUMENT_TABLES:
+        table = _document_table(name)
+        for row in bind.execute(sa.select(table.c.id, table.c.file_path)).fetchall():
+            if not row.file_path or not os.path.isfile(row.file_path):
+                continue
+            sha256 = _sha256(row.file_path)
+            blob = blobs.get(sha256)
+            if blob is None:
+                extension = os.path.splitext(row.file_path)[1] or ".pdf"
+                target = os.path.join(BLOB_DIR, sha256[:2], f"{sha256}{extension}")
+                if not os.path.exists(target):
+                    _link_or_copy(row.file_path, target)
+                blob = blobs[sha256] = {
+                    "sha256": sha256,
+                    "file_path": target,
+                    "file_size": os.path.getsize(target),
+                    "ref_count": 0,
+                    "created_at": datetime.utcnow(),
+                }
+            blob["ref_count"] += 1
+            bind.execute(
+                table.update()
+                .where(table.c.id == row.id)
+                .values(file_path=blob["file_path"], sha256=sha256)
+            )
+    if blobs:
+        op.bulk_insert(stored_blobs, list(blobs.values()))
+
+
+def upgrade() -> None:
+    op.create_table(
+        "stored_blobs",
+        sa.Column("sha256", sa.String(64), primary_key=True),
+        sa.Column("file_path", sa.String(500), nullable=False),
+        sa.Column("file_size", sa.Integer(), nullable=False),
+        sa.Column("ref_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    for name in DOCUMENT_TABLES:
+        op.add_column(name, sa.Column("sha256", sa.String(64), nullable=True))
+        op.create_index(f"ix_{name}_sha256", name, ["sha256"])
+
+    _backfill(op.get_bind())
+
+
+def downgrade() -> None:
+    # Rows keep pointing at their blob files, which stay valid without the store
+    for name in DOCUMENT_TABLES:
+        op.drop_index(f"ix_{name}_sha256", table_name=name)
+        op.drop_column(name, "sha256")
+    op.drop_table("stored_blobs")
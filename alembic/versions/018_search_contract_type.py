@@ -0,0 +1,105 @@
+"""add contract type to contract search documents
+
+Revision ID: 018_search_contract_type
+Revises: 017_document_store
+Create Date: 2026-10-17
+
+The paginated contract tables also match the contract type, so it becomes
+part of the contract search text. Existing contract documents are rebuilt.
+"""
+import re
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "018_search_contract_type"
+down_revision = "017_document_store"
+branch_labels = None
+depends_on = None
+
+_WORD = re.compile(r"\w+")
+BATCH_SIZE = 1000
+
+search_documents = sa.table(
+    "search_documents",
+    sa.column("entity_type", sa.String),
+    sa.column("entity_id", sa.Integer),
+    sa.column("content", sa.Text),
+    sa.column("updated_at", sa.DateTime),
+)
+contracts = sa.table(
+    "contracts",
+    sa.column("id", sa.Integer),
+    sa.column("contract_id", sa.String),
+    sa.column("contract_description", sa.String),
+    sa.column("contract_type", sa.String),
+    sa.column("vendor_id", sa.Integer),
+    sa.column("contract_owner_id", sa.Integer),
+)
+vendors = sa.table(
+    "vendors",
+    sa.column("id", sa.Integer),
+    sa.column("vendor_name", sa.String),
+)
+users = sa.table(
+    "users",
+    sa.column("id", sa.Integer),
+    sa.column("first_name", sa.String),
+    sa.column("last_name", sa.String),
+)
+
+
+def _normalize(*values) -> str:
+    # Same as app.services.search_index.normalize
+    return " ".join(word for value in values if value for word in _WORD.findall(str(value).lower()))
+
+
+def _rebuild_contract_documents(include_type: bool) -> None:
+    bind = op.get_bind()
+    now = datetime.utcnow()
+    rows = bind.execute(
+        sa.select(
+            contracts.c.id,
+            contracts.c.contract_id,
+            contracts.c.contract_description,
+            contracts.c.contract_type,
+            vendors.c.vendor_name,
+            users.c.first_name,
+            users.c.last_name,
+        )
+        .select_from(contracts)
+        .outerjoin(vendors, contracts.c.vendor_id == vendors.c.id)
+        .outerjoin(users, contracts.c.contract_owner_id == users.c.id)
+    ).all()
+    update = (
+        search_documents.update()
+        .where(search_documents.c.entity_type == "contract")
+        .where(search_documents.c.entity_id == sa.bindparam("b_entity_id"))
+        .values(content=sa.bindparam("b_content"), updated_at=sa.bindparam("b_updated_at"))
+    )
+    for start in range(0, len(rows), BATCH_SIZE):
+        bind.execute(update, [
+            {
+                "b_entity_id": row.id,
+                "b_content": _normalize(
+                    row.contract_id,
+                    row.contract_description,
+                    row.contract_type if include_type else None,
+                    row.vendor_name,
+                    row.first_name,
+                    row.last_name,
+                ),
+                "b_updated_at": now,
+            }
+            for row in rows[start:start + BATCH_SIZE]
+        ])
+
+
+def upgrade() -> None:
+    _rebuild_contract_documents(include_type=True)
+
+
+def downgrade() -> None:
+    _rebuild_contract_documents(include_type=False)
@@ -0,0 +1,38 @@
+"""add released_at to stored_blobs
+
+Revision ID: 019_blob_released_at
+Revises: 018_search_contract_type
+Create Date: 2026-10-17
+
+Unreferenced blobs are no longer deleted on commit: released_at records when
+ref_count dropped to zero and a periodic sweep deletes the file after a grace
+period. Rows already at zero are marked released now.
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "019_blob_released_at"
+down_revision = "018_search_contract_type"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("stored_blobs", sa.Column("released_at", sa.DateTime(), nullable=True))
+    op.create_index("ix_stored_blobs_released_at", "stored_blobs", ["released_at"])
+    stored_blobs = sa.table(
+        "stored_blobs",
+        sa.column("ref_count", sa.Integer),
+        sa.column("released_at", sa.DateTime),
+    )
+    op.execute(
+        stored_blobs.update().where(stored_blobs.c.ref_count <= 0).values(released_at=datetime.utcnow())
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_stored_blobs_released_at", table_name="stored_blobs")
+    op.drop_column("stored_blobs", "released_at")
@@ -0,0 +1,32 @@
+"""add dashboard_stats_state freshness marker
+
+Revision ID: 020_dashboard_stats_state
+Revises: 019_blob_released_at
+Create Date: 2026-10-17
+
+dashboard_stats is rebuilt when the date it was rebuilt for is not today,
+recorded in a single dashboard_stats_state row instead of being derived from
+the counter rows' updated_at. The table starts empty; the first dashboard read
+rebuilds the counters and writes the marker.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "020_dashboard_stats_state"
+down_revision = "019_blob_released_at"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "dashboard_stats_state",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("rebuilt_on", sa.Date(), nullable=False),
+        sa.Column("rebuilt_at", sa.DateTime(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("dashboard_stats_state")
@@ -0,0 +1,31 @@
+"""add scheduled_job_leases
+
+Revision ID: 021_scheduled_job_leases
+Revises: 020_dashboard_stats_state
+Create Date: 2026-10-17
+
+Scheduled jobs lock with pg_try_advisory_lock on PostgreSQL and sp_getapplock
+on SQL Server. Other databases claim a per-job lease row with a conditional
+UPDATE, so only one worker runs a job in multi-worker mode there as well.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "021_scheduled_job_leases"
+down_revision = "020_dashboard_stats_state"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "scheduled_job_leases",
+        sa.Column("job_name", sa.String(100), primary_key=True),
+        sa.Column("holder", sa.String(64), nullable=False),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("scheduled_job_leases")
@@ -1,11 +1,14 @@
 from fastapi import APIRouter
-from app.api.v1 import health, vendors, contracts, auth, dashboards, contract_updates
+from app.api.v1 import health, metrics, vendors, contracts, auth, dashboards, contract_updates
 
 api_router = APIRouter()
 
 # Include health check router
 api_router.include_router(health.router, tags=["health"])
 
+# Include metrics router
+api_router.include_router(metrics.router, tags=["metrics"])
+
 # Include authentication router
 api_router.include_router(auth.router, prefix="/auth", tags=["authentication"])
 
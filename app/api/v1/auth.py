@@ -1,17 +1,19 @@
 from datetime import timedelta
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
 from app.db.database import get_db
 from app.core.security import (
-    verify_password,
-    get_password_hash,
+    password_hasher,
     create_access_token,
     get_current_active_user,
+    invalidate_principal,
     ACCESS_TOKEN_EXPIRE_MINUTES
 )
-from app.core.constants import ErrorMessages, HTTPStatus
+from app.core.constants import ErrorMessages, HTTPStatus, SuccessMessages
+from app.core.cache import reference_cache, USERS_NAMESPACE
+from app.core.rate_limit import login_rate_limiter
 from app.models.contract import User, UserRole, DepartmentType
 from app.schemas.auth import (
     Token,
@@ -41,7 +43,7 @@ def register_user(
     contract_service = ContractService(db)
     user_id = contract_service.generate_user_id()
     
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = password_hasher.hash(user_data.password)
     
     try:
         department_enum = DepartmentType(user_data.department)
@@ -74,18 +76,24 @@ def register_user(
     db.add(new_user)
     db.commit()
     db.refresh(new_user)
+    reference_cache.invalidate(USERS_NAMESPACE)
     
     return new_user
 
 
 @router.post("/login", response_model=Token)
 def login(
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
 ):
+    attempt_keys = login_rate_limiter.keys(form_data.username, request.client.host if request.client else None)
+    login_rate_limiter.check(attempt_keys)
+    
     user = db.query(User).filter(User.email == form_data.username).first()
     
     if not user:
+        login_rate_limiter.record_failure(attempt_keys)
         raise HTTPException(
             status_code=HTTPStatus.UNAUTHORIZED,
             detail=ErrorMessages.INVALID_CREDENTIALS,
@@ -99,7 +107,8 @@ def login(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    if not verify_password(form_data.password, user.hashed_password):
+    if not password_hasher.verify(form_data.password, user.hashed_password):
+        login_rate_limiter.record_failure(attempt_keys)
         raise HTTPException(
             status_code=HTTPStatus.UNAUTHORIZED,
             detail=ErrorMessages.INVALID_CREDENTIALS,
@@ -112,6 +121,8 @@ def login(
             detail=ErrorMessages.INACTIVE_USER
         )
     
+    # Success clears the email counter; the IP keeps its history
+    login_rate_limiter.reset(attempt_keys[:1])
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         data={"sub": user.email, "role": user.role.value if user.role else None},
@@ -123,12 +134,17 @@ def login(
 
 @router.post("/login-json", response_model=Token)
 def login_json(
+    request: Request,
     user_login: UserLogin,
     db: Session = Depends(get_db)
 ):
+    attempt_keys = login_rate_limiter.keys(user_login.email, request.client.host if request.client else None)
+    login_rate_limiter.check(attempt_keys)
+    
     user = db.query(User).filter(User.email == user_login.email).first()
     
     if not user:
+        login_rate_limiter.record_failure(attempt_keys)
         raise HTTPException(
             status_code=HTTPStatus.UNAUTHORIZED,
             detail=ErrorMessages.INVALID_CREDENTIALS
@@ -140,7 +156,8 @@ def login_json(
             detail=ErrorMessages.NO_PASSWORD_SET
         )
     
-    if not verify_password(user_login.password, user.hashed_password):
+    if not password_hasher.verify(user_login.password, user.hashed_password):
+        login_rate_limiter.record_failure(attempt_keys)
         raise HTTPException(
             status_code=HTTPStatus.UNAUTHORIZED,
             detail=ErrorMessages.INVALID_CREDENTIALS
@@ -152,6 +169,8 @@ def login_json(
             detail=ErrorMessages.INACTIVE_USER
         )
     
+    # Success clears the email counter; the IP keeps its history
+    login_rate_limiter.reset(attempt_keys[:1])
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         data={"sub": user.email, "role": user.role.value if user.role else None},
@@ -180,16 +199,20 @@ def change_password(
             detail=ErrorMessages.NO_PASSWORD_SET
         )
     
-    if not verify_password(password_data.current_password, current_user.hashed_password):
+    attempt_keys = login_rate_limiter.keys(current_user.email, None)
+    login_rate_limiter.check(attempt_keys)
+    if not password_hasher.verify(password_data.current_password, current_user.hashed_password):
+        login_rate_limiter.record_failure(attempt_keys)
         raise HTTPException(
             status_code=HTTPStatus.BAD_REQUEST,
             detail=ErrorMessages.INCORRECT_CURRENT_PASSWORD
         )
     
-    current_user.hashed_password = get_password_hash(password_data.new_password)
+    current_user.hashed_password = password_hasher.hash(password_data.new_password)
     db.commit()
+    invalidate_principal(current_user.email)
     
-    return {"message": ErrorMessages.PASSWORD_CHANGED}
+    return {"message": SuccessMessages.PASSWORD_CHANGED}
 
 
 @router.post("/set-password/{user_id}")
@@ -212,7 +235,8 @@ def set_user_password(
             detail=ErrorMessages.USER_NOT_FOUND
         )
     
-    user.hashed_password = get_password_hash(new_password)
+    user.hashed_password = password_hasher.hash(new_password)
     db.commit()
+    invalidate_principal(user.email)
     
     return {"message": f"Password set successfully for user {user.email}"}
\ No newline at end of file
@@ -1,19 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, status, Query
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, status, Query, Request
 from sqlalchemy.orm import Session
 from typing import List, Optional
+import csv
 import json
+import zipfile
 from datetime import datetime
+from openpyxl.utils.exceptions import InvalidFileException
 from pydantic import ValidationError
 
-from app.db.database import get_db
-from app.services.contract_service import ContractService
+from app.db.database import get_db, SessionLocal
+from app.core.cache import cached_json_response
+from app.core.downloads import document_file_response
+from app.core.exports import export_response
+from app.core.imports import detect_import_format, iter_import_rows
+from app.core.security import get_current_principal, require_contract_admin, UserPrincipal
+from app.services.contract_import import ContractImportService
+from app.services.contract_service import ContractService, CONTRACT_EXPORT_COLUMNS
 from app.schemas.contract import (
     ContractCreate, ContractUpdate, ContractDetailResponse,
     ContractListResponse, ContractSearchResponse,
     UserCreate, UserResponse, UserListResponse, ContractValidationEnums,
     ContractSummary, ContractDocumentResponse,
     TerminationDocumentResponse, TerminationDocumentUpdate,
-    TerminationDocumentFromContractDocument,
+    TerminationDocumentFromContractDocument, ContractImportResponse,
 )
 from app.models.contract import (
     ContractType, DepartmentType, NoticePeriodType, ExpirationNoticePeriodType,
@@ -106,6 +115,35 @@ async def create_contract(
         )
 
 
+@router.post("/bulk", response_model=ContractImportResponse)
+def bulk_import_contracts(
+    file: UploadFile = File(..., description="Contracts as CSV, XLSX or JSON lines (one ContractCreate per row)"),
+    format: Optional[str] = Query(None, description="csv, xlsx or jsonl (default: from the file extension)"),
+    dry_run: bool = Query(False, description="Only validate and report errors"),
+    partial: bool = Query(False, description="Create the valid rows even if other rows fail"),
+    db: Session = Depends(get_db),
+    current_user: UserPrincipal = Depends(require_contract_admin),
+):
+    """
+    Create many contracts from a file in one transaction.
+
+    Columns / keys are the ContractCreate fields. Every row is validated first
+    and the response lists the errors per row; unless partial is set nothing
+    is created when any row fails. Contracts are created without documents.
+    """
+    import_format = detect_import_format(file.filename, format)
+    try:
+        rows = iter_import_rows(file.file, import_format)
+        return ContractImportService(db).import_rows(rows, dry_run=dry_run, partial=partial)
+    except HTTPException:
+        raise
+    except (UnicodeDecodeError, csv.Error, InvalidFileException, zipfile.BadZipFile) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Could not read {import_format} file: {e}"
+        )
+
+
 @router.put("/{contract_id}", response_model=ContractDetailResponse)
 def update_contract(
     contract_id: int,
@@ -147,13 +185,52 @@ def update_contract(
         )
 
 
+# Declared before /{contract_id} so "export" is not parsed as an ID
+@router.get("/export")
+def export_contracts(
+    format: str = Query("csv", pattern="^(csv|xlsx)$", description="csv or xlsx"),
+    search: Optional[str] = Query(None, description="Search keyword"),
+    status: Optional[ContractStatusType] = Query(None, description="Filter by status"),
+    contract_type: Optional[ContractType] = Query(None, description="Filter by type"),
+    department: Optional[DepartmentType] = Query(None, description="Filter by department"),
+    owner_id: Optional[int] = Query(None, description="Filter by contract owner ID"),
+    vendor_id: Optional[int] = Query(None, description="Filter by vendor ID"),
+    expiring_soon: Optional[bool] = Query(None, description="Filter expiring within 30 days"),
+    current_user: UserPrincipal = Depends(get_current_principal)
+):
+    """
+    Export every contract matching the GET /contracts filters as CSV or XLSX.
+    Rows are streamed from a server-side cursor, so memory does not grow with the result size.
+    """
+    filters = dict(
+        search=search,
+        status=status,
+        contract_type=contract_type.value if contract_type else None,
+        department=department.value if department else None,
+        owner_id=owner_id,
+        vendor_id=vendor_id,
+        expiring_soon=expiring_soon,
+    )
+
+    def rows():
+        # Own session: a streamed body outlives the request's get_db dependency
+        db = SessionLocal()
+        try:
+            yield from ContractService(db).iter_contract_export_rows(**filters)
+        finally:
+            db.close()
+
+    filename_stem = f"contracts_{datetime.now().strftime('%Y%m%d_%H%M')}"
+    return export_response(CONTRACT_EXPORT_COLUMNS, rows(), filename_stem, format, sheet_name="Contracts")
+
+
 @router.get("/{contract_id}", response_model=ContractDetailResponse)
 def get_contract(contract_id: int, db: Session = Depends(get_db)):
     """
     Get contract by ID with all related information.
     """
     contract_service = ContractService(db)
-    contract = contract_service.get_contract_by_id(contract_id)
+    contract = contract_service.get_contract_by_id(contract_id, profile="detail")
     
     if not contract:
         raise HTTPException(
@@ -185,7 +262,7 @@ def get_contract_by_contract_id(contract_id: str, db: Session = Depends(get_db))
     Get contract by contract ID (CT1, CT2, etc.) with all related information.
     """
     contract_service = ContractService(db)
-    contract = contract_service.get_contract_by_contract_id(contract_id)
+    contract = contract_service.get_contract_by_contract_id(contract_id, profile="detail")
     
     if not contract:
         raise HTTPException(
@@ -414,18 +491,38 @@ def delete_termination_document(contract_id: int, doc_id: int, db: Session = Dep
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Termination document not found")
 
 
+@router.get("/{contract_id}/documents/{doc_id}/download")
+def download_contract_document(
+    contract_id: int,
+    doc_id: int,
+    request: Request,
+    inline: bool = Query(False, description="Display in the browser instead of downloading"),
+    current_user: UserPrincipal = Depends(get_current_principal),
+    db: Session = Depends(get_db)
+):
+    """Download a contract document. Supports Range requests and ETag revalidation."""
+    contract_service = ContractService(db)
+    doc = contract_service.get_contract_document(contract_id, doc_id)
+    if not doc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Contract document not found")
+    return document_file_response(request, doc.file_path, doc.file_name, doc.content_type, inline=inline)
+
+
 @router.get("/{contract_id}/termination-documents/{doc_id}/download")
-def download_termination_document(contract_id: int, doc_id: int, db: Session = Depends(get_db)):
+def download_termination_document(
+    contract_id: int,
+    doc_id: int,
+    request: Request,
+    inline: bool = Query(False, description="Display in the browser instead of downloading"),
+    current_user: UserPrincipal = Depends(get_current_principal),
+    db: Session = Depends(get_db)
+):
     """Download termination document file. All roles can download."""
-    from fastapi.responses import FileResponse
     contract_service = ContractService(db)
     doc = contract_service.get_termination_document(contract_id, doc_id)
     if not doc:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Termination document not found")
-    import os
-    if not os.path.exists(doc.file_path):
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
-    return FileResponse(doc.file_path, filename=doc.file_name, media_type=doc.content_type or "application/pdf")
+    return document_file_response(request, doc.file_path, doc.file_name, doc.content_type, inline=inline)
 
 
 @router.get("/summary/dashboard", response_model=ContractSummary)
@@ -517,108 +614,99 @@ def get_user_email(user_id: int, db: Session = Depends(get_db)):
 
 # Validation and Helper Endpoints
 @router.get("/validation/enums", response_model=ContractValidationEnums)
-def get_validation_enums():
+def get_validation_enums(request: Request):
     """
     Get all enum values for form validation.
     """
-    return ContractValidationEnums()
+    return cached_json_response(request, "reference:contract_enums", ContractValidationEnums)
 
 
 @router.get("/validation/vendors")
-def get_vendors_for_dropdown(db: Session = Depends(get_db)):
+def get_vendors_for_dropdown(request: Request, db: Session = Depends(get_db)):
     """
     Get list of vendors for dropdown selection.
+    Cached until a vendor is created or updated.
     """
     from app.services.vendor_service import VendorService
     vendor_service = VendorService(db)
-    vendors = vendor_service.get_vendors(skip=0, limit=1000)
-    
-    return [
-        {
-            "id": vendor.id,
-            "vendor_id": vendor.vendor_id,
-            "vendor_name": vendor.vendor_name,
-            "vendor_country": vendor.vendor_country
-        }
-        for vendor in vendors
-    ]
+    return cached_json_response(request, "vendors:dropdown", vendor_service.get_vendor_dropdown_options)
 
 
 @router.get("/validation/departments")
-def get_departments():
+def get_departments(request: Request):
     """
     Get list of departments for dropdown selection.
     """
-    return [
+    return cached_json_response(request, "reference:departments", lambda: [
         {"value": dept.value, "label": dept.value}
         for dept in DepartmentType
-    ]
+    ])
 
 
 @router.get("/validation/contract-types")
-def get_contract_types():
+def get_contract_types(request: Request):
     """
     Get list of contract types for dropdown selection.
     """
-    return [
+    return cached_json_response(request, "reference:contract_types", lambda: [
         {"value": ct.value, "label": ct.value}
         for ct in ContractType
-    ]
+    ])
 
 
 @router.get("/validation/currencies")
-def get_currencies():
+def get_currencies(request: Request):
     """
     Get list of currencies for dropdown selection.
     """
-    return [
+    return cached_json_response(request, "reference:currencies", lambda: [
         {"value": curr.value, "label": curr.value}
         for curr in CurrencyType
-    ]
+    ])
 
 
 @router.get("/validation/payment-methods")
-def get_payment_methods():
+def get_payment_methods(request: Request):
     """
     Get list of payment methods for dropdown selection.
     """
-    return [
+    return cached_json_response(request, "reference:payment_methods", lambda: [
         {"value": pm.value, "label": pm.value}
         for pm in PaymentMethodType
-    ]
+    ])
 
 
 @router.get("/validation/notice-periods")
-def get_notice_periods():
+def get_notice_periods(request: Request):
     """
     Get list of notice periods for dropdown selection.
     """
-    return [
+    return cached_json_response(request, "reference:notice_periods", lambda: [
         {"value": np.value, "label": np.value}
         for np in NoticePeriodType
-    ]
+    ])
 
 
 @router.get("/validation/renewal-periods")
-def get_renewal_periods():
+def get_renewal_periods(request: Request):
     """
     Get list of renewal periods for dropdown selection.
     """
-    return [
+    return cached_json_response(request, "reference:renewal_periods", lambda: [
         {"value": rp.value, "label": rp.value}
         for rp in RenewalPeriodType
-    ]
+    ])
 
 
 @router.get("/validation/expiration-notice-periods")
-def get_expiration_notice_periods():
+def get_expiration_notice_periods(request: Request):
     """
     Get list of expiration notice periods for dropdown selection.
     """
-    return [
+    return cached_json_response(request, "reference:expiration_notice_periods", lambda: [
         {"value": enp.value, "label": enp.value}
         for enp in ExpirationNoticePeriodType
-    ]
+    ])
 
 
 @router.post("/{contract_id}/save-pending-termination")
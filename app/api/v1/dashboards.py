@@ -8,7 +8,7 @@ from datetime import date, timedelta
 
 from app.db.database import get_db
 from app.core.security import (
-    get_current_active_user,
+    UserPrincipal,
     require_contract_admin,
     require_contract_manager
 )
@@ -28,7 +28,7 @@ router = APIRouter()
 
 @router.get("/manager", response_model=ContractManagerDashboard)
 def get_manager_dashboard(
-    current_user: User = Depends(require_contract_manager),
+    current_user: UserPrincipal = Depends(require_contract_manager),
     db: Session = Depends(get_db)
 ):
     """
@@ -82,7 +82,7 @@ def get_manager_dashboard(
 
 @router.get("/admin", response_model=ContractAdminDashboard)
 def get_admin_dashboard(
-    current_user: User = Depends(require_contract_admin),
+    current_user: UserPrincipal = Depends(require_contract_admin),
     db: Session = Depends(get_db)
 ):
     """
@@ -141,7 +141,7 @@ def get_admin_dashboard(
 
 @router.get("/pending-documents", response_model=PendingDocumentsWorkbasket)
 def get_pending_termination_documents(
-    current_user: User = Depends(require_contract_admin),
+    current_user: UserPrincipal = Depends(require_contract_admin),
     db: Session = Depends(get_db)
 ):
     """
@@ -184,7 +184,7 @@ def get_pending_termination_documents(
 def perform_contract_action(
     contract_id: int,
     action_request: ContractActionRequest,
-    current_user: User = Depends(require_contract_manager),
+    current_user: UserPrincipal = Depends(require_contract_manager),
     db: Session = Depends(get_db)
 ):
     """
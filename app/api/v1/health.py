@@ -1,9 +1,11 @@
 from fastapi import APIRouter, Depends
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 from datetime import datetime
-from app.schemas.contracts import HealthCheck
+from app.schemas.contracts import HealthCheck, ScheduledJobStatus
 from app.db.database import get_db
 from app.core.config import settings
+from app.services.expiry_sweeper import latest_expiry_sweep
 
 router = APIRouter()
 
@@ -15,14 +17,22 @@ async def health_check(db: Session = Depends(get_db)):
     """
     try:
         # Test database connection
-        db.execute("SELECT 1")
+        db.execute(text("SELECT 1"))
         database_status = "connected"
     except Exception:
         database_status = "disconnected"
+
+    expiry_sweep = None
+    if database_status == "connected":
+        try:
+            expiry_sweep = latest_expiry_sweep(db)
+        except Exception:
+            expiry_sweep = None
     
     return HealthCheck(
         status="healthy" if database_status == "connected" else "unhealthy",
         timestamp=datetime.utcnow(),
         version=settings.app_version,
-        database=database_status
+        database=database_status,
+        expiry_sweep=ScheduledJobStatus.model_validate(expiry_sweep) if expiry_sweep else None
     )
\ No newline at end of file
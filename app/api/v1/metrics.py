@@ -0,0 +1,16 @@
+from fastapi import APIRouter, HTTPException, Response
+from app.core.config import settings
+from app.core.constants import ErrorMessages, HTTPStatus
+from app.core.metrics import CONTENT_TYPE, metrics_registry
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_class=Response)
+async def metrics():
+    """
+    SQL statement and connection pool metrics of this worker in the Prometheus text format
+    """
+    if not settings.db_metrics_enabled:
+        raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail=ErrorMessages.RESOURCE_NOT_FOUND)
+    return Response(content=metrics_registry.render(), media_type=CONTENT_TYPE)
@@ -1,12 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, status
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, status, Request, Query
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
 import json
 from pydantic import ValidationError
 
-from app.db.database import get_db
-from app.services.vendor_service import VendorService
+from app.db.database import get_db, SessionLocal
+from app.core.cache import cached_json_response
+from app.core.downloads import document_file_response
+from app.core.exports import export_response
+from app.core.security import get_current_principal, UserPrincipal
+from app.services.vendor_service import VendorService, VENDOR_EXPORT_COLUMNS
 from app.schemas.vendor import (
     VendorCreate, VendorUpdate, VendorResponse, VendorDetailResponse,
     DocumentType, VendorDocumentResponse, VendorListResponse,
@@ -341,6 +345,32 @@ def update_vendor(
         )
 
 
+# Declared before /{vendor_id} so "export" is not parsed as an ID
+@router.get("/export")
+def export_vendors(
+    format: str = Query("csv", pattern="^(csv|xlsx)$", description="csv or xlsx"),
+    status_filter: Optional[str] = None,
+    search: Optional[str] = None,
+    current_user: UserPrincipal = Depends(get_current_principal)
+):
+    """
+    Export every vendor matching the GET /vendors filters as CSV or XLSX.
+    Rows are streamed from a server-side cursor, so memory does not grow with the result size.
+    """
+    from datetime import datetime
+    
+    def rows():
+        # Own session: a streamed body outlives the request's get_db dependency
+        db = SessionLocal()
+        try:
+            yield from VendorService(db).iter_vendor_export_rows(status_filter=status_filter, search=search)
+        finally:
+            db.close()
+    
+    filename_stem = f"vendors_{datetime.now().strftime('%Y%m%d_%H%M')}"
+    return export_response(VENDOR_EXPORT_COLUMNS, rows(), filename_stem, format, sheet_name="Vendors")
+
+
 @router.get("/{vendor_id}", response_model=VendorProfileDetailResponse)
 def get_vendor(vendor_id: int, db: Session = Depends(get_db)):
     """
@@ -543,11 +573,11 @@ def get_required_documents(vendor_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/validation/countries")
-def get_supported_countries():
+def get_supported_countries(request: Request):
     """
     Get list of supported countries with their validation rules.
     """
-    return {
+    return cached_json_response(request, "reference:vendor_countries", lambda: {
         "aruba_countries": ["Aruba", "Curacao", "Bonaire", "Saint Martin"],
         "validation_rules": {
             "aruba_countries": {
@@ -563,15 +593,15 @@ def get_supported_countries():
                 "zip_code": "optional"
             }
         }
-    }
+    })
 
 
 @router.get("/validation/enums")
-def get_validation_enums():
+def get_validation_enums(request: Request):
     """
     Get all enum values for form validation.
     """
-    return {
+    return cached_json_response(request, "reference:vendor_enums", lambda: {
         "bank_customer_types": ["Aruba Bank", "Orco Bank", "None"],
         "material_outsourcing_types": ["Yes", "No"],
         "due_diligence_required_types": ["Yes", "No"],
@@ -585,7 +615,7 @@ def get_validation_enums():
             "Disaster Recovery Plan",
             "Insurance Policy"
         ]
-    }
+    })
 
 
 @router.get("/{vendor_id}/documents", response_model=VendorDocumentsResponse)
@@ -640,6 +670,28 @@ def get_vendor_documents_summary(
     return summary_data
 
 
+@router.get("/{vendor_id}/documents/{doc_id}/download")
+def download_vendor_document(
+    vendor_id: int,
+    doc_id: int,
+    request: Request,
+    inline: bool = Query(False, description="Display in the browser instead of downloading"),
+    current_user: UserPrincipal = Depends(get_current_principal),
+    db: Session = Depends(get_db)
+):
+    """
+    Download a vendor document. Supports Range requests and ETag revalidation.
+    """
+    vendor_service = VendorService(db)
+    doc = vendor_service.get_vendor_document(vendor_id, doc_id)
+    if not doc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Vendor document not found"
+        )
+    return document_file_response(request, doc.file_path, doc.file_name, doc.content_type, inline=inline)
+
+
 @router.put("/{vendor_id}/email", response_model=VendorEmailResponse)
 def update_vendor_primary_email(
     vendor_id: int,
@@ -1,7 +1,8 @@
 from urllib.parse import quote
 from nicegui import ui, app
 from app.models.contract import UserRole
-from app.utils.notifications import get_user_notifications, get_notification_count
+from app.core.config import settings
+from app.utils.notifications import get_user_notifications, get_notification_count, mark_notifications_read
 
 
 def header(current_path: str = None):
@@ -93,86 +94,68 @@ def header(current_path: str = None):
 
         # Right section: notifications bell and logout button
         with ui.element("div").classes("flex flex-row items-center gap-4"):
-            # Notification bell icon with badge
-            notifications = get_user_notifications()
-            
-            # Add sample notifications for testing if none exist
-            if len(notifications) == 0:
-                from datetime import date, timedelta
-                sample_date = date.today()
-                notifications = [
-                    {
-                        "type": "pending_review",
-                        "title": "Contract Update Pending Review",
-                        "message": "Update for CT-2024-001 (ABC Corporation) requires your review.",
-                        "link": "/contract-updates",
-                        "priority": "high",
-                        "timestamp": sample_date,
-                        "contract_id": "CT-2024-001",
-                    },
-                    {
-                        "type": "expiring_soon",
-                        "title": "Contract CT-2024-015 Expiring Soon",
-                        "message": "Contract CT-2024-015 with XYZ Services expires in 15 days.",
-                        "link": "/contract-info/15",
-                        "priority": "medium",
-                        "timestamp": sample_date,
-                        "contract_id": "CT-2024-015",
-                    },
-                    {
-                        "type": "expiring_soon",
-                        "title": "Contract CT-2024-023 Expiring Soon",
-                        "message": "Contract CT-2024-023 with Acme Ltd expires in 28 days.",
-                        "link": "/contract-info/23",
-                        "priority": "medium",
-                        "timestamp": sample_date,
-                        "contract_id": "CT-2024-023",
-                    },
-                    {
-                        "type": "past_due",
-                        "title": "Contract CT-2024-008 is Past Due",
-                        "message": "Contract CT-2024-008 with Tech Solutions expired 5 days ago. Action required.",
-                        "link": "/contract-info/8",
-                        "priority": "high",
-                        "timestamp": sample_date - timedelta(days=5),
-                        "contract_id": "CT-2024-008",
-                    },
-                ]
-            
-            notification_count = len(notifications)
-            
-            # Notification bell button with badge - use button with menu
-            with ui.element("div").classes("relative"):
-                notification_btn = ui.button(icon="notifications", color=None).classes(
-                    "text-weight-regular uppercase text-gray-500 font-[segoe ui]"
-                ).props("flat")
-                
-                # Badge showing notification count
+            # Notification bell icon with badge: only the unread COUNT runs on page load,
+            # the inbox itself is fetched when the menu is opened
+            inbox = {"notifications": [], "has_more": False}
+            page_size = settings.notification_page_size
+
+            @ui.refreshable
+            def notification_badge():
+                notification_count = get_notification_count()
                 if notification_count > 0:
                     badge_text = str(notification_count) if notification_count <= 99 else "99+"
                     with ui.element("span").classes(
                         "absolute -top-1 -right-1 bg-red-500 text-white text-xs font-bold rounded-full"
                     ).style("width: 18px; height: 18px; display: flex; align-items: center; justify-content: center; z-index: 10;"):
                         ui.label(badge_text).classes("text-[10px]")
+
+            def load_notifications(reset: bool = True):
+                offset = 0 if reset else len(inbox["notifications"])
+                # One extra row tells whether there is another page
+                page = get_user_notifications(limit=page_size + 1, offset=offset)
+                inbox["has_more"] = len(page) > page_size
+                page = page[:page_size]
+                inbox["notifications"] = page if reset else inbox["notifications"] + page
+                notification_list.refresh()
+
+            def mark_all_read():
+                mark_notifications_read()
+                notification_badge.refresh()
+                load_notifications()
+
+            # Notification bell button with badge - use button with menu
+            with ui.element("div").classes("relative"):
+                notification_btn = ui.button(icon="notifications", color=None).classes(
+                    "text-weight-regular uppercase text-gray-500 font-[segoe ui]"
+                ).props("flat")
+                
+                # Badge showing unread notification count
+                notification_badge()
             
             # Notification dropdown menu
             # Important: `ui.menu()` must be NESTED under the trigger element to anchor correctly.
             # If it is created elsewhere, Quasar may place it at the viewport origin (top-left).
             with notification_btn:
                 notification_menu = ui.menu().props('anchor="bottom end" self="top end"')
+                notification_menu.on_value_change(lambda e: load_notifications() if e.value else None)
                 with notification_menu:
                     with ui.card().classes(
                         "min-w-[400px] max-w-[500px] max-h-[600px] overflow-y-auto shadow-xl p-0 uppercase"
                     ):
-                        ui.label("Notifications").classes("text-h6 font-bold mb-4 p-4 border-b sticky top-0 bg-white z-10")
-                        
-                        if notification_count == 0:
-                            with ui.column().classes("p-6 items-center gap-2"):
-                                ui.icon("notifications_off", size="48px", color="gray")
-                                ui.label("No notifications").classes("text-gray-500")
-                        else:
+                        with ui.row().classes("w-full items-center justify-between mb-4 p-4 border-b sticky top-0 bg-white z-10"):
+                            ui.label("Notifications").classes("text-h6 font-bold")
+                            ui.button("Mark all as read", on_click=mark_all_read).props("flat dense size=sm color=primary")
+
+                        @ui.refreshable
+                        def notification_list():
+                            notifications = inbox["notifications"]
+                            if not notifications:
+                                with ui.column().classes("p-6 items-center gap-2"):
+                                    ui.icon("notifications_off", size="48px", color="gray")
+                                    ui.label("No notifications").classes("text-gray-500")
+                                return
                             with ui.column().classes("gap-2 p-2"):
-                                for notif in notifications[:10]:  # Show max 10 notifications
+                                for notif in notifications:
                                     priority = notif.get("priority", "low")
                                     priority_colors = {
                                         "high": "border-l-red-500 bg-red-50",
@@ -180,12 +163,17 @@ def header(current_path: str = None):
                                         "low": "border-l-blue-500 bg-blue-50"
                                     }
                                     border_color = priority_colors.get(priority, "border-l-gray-500 bg-gray-50")
+                                    if notif.get("is_read"):
+                                        border_color += " opacity-60"
                                     
                                     notif_link = notif.get("link", "#")
                                     
-                                    def make_click_handler(link=notif_link):
+                                    def make_click_handler(link=notif_link, notification_id=notif.get("id"), is_read=notif.get("is_read")):
                                         def handle_click():
                                             notification_menu.close()
+                                            if not is_read:
+                                                mark_notifications_read([notification_id])
+                                                notification_badge.refresh()
                                             if link and link != "#":
                                                 ui.navigate.to(link)
                                         return handle_click
@@ -200,8 +188,12 @@ def header(current_path: str = None):
                                                 ui.label(notif.get("title", "Notification")).classes("font-semibold text-sm")
                                                 ui.label(notif.get("message", "")).classes("text-xs text-gray-600")
                                 
-                                if notification_count > 10:
-                                    ui.label(f"... and {notification_count - 10} more").classes("text-xs text-gray-500 text-center p-2")
+                                if inbox["has_more"]:
+                                    ui.button("Load more", on_click=lambda: load_notifications(reset=False)).props(
+                                        "flat dense size=sm"
+                                    ).classes("w-full text-xs text-gray-500")
+
+                        notification_list()
             
             # Logout button with confirmation dialog
             logout_btn = ui.button("Logout", color=None, icon="logout").classes(
@@ -0,0 +1,48 @@
+"""
+Push-based page refresh.
+A page registers a refresh coroutine for one or more event bus topics; it
+runs whenever another request commits a matching change, instead of the page
+polling the browser or the database on a timer.
+"""
+from typing import Awaitable, Callable, Iterable
+
+from nicegui import Client, ui
+
+from app.core.events import event_bus
+
+
+def live_updates(topics: Iterable[str], refresh: Callable[[], Awaitable[None]]) -> None:
+    """
+    Call refresh() for the current client whenever one of topics is published.
+    Bursts are coalesced: events arriving during a refresh trigger one more refresh.
+    Subscriptions are dropped as soon as the client is deleted.
+    """
+    client = ui.context.client
+    state = {"running": False, "dirty": False}
+
+    async def on_event(payload) -> None:
+        if client.id not in Client.instances:
+            # Published before the delete handler ran
+            return
+        if state["running"]:
+            state["dirty"] = True
+            return
+        state["running"] = True
+        try:
+            while True:
+                state["dirty"] = False
+                with client:
+                    await refresh()
+                if not state["dirty"]:
+                    break
+        finally:
+            state["running"] = False
+
+    unsubscribers = [event_bus.subscribe(topic, on_event) for topic in topics]
+
+    def unsubscribe_all() -> None:
+        for unsubscribe in unsubscribers:
+            unsubscribe()
+
+    # on_delete rather than on_disconnect: a client that reconnects keeps its page
+    client.on_delete(unsubscribe_all)
@@ -0,0 +1,48 @@
+"""
+Excel export through the background report job runner.
+The page hands over its rows, a notification shows progress while the
+workbook is generated in a worker process, and the browser then downloads
+the stored file from /files/reports/{job_id}.
+"""
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from nicegui import app, ui
+
+from app.pages.document_files import report_file_url
+from app.services.report_jobs import ReportJobStatus, report_jobs
+
+POLL_INTERVAL_SECONDS = 0.5
+
+
+async def export_report(
+    filename: str,
+    sheet_name: str,
+    rows: List[Dict[str, Any]],
+    number_formats: Optional[Dict[str, str]] = None,
+) -> bool:
+    """
+    Generate rows (dicts keyed by column header) as an .xlsx report and download it.
+    Returns False (after notifying the user) if the job failed.
+    """
+    job = report_jobs.submit(
+        filename,
+        sheet_name,
+        rows,
+        number_formats=number_formats,
+        owner_id=app.storage.user.get("user_id"),
+    )
+
+    notification = ui.notification(f"Generating {filename}...", spinner=True, timeout=None)
+    try:
+        while not job.finished:
+            notification.message = f"Generating {filename}... {int(report_jobs.progress(job) * 100)}%"
+            await asyncio.sleep(POLL_INTERVAL_SECONDS)
+    finally:
+        notification.dismiss()
+
+    if job.status == ReportJobStatus.FAILED:
+        ui.notify(f"Error generating report: {job.error}", type="negative")
+        return False
+    ui.download(report_file_url(job.id), filename=filename)
+    return True
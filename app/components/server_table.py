@@ -0,0 +1,118 @@
+"""
+Server-driven table component.
+The table asks the backend for one page at a time (sort, filters and paging
+are done in SQL) instead of receiving every row up front.
+"""
+from typing import Any, Awaitable, Callable, Optional
+
+from nicegui import ui
+
+# fetch_page(skip, limit, after, sort_by, descending) -> (rows, total_count, next_cursor)
+FetchPage = Callable[..., Awaitable[tuple[list[dict], int, Optional[tuple]]]]
+
+
+class ServerTable:
+    """
+    ui.table in Quasar server-side mode.
+
+    Keyset cursors are remembered per page number, so moving forward page by
+    page uses (sort_key, id) keyset pagination; jumping to an arbitrary page
+    falls back to OFFSET for that one request.
+    """
+
+    def __init__(
+        self,
+        columns: list[dict],
+        fetch_page: FetchPage,
+        column_defaults: Optional[dict] = None,
+        rows_per_page: int = 10,
+        sort_by: Optional[str] = None,
+        descending: bool = False,
+        row_key: str = "id",
+    ):
+        self.fetch_page = fetch_page
+        self.total_count = 0
+        self.on_loaded: Optional[Callable[[int], Any]] = None
+        self._cursors: dict[int, Optional[tuple]] = {1: None}
+        self._cursor_sort: tuple = (sort_by, descending, rows_per_page)
+        self.table = ui.table(
+            columns=columns,
+            column_defaults=column_defaults,
+            rows=[],
+            row_key=row_key,
+            pagination={
+                "page": 1,
+                "rowsPerPage": rows_per_page,
+                "sortBy": sort_by,
+                "descending": descending,
+                "rowsNumber": 0,
+            },
+        )
+        self.table.on("request", self._on_request)
+
+    async def _on_request(self, e) -> None:
+        await self.load(e.args["pagination"])
+
+    async def load(self, pagination: Optional[dict] = None) -> None:
+        """Fetch and show the page described by pagination (defaults to the current one)"""
+        pagination = dict(pagination or self.table.pagination)
+        page = max(int(pagination.get("page") or 1), 1)
+        rows_per_page = int(pagination["rowsPerPage"] if pagination.get("rowsPerPage") is not None else 10)
+        sort_by = pagination.get("sortBy")
+        descending = bool(pagination.get("descending"))
+
+        # Cursors are only valid for the sort order and page size they were taken with
+        if (sort_by, descending, rows_per_page) != self._cursor_sort:
+            self._cursors = {1: None}
+            self._cursor_sort = (sort_by, descending, rows_per_page)
+
+        # rowsPerPage = 0 means "All" in Quasar
+        limit = rows_per_page or max(self.total_count, 1)
+        rows, total_count, next_cursor = await self.fetch_page(
+            skip=(page - 1) * rows_per_page,
+            limit=limit,
+            after=self._cursors.get(page),
+            sort_by=sort_by,
+            descending=descending,
+        )
+        self._cursors[page + 1] = next_cursor
+        self.total_count = total_count
+
+        self.table.rows = rows
+        self.table.pagination = {
+            **pagination,
+            "page": page,
+            "rowsPerPage": rows_per_page,
+            "sortBy": sort_by,
+            "descending": descending,
+            "rowsNumber": total_count,
+        }
+        self.table.update()
+        if self.on_loaded:
+            self.on_loaded(total_count)
+
+    async def refresh(self) -> None:
+        """Reload from page 1, e.g. after a filter changed"""
+        self._cursors = {1: None}
+        await self.load({**self.table.pagination, "page": 1})
+
+    async def fetch_all(self, batch_size: int = 500, **filters) -> list[dict]:
+        """
+        All rows matching the current filters and sort (for exports), fetched in keyset batches.
+        Extra keyword filters are passed through to fetch_page.
+        """
+        pagination = self.table.pagination
+        rows: list[dict] = []
+        after = None
+        while True:
+            batch, _, after = await self.fetch_page(
+                skip=len(rows),
+                limit=batch_size,
+                after=after,
+                sort_by=pagination.get("sortBy"),
+                descending=bool(pagination.get("descending")),
+                **filters
+            )
+            rows.extend(batch)
+            if after is None:
+                return rows
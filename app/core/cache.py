@@ -0,0 +1,107 @@
+"""
+In-process TTL cache for reference data (dropdowns, validation enums)
+and ETag / Cache-Control helpers for the endpoints that serve it.
+"""
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from app.core.config import settings
+
+# Cache key namespaces; invalidate("vendors") drops every "vendors:*" entry
+VENDORS_NAMESPACE = "vendors"
+USERS_NAMESPACE = "users"
+PRINCIPALS_NAMESPACE = "principals"
+
+
+class TTLCache:
+    """
+    Thread-safe key/value cache whose entries expire after ttl seconds.
+    Keys are "namespace:name" strings so related entries can be dropped together.
+    """
+
+    def __init__(self, default_ttl: float):
+        self.default_ttl = default_ttl
+        self._entries: Dict[str, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return default
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (self.default_ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+
+    def get_or_set(self, key: str, build: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        """
+        Cached value for key, calling build() on a miss
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = build()
+            self.set(key, value, ttl)
+        return value
+
+    def invalidate(self, namespace: str) -> None:
+        """
+        Drop the key itself and every "namespace:*" entry
+        """
+        prefix = f"{namespace}:"
+        with self._lock:
+            for key in [k for k in self._entries if k == namespace or k.startswith(prefix)]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+reference_cache = TTLCache(default_ttl=settings.reference_cache_ttl_seconds)
+# Authenticated API users, keyed "principals:<email>:<token iat>" (see app.core.security)
+principal_cache = TTLCache(default_ttl=settings.principal_cache_ttl_seconds)
+
+
+def _etag_for(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def cached_json_response(
+    request: Request,
+    key: str,
+    build: Callable[[], Any],
+    ttl: Optional[float] = None,
+) -> Response:
+    """
+    JSON response for reference data, built once per TTL and served with an ETag.
+    Returns 304 Not Modified when the client already holds the current version.
+    """
+    def serialize() -> Tuple[bytes, str]:
+        body = json.dumps(jsonable_encoder(build()), separators=(",", ":")).encode("utf-8")
+        return body, _etag_for(body)
+
+    body, etag = reference_cache.get_or_set(f"{key}:response", serialize, ttl)
+    headers = {
+        "ETag": etag,
+        # Browsers must revalidate (cheap 304) once max-age has passed
+        "Cache-Control": f"private, max-age={settings.reference_cache_max_age_seconds}, must-revalidate",
+    }
+
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
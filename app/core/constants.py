@@ -20,6 +20,8 @@ class ErrorMessages:
     INCORRECT_CURRENT_PASSWORD = "Incorrect current password"
     INSUFFICIENT_PERMISSIONS = "Insufficient permissions"
     USER_NOT_FOUND = "User not found"
+    TOO_MANY_LOGIN_ATTEMPTS = "Too many failed login attempts. Try again later."
+    PASSWORD_HASHING_BUSY = "Authentication service is busy. Try again shortly."
     
     # Vendor errors
     VENDOR_NOT_FOUND = "Vendor not found"
@@ -34,6 +36,7 @@ class ErrorMessages:
     INVALID_EXTENSION_DATE = "Extension date must be after current end date"
     CONTRACT_ALREADY_TERMINATED = "Contract is already terminated"
     VENDOR_REQUIRED = "Vendor is required for contract creation"
+    TOO_MANY_IMPORT_ROWS = "Import file has more rows than allowed"
     
     # Document errors
     INVALID_FILE_TYPE = "Only PDF files are allowed"
@@ -141,6 +144,8 @@ class FileConstants:
     UPLOAD_DIR = "uploads"
     VENDOR_DOCS_DIR = "uploads/vendors"
     CONTRACT_DOCS_DIR = "uploads/contracts"
+    # Content-addressed document store: <BLOB_DIR>/<sha256[:2]>/<sha256><ext>
+    BLOB_DIR = "uploads/blobs"
 
 
 # ============================================================================
@@ -256,10 +261,13 @@ class HTTPStatus:
     FORBIDDEN = 403
     NOT_FOUND = 404
     CONFLICT = 409
+    PAYLOAD_TOO_LARGE = 413
     UNPROCESSABLE_ENTITY = 422
+    TOO_MANY_REQUESTS = 429
     
     # Server errors
     INTERNAL_SERVER_ERROR = 500
+    SERVICE_UNAVAILABLE = 503
 
 
 # ============================================================================
@@ -0,0 +1,45 @@
+"""
+File responses for stored documents: ETag revalidation, HTTP Range and
+zero-copy streaming (Starlette FileResponse uses the ASGI pathsend extension
+when the server supports it and chunked reads otherwise).
+"""
+import os
+
+from fastapi import HTTPException, Request, Response, status
+from fastapi.responses import FileResponse
+
+
+def document_file_response(
+    request: Request,
+    file_path: str,
+    filename: str,
+    content_type: str = "application/pdf",
+    inline: bool = False,
+) -> Response:
+    """
+    Stream a stored document. Returns 304 when If-None-Match holds the current ETag;
+    Range / If-Range requests are answered with 206 partial content by FileResponse.
+    """
+    try:
+        stat_result = os.stat(file_path)
+    except OSError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
+
+    response = FileResponse(
+        file_path,
+        filename=filename,
+        media_type=content_type or "application/pdf",
+        stat_result=stat_result,
+        content_disposition_type="inline" if inline else "attachment",
+    )
+    # Stored files are never rewritten in place, so clients may reuse them after revalidating
+    response.headers["Cache-Control"] = "private, no-cache"
+
+    etag = response.headers.get("etag")
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag and etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag, "Cache-Control": response.headers["Cache-Control"]},
+        )
+    return response
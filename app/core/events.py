@@ -0,0 +1,88 @@
+"""
+In-process publish/subscribe for server-side change notifications.
+
+Committed Contract / ContractUpdate changes are published here (see
+app.db.change_events) and pages subscribe to refresh their tables, so
+connected clients are pushed updates instead of polling. Publishing is
+thread-safe (commits usually happen in run_db worker threads); callbacks
+always run on the event loop. Events are not shared between worker processes.
+"""
+import asyncio
+import inspect
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+# Topics; the payload is {"ids": [...]} of the changed rows
+CONTRACTS_TOPIC = "contracts"
+CONTRACT_UPDATES_TOPIC = "contract_updates"
+
+Subscriber = Callable[[Any], Any]
+
+
+class EventBus:
+    """
+    Topic -> subscriber callbacks (sync functions or coroutine functions)
+    """
+
+    def __init__(self):
+        self._subscribers: Dict[str, List[Subscriber]] = {}
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def subscribe(self, topic: str, callback: Subscriber) -> Callable[[], None]:
+        """
+        Register callback for topic; must be called on the event loop.
+        Returns a function that removes the subscription.
+        """
+        self._loop = asyncio.get_running_loop()
+        with self._lock:
+            self._subscribers.setdefault(topic, []).append(callback)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                callbacks = self._subscribers.get(topic, [])
+                if callback in callbacks:
+                    callbacks.remove(callback)
+
+        return unsubscribe
+
+    def publish(self, topic: str, payload: Any = None) -> None:
+        """
+        Deliver payload to the topic's subscribers on the event loop (from any thread)
+        """
+        with self._lock:
+            if not self._subscribers.get(topic):
+                return
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._dispatch(topic, payload)
+        else:
+            loop.call_soon_threadsafe(self._dispatch, topic, payload)
+
+    def _dispatch(self, topic: str, payload: Any) -> None:
+        with self._lock:
+            callbacks = list(self._subscribers.get(topic, []))
+        for callback in callbacks:
+            try:
+                if inspect.iscoroutinefunction(callback):
+                    asyncio.create_task(self._run(callback, topic, payload))
+                else:
+                    callback(payload)
+            except Exception as e:
+                print(f"Error in {topic} event subscriber: {e}")
+
+    @staticmethod
+    async def _run(callback: Subscriber, topic: str, payload: Any) -> None:
+        try:
+            await callback(payload)
+        except Exception as e:
+            print(f"Error in {topic} event subscriber: {e}")
+
+
+event_bus = EventBus()
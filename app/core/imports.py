@@ -0,0 +1,102 @@
+"""
+CSV / XLSX / JSON lines import parsing.
+
+Counterpart of app.core.exports: an uploaded file is read row by row into
+dicts keyed by the header (CSV / XLSX) or the object keys (JSON lines). XLSX
+is opened with openpyxl read-only mode, so rows are streamed from the sheet
+rather than loaded as a whole workbook.
+"""
+import codecs
+import csv
+import json
+import os
+from datetime import datetime
+from typing import Any, BinaryIO, Dict, Iterator, Optional, Tuple
+
+from fastapi import HTTPException, status
+from openpyxl import load_workbook
+
+IMPORT_FORMATS = ("csv", "xlsx", "jsonl")
+
+# Row = (row number in the file, values by column name)
+ImportRow = Tuple[int, Dict[str, Any]]
+
+
+def detect_import_format(filename: Optional[str], requested: Optional[str] = None) -> str:
+    """
+    Import format from an explicit format parameter or the file extension
+    """
+    import_format = (requested or os.path.splitext(filename or "")[1].lstrip(".")).lower()
+    if import_format in ("json", "ndjson"):
+        import_format = "jsonl"
+    if import_format not in IMPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"format must be one of: {', '.join(IMPORT_FORMATS)}",
+        )
+    return import_format
+
+
+def _clean(value: Any) -> Any:
+    """
+    Blank cells -> None, stripped strings, midnight datetimes (XLSX dates) -> date
+    """
+    if isinstance(value, str):
+        value = value.strip()
+        return value or None
+    if isinstance(value, datetime) and value.time() == datetime.min.time():
+        return value.date()
+    return value
+
+
+def _clean_row(row: Dict[Any, Any]) -> Dict[str, Any]:
+    return {str(key).strip(): _clean(value) for key, value in row.items() if key is not None and str(key).strip()}
+
+
+def iter_csv_rows(stream: BinaryIO) -> Iterator[ImportRow]:
+    reader = csv.DictReader(codecs.iterdecode(stream, "utf-8-sig"))
+    for row in reader:
+        values = _clean_row(row)
+        if any(value is not None for value in values.values()):
+            yield reader.line_num, values
+
+
+def iter_xlsx_rows(stream: BinaryIO) -> Iterator[ImportRow]:
+    workbook = load_workbook(stream, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        for line_number, cells in enumerate(rows, 2):
+            values = _clean_row(dict(zip(header, cells)))
+            if any(value is not None for value in values.values()):
+                yield line_number, values
+    finally:
+        workbook.close()
+
+
+def iter_jsonl_rows(stream: BinaryIO) -> Iterator[ImportRow]:
+    for line_number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            row = {"__error__": f"Invalid JSON: {e.msg}"}
+        if not isinstance(row, dict):
+            row = {"__error__": "Each line must be a JSON object"}
+        yield line_number, _clean_row(row)
+
+
+def iter_import_rows(stream: BinaryIO, import_format: str) -> Iterator[ImportRow]:
+    """
+    (row number, values) for every non-blank row of an uploaded file.
+    Unparseable JSON lines are yielded as {"__error__": message}.
+    """
+    if import_format == "csv":
+        return iter_csv_rows(stream)
+    if import_format == "xlsx":
+        return iter_xlsx_rows(stream)
+    return iter_jsonl_rows(stream)
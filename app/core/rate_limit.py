@@ -0,0 +1,96 @@
+"""
+In-memory failed-login limiter.
+
+Failures are counted per key ("email:<address>", "ip:<client>") in a sliding
+window; once a key reaches its limit further attempts get 429 with Retry-After
+until the oldest failure leaves the window. A successful login clears the
+email key. State is per process, like the other in-process caches.
+"""
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Iterable, Optional, Tuple
+
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.core.constants import ErrorMessages, HTTPStatus
+
+# Prune idle keys at most this often
+_PRUNE_INTERVAL_SECONDS = 60
+
+
+class LoginRateLimiter:
+    """
+    Sliding-window counter of failed attempts; limits are given per key prefix
+    """
+
+    def __init__(self, limits: Dict[str, int], window_seconds: float):
+        self.limits = limits
+        self.window_seconds = window_seconds
+        self._failures: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+        self._last_prune = time.monotonic()
+
+    @staticmethod
+    def keys(email: Optional[str], client_ip: Optional[str]) -> Tuple[str, ...]:
+        keys = []
+        if email:
+            keys.append(f"email:{email.strip().lower()}")
+        if client_ip:
+            keys.append(f"ip:{client_ip}")
+        return tuple(keys)
+
+    def _limit(self, key: str) -> int:
+        return self.limits.get(key.split(":", 1)[0], 0)
+
+    def _recent(self, key: str, now: float) -> Deque[float]:
+        failures = self._failures.get(key)
+        if failures is None:
+            return deque()
+        while failures and failures[0] <= now - self.window_seconds:
+            failures.popleft()
+        if not failures:
+            del self._failures[key]
+        return failures
+
+    def check(self, keys: Iterable[str]) -> None:
+        """
+        Raise 429 if any key has used up its failed attempts
+        """
+        now = time.monotonic()
+        with self._lock:
+            for key in keys:
+                limit = self._limit(key)
+                failures = self._recent(key, now)
+                if limit and len(failures) >= limit:
+                    retry_after = max(1, int(failures[0] + self.window_seconds - now) + 1)
+                    raise HTTPException(
+                        status_code=HTTPStatus.TOO_MANY_REQUESTS,
+                        detail=ErrorMessages.TOO_MANY_LOGIN_ATTEMPTS,
+                        headers={"Retry-After": str(retry_after)},
+                    )
+
+    def record_failure(self, keys: Iterable[str]) -> None:
+        now = time.monotonic()
+        with self._lock:
+            for key in keys:
+                self._failures.setdefault(key, deque()).append(now)
+            if now - self._last_prune > _PRUNE_INTERVAL_SECONDS:
+                self._last_prune = now
+                for key in list(self._failures):
+                    self._recent(key, now)
+
+    def reset(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._failures.pop(key, None)
+
+
+login_rate_limiter = LoginRateLimiter(
+    limits={
+        "email": settings.login_max_attempts_per_email,
+        "ip": settings.login_max_attempts_per_ip,
+    },
+    window_seconds=settings.login_attempt_window_seconds,
+)
@@ -1,6 +1,9 @@
 """
 Security utilities for authentication and authorization
 """
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
@@ -10,11 +13,13 @@ from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.cache import principal_cache, PRINCIPALS_NAMESPACE
+from app.core.constants import ErrorMessages, HTTPStatus
 from app.db.database import get_db
 from app.models.contract import User, UserRole
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing; bcrypt_rounds only applies to new hashes, existing ones verify at their own cost
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.bcrypt_rounds)
 
 # OAuth2 scheme
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login")
@@ -35,6 +40,43 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+class PasswordHasher:
+    """
+    Runs bcrypt on a dedicated, bounded thread pool for request handlers.
+    At most max_workers hashes run at once (bcrypt releases the GIL, so this caps
+    the CPU a burst of logins can take); once max_pending calls are queued or
+    running, new ones fail fast with 503 instead of piling up behind them.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hash")
+        self._slots = threading.BoundedSemaphore(max_pending)
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise HTTPException(
+                status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+                detail=ErrorMessages.PASSWORD_HASHING_BUSY,
+                headers={"Retry-After": "1"},
+            )
+        try:
+            return self._executor.submit(fn, *args).result()
+        finally:
+            self._slots.release()
+
+    def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return self._run(verify_password, plain_password, hashed_password)
+
+    def hash(self, password: str) -> str:
+        return self._run(get_password_hash, password)
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.password_hash_workers,
+    max_pending=settings.password_hash_max_pending,
+)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create a JWT access token"""
     to_encode = data.copy()
@@ -42,7 +84,8 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=15)
-    to_encode.update({"exp": expire})
+    # iat distinguishes tokens of the same user in the principal cache
+    to_encode.update({"exp": expire, "iat": datetime.utcnow()})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
@@ -60,28 +103,53 @@ def decode_access_token(token: str) -> dict:
         )
 
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
-    """Get the current authenticated user"""
-    credentials_exception = HTTPException(
+@dataclass(frozen=True)
+class UserPrincipal:
+    """Authenticated user as cached per token - what the role checks and dashboards need"""
+    id: int
+    email: str
+    role: Optional[UserRole]
+    is_active: bool
+    first_name: str
+    last_name: str
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
-    try:
-        payload = decode_access_token(token)
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
+
+
+def _token_subject(token: str) -> tuple:
+    """(email, iat) of a valid token"""
+    payload = decode_access_token(token)
+    email: str = payload.get("sub")
+    if email is None:
+        raise _credentials_exception()
+    # Tokens issued before iat was added fall back to their expiry
+    return email, payload.get("iat", payload.get("exp"))
+
+
+def invalidate_principal(email: Optional[str] = None) -> None:
+    """
+    Drop cached principals of one user (all of their tokens), or of every user.
+    Call after changing a user's password, role, email or active flag.
+    """
+    principal_cache.invalidate(f"{PRINCIPALS_NAMESPACE}:{email}" if email else PRINCIPALS_NAMESPACE)
+
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+) -> User:
+    """Get the current authenticated user (ORM instance, always read from the database)"""
+    email, _ = _token_subject(token)
     
     user = db.query(User).filter(User.email == email).first()
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
     
     if not user.is_active:
         raise HTTPException(
@@ -101,14 +169,50 @@ async def get_current_active_user(
     return current_user
 
 
+async def get_current_principal(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+) -> UserPrincipal:
+    """
+    Get the current authenticated user without a users-table query per request.
+    The principal is cached for principal_cache_ttl_seconds per (sub, iat) and
+    dropped by invalidate_principal() when the user is changed.
+    """
+    email, issued_at = _token_subject(token)
+    key = f"{PRINCIPALS_NAMESPACE}:{email}:{issued_at}"
+    
+    principal = principal_cache.get(key)
+    if principal is None:
+        user = db.query(User).filter(User.email == email).first()
+        if user is None:
+            raise _credentials_exception()
+        principal = UserPrincipal(
+            id=user.id,
+            email=user.email,
+            role=user.role,
+            is_active=bool(user.is_active),
+            first_name=user.first_name,
+            last_name=user.last_name,
+        )
+        principal_cache.set(key, principal)
+    
+    if not principal.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Inactive user"
+        )
+    
+    return principal
+
+
 def require_role(required_roles: list[UserRole]):
     """
     Dependency to check if user has required role
     Usage: Depends(require_role([UserRole.CONTRACT_ADMIN]))
     """
     async def role_checker(
-        current_user: User = Depends(get_current_active_user)
-    ) -> User:
+        current_user: UserPrincipal = Depends(get_current_principal)
+    ) -> UserPrincipal:
         if current_user.role not in required_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -120,8 +224,8 @@ def require_role(required_roles: list[UserRole]):
 
 # Role-specific dependencies
 async def require_contract_admin(
-    current_user: User = Depends(get_current_active_user)
-) -> User:
+    current_user: UserPrincipal = Depends(get_current_principal)
+) -> UserPrincipal:
     """Require Contract Admin role"""
     if current_user.role != UserRole.CONTRACT_ADMIN:
         raise HTTPException(
@@ -132,8 +236,8 @@ async def require_contract_admin(
 
 
 async def require_contract_manager(
-    current_user: User = Depends(get_current_active_user)
-) -> User:
+    current_user: UserPrincipal = Depends(get_current_principal)
+) -> UserPrincipal:
     """Require Contract Manager or Contract Admin role"""
     allowed_roles = [UserRole.CONTRACT_MANAGER, UserRole.CONTRACT_MANAGER_OWNER, UserRole.CONTRACT_ADMIN]
     if current_user.role not in allowed_roles:
@@ -0,0 +1,42 @@
+"""
+Publishes committed Contract / ContractUpdate changes to the in-process event bus.
+
+after_flush records which rows a session changed, after_commit publishes them
+(so subscribers only ever re-read committed data) and after_rollback discards
+them. Imported once at startup from main.py to register the listeners.
+"""
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.events import CONTRACT_UPDATES_TOPIC, CONTRACTS_TOPIC, event_bus
+from app.models.contract import Contract, ContractUpdate
+
+_PENDING_KEY = "pending_change_events"
+
+_TOPICS = (
+    (Contract, CONTRACTS_TOPIC),
+    (ContractUpdate, CONTRACT_UPDATES_TOPIC),
+)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session: Session, flush_context) -> None:
+    pending = session.info.setdefault(_PENDING_KEY, {})
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        for model, topic in _TOPICS:
+            if isinstance(obj, model) and obj.id is not None:
+                pending.setdefault(topic, set()).add(obj.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_changes(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    for topic, ids in pending.items():
+        event_bus.publish(topic, {"ids": sorted(ids)})
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
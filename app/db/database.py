@@ -1,19 +1,74 @@
+from typing import Any, Callable, TypeVar
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from app.core.config import settings
+from app.db.query_metrics import instrument_engine, timed_pool_options
 
 engine = create_engine(
     settings.database_url,
     echo=settings.database_echo,
     pool_pre_ping=True,
-    pool_recycle=300
+    pool_recycle=300,
+    **timed_pool_options(settings.database_url, "sync")
 )
+instrument_engine(engine, "sync")
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
+T = TypeVar("T")
+
+# Sync driver -> async driver used by the async engine
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+    "mssql": "mssql+aioodbc",
+    "mssql+pyodbc": "mssql+aioodbc",
+}
+
+
+def get_async_database_url(database_url: str) -> str:
+    """
+    Derive the async driver URL from the sync DATABASE_URL.
+    ASYNC_DATABASE_URL wins when it is set explicitly.
+    """
+    if settings.async_database_url:
+        return settings.async_database_url
+    url = make_url(database_url)
+    drivername = ASYNC_DRIVERS.get(url.drivername, url.drivername)
+    return url.set(drivername=drivername).render_as_string(hide_password=False)
+
+
+def _create_async_engine():
+    """Create the async engine; None when the async driver is not installed."""
+    async_url = get_async_database_url(settings.database_url)
+    engine_kwargs = {"echo": settings.database_echo}
+    if not async_url.startswith("sqlite"):
+        engine_kwargs.update(pool_pre_ping=True, pool_recycle=300)
+    try:
+        async_engine = create_async_engine(async_url, **engine_kwargs, **timed_pool_options(async_url, "async"))
+    except ImportError as e:
+        print(f"Async database driver not available ({e}); page reads fall back to a worker thread")
+        return None
+    instrument_engine(async_engine.sync_engine, "async")
+    return async_engine
+
+
+async_engine = _create_async_engine()
+
+AsyncSessionLocal = (
+    async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+    if async_engine is not None
+    else None
+)
+
 
 def get_db():
     """Dependency to get database session"""
@@ -21,4 +76,39 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+    """Dependency to get async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def _run_in_sync_session(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    db = SessionLocal()
+    try:
+        return fn(db, *args, **kwargs)
+    finally:
+        db.close()
+
+
+async def run_db(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run fn(db, *args, **kwargs) without blocking the event loop.
+
+    fn receives a regular sync Session, so the existing ORM code (including
+    lazy loads on relationships) works unchanged. With an async driver it
+    runs on the async engine via AsyncSession.run_sync; otherwise it runs
+    on the sync engine in a worker thread.
+    """
+    if AsyncSessionLocal is None:
+        from starlette.concurrency import run_in_threadpool
+        return await run_in_threadpool(_run_in_sync_session, fn, *args, **kwargs)
+
+    async with AsyncSessionLocal() as db:
+        def call(sync_session: Session) -> T:
+            return fn(sync_session, *args, **kwargs)
+        result = await db.run_sync(call)
+        await db.commit()
+        return result
@@ -0,0 +1,54 @@
+"""
+Statement counter for spotting N+1 lazy loads.
+
+    with assert_max_queries(3):
+        client.get("/api/v1/contracts/?limit=100")
+
+fails when the block issues more statements than allowed, whatever the
+number of rows returned.
+"""
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.db.database import engine as default_engine
+
+
+class QueryCounter:
+    """
+    Counts the SQL statements executed on an engine while active
+    """
+
+    def __init__(self, bind: Optional[Engine] = None):
+        self.engine = bind if bind is not None else default_engine
+        self.statements: List[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self) -> "QueryCounter":
+        event.listen(self.engine, "before_cursor_execute", self._before_cursor_execute)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        event.remove(self.engine, "before_cursor_execute", self._before_cursor_execute)
+
+
+@contextmanager
+def assert_max_queries(max_queries: int, bind: Optional[Engine] = None) -> Iterator[QueryCounter]:
+    """
+    Raise AssertionError if the block executes more than max_queries statements
+    """
+    with QueryCounter(bind) as counter:
+        yield counter
+    if counter.count > max_queries:
+        statements = "\n".join(f"  {i}. {sql}" for i, sql in enumerate(counter.statements, 1))
+        raise AssertionError(
+            f"Expected at most {max_queries} queries, {counter.count} were executed:\n{statements}"
+        )
@@ -0,0 +1,198 @@
+"""
+SQL statement metrics per route.
+
+Engine hooks (before/after_cursor_execute) time every statement and attribute
+it to the current route: the FastAPI route or NiceGUI page template of the
+HTTP request being served, the NiceGUI page whose event handler is running,
+or "background" (schedulers, scripts). Each routed HTTP request also records
+its statement count, total DB time and rows returned. Rows are what the DBAPI
+cursor reports for row-returning statements (psycopg2 does; SQLite and pyodbc
+report -1 for SELECT, and those are left out).
+
+Pool checkout wait is timed in a subclass of the engine's pool class, and
+connections in use / idle are read from the pools when /api/v1/metrics is
+scraped.
+"""
+import sys
+import time
+from contextvars import ContextVar, Token
+from typing import Any, Dict, MutableMapping, Optional, Type
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import Pool
+
+from app.core.config import settings
+from app.core.metrics import metrics_registry
+
+BACKGROUND_ROUTE = "background"
+OTHER_ROUTE = "other"
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+ROW_BUCKETS = (0, 1, 10, 100, 1000, 10000, 100000)
+CHECKOUT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30)
+
+QUERY_DURATION = metrics_registry.histogram(
+    "db_query_duration_seconds", "Duration of each SQL statement", LATENCY_BUCKETS, ("route",)
+)
+QUERY_ROWS = metrics_registry.histogram(
+    "db_query_rows", "Rows returned by each row-returning SQL statement", ROW_BUCKETS, ("route",)
+)
+REQUEST_QUERIES = metrics_registry.histogram(
+    "db_request_queries", "SQL statements executed per HTTP request", QUERY_COUNT_BUCKETS, ("route",)
+)
+REQUEST_DURATION = metrics_registry.histogram(
+    "db_request_duration_seconds", "Total SQL statement time per HTTP request", LATENCY_BUCKETS, ("route",)
+)
+REQUEST_ROWS = metrics_registry.histogram(
+    "db_request_rows", "Rows returned by SQL statements per HTTP request", ROW_BUCKETS, ("route",)
+)
+POOL_CHECKOUT_WAIT = metrics_registry.histogram(
+    "db_pool_checkout_wait_seconds", "Time to get a connection from the pool", CHECKOUT_BUCKETS, ("pool",)
+)
+
+# Pool label -> engine; the engine's current pool is read at scrape time (dispose() replaces it)
+_engines: Dict[str, Engine] = {}
+
+
+def _pool_gauge(read):
+    def collect():
+        values = {}
+        for label, bound in _engines.items():
+            pool = bound.pool
+            if hasattr(pool, "checkedout"):
+                values[(label,)] = read(pool)
+        return values
+    return collect
+
+
+metrics_registry.gauge(
+    "db_pool_connections_in_use", "Connections checked out of the pool",
+    _pool_gauge(lambda pool: pool.checkedout()), ("pool",),
+)
+metrics_registry.gauge(
+    "db_pool_connections_idle", "Open connections waiting in the pool",
+    _pool_gauge(lambda pool: pool.checkedin()), ("pool",),
+)
+metrics_registry.gauge(
+    "db_pool_size", "Configured pool size (overflow connections come on top)",
+    _pool_gauge(lambda pool: pool.size()), ("pool",),
+)
+
+
+class RequestQueries:
+    """
+    SQL totals of one HTTP request
+    """
+    __slots__ = ("scope", "queries", "duration", "rows")
+
+    def __init__(self, scope: MutableMapping[str, Any]):
+        self.scope = scope
+        self.queries = 0
+        self.duration = 0.0
+        self.rows = 0
+
+    @property
+    def route(self) -> Optional[str]:
+        # Set by the router once the request is matched (FastAPI routes and NiceGUI pages)
+        return getattr(self.scope.get("route"), "path", None)
+
+
+_current_request: ContextVar[Optional[RequestQueries]] = ContextVar("current_request_queries", default=None)
+
+
+def begin_request(scope: MutableMapping[str, Any]) -> Token:
+    return _current_request.set(RequestQueries(scope))
+
+
+def end_request(token: Token) -> None:
+    """
+    Record the request's totals; requests that matched no route (static files, socket.io) are skipped
+    """
+    request = _current_request.get()
+    _current_request.reset(token)
+    route = request.route if request is not None else None
+    if route is None:
+        return
+    REQUEST_QUERIES.observe(request.queries, route)
+    REQUEST_DURATION.observe(request.duration, route)
+    REQUEST_ROWS.observe(request.rows, route)
+
+
+def _page_route() -> Optional[str]:
+    """
+    Path of the NiceGUI page whose event handler is running, if any
+    """
+    nicegui = sys.modules.get("nicegui")
+    if nicegui is None:
+        return None
+    try:
+        return nicegui.context.client.page.path
+    except Exception:
+        # No UI context: worker thread, scheduler task or a script
+        return None
+
+
+def _current_route(request: Optional[RequestQueries]) -> str:
+    route = request.route if request is not None else None
+    if route is None:
+        # socket.io event handlers run in a task started from the polling / websocket request
+        route = _page_route() or (OTHER_ROUTE if request is not None else BACKGROUND_ROUTE)
+    return route
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._query_metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_query_metrics_started", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    rowcount = getattr(cursor, "rowcount", None)
+    rows = rowcount if cursor.description is not None and rowcount is not None and rowcount >= 0 else None
+
+    request = _current_request.get()
+    route = _current_route(request)
+    QUERY_DURATION.observe(elapsed, route)
+    if rows is not None:
+        QUERY_ROWS.observe(rows, route)
+    if request is not None:
+        request.queries += 1
+        request.duration += elapsed
+        request.rows += rows or 0
+
+
+def timed_pool_options(database_url: str, label: str) -> dict:
+    """
+    create_engine kwargs that time pool checkouts (empty when metrics are disabled)
+    """
+    if not settings.db_metrics_enabled:
+        return {}
+    url = make_url(database_url)
+    pool_class: Type[Pool] = url.get_dialect().get_pool_class(url)
+
+    class TimedPool(pool_class):
+        def _do_get(self):
+            started = time.perf_counter()
+            try:
+                return super()._do_get()
+            finally:
+                POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started, label)
+
+    TimedPool.__name__ = TimedPool.__qualname__ = f"Timed{pool_class.__name__}"
+    return {"poolclass": TimedPool}
+
+
+def instrument_engine(bind: Engine, label: str) -> None:
+    """
+    Attach the statement hooks and report the engine's pool as pool=label
+    """
+    if not settings.db_metrics_enabled:
+        return
+    event.listen(bind, "before_cursor_execute", _before_cursor_execute)
+    event.listen(bind, "after_cursor_execute", _after_cursor_execute)
+    _engines[label] = bind
@@ -31,6 +31,13 @@ from .contract import (
     ContractUpdateStatus
 )
 
+from .id_counter import IdCounter
+from .dashboard_stats import DashboardStat, DashboardStatsState
+from .scheduled_job_run import ScheduledJobRun, ScheduledJobLease
+from .user_notification import UserNotification
+from .search_document import SearchDocument
+from .stored_blob import StoredBlob
+
 __all__ = [
     "Vendor",
     "VendorAddress",
@@ -58,5 +65,13 @@ __all__ = [
     "ContractStatusType",
     "ContractTerminationType",
     "UserRole",
-    "ContractUpdateStatus"
+    "ContractUpdateStatus",
+    "IdCounter",
+    "DashboardStat",
+    "DashboardStatsState",
+    "ScheduledJobRun",
+    "ScheduledJobLease",
+    "UserNotification",
+    "SearchDocument",
+    "StoredBlob"
 ]
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Enum, Numeric, Date, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Enum, Numeric, Date, Text, Index, text
 from sqlalchemy.orm import relationship
 from app.db.database import Base
 from datetime import datetime, date
@@ -131,12 +131,24 @@ class ContractUpdateStatus(str, enum.Enum):
 
 class Contract(Base):
     __tablename__ = "contracts"
+    __table_args__ = (
+        # Status lists and expiry windows (dashboards, needing review, requiring attention)
+        Index("ix_contracts_status_end_date", "status", "end_date"),
+        # Active contracts by end date; partial where the database supports it
+        Index(
+            "ix_contracts_active_end_date",
+            "end_date",
+            postgresql_where=text("status = 'Active'"),
+            mssql_where=text("status = 'Active'"),
+            sqlite_where=text("status = 'Active'"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     contract_id = Column(String(20), unique=True, index=True, nullable=False)  # Auto-generated: CT1, CT2, etc.
     
     # Basic Contract Information
-    vendor_id = Column(Integer, ForeignKey("vendors.id"), nullable=False)
+    vendor_id = Column(Integer, ForeignKey("vendors.id"), nullable=False, index=True)
     contract_description = Column(String(100), nullable=False)
     contract_type = Column(Enum(ContractType, values_callable=lambda x: [e.value for e in x]), nullable=False)
     
@@ -159,9 +171,9 @@ class Contract(Base):
     expiration_notice_frequency = Column(Enum(ExpirationNoticePeriodType, values_callable=lambda x: [e.value for e in x]), nullable=False)
     
     # Contract Ownership
-    contract_owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    contract_owner_backup_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    contract_owner_manager_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    contract_owner_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    contract_owner_backup_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    contract_owner_manager_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     
     # Status and Termination
     status = Column(Enum(ContractStatusType, values_callable=lambda x: [e.value for e in x]), nullable=False, default=ContractStatusType.ACTIVE)
@@ -221,7 +233,7 @@ class ContractDocument(Base):
     __tablename__ = "contract_documents"
 
     id = Column(Integer, primary_key=True, index=True)
-    contract_id = Column(Integer, ForeignKey("contracts.id"), nullable=False)
+    contract_id = Column(Integer, ForeignKey("contracts.id"), nullable=False, index=True)
     
     # Document Information
     file_name = Column(String(255), nullable=False)
@@ -229,6 +241,7 @@ class ContractDocument(Base):
     document_signed_date = Column(Date, nullable=False)  # Date when document was signed
     file_path = Column(String(500), nullable=False)
     file_size = Column(Integer, nullable=False)
+    sha256 = Column(String(64), nullable=True, index=True)  # Content hash; file_path is its blob in the document store
     content_type = Column(String(100), nullable=False)
     
     # Timestamps
@@ -243,7 +256,7 @@ class TerminationDocument(Base):
     __tablename__ = "termination_documents"
 
     id = Column(Integer, primary_key=True, index=True)
-    contract_id = Column(Integer, ForeignKey("contracts.id"), nullable=False)
+    contract_id = Column(Integer, ForeignKey("contracts.id"), nullable=False, index=True)
     
     # Document Information
     file_name = Column(String(255), nullable=False)
@@ -251,6 +264,7 @@ class TerminationDocument(Base):
     document_date = Column(Date, nullable=False)  # Document date (per AC)
     file_path = Column(String(500), nullable=False)
     file_size = Column(Integer, nullable=False)
+    sha256 = Column(String(64), nullable=True, index=True)  # Content hash; file_path is its blob in the document store
     content_type = Column(String(100), nullable=False)
     
     # Timestamps
@@ -263,6 +277,10 @@ class TerminationDocument(Base):
 class ContractUpdate(Base):
     """Track contract review workflow - responses, returns, and admin comments"""
     __tablename__ = "contract_updates"
+    __table_args__ = (
+        # Latest update per contract and "already acted on" lookups
+        Index("ix_contract_updates_contract_status_created", "contract_id", "status", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     contract_id = Column(Integer, ForeignKey("contracts.id"), nullable=False)
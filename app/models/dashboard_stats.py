@@ -0,0 +1,43 @@
+from sqlalchemy import Column, Integer, String, DateTime, Date, Numeric, UniqueConstraint
+from app.db.database import Base
+from datetime import datetime
+
+
+class DashboardStat(Base):
+    """
+    Dashboard read model: contract counters per (status, department, currency).
+    Maintained by DashboardStatsService; the expiring buckets are relative to computed_for.
+    """
+    __tablename__ = "dashboard_stats"
+    __table_args__ = (
+        UniqueConstraint("status", "department", "currency", name="uq_dashboard_stats_group"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    status = Column(String(50), nullable=False)
+    department = Column(String(128), nullable=False)
+    currency = Column(String(10), nullable=False)
+
+    # Counters
+    total = Column(Integer, nullable=False, default=0)
+    amount = Column(Numeric(18, 2), nullable=False, default=0)
+    current = Column(Integer, nullable=False, default=0)  # end_date >= computed_for
+    current_amount = Column(Numeric(18, 2), nullable=False, default=0)
+    expiring_30 = Column(Integer, nullable=False, default=0)
+    expiring_60 = Column(Integer, nullable=False, default=0)
+    expiring_90 = Column(Integer, nullable=False, default=0)
+
+    computed_for = Column(Date, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class DashboardStatsState(Base):
+    """
+    Freshness marker of the dashboard_stats read model: a single row with the date
+    the counters were last fully rebuilt for. A new date triggers the next rebuild.
+    """
+    __tablename__ = "dashboard_stats_state"
+
+    id = Column(Integer, primary_key=True)
+    rebuilt_on = Column(Date, nullable=False)
+    rebuilt_at = Column(DateTime, nullable=False, default=datetime.utcnow)
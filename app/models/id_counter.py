@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from app.db.database import Base
+from datetime import datetime
+
+
+class IdCounter(Base):
+    """Last allocated number per business ID prefix (CT, U, AB, OB)"""
+    __tablename__ = "id_counters"
+
+    prefix = Column(String(10), primary_key=True)
+    last_value = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text
+from app.db.database import Base
+from datetime import datetime
+
+
+class ScheduledJobRun(Base):
+    """Audit row for one run of a scheduled background job (e.g. the expiry sweep)"""
+    __tablename__ = "scheduled_job_runs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_name = Column(String(100), nullable=False, index=True)
+    status = Column(String(20), nullable=False)  # success / failed
+    affected_count = Column(Integer, nullable=False, default=0)
+    error = Column(Text, nullable=True)
+    started_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+
+
+class ScheduledJobLease(Base):
+    """
+    Job lock on databases without advisory / application locks: the worker that
+    claims the row runs the job until expires_at (see app.services.scheduled_jobs)
+    """
+    __tablename__ = "scheduled_job_leases"
+
+    job_name = Column(String(100), primary_key=True)
+    holder = Column(String(64), nullable=False)
+    expires_at = Column(DateTime, nullable=False)
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, UniqueConstraint
+from app.db.database import Base
+from datetime import datetime
+
+
+class SearchDocument(Base):
+    """
+    Search text of one contract or vendor (lowercased, fields joined by spaces).
+    Maintained on write by app.services.search_index. On PostgreSQL the table
+    also has a generated content_tsv tsvector column and GIN indexes (migration 016).
+    """
+    __tablename__ = "search_documents"
+    __table_args__ = (
+        UniqueConstraint("entity_type", "entity_id", name="uq_search_documents_entity"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    entity_type = Column(String(20), nullable=False)  # contract / vendor
+    entity_id = Column(Integer, nullable=False)
+    content = Column(Text, nullable=False)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
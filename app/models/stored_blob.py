@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from app.db.database import Base
+from datetime import datetime
+
+
+class StoredBlob(Base):
+    """
+    One file in the content-addressed document store (uploads/blobs), shared by
+    every ContractDocument / TerminationDocument / VendorDocument with the same
+    sha256. ref_count is maintained by app.services.document_store; released_at
+    is set when it drops to zero and the file is deleted by the periodic sweep.
+    """
+    __tablename__ = "stored_blobs"
+
+    sha256 = Column(String(64), primary_key=True)
+    file_path = Column(String(500), nullable=False)
+    file_size = Column(Integer, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    released_at = Column(DateTime, nullable=True, index=True)
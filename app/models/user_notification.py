@@ -0,0 +1,36 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, ForeignKey, Index, UniqueConstraint
+from app.db.database import Base
+from datetime import datetime
+
+
+class UserNotification(Base):
+    """
+    Persisted notification inbox row. Populated by NotificationService (daily
+    refresh job and ContractUpdate status changes); the header only counts unread rows.
+    """
+    __tablename__ = "user_notifications"
+    __table_args__ = (
+        # One row per notification subject (e.g. "pending_review:42") and user
+        UniqueConstraint("user_id", "dedupe_key", name="uq_user_notifications_user_dedupe"),
+        # Unread badge count
+        Index("ix_user_notifications_user_read", "user_id", "is_read"),
+        # Paginated inbox, newest first
+        Index("ix_user_notifications_user_created", "user_id", "created_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    type = Column(String(50), nullable=False)  # expiring_soon / past_due / pending_review
+    dedupe_key = Column(String(100), nullable=False)
+    title = Column(String(255), nullable=False)
+    message = Column(Text, nullable=False)
+    link = Column(String(255), nullable=True)
+    priority = Column(String(10), nullable=False, default="medium")  # high / medium / low
+
+    # Subject of the notification
+    contract_id = Column(Integer, ForeignKey("contracts.id", ondelete="CASCADE"), nullable=True)
+    contract_update_id = Column(Integer, ForeignKey("contract_updates.id", ondelete="CASCADE"), nullable=True)
+
+    is_read = Column(Boolean, nullable=False, default=False)
+    read_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
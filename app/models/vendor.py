@@ -150,6 +150,7 @@ class VendorDocument(Base):
     document_signed_date = Column(DateTime, nullable=False)  # Date when document was signed
     file_path = Column(String(500), nullable=False)
     file_size = Column(Integer, nullable=False)
+    sha256 = Column(String(64), nullable=True, index=True)  # Content hash; file_path is its blob in the document store
     content_type = Column(String(100), nullable=False)
     
     created_at = Column(DateTime, default=datetime.utcnow)
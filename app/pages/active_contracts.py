@@ -1,20 +1,15 @@
 from datetime import datetime, timedelta, date
 from nicegui import ui, app
-from app.db.database import SessionLocal
+from app.db.database import run_db
 from app.services.contract_service import ContractService
-from app.models.contract import ContractStatusType, User, UserRole
+from app.models.contract import ContractStatusType, User
 from app.utils.navigation import get_dashboard_url
 from app.components.breadcrumb import breadcrumb
-import io
-import base64
-try:
-    import pandas as pd
-    PANDAS_AVAILABLE = True
-except ImportError:
-    PANDAS_AVAILABLE = False
+from app.components.report_export import export_report
+from app.components.server_table import ServerTable
 
 
-def active_contracts():
+async def active_contracts():
     # Get current logged-in user - use stored user_id first (from login)
     current_user_id = app.storage.user.get('user_id', None)
     current_user_role = app.storage.user.get('user_role', None)
@@ -22,39 +17,38 @@ def active_contracts():
     # If user_id is not stored, try to look it up by username
     if not current_user_id:
         current_username = app.storage.user.get('username', None)
+        def lookup_current_user(db):
+            nonlocal current_user_id, current_user_role
+            if current_username:
+                # Try multiple matching strategies
+                # 1. Exact email match
+                current_user = db.query(User).filter(User.email == current_username).first()
+                # 2. Email contains username
+                if not current_user:
+                    current_user = db.query(User).filter(User.email.ilike(f"%{current_username}%")).first()
+                # 3. First name match
+                if not current_user:
+                    current_user = db.query(User).filter(User.first_name.ilike(f"%{current_username}%")).first()
+                # 4. Last name match
+                if not current_user:
+                    current_user = db.query(User).filter(User.last_name.ilike(f"%{current_username}%")).first()
+                # 5. Full name match (e.g., "William Defoe")
+                if not current_user and ' ' in current_username:
+                    parts = current_username.split()
+                    if len(parts) >= 2:
+                        current_user = db.query(User).filter(
+                            User.first_name.ilike(f"%{parts[0]}%"),
+                            User.last_name.ilike(f"%{parts[-1]}%")
+                        ).first()
+                
+                if current_user:
+                    current_user_id = current_user.id
+                    current_user_role = current_user.role.value if current_user.role else None
+                    print(f"Found current user: {current_user.first_name} {current_user.last_name} (ID: {current_user_id}, Role: {current_user_role})")
+                else:
+                    print(f"Could not find user matching: {current_username}")
         try:
-            db = SessionLocal()
-            try:
-                if current_username:
-                    # Try multiple matching strategies
-                    # 1. Exact email match
-                    current_user = db.query(User).filter(User.email == current_username).first()
-                    # 2. Email contains username
-                    if not current_user:
-                        current_user = db.query(User).filter(User.email.ilike(f"%{current_username}%")).first()
-                    # 3. First name match
-                    if not current_user:
-                        current_user = db.query(User).filter(User.first_name.ilike(f"%{current_username}%")).first()
-                    # 4. Last name match
-                    if not current_user:
-                        current_user = db.query(User).filter(User.last_name.ilike(f"%{current_username}%")).first()
-                    # 5. Full name match (e.g., "William Defoe")
-                    if not current_user and ' ' in current_username:
-                        parts = current_username.split()
-                        if len(parts) >= 2:
-                            current_user = db.query(User).filter(
-                                User.first_name.ilike(f"%{parts[0]}%"),
-                                User.last_name.ilike(f"%{parts[-1]}%")
-                            ).first()
-                    
-                    if current_user:
-                        current_user_id = current_user.id
-                        current_user_role = current_user.role.value if current_user.role else None
-                        print(f"Found current user: {current_user.first_name} {current_user.last_name} (ID: {current_user_id}, Role: {current_user_role})")
-                    else:
-                        print(f"Could not find user matching: {current_username}")
-            finally:
-                db.close()
+            await run_db(lookup_current_user)
         except Exception as e:
             print(f"Error fetching current user: {e}")
             import traceback
@@ -66,69 +60,29 @@ def active_contracts():
     with ui.row().classes("max-w-6xl mx-auto mt-4"):
         breadcrumb([("Home", get_dashboard_url()), ("Active Contracts", None)])
     
-    # Global variables for table and data
-    contracts_table = None
-    contract_rows = []
-    
-    
-    # Fetch active contracts from database
-    def fetch_active_contracts():
+    # Fetch one page of active contracts from database
+    def fetch_active_contracts_page(db, search=None, **page_params):
         """
-        Fetches active contracts directly from the database service.
+        Fetches one page of active contracts directly from the database service.
         This avoids HTTP requests and circular dependencies.
-        Filters contracts based on user role:
+        Role scoping, search, sorting and paging are done in SQL:
         - Contract Admin: sees all contracts
         - Contract Manager/Backup/Owner: sees only contracts they are assigned to
+        Returns: (rows, total_count, next_cursor)
         """
-        db = SessionLocal()
         try:
             contract_service = ContractService(db)
             
-            # Get active contracts only (limit 1000 for display)
-            contracts, _ = contract_service.search_and_filter_contracts(
-                skip=0,
-                limit=1000,
+            contracts, total_count, next_cursor = contract_service.get_contracts_page(
                 status=ContractStatusType.ACTIVE,
-                search=None,
-                contract_type=None,
-                department=None,
-                owner_id=None,
-                vendor_id=None,
-                expiring_soon=None
+                search=search,
+                user_role=current_user_role or "",
+                user_id=current_user_id,
+                **page_params
             )
             
-            # Apply role-based filtering
-            total_contracts_before_filter = len(contracts)
-            
-            if current_user_role == UserRole.CONTRACT_ADMIN.value:
-                # Contract Admin sees all contracts
-                print(f"User is Contract Admin - showing all {len(contracts)} active contracts")
-            elif current_user_role in [UserRole.CONTRACT_MANAGER.value, UserRole.CONTRACT_MANAGER_BACKUP.value, UserRole.CONTRACT_MANAGER_OWNER.value]:
-                # Contract Manager/Backup/Owner sees only contracts they are assigned to
-                if current_user_id:
-                    filtered_contracts = []
-                    for contract in contracts:
-                        # Check if user is assigned to this contract in any role
-                        if (contract.contract_owner_id == current_user_id or
-                            contract.contract_owner_backup_id == current_user_id or
-                            contract.contract_owner_manager_id == current_user_id):
-                            filtered_contracts.append(contract)
-                    contracts = filtered_contracts
-                    print(f"User is {current_user_role} - showing {len(contracts)} assigned contracts out of {total_contracts_before_filter} total")
-                else:
-                    # No user ID, show empty list
-                    contracts = []
-                    print(f"User is {current_user_role} but no user_id found - showing 0 contracts")
-            else:
-                # Unknown role or no role - show empty list for safety
-                contracts = []
-                print(f"User has unknown role '{current_user_role}' - showing 0 contracts")
-            
-            print(f"Found {len(contracts)} active contracts from database (after role filtering)")
-            
             if not contracts:
-                print("No active contracts found in database")
-                return []
+                return [], total_count, None
             
             # Map contract data to table row format
             rows = []
@@ -240,18 +194,14 @@ def active_contracts():
                 }
                 rows.append(row_data)
             
-            print(f"Processed {len(rows)} contract rows")
-            return rows
+            return rows, total_count, next_cursor
             
         except Exception as e:
             error_msg = f"Error fetching contracts: {str(e)}"
             print(error_msg)
             import traceback
             traceback.print_exc()
-            ui.notify(error_msg, type="negative")
-            return []
-        finally:
-            db.close()
+            return [], 0, None
 
     contract_columns = [
         {
@@ -309,18 +259,10 @@ def active_contracts():
         "headerClasses": "bg-[#144c8e] text-white",
     }
 
-    # Fetch contracts data
-    contract_rows = []
-    
-    # Initial fetch
-    contract_rows = fetch_active_contracts()
-    
-    # Debug: Check if we have data
-    print(f"Total contract rows fetched: {len(contract_rows)}")
-    if contract_rows:
-        print(f"First row sample: {contract_rows[0]}")
-    else:
-        ui.notify("No active contracts available. Please check the database.", type="warning")
+    async def fetch_page(**page_params):
+        """Fetch one table page without blocking the event loop"""
+        search = (search_input.value or "").strip() or None
+        return await run_db(fetch_active_contracts_page, search=search, **page_params)
     
     # Main container
     with ui.element("div").classes("max-w-6xl mt-8 mx-auto w-full"):
@@ -338,65 +280,56 @@ def active_contracts():
         
         # Count label row
         with ui.row().classes('ml-4 mb-2'):
-            count_label = ui.label(f"Total: {len(contract_rows)} contracts").classes("text-sm text-gray-500")
+            count_label = ui.label("Total: 0 contracts").classes("text-sm text-gray-500")
         
-        # Define search functions first
-        def filter_contracts():
-            # Show all contracts regardless of role
-            base_rows = contract_rows
-            
-            search_term = (search_input.value or "").lower()
-            if not search_term:
-                contracts_table.rows = base_rows
-            else:
-                filtered = [
-                    row for row in base_rows
-                    if search_term in (row['contract_id'] or "").lower()
-                    or search_term in (row['vendor_name'] or "").lower()
-                    or search_term in (row['contract_type'] or "").lower()
-                    or search_term in (row['description'] or "").lower()
-                    or search_term in (row['my_role'] or "").lower()
-                ]
-                contracts_table.rows = filtered
-            contracts_table.update()
+        # Define search functions first (search runs server-side)
+        async def filter_contracts():
+            await contracts_server_table.refresh()
         
-        def clear_search():
+        async def clear_search():
             search_input.value = ""
-            filter_contracts()  # Use filter_contracts to respect current role
+            await filter_contracts()
         
         # Search input for filtering contracts (above the table)
         with ui.row().classes('w-full ml-4 mr-4 mb-6 gap-2 px-2'):
-            search_input = ui.input(placeholder='Search by Contract ID, Vendor, Type, Description, or My Role...').classes(
+            search_input = ui.input(placeholder='Search by Contract ID, Vendor, Type, Description, or Manager...').classes(
                 'flex-1'
-            ).props('outlined dense clearable')
+            ).props('outlined dense clearable debounce=400')
             with search_input.add_slot('prepend'):
                 ui.icon('search').classes('text-gray-400')
             ui.button(icon='search', on_click=filter_contracts).props('color=primary')
             ui.button(icon='clear', on_click=clear_search).props('color=secondary')
         
         # Show message if no data
-        if not contract_rows:
-            with ui.card().classes("w-full p-6"):
-                ui.label("No active contracts found").classes("text-lg font-bold text-gray-500")
-                ui.label("Please check that the backend has contract data.").classes("text-sm text-gray-400 mt-2")
-        
-        # Create table after search bar (showing all contracts)
-        initial_rows = contract_rows
-        print(f"Creating table with {len(initial_rows)} rows")
+        no_data_card = ui.card().classes("w-full p-6")
+        with no_data_card:
+            ui.label("No active contracts found").classes("text-lg font-bold text-gray-500")
+            ui.label("Please check that the backend has contract data.").classes("text-sm text-gray-400 mt-2")
+        no_data_card.visible = False
         
-        contracts_table = ui.table(
+        # Create table after search bar (rows are requested page by page)
+        contracts_server_table = ServerTable(
             columns=contract_columns,
             column_defaults=contract_columns_defaults,
-            rows=initial_rows,
-            pagination=10,
+            fetch_page=fetch_page,
+            rows_per_page=10,
+            sort_by="expiration_date",
             row_key="id"
-        ).classes("w-full").props("flat bordered").classes(
+        )
+        contracts_table = contracts_server_table.table
+        contracts_table.classes("w-full").props("flat bordered").classes(
             "contracts-table shadow-lg rounded-lg overflow-hidden"
         )
         
-        # Force update if we have data
-        if initial_rows:
-            contracts_table.update()
+        def on_contracts_loaded(total_count):
+            count_label.text = f"Total: {total_count} contracts"
+        contracts_server_table.on_loaded = on_contracts_loaded
+        
+        # Initial fetch
+        await contracts_server_table.load()
+        if not contracts_server_table.total_count:
+            no_data_card.visible = True
+            ui.notify("No active contracts available. Please check the database.", type="warning")
         
         # Generate button (moved from header to after table)
         ui.button("Generate", icon="description", on_click=lambda: open_generate_dialog()).props('color=primary').classes('ml-4 mt-4')
@@ -484,7 +417,7 @@ def active_contracts():
                 
                 dialog.open()
         
-        def generate_excel_report(start_date_str, end_date_str, dialog):
+        async def generate_excel_report(start_date_str, end_date_str, dialog):
             """Generate Excel report for active contracts within date range"""
             try:
                 # Parse dates
@@ -495,19 +428,14 @@ def active_contracts():
                     ui.notify("Start date must be before end date", type="negative")
                     return
                 
-                # Use all contract rows for the report
-                filtered_contracts = contract_rows
+                # Use all contract rows matching the current search for the report
+                filtered_contracts = await contracts_server_table.fetch_all()
                 
                 if not filtered_contracts:
                     ui.notify("No active contracts available for export", type="warning")
                     dialog.close()
                     return
                 
-                if not PANDAS_AVAILABLE:
-                    ui.notify("Excel export requires pandas library. Please install it: pip install pandas openpyxl", type="negative")
-                    dialog.close()
-                    return
-                
                 # Prepare data for Excel with all required fields
                 report_data = []
                 for contract in filtered_contracts:
@@ -529,48 +457,12 @@ def active_contracts():
                         "Previous Extension/Renewal 3": "N/A",  # Not yet implemented in database
                     })
                 
-                # Create DataFrame
-                df = pd.DataFrame(report_data)
-                
-                # Create Excel file in memory
-                output = io.BytesIO()
-                with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                    df.to_excel(writer, index=False, sheet_name='Active Contracts')
-                    
-                    # Get the worksheet
-                    worksheet = writer.sheets['Active Contracts']
-                    
-                    # Auto-adjust column widths
-                    for column in worksheet.columns:
-                        max_length = 0
-                        column_letter = column[0].column_letter
-                        for cell in column:
-                            try:
-                                if len(str(cell.value)) > max_length:
-                                    max_length = len(str(cell.value))
-                            except (AttributeError, TypeError):
-                                pass
-                        adjusted_width = min(max_length + 2, 50)
-                        worksheet.column_dimensions[column_letter].width = adjusted_width
-                
-                output.seek(0)
-                
-                # Convert to base64 for download
-                excel_data = output.getvalue()
-                b64_data = base64.b64encode(excel_data).decode()
-                
                 # Generate filename
                 filename = f"Active_Contracts_Report_{start_date_str}_to_{end_date_str}.xlsx"
                 
-                # Trigger download using JavaScript
-                ui.run_javascript(f'''
-                    const link = document.createElement('a');
-                    link.href = 'data:application/vnd.openxmlformats-officedocument.spreadsheetml.sheet;base64,{b64_data}';
-                    link.download = '{filename}';
-                    document.body.appendChild(link);
-                    link.click();
-                    document.body.removeChild(link);
-                ''')
+                # Build the workbook in a report worker process; the browser downloads it when ready
+                if not await export_report(filename, 'Active Contracts', report_data):
+                    return
                 
                 ui.notify(f"Report generated successfully! {len(filtered_contracts)} contract(s) exported.", type="positive")
                 dialog.close()
@@ -1,142 +1,108 @@
 """All Contracts page - lists contracts of any status (active, expired, terminated, etc.)."""
 from datetime import datetime, timedelta, date
 from nicegui import ui, app
-from app.db.database import SessionLocal
-from app.services.contract_service import ContractService
-from app.models.contract import ContractStatusType, User, UserRole
+from app.db.database import run_db
+from app.services.async_service import AsyncContractService
+from app.models.contract import ContractStatusType, User
 from app.utils.navigation import get_dashboard_url
 from app.components.breadcrumb import breadcrumb
-import io
-import base64
-try:
-    import pandas as pd
-    PANDAS_AVAILABLE = True
-except ImportError:
-    PANDAS_AVAILABLE = False
+from app.components.report_export import export_report
+from app.components.server_table import ServerTable
 
 
-def all_contracts():
+async def all_contracts():
     current_user_id = app.storage.user.get('user_id', None)
     current_user_role = app.storage.user.get('user_role', None)
 
     if not current_user_id:
         current_username = app.storage.user.get('username', None)
+        def lookup_current_user(db):
+            nonlocal current_user_id, current_user_role
+            if current_username:
+                current_user = db.query(User).filter(User.email == current_username).first()
+                if not current_user:
+                    current_user = db.query(User).filter(User.email.ilike(f"%{current_username}%")).first()
+                if not current_user:
+                    current_user = db.query(User).filter(User.first_name.ilike(f"%{current_username}%")).first()
+                if current_user:
+                    current_user_id = current_user.id
+                    current_user_role = current_user.role.value if current_user.role else None
         try:
-            db = SessionLocal()
-            try:
-                if current_username:
-                    current_user = db.query(User).filter(User.email == current_username).first()
-                    if not current_user:
-                        current_user = db.query(User).filter(User.email.ilike(f"%{current_username}%")).first()
-                    if not current_user:
-                        current_user = db.query(User).filter(User.first_name.ilike(f"%{current_username}%")).first()
-                    if current_user:
-                        current_user_id = current_user.id
-                        current_user_role = current_user.role.value if current_user.role else None
-            finally:
-                db.close()
+            await run_db(lookup_current_user)
         except Exception as e:
             print(f"Error fetching current user: {e}")
 
     with ui.row().classes("max-w-6xl mx-auto mt-4"):
         breadcrumb([("Home", get_dashboard_url()), ("All Contracts", None)])
 
-    contract_rows = []
-
-    def fetch_all_contracts():
-        db = SessionLocal()
+    def build_contract_row(contract):
+        backup_name = f"{contract.contract_owner_backup.first_name} {contract.contract_owner_backup.last_name}" if contract.contract_owner_backup else "N/A"
+        vendor_name = contract.vendor.vendor_name if contract.vendor else "Unknown"
+        vendor_id = contract.vendor.id if contract.vendor else None
+        contract_type = contract.contract_type.value if hasattr(contract.contract_type, 'value') else str(contract.contract_type)
+        status = contract.status.value if hasattr(contract.status, 'value') else str(contract.status)
+        department = contract.department.value if hasattr(contract.department, 'value') else str(contract.department)
+        automatic_renewal = contract.automatic_renewal.value if hasattr(contract.automatic_renewal, 'value') else str(contract.automatic_renewal)
+
+        formatted_start_date = contract.start_date.strftime("%Y-%m-%d") if contract.start_date else "N/A"
+        if contract.end_date:
+            exp_date = contract.end_date
+            formatted_date = exp_date.strftime("%Y-%m-%d")
+            exp_timestamp = datetime.combine(exp_date, datetime.min.time()).timestamp()
+            month = exp_date.month
+            year = exp_date.year
+            ending_quarter = f"Q{(month - 1) // 3 + 1} {year}"
+        else:
+            formatted_date = "N/A"
+            exp_timestamp = 0
+            ending_quarter = "N/A"
+
+        my_role = "N/A"
+        if current_user_id:
+            if contract.contract_owner_id == current_user_id:
+                my_role = "Contract Manager"
+            elif contract.contract_owner_backup_id == current_user_id:
+                my_role = "Backup"
+            elif contract.contract_owner_manager_id == current_user_id:
+                my_role = "Owner"
+
+        status_color = "green" if contract.status == ContractStatusType.ACTIVE else "red" if contract.status == ContractStatusType.TERMINATED else "orange"
+
+        return {
+            "id": int(contract.id),
+            "contract_id": str(contract.contract_id or ""),
+            "vendor_id": int(vendor_id) if vendor_id else 0,
+            "vendor_name": str(vendor_name or ""),
+            "contract_type": str(contract_type or ""),
+            "description": str(contract.contract_description or ""),
+            "start_date": str(formatted_start_date),
+            "end_date": str(formatted_date),
+            "expiration_date": str(formatted_date),
+            "expiration_timestamp": float(exp_timestamp),
+            "ending_quarter": str(ending_quarter),
+            "automatic_renewal": str(automatic_renewal),
+            "department": str(department),
+            "status": str(status or "Unknown"),
+            "status_color": str(status_color),
+            "my_role": str(my_role),
+            "backup": str(backup_name),
+        }
+
+    async def fetch_page(**page_params):
+        """One table page; role scoping, search and sort are done in SQL"""
         try:
-            contract_service = ContractService(db)
-            contracts, _ = contract_service.search_and_filter_contracts(
-                skip=0,
-                limit=1000,
-                search=None,
-                status=None,
-                contract_type=None,
-                department=None,
-                owner_id=None,
-                vendor_id=None,
-                expiring_soon=None
+            return await AsyncContractService().get_contracts_page(
+                search=(search_input.value or "").strip() or None,
+                user_role=current_user_role or "",
+                user_id=current_user_id,
+                build=build_contract_row,
+                **page_params
             )
-
-            if current_user_role == UserRole.CONTRACT_ADMIN.value:
-                pass  # Admin sees all contracts
-            elif current_user_role in [UserRole.CONTRACT_MANAGER.value, UserRole.CONTRACT_MANAGER_BACKUP.value, UserRole.CONTRACT_MANAGER_OWNER.value]:
-                if current_user_id:
-                    contracts = [
-                        c for c in contracts
-                        if (c.contract_owner_id == current_user_id or
-                            c.contract_owner_backup_id == current_user_id or
-                            c.contract_owner_manager_id == current_user_id)
-                    ]
-                else:
-                    contracts = []
-            else:
-                contracts = []
-
-            rows = []
-            for contract in contracts:
-                backup_name = f"{contract.contract_owner_backup.first_name} {contract.contract_owner_backup.last_name}" if contract.contract_owner_backup else "N/A"
-                vendor_name = contract.vendor.vendor_name if contract.vendor else "Unknown"
-                vendor_id = contract.vendor.id if contract.vendor else None
-                contract_type = contract.contract_type.value if hasattr(contract.contract_type, 'value') else str(contract.contract_type)
-                status = contract.status.value if hasattr(contract.status, 'value') else str(contract.status)
-                department = contract.department.value if hasattr(contract.department, 'value') else str(contract.department)
-                automatic_renewal = contract.automatic_renewal.value if hasattr(contract.automatic_renewal, 'value') else str(contract.automatic_renewal)
-
-                formatted_start_date = contract.start_date.strftime("%Y-%m-%d") if contract.start_date else "N/A"
-                if contract.end_date:
-                    exp_date = contract.end_date
-                    formatted_date = exp_date.strftime("%Y-%m-%d")
-                    exp_timestamp = datetime.combine(exp_date, datetime.min.time()).timestamp()
-                    month = exp_date.month
-                    year = exp_date.year
-                    ending_quarter = f"Q{(month - 1) // 3 + 1} {year}"
-                else:
-                    formatted_date = "N/A"
-                    exp_timestamp = 0
-                    ending_quarter = "N/A"
-
-                my_role = "N/A"
-                if current_user_id:
-                    if contract.contract_owner_id == current_user_id:
-                        my_role = "Contract Manager"
-                    elif contract.contract_owner_backup_id == current_user_id:
-                        my_role = "Backup"
-                    elif contract.contract_owner_manager_id == current_user_id:
-                        my_role = "Owner"
-
-                status_color = "green" if contract.status == ContractStatusType.ACTIVE else "red" if contract.status == ContractStatusType.TERMINATED else "orange"
-
-                rows.append({
-                    "id": int(contract.id),
-                    "contract_id": str(contract.contract_id or ""),
-                    "vendor_id": int(vendor_id) if vendor_id else 0,
-                    "vendor_name": str(vendor_name or ""),
-                    "contract_type": str(contract_type or ""),
-                    "description": str(contract.contract_description or ""),
-                    "start_date": str(formatted_start_date),
-                    "end_date": str(formatted_date),
-                    "expiration_date": str(formatted_date),
-                    "expiration_timestamp": float(exp_timestamp),
-                    "ending_quarter": str(ending_quarter),
-                    "automatic_renewal": str(automatic_renewal),
-                    "department": str(department),
-                    "status": str(status or "Unknown"),
-                    "status_color": str(status_color),
-                    "my_role": str(my_role),
-                    "backup": str(backup_name),
-                })
-            return rows
         except Exception as e:
             print(f"Error fetching contracts: {e}")
             import traceback
             traceback.print_exc()
-            return []
-        finally:
-            db.close()
-
-    contract_rows = fetch_all_contracts()
+            return [], 0, None
 
     contract_columns = [
         {"name": "contract_id", "label": "Contract ID", "field": "contract_id", "align": "left", "sortable": True},
@@ -160,50 +126,42 @@ def all_contracts():
             ui.label("Contracts of any status: active, expired, terminated, etc.").classes("text-sm text-gray-500")
 
         with ui.row().classes('ml-4 mb-2'):
-            ui.label(f"Total: {len(contract_rows)} contracts").classes("text-sm text-gray-500")
+            count_label = ui.label("Total: 0 contracts").classes("text-sm text-gray-500")
 
-        def filter_contracts():
-            search_term = (search_input.value or "").lower()
-            if not search_term:
-                contracts_table.rows = contract_rows
-            else:
-                filtered = [
-                    row for row in contract_rows
-                    if search_term in (row.get('contract_id') or "").lower()
-                    or search_term in (row.get('vendor_name') or "").lower()
-                    or search_term in (row.get('contract_type') or "").lower()
-                    or search_term in (row.get('description') or "").lower()
-                    or search_term in (row.get('status') or "").lower()
-                    or search_term in (row.get('my_role') or "").lower()
-                ]
-                contracts_table.rows = filtered
-            contracts_table.update()
+        async def filter_contracts():
+            await contracts_server_table.refresh()
 
-        def clear_search():
+        async def clear_search():
             search_input.value = ""
-            filter_contracts()
+            await filter_contracts()
 
         with ui.row().classes('w-full ml-4 mr-4 mb-6 gap-2 px-2'):
-            search_input = ui.input(placeholder='Search by Contract ID, Vendor, Type, Description, Status, or My Role...').classes(
+            search_input = ui.input(placeholder='Search by Contract ID, Vendor, Type, Description, or Manager...').classes(
                 'flex-1'
-            ).props('outlined dense clearable')
+            ).props('outlined dense clearable debounce=400')
             with search_input.add_slot('prepend'):
                 ui.icon('search').classes('text-gray-400')
             ui.button(icon='search', on_click=filter_contracts).props('color=primary')
             ui.button(icon='clear', on_click=clear_search).props('color=secondary')
 
-        if not contract_rows:
-            with ui.card().classes("w-full p-6"):
-                ui.label("No contracts found").classes("text-lg font-bold text-gray-500")
-                ui.label("Contracts will appear here when they are created.").classes("text-sm text-gray-400 mt-2")
+        no_data_card = ui.card().classes("w-full p-6")
+        with no_data_card:
+            ui.label("No contracts found").classes("text-lg font-bold text-gray-500")
+            ui.label("Contracts will appear here when they are created.").classes("text-sm text-gray-400 mt-2")
+        no_data_card.visible = False
 
-        contracts_table = ui.table(
+        contracts_server_table = ServerTable(
             columns=contract_columns,
             column_defaults=contract_columns_defaults,
-            rows=contract_rows,
-            pagination=10,
+            fetch_page=fetch_page,
+            rows_per_page=10,
             row_key="id"
-        ).classes("w-full").props("flat bordered").classes("contracts-table shadow-lg rounded-lg overflow-hidden")
+        )
+        contracts_table = contracts_server_table.table
+        contracts_table.classes("w-full").props("flat bordered").classes("contracts-table shadow-lg rounded-lg overflow-hidden")
+        contracts_server_table.on_loaded = lambda total_count: count_label.set_text(f"Total: {total_count} contracts")
+        await contracts_server_table.load()
+        no_data_card.visible = not contracts_server_table.total_count
 
         ui.button("Generate", icon="description", on_click=lambda: open_generate_dialog()).props('color=primary').classes('ml-4 mt-4')
         search_input.on_value_change(filter_contracts)
@@ -259,16 +217,13 @@ def all_contracts():
                                  on_click=lambda: generate_excel_report(dialog)).props('color=primary')
                 dialog.open()
 
-        def generate_excel_report(dialog):
+        async def generate_excel_report(dialog):
             try:
+                contract_rows = await contracts_server_table.fetch_all()
                 if not contract_rows:
                     ui.notify("No contracts available for export", type="warning")
                     dialog.close()
                     return
-                if not PANDAS_AVAILABLE:
-                    ui.notify("Excel export requires pandas. Please install: pip install pandas openpyxl", type="negative")
-                    dialog.close()
-                    return
                 report_data = []
                 for c in contract_rows:
                     report_data.append({
@@ -282,21 +237,10 @@ def all_contracts():
                         "Department": c.get('department', ''),
                         "My Role": c.get('my_role', ''),
                     })
-                df = pd.DataFrame(report_data)
-                output = io.BytesIO()
-                with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                    df.to_excel(writer, index=False, sheet_name='All Contracts')
-                output.seek(0)
-                b64_data = base64.b64encode(output.getvalue()).decode()
                 filename = f"All_Contracts_Report_{datetime.now().strftime('%Y%m%d_%H%M')}.xlsx"
-                ui.run_javascript(f'''
-                    const link = document.createElement('a');
-                    link.href = 'data:application/vnd.openxmlformats-officedocument.spreadsheetml.sheet;base64,{b64_data}';
-                    link.download = '{filename}';
-                    document.body.appendChild(link);
-                    link.click();
-                    document.body.removeChild(link);
-                ''')
+                # Build the workbook in a report worker process; the browser downloads it when ready
+                if not await export_report(filename, 'All Contracts', report_data):
+                    return
                 ui.notify(f"Report generated! {len(contract_rows)} contract(s) exported.", type="positive")
                 dialog.close()
             except Exception as e:
@@ -2,6 +2,7 @@ from nicegui import ui
 from datetime import datetime, date
 from app.utils.navigation import get_dashboard_url
 from app.components.breadcrumb import breadcrumb
+from app.pages.document_files import contract_document_url, termination_document_url
 from app.models.contract import (
     ContractType, AutomaticRenewalType, RenewalPeriodType, DepartmentType,
     NoticePeriodType, ExpirationNoticePeriodType, CurrencyType, PaymentMethodType,
@@ -13,20 +14,12 @@ def contract_info(contract_id: int):
     """Display contract information by ID"""
     # Fetch contract from database
     from app.db.database import SessionLocal
-    from sqlalchemy.orm import joinedload
+    from app.services.contract_service import ContractService
     
     contract = None
     db = SessionLocal()
     try:
-        from app.models.contract import Contract
-        contract = db.query(Contract).options(
-            joinedload(Contract.vendor),
-            joinedload(Contract.contract_owner),
-            joinedload(Contract.contract_owner_backup),
-            joinedload(Contract.contract_owner_manager),
-            joinedload(Contract.documents),
-            joinedload(Contract.termination_documents)
-        ).filter(Contract.id == contract_id).first()
+        contract = ContractService(db).get_contract_by_id(contract_id, profile="detail")
         
         if not contract:
             print(f"Contract with ID {contract_id} not found")
@@ -507,29 +500,19 @@ def contract_info(contract_id: int):
                             view_btn = ui.button("View", icon="visibility").props('color=primary flat size=sm')
                             download_btn = ui.button("Download", icon="download").props('color=secondary flat size=sm')
                             
-                            def make_download_handler(doc_path, doc_name, file_name):
+                            def make_view_handler(doc_id):
+                                def view_document():
+                                    ui.navigate.to(contract_document_url(contract.id, doc_id, inline=True), new_tab=True)
+                                return view_document
+                            
+                            def make_download_handler(doc_id, file_name):
                                 def download_document():
-                                    import os
-                                    if os.path.exists(doc_path):
-                                        with open(doc_path, 'rb') as f:
-                                            file_content = f.read()
-                                        import base64
-                                        b64_content = base64.b64encode(file_content).decode()
-                                        ui.run_javascript(f'''
-                                            const link = document.createElement('a');
-                                            link.href = 'data:application/pdf;base64,{b64_content}';
-                                            link.download = '{file_name}';
-                                            document.body.appendChild(link);
-                                            link.click();
-                                            document.body.removeChild(link);
-                                        ''')
-                                        ui.notify(f"Downloaded {doc_name}", type="positive")
-                                    else:
-                                        ui.notify(f"File not found: {doc_name}", type="negative")
+                                    # Browser fetches the file itself (Range/ETag capable), not over the websocket
+                                    ui.download(contract_document_url(contract.id, doc_id), filename=file_name)
                                 return download_document
                             
-                            view_btn.on_click(make_download_handler(doc.file_path, doc.custom_document_name, doc.file_name))
-                            download_btn.on_click(make_download_handler(doc.file_path, doc.custom_document_name, doc.file_name))
+                            view_btn.on_click(make_view_handler(doc.id))
+                            download_btn.on_click(make_download_handler(doc.id, doc.file_name))
             else:
                 ui.label("No documents uploaded").classes("text-gray-500 italic")
 
@@ -539,24 +522,11 @@ def contract_info(contract_id: int):
         can_manage_termination_docs = user_role in ("Contract Admin", "Super User")
         termination_docs = list(contract.termination_documents or [])
 
-        def _download_termination_doc(doc_path: str, doc_name: str, file_name: str):
-            import os
-            if os.path.exists(doc_path):
-                with open(doc_path, "rb") as f:
-                    file_content = f.read()
-                import base64
-                b64_content = base64.b64encode(file_content).decode()
-                ui.run_javascript(f"""
-                    const link = document.createElement('a');
-                    link.href = 'data:application/pdf;base64,{b64_content}';
-                    link.download = '{file_name}';
-                    document.body.appendChild(link);
-                    link.click();
-                    document.body.removeChild(link);
-                """)
-                ui.notify(f"Downloaded {doc_name}", type="positive")
-            else:
-                ui.notify(f"File not found: {doc_name}", type="negative")
+        def _view_termination_doc(doc_id: int):
+            ui.navigate.to(termination_document_url(contract.id, doc_id, inline=True), new_tab=True)
+
+        def _download_termination_doc(doc_id: int, file_name: str):
+            ui.download(termination_document_url(contract.id, doc_id), filename=file_name)
 
         if len(termination_docs) > 0 or can_manage_termination_docs:
             with ui.card().classes("w-full max-w-5xl mx-auto mt-6 p-6"):
@@ -573,8 +543,8 @@ def contract_info(contract_id: int):
                             with ui.row().classes("gap-2"):
                                 view_btn = ui.button("View", icon="visibility").props("color=primary flat size=sm")
                                 download_btn = ui.button("Download", icon="download").props("color=secondary flat size=sm")
-                                view_btn.on_click(lambda p=tdoc.file_path, n=tdoc.document_name, f=tdoc.file_name: _download_termination_doc(p, n, f))
-                                download_btn.on_click(lambda p=tdoc.file_path, n=tdoc.document_name, f=tdoc.file_name: _download_termination_doc(p, n, f))
+                                view_btn.on_click(lambda tid=tdoc.id: _view_termination_doc(tid))
+                                download_btn.on_click(lambda tid=tdoc.id, f=tdoc.file_name: _download_termination_doc(tid, f))
                                 if can_manage_termination_docs:
                                     edit_btn = ui.button("Edit", icon="edit").props("flat size=sm")
                                     delete_btn = ui.button("Delete", icon="delete").props("flat color=negative size=sm")
@@ -639,22 +609,21 @@ def contract_info(contract_id: int):
             if not file_ref.get("content"):
                 ui.notify("Please select a PDF file", type="negative")
                 return
-            import httpx
+            from fastapi import HTTPException
+            from app.db.database import run_db
             fname = file_ref.get("name") or "document.pdf"
             file_content = file_ref["content"]
             try:
-                async with httpx.AsyncClient() as client:
-                    response = await client.post(
-                        f"http://localhost:8000/api/v1/contracts/{contract.id}/termination-documents",
-                        data={"document_name": name, "document_date": date_val},
-                        files={"file": (fname, file_content, "application/pdf")},
+                await run_db(
+                    lambda db: ContractService(db).store_termination_document_bytes(
+                        contract.id, file_content, fname, name, datetime.fromisoformat(date_val).date()
                     )
-                if response.status_code == 201:
-                    ui.notify("Termination document uploaded", type="positive")
-                    dialog.close()
-                    ui.navigate.reload()
-                else:
-                    ui.notify(response.json().get("detail", "Upload failed"), type="negative")
+                )
+                ui.notify("Termination document uploaded", type="positive")
+                dialog.close()
+                ui.navigate.reload()
+            except HTTPException as e:
+                ui.notify(e.detail or "Upload failed", type="negative")
             except Exception as e:
                 ui.notify(str(e), type="negative")
 
@@ -667,33 +636,35 @@ def contract_info(contract_id: int):
             if not date_val:
                 ui.notify("Please enter document date", type="negative")
                 return
+            from fastapi import HTTPException
+            from app.db.database import run_db
             try:
-                import httpx
-                async with httpx.AsyncClient() as client:
-                    response = await client.put(
-                        f"http://localhost:8000/api/v1/contracts/{cid}/termination-documents/{doc_id}",
-                        json={"document_name": name, "document_date": date_val},
+                doc = await run_db(
+                    lambda db: ContractService(db).update_termination_document(
+                        cid, doc_id, document_name=name, document_date=datetime.fromisoformat(date_val).date()
                     )
-                if response.status_code == 200:
+                )
+                if doc:
                     ui.notify("Termination document updated", type="positive")
                     dialog.close()
                     ui.navigate.reload()
                 else:
-                    ui.notify(response.json().get("detail", "Update failed"), type="negative")
+                    ui.notify("Termination document not found", type="negative")
+            except HTTPException as e:
+                ui.notify(e.detail or "Update failed", type="negative")
             except Exception as e:
                 ui.notify(str(e), type="negative")
 
         async def _do_delete_termination_doc(dialog, cid: int, doc_id: int):
+            from app.db.database import run_db
             try:
-                import httpx
-                async with httpx.AsyncClient() as client:
-                    response = await client.delete(f"http://localhost:8000/api/v1/contracts/{cid}/termination-documents/{doc_id}")
-                if response.status_code == 204:
+                deleted = await run_db(lambda db: ContractService(db).delete_termination_document(cid, doc_id))
+                if deleted:
                     ui.notify("Termination document deleted", type="positive")
                     dialog.close()
                     ui.navigate.reload()
                 else:
-                    ui.notify(response.json().get("detail", "Delete failed"), type="negative")
+                    ui.notify("Termination document not found", type="negative")
             except Exception as e:
                 ui.notify(str(e), type="negative")
 
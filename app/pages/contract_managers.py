@@ -1,17 +1,13 @@
 from nicegui import ui
-import io
 from app.utils.navigation import get_dashboard_url
 from app.components.breadcrumb import breadcrumb
-import base64
+from app.components.report_export import export_report
 from datetime import datetime
 import os
 
 from app.core.config import settings
-try:
-    import pandas as pd
-    PANDAS_AVAILABLE = True
-except ImportError:
-    PANDAS_AVAILABLE = False
+from app.core.cache import reference_cache, USERS_NAMESPACE
+from app.core.security import invalidate_principal
 
 
 def contract_managers():
@@ -540,6 +536,7 @@ def contract_managers():
                                     db.add(new_user)
                                     db.commit()
                                     db.refresh(new_user)
+                                    reference_cache.invalidate(USERS_NAMESPACE)
 
                                     # Add to table data with zero contract counts
                                     row_data = {
@@ -842,6 +839,7 @@ def contract_managers():
                                         return
 
                                     # Apply changes
+                                    previous_email = user.email
                                     user.first_name = first_name
                                     user.last_name = last_name
                                     user.email = email
@@ -850,6 +848,9 @@ def contract_managers():
 
                                     db.commit()
                                     db.refresh(user)
+                                    reference_cache.invalidate(USERS_NAMESPACE)
+                                    # Cached API principals still carry the old role / email
+                                    invalidate_principal(previous_email)
 
                                     # Update row data in table
                                     row_data['user_id'] = str(user.user_id or "")
@@ -901,14 +902,9 @@ def contract_managers():
                 
                 dialog.open()
         
-        def generate_excel_report(dialog):
+        async def generate_excel_report(dialog):
             """Generate Excel report for user administration"""
             try:
-                if not PANDAS_AVAILABLE:
-                    ui.notify("Excel export requires pandas library. Please install it: pip install pandas openpyxl", type="negative")
-                    dialog.close()
-                    return
-                
                 if not manager_rows:
                     ui.notify("No users available for export", type="warning")
                     dialog.close()
@@ -927,49 +923,13 @@ def contract_managers():
                         "Owner": user.get('owner_count', 0),
                     })
                 
-                # Create DataFrame
-                df = pd.DataFrame(report_data)
-                
-                # Create Excel file in memory
-                output = io.BytesIO()
-                with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                    df.to_excel(writer, index=False, sheet_name='User Administration')
-                    
-                    # Get the worksheet
-                    worksheet = writer.sheets['User Administration']
-                    
-                    # Auto-adjust column widths
-                    for column in worksheet.columns:
-                        max_length = 0
-                        column_letter = column[0].column_letter
-                        for cell in column:
-                            try:
-                                if len(str(cell.value)) > max_length:
-                                    max_length = len(str(cell.value))
-                            except (AttributeError, TypeError):
-                                pass
-                        adjusted_width = min(max_length + 2, 50)
-                        worksheet.column_dimensions[column_letter].width = adjusted_width
-                
-                output.seek(0)
-                
-                # Convert to base64 for download
-                excel_data = output.getvalue()
-                b64_data = base64.b64encode(excel_data).decode()
-                
                 # Generate filename
                 today = datetime.now().strftime("%Y-%m-%d")
                 filename = f"User_Administration_Report_{today}.xlsx"
                 
-                # Trigger download using JavaScript
-                ui.run_javascript(f'''
-                    const link = document.createElement('a');
-                    link.href = 'data:application/vnd.openxmlformats-officedocument.spreadsheetml.sheet;base64,{b64_data}';
-                    link.download = '{filename}';
-                    document.body.appendChild(link);
-                    link.click();
-                    document.body.removeChild(link);
-                ''')
+                # Build the workbook in a report worker process; the browser downloads it when ready
+                if not await export_report(filename, 'User Administration', report_data):
+                    return
                 
                 ui.notify(f"Report generated successfully! {len(manager_rows)} user(s) exported.", type="positive")
                 dialog.close()
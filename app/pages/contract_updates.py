@@ -1,15 +1,17 @@
 from datetime import datetime, timedelta, date
 import asyncio
 import logging
+from fastapi import HTTPException
 from nicegui import ui, app, run
-import io
 import re
-import base64
 import httpx
 from app.utils.vendor_lookup import get_vendor_id_by_name
 from app.utils.navigation import get_dashboard_url
 from app.components.breadcrumb import breadcrumb
-from app.db.database import SessionLocal
+from app.components.report_export import export_report
+from app.components.live_updates import live_updates
+from app.core.events import CONTRACT_UPDATES_TOPIC
+from app.db.database import SessionLocal, run_db
 from sqlalchemy.orm import joinedload
 from app.models.contract import (
     ContractUpdate,
@@ -21,15 +23,35 @@ from app.models.contract import (
     UserRole,
 )
 from app.models.vendor import Vendor
-try:
-    import pandas as pd
-    PANDAS_AVAILABLE = True
-except ImportError:
-    PANDAS_AVAILABLE = False
+from app.services.contract_service import ContractService
 
 log = logging.getLogger(__name__)
 
 
+def _store_termination_document(
+    db,
+    contract_db_id: int,
+    content: bytes,
+    file_name: str,
+    document_name: str,
+    document_date: str,
+) -> str | None:
+    """Store an uploaded termination document via ContractService. Returns an error message or None."""
+    try:
+        ContractService(db).store_termination_document_bytes(
+            contract_db_id,
+            content,
+            file_name or "document.pdf",
+            document_name.strip(),
+            datetime.fromisoformat(document_date.strip()).date(),
+        )
+        return None
+    except HTTPException as e:
+        return str(e.detail)
+    except ValueError as e:
+        return str(e)
+
+
 def _complete_returned_update_blocking(
     update_id: int | None,
     contract_db_id: int,
@@ -47,21 +69,20 @@ def _complete_returned_update_blocking(
     log.info("_complete_returned_update_blocking: update_id=%s contract_db_id=%s decision=%s", update_id, contract_db_id, decision)
     try:
         if decision == "Terminate" and term_doc_file_content:
-            with httpx.Client(timeout=90.0) as client:
-                r = client.post(
-                    f"http://localhost:8000/api/v1/contracts/{contract_db_id}/termination-documents",
-                    data={"document_name": term_doc_name.strip(), "document_date": term_doc_date.strip()},
-                    files={"file": (term_doc_file_name or "document.pdf", term_doc_file_content, "application/pdf")},
+            doc_db = SessionLocal()
+            try:
+                error = _store_termination_document(
+                    doc_db,
+                    contract_db_id,
+                    term_doc_file_content,
+                    term_doc_file_name,
+                    term_doc_name,
+                    term_doc_date,
                 )
-            if r.status_code not in (200, 201):
-                try:
-                    body = r.json()
-                    detail = body.get("detail", "Failed to store termination document")
-                    if isinstance(detail, list):
-                        detail = "; ".join(str(x.get("msg", x)) for x in detail) if detail else "Request failed"
-                    return (False, str(detail))
-                except Exception:
-                    return (False, (r.text or f"Request failed (HTTP {r.status_code})"))
+            finally:
+                doc_db.close()
+            if error:
+                return (False, error)
         db = SessionLocal()
         try:
             upd = db.query(ContractUpdate).filter(ContractUpdate.id == (update_id or 0)).first()
@@ -95,23 +116,22 @@ def _complete_returned_update_blocking(
         return (False, str(e))
 
 
-def contract_updates():
+async def contract_updates():
     # Current user (for My Role column)
     current_user_id = None
     current_user_role = None
     try:
         current_username = app.storage.user.get("username", None) if app.storage.user else None
         if current_username:
-            db_user = SessionLocal()
-            try:
-                u = db_user.query(User).filter(User.email == current_username).first()
+            def lookup_current_user(db):
+                nonlocal current_user_id, current_user_role
+                u = db.query(User).filter(User.email == current_username).first()
                 if not u:
-                    u = db_user.query(User).filter(User.email.ilike(f"%{current_username}%")).first()
+                    u = db.query(User).filter(User.email.ilike(f"%{current_username}%")).first()
                 if u:
                     current_user_id = u.id
                     current_user_role = u.role.value if hasattr(u.role, "value") else str(u.role)
-            finally:
-                db_user.close()
+            await run_db(lookup_current_user)
     except Exception as e:
         print(f"Error resolving current user for contract_updates: {e}")
 
@@ -447,10 +467,10 @@ def contract_updates():
     # Fetch contract updates from API (or use mock as fallback)
     contract_rows = []
     
-    def reload_contract_updates():
+    async def reload_contract_updates():
         """Reload contract updates from database"""
         nonlocal contract_rows
-        new_rows = load_data_sync()
+        new_rows = await run_db(fetch_contract_update_rows)
         if new_rows:
             contract_rows = new_rows
             # Update filter options with new data
@@ -473,12 +493,11 @@ def contract_updates():
             apply_filters()
     
     # Fetch contract updates directly from database (like active_contracts.py)
-    def load_data_sync():
+    def fetch_contract_update_rows(db):
         """
         Load contract updates directly from the database.
         This avoids HTTP requests and circular dependencies.
         """
-        db = SessionLocal()
         try:
             # Use eager loading to prevent N+1 queries
             query = db.query(ContractUpdate).options(
@@ -649,8 +668,6 @@ def contract_updates():
             import traceback
             traceback.print_exc()
             return []
-        finally:
-            db.close()
     
     # Start with empty data - will be loaded asynchronously
     contract_rows = []
@@ -805,13 +822,13 @@ def contract_updates():
         ui.button("Generate", icon="description", on_click=lambda: open_generate_dialog()).props('color=primary').classes('ml-4 mt-4')
         
         # Function to load data asynchronously and update UI
-        def load_data_and_update():
+        async def load_data_and_update():
             """Load data from database and update the table"""
             nonlocal contract_rows, loading_label
             
             try:
                 print("Loading contract updates from database...")
-                new_rows = load_data_sync()
+                new_rows = await run_db(fetch_contract_update_rows)
                 print(f"Received {len(new_rows) if new_rows else 0} rows from database")
                 
                 if new_rows and len(new_rows) > 0:
@@ -1158,7 +1175,7 @@ def contract_updates():
                     ui.label("Completing…")
                 loading_row.set_visibility(False)
 
-                def do_save():
+                async def do_save():
                     """Save changes without changing status (manager, returned only)."""
                     if status_raw != ContractUpdateStatus.RETURNED.value or current_user_role == UserRole.CONTRACT_ADMIN.value:
                         return
@@ -1196,7 +1213,7 @@ def contract_updates():
                             upd.updated_at = datetime.utcnow()
                             db3.commit()
                             ui.notify("Changes saved. Status remains Returned.", type="positive")
-                            reload_contract_updates()
+                            await reload_contract_updates()
                             apply_filters()
                         finally:
                             db3.close()
@@ -1204,7 +1221,7 @@ def contract_updates():
                         ui.notify(f"Error saving: {e}", type="negative")
                     contract_decision_dialog.close()
 
-                def do_send_back():
+                async def do_send_back():
                     """Send back: admin changes status from Review to Returned."""
                     if status_raw != ContractUpdateStatus.PENDING_REVIEW.value or current_user_role != UserRole.CONTRACT_ADMIN.value:
                         return
@@ -1234,7 +1251,7 @@ def contract_updates():
                             upd.updated_at = datetime.utcnow()
                             db3.commit()
                             ui.notify("Sent back to Contract Manager. Status is now Returned.", type="info")
-                            reload_contract_updates()
+                            await reload_contract_updates()
                             apply_filters()
                             if current_tab["value"] == "returned":
                                 switch_tab("returned")
@@ -1244,7 +1261,7 @@ def contract_updates():
                         ui.notify(f"Error sending back: {e}", type="negative")
                     contract_decision_dialog.close()
 
-                def do_complete():
+                async def do_complete():
                     status_raw = (selected_contract.get("status_raw", "") or selected_contract.get("status", "") or "").strip().lower()
                     log.info("Contract Updates Complete clicked: status_raw=%r current_user_role=%s update_id=%s contract_db_id=%s",
                              status_raw, current_user_role, selected_contract.get("update_id"), selected_contract.get("contract_db_id") or selected_contract.get("id"))
@@ -1307,7 +1324,7 @@ def contract_updates():
                                     if result[0]:
                                         ui.notify("Contract resubmitted for review. It has been routed to Contract Admin.", type="positive")
                                         try:
-                                            reload_contract_updates()
+                                            await reload_contract_updates()
                                             apply_filters()
                                         except Exception as e:
                                             log.warning("reload/apply_filters after returned complete: %s", e)
@@ -1367,18 +1384,20 @@ def contract_updates():
                             tname = (term_doc_name_input.value or "").strip()
                             tdate = (term_doc_date_input.value or "").strip()
                             try:
-                                with httpx.Client(timeout=30.0) as client:
-                                    r = client.post(
-                                        f"http://localhost:8000/api/v1/contracts/{contract_db_id}/termination-documents",
-                                        data={"document_name": tname, "document_date": tdate},
-                                        files={"file": (term_doc_upload_ref["name"] or "document.pdf", term_doc_upload_ref["content"], "application/pdf")},
-                                    )
-                                if r.status_code not in (200, 201):
-                                    ui.notify(r.json().get("detail", "Failed to store termination document"), type="negative")
-                                    return
+                                error = await run_db(
+                                    _store_termination_document,
+                                    contract_db_id,
+                                    term_doc_upload_ref["content"],
+                                    term_doc_upload_ref["name"],
+                                    tname,
+                                    tdate,
+                                )
                             except Exception as e:
                                 ui.notify(f"Error storing termination document: {e}", type="negative")
                                 return
+                            if error:
+                                ui.notify(error, type="negative")
+                                return
                         db3 = SessionLocal()
                         try:
                             upd = db3.query(ContractUpdate).filter(ContractUpdate.id == (update_id or 0)).first()
@@ -1419,7 +1438,7 @@ def contract_updates():
                             upd.updated_at = datetime.utcnow()
                             db3.commit()
                             ui.notify("Review completed", type="positive")
-                            reload_contract_updates()
+                            await reload_contract_updates()
                             apply_filters()
                             if current_tab['value'] == 'returned':
                                 switch_tab('returned')
@@ -1556,14 +1575,9 @@ def contract_updates():
                 
                 dialog.open()
         
-        def generate_excel_report(start_date_str, end_date_str, dialog):
+        async def generate_excel_report(start_date_str, end_date_str, dialog):
             """Generate Excel report for contract updates"""
             try:
-                if not PANDAS_AVAILABLE:
-                    ui.notify("Excel export requires pandas library. Please install it: pip install pandas openpyxl", type="negative")
-                    dialog.close()
-                    return
-                
                 if not contract_rows:
                     ui.notify("No contract updates available for export", type="warning")
                     dialog.close()
@@ -1583,48 +1597,12 @@ def contract_updates():
                         "Response Date": contract.get('response_date', ''),
                     })
                 
-                # Create DataFrame
-                df = pd.DataFrame(report_data)
-                
-                # Create Excel file in memory
-                output = io.BytesIO()
-                with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                    df.to_excel(writer, index=False, sheet_name='Contract Updates')
-                    
-                    # Get the worksheet
-                    worksheet = writer.sheets['Contract Updates']
-                    
-                    # Auto-adjust column widths
-                    for column in worksheet.columns:
-                        max_length = 0
-                        column_letter = column[0].column_letter
-                        for cell in column:
-                            try:
-                                if len(str(cell.value)) > max_length:
-                                    max_length = len(str(cell.value))
-                            except (AttributeError, TypeError):
-                                pass
-                        adjusted_width = min(max_length + 2, 50)
-                        worksheet.column_dimensions[column_letter].width = adjusted_width
-                
-                output.seek(0)
-                
-                # Convert to base64 for download
-                excel_data = output.getvalue()
-                b64_data = base64.b64encode(excel_data).decode()
-                
                 # Generate filename
                 filename = f"Contract_Updates_Report_{start_date_str}_to_{end_date_str}.xlsx"
                 
-                # Trigger download using JavaScript
-                ui.run_javascript(f'''
-                    const link = document.createElement('a');
-                    link.href = 'data:application/vnd.openxmlformats-officedocument.spreadsheetml.sheet;base64,{b64_data}';
-                    link.download = '{filename}';
-                    document.body.appendChild(link);
-                    link.click();
-                    document.body.removeChild(link);
-                ''')
+                # Build the workbook in a report worker process; the browser downloads it when ready
+                if not await export_report(filename, 'Contract Updates', report_data):
+                    return
                 
                 ui.notify(f"Report generated successfully! {len(contract_rows)} contract(s) exported.", type="positive")
                 dialog.close()
@@ -1731,7 +1709,7 @@ def contract_updates():
                 
                 edit_dialog.open()
         
-        def save_contract_changes(original_row, new_data, dialog):
+        async def save_contract_changes(original_row, new_data, dialog):
             """Save changes to contract"""
             try:
                 update_id = original_row.get('update_id') or original_row.get('id')
@@ -1764,7 +1742,7 @@ def contract_updates():
                         ui.notify(f"Changes saved for contract {original_row['contract_id']}", type="positive")
                         dialog.close()
                         # Reload data
-                        reload_contract_updates()
+                        await reload_contract_updates()
                         apply_filters()
                         # Refresh tab if we're on returned contracts tab
                         if current_tab['value'] == 'returned':
@@ -1797,7 +1775,7 @@ def contract_updates():
                 
                 dialog.open()
         
-        def confirm_complete(row, dialog):
+        async def confirm_complete(row, dialog):
             """Confirm completion - process task and route to next workflow step"""
             try:
                 update_id = row.get('update_id') or row.get('id')
@@ -1828,7 +1806,7 @@ def contract_updates():
                         ui.notify(message, type="positive")
                         dialog.close()
                         # Reload data
-                        reload_contract_updates()
+                        await reload_contract_updates()
                         apply_filters()
                         # Refresh tab if we're on returned contracts tab
                         if current_tab['value'] == 'returned':
@@ -1892,11 +1870,6 @@ def contract_updates():
                 
                 actions_dialog.open()
         
-        # Store the handler function in a way that can be accessed from JavaScript
-        # We'll use ui.run_javascript to bridge the gap
-        # For now, let's use a simpler approach: make the Response button open the response dialog
-        # which already has Edit, Complete, and Send Back buttons
-        
         # Update view_response to include action buttons and previous response info
         def view_response_with_actions(row):
             """Open response dialog with action buttons and previous response information"""
@@ -1993,9 +1966,8 @@ def contract_updates():
         view_response = view_response_with_actions
         
         # Add slot for actions column - "Response" button
-        # Since NiceGUI table slots have limitations with Python callbacks,
-        # we'll use a simpler approach: the button opens the response dialog
-        # which contains all action options (View Response, Edit, Complete, Send Back)
+        # The button emits a table event handled directly in Python; the
+        # actions dialog contains all options (View Response, Edit, Complete, Send Back)
         contracts_table.add_slot('body-cell-actions', '''
             <q-td :props="props">
                 <q-btn 
@@ -2003,60 +1975,20 @@ def contract_updates():
                     color="primary" 
                     size="sm" 
                     icon="description"
-                    @click="() => {
-                        const contractId = props.row.contract_id;
-                        // Store in window for Python to access
-                        window.pendingContractAction = contractId;
-                        // Trigger event
-                        window.dispatchEvent(new Event('contractActionPending'));
-                    }"
+                    @click="$parent.$emit('response_click', props.row)"
                 />
             </q-td>
         ''')
         
-        # Initialize JavaScript bridge for contract actions
-        ui.add_head_html('''
-            <script>
-                window.pendingContractAction = null;
-                window.contractActionHandlers = [];
-            </script>
-        ''')
-        
-        # Set up event listener using timer to check for pending actions
-        # Note: This uses a polling mechanism as NiceGUI table slots don't easily support
-        # direct Python callbacks. In production, you might want to use a different approach
-        # such as custom table implementation or API endpoints.
-        pending_contract_ids = []
+        def on_response_click(e) -> None:
+            row = e.args[0] if isinstance(e.args, (list, tuple)) and len(e.args) > 0 else e.args
+            if not isinstance(row, dict) or not row.get("contract_id"):
+                ui.notify("Could not open actions: missing contract data", type="negative")
+                return
+            open_actions_for_contract(row["contract_id"])
         
-        def process_pending_actions():
-            """Process any pending contract actions"""
-            try:
-                # Check JavaScript for pending actions
-                js_code = 'window.pendingContractAction || null'
-                result = ui.run_javascript(js_code)
-                
-                # Handle the result (might be async, so we check if it's a string or has value)
-                contract_id = None
-                if isinstance(result, str) and result != 'null':
-                    contract_id = result
-                elif hasattr(result, 'value') and result.value and result.value != 'null':
-                    contract_id = result.value
-                
-                if contract_id and contract_id not in pending_contract_ids:
-                    pending_contract_ids.append(contract_id)
-                    # Clear the JavaScript variable
-                    ui.run_javascript('window.pendingContractAction = null')
-                    # Open the actions dialog
-                    open_actions_for_contract(contract_id)
-                    # Remove from pending list after a delay
-                    def remove_from_pending():
-                        if contract_id in pending_contract_ids:
-                            pending_contract_ids.remove(contract_id)
-                    ui.timer(1.0, remove_from_pending, once=True)
-            except Exception:
-                # Silently handle errors - the timer will keep checking
-                pass
+        contracts_table.on("response_click", on_response_click)
         
-        # Check every 500ms for pending actions
-        ui.timer(0.5, process_pending_actions)
+        # Refresh the table when another user changes a contract update (pushed, no polling)
+        live_updates([CONTRACT_UPDATES_TOPIC], reload_contract_updates)
 
@@ -0,0 +1,83 @@
+"""
+Document and report file routes for the Web UI.
+
+Pages link to these URLs instead of pushing file contents over the NiceGUI
+websocket. They are registered on the NiceGUI app so the browser session
+(app.storage.user) authenticates them; API clients use the
+/api/v1/.../download endpoints with a bearer token.
+"""
+from fastapi import HTTPException, Request, status
+from nicegui import app
+
+from app.core.downloads import document_file_response
+from app.db.database import run_db
+from app.services.contract_service import ContractService
+from app.services.vendor_service import VendorService
+from app.services.report_jobs import ReportJobStatus, report_jobs
+
+
+def contract_document_url(contract_id: int, doc_id: int, inline: bool = False) -> str:
+    return f"/files/contracts/{contract_id}/documents/{doc_id}" + ("?inline=true" if inline else "")
+
+
+def termination_document_url(contract_id: int, doc_id: int, inline: bool = False) -> str:
+    return f"/files/contracts/{contract_id}/termination-documents/{doc_id}" + ("?inline=true" if inline else "")
+
+
+def vendor_document_url(vendor_id: int, doc_id: int, inline: bool = False) -> str:
+    return f"/files/vendors/{vendor_id}/documents/{doc_id}" + ("?inline=true" if inline else "")
+
+
+def report_file_url(job_id: str) -> str:
+    return f"/files/reports/{job_id}"
+
+
+def _require_login() -> None:
+    if not app.storage.user.get("logged_in"):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+
+
+def _not_found(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=detail)
+
+
+@app.get("/files/contracts/{contract_id}/documents/{doc_id}")
+async def contract_document_file(contract_id: int, doc_id: int, request: Request, inline: bool = False):
+    _require_login()
+    doc = await run_db(lambda db: ContractService(db).get_contract_document(contract_id, doc_id))
+    if not doc:
+        raise _not_found("Contract document not found")
+    return document_file_response(request, doc.file_path, doc.file_name, doc.content_type, inline=inline)
+
+
+@app.get("/files/contracts/{contract_id}/termination-documents/{doc_id}")
+async def termination_document_file(contract_id: int, doc_id: int, request: Request, inline: bool = False):
+    _require_login()
+    doc = await run_db(lambda db: ContractService(db).get_termination_document(contract_id, doc_id))
+    if not doc:
+        raise _not_found("Termination document not found")
+    return document_file_response(request, doc.file_path, doc.file_name, doc.content_type, inline=inline)
+
+
+@app.get("/files/vendors/{vendor_id}/documents/{doc_id}")
+async def vendor_document_file(vendor_id: int, doc_id: int, request: Request, inline: bool = False):
+    _require_login()
+    doc = await run_db(lambda db: VendorService(db).get_vendor_document(vendor_id, doc_id))
+    if not doc:
+        raise _not_found("Vendor document not found")
+    return document_file_response(request, doc.file_path, doc.file_name, doc.content_type, inline=inline)
+
+
+@app.get("/files/reports/{job_id}")
+async def report_file(job_id: str, request: Request):
+    _require_login()
+    job = report_jobs.get(job_id)
+    # Reports are only served to the user who generated them
+    if not job or job.status != ReportJobStatus.DONE or job.owner_id != app.storage.user.get("user_id"):
+        raise _not_found("Report not found")
+    return document_file_response(
+        request,
+        job.file_path,
+        job.filename,
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    )
@@ -1,19 +1,13 @@
 from datetime import datetime, timedelta, date
 from nicegui import ui
-from app.db.database import SessionLocal
+from app.db.database import run_db
 from app.utils.navigation import get_dashboard_url
 from app.components.breadcrumb import breadcrumb
+from app.components.report_export import export_report
 from app.models.vendor import VendorStatusType
-import io
-import base64
-try:
-    import pandas as pd
-    PANDAS_AVAILABLE = True
-except ImportError:
-    PANDAS_AVAILABLE = False
 
 
-def due_diligence_report():
+async def due_diligence_report():
     # Breadcrumb navigation
     with ui.row().classes("max-w-6xl mx-auto mt-4"):
         breadcrumb([("Home", get_dashboard_url()), ("Due Diligence Report", None)])
@@ -24,11 +18,10 @@ def due_diligence_report():
     
     
     # Fetch active vendors with due diligence information
-    def fetch_due_diligence_vendors():
+    def fetch_due_diligence_vendors(db):
         """
         Fetches active vendors with their due diligence information and associated contract managers/backups.
         """
-        db = SessionLocal()
         try:
             # Get all active vendors (limit 1000 for display)
             # Need to load contracts relationship with owners
@@ -125,8 +118,6 @@ def due_diligence_report():
             import traceback
             traceback.print_exc()
             return []
-        finally:
-            db.close()
 
     vendor_columns = [
         {
@@ -183,7 +174,7 @@ def due_diligence_report():
         "headerClasses": "bg-[#144c8e] text-white",
     }
 
-    vendor_rows = fetch_due_diligence_vendors()
+    vendor_rows = await run_db(fetch_due_diligence_vendors)
     
     # Main container
     with ui.element("div").classes("max-w-6xl mt-8 mx-auto w-full"):
@@ -304,14 +295,9 @@ def due_diligence_report():
                 
                 dialog.open()
         
-        def generate_excel_report(dialog):
+        async def generate_excel_report(dialog):
             """Generate Excel report for vendors due diligence"""
             try:
-                if not PANDAS_AVAILABLE:
-                    ui.notify("Excel export requires pandas library. Please install it: pip install pandas openpyxl", type="negative")
-                    dialog.close()
-                    return
-                
                 if not vendor_rows:
                     ui.notify("No vendors available for export", type="warning")
                     dialog.close()
@@ -330,49 +316,13 @@ def due_diligence_report():
                         "Contract Backups": vendor.get('contract_backups', 'N/A'),
                     })
                 
-                # Create DataFrame
-                df = pd.DataFrame(report_data)
-                
-                # Create Excel file in memory
-                output = io.BytesIO()
-                with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                    df.to_excel(writer, index=False, sheet_name='Due Diligence Report')
-                    
-                    # Get the worksheet
-                    worksheet = writer.sheets['Due Diligence Report']
-                    
-                    # Auto-adjust column widths
-                    for column in worksheet.columns:
-                        max_length = 0
-                        column_letter = column[0].column_letter
-                        for cell in column:
-                            try:
-                                if len(str(cell.value)) > max_length:
-                                    max_length = len(str(cell.value))
-                            except (AttributeError, TypeError):
-                                pass
-                        adjusted_width = min(max_length + 2, 50)
-                        worksheet.column_dimensions[column_letter].width = adjusted_width
-                
-                output.seek(0)
-                
-                # Convert to base64 for download
-                excel_data = output.getvalue()
-                b64_data = base64.b64encode(excel_data).decode()
-                
                 # Generate filename
                 today = datetime.now().strftime("%Y-%m-%d")
                 filename = f"Due_Diligence_Report_{today}.xlsx"
                 
-                # Trigger download using JavaScript
-                ui.run_javascript(f'''
-                    const link = document.createElement('a');
-                    link.href = 'data:application/vnd.openxmlformats-officedocument.spreadsheetml.sheet;base64,{b64_data}';
-                    link.download = '{filename}';
-                    document.body.appendChild(link);
-                    link.click();
-                    document.body.removeChild(link);
-                ''')
+                # Build the workbook in a report worker process; the browser downloads it when ready
+                if not await export_report(filename, 'Due Diligence Report', report_data):
+                    return
                 
                 ui.notify(f"Report generated successfully! {len(vendor_rows)} vendor(s) exported.", type="positive")
                 dialog.close()
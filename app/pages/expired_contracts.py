@@ -1,53 +1,47 @@
 from datetime import datetime, timedelta, date
 from nicegui import ui, app
-from app.db.database import SessionLocal
+from app.db.database import run_db
 from app.utils.navigation import get_dashboard_url
 from app.components.breadcrumb import breadcrumb
+from app.components.report_export import export_report
 from app.services.contract_service import ContractService
+from app.components.server_table import ServerTable
 from app.models.contract import ContractStatusType, User
-import io
-import base64
-try:
-    import pandas as pd
-    PANDAS_AVAILABLE = True
-except ImportError:
-    PANDAS_AVAILABLE = False
 
 
-def expired_contracts():
+async def expired_contracts():
     # Get current logged-in user - use stored user_id first (from login)
     current_user_id = app.storage.user.get('user_id', None)
     
     # If user_id is not stored, try to look it up by username
     if not current_user_id:
         current_username = app.storage.user.get('username', None)
+        def lookup_current_user(db):
+            nonlocal current_user_id
+            if current_username:
+                # Try multiple matching strategies
+                current_user = db.query(User).filter(User.email == current_username).first()
+                if not current_user:
+                    current_user = db.query(User).filter(User.email.ilike(f"%{current_username}%")).first()
+                if not current_user:
+                    current_user = db.query(User).filter(User.first_name.ilike(f"%{current_username}%")).first()
+                if not current_user:
+                    current_user = db.query(User).filter(User.last_name.ilike(f"%{current_username}%")).first()
+                if not current_user and ' ' in current_username:
+                    parts = current_username.split()
+                    if len(parts) >= 2:
+                        current_user = db.query(User).filter(
+                            User.first_name.ilike(f"%{parts[0]}%"),
+                            User.last_name.ilike(f"%{parts[-1]}%")
+                        ).first()
+                
+                if current_user:
+                    current_user_id = current_user.id
+                    print(f"Found current user: {current_user.first_name} {current_user.last_name} (ID: {current_user_id})")
+                else:
+                    print(f"Could not find user matching: {current_username}")
         try:
-            db = SessionLocal()
-            try:
-                if current_username:
-                    # Try multiple matching strategies
-                    current_user = db.query(User).filter(User.email == current_username).first()
-                    if not current_user:
-                        current_user = db.query(User).filter(User.email.ilike(f"%{current_username}%")).first()
-                    if not current_user:
-                        current_user = db.query(User).filter(User.first_name.ilike(f"%{current_username}%")).first()
-                    if not current_user:
-                        current_user = db.query(User).filter(User.last_name.ilike(f"%{current_username}%")).first()
-                    if not current_user and ' ' in current_username:
-                        parts = current_username.split()
-                        if len(parts) >= 2:
-                            current_user = db.query(User).filter(
-                                User.first_name.ilike(f"%{parts[0]}%"),
-                                User.last_name.ilike(f"%{parts[-1]}%")
-                            ).first()
-                    
-                    if current_user:
-                        current_user_id = current_user.id
-                        print(f"Found current user: {current_user.first_name} {current_user.last_name} (ID: {current_user_id})")
-                    else:
-                        print(f"Could not find user matching: {current_username}")
-            finally:
-                db.close()
+            await run_db(lookup_current_user)
         except Exception as e:
             print(f"Error fetching current user: {e}")
             import traceback
@@ -59,39 +53,29 @@ def expired_contracts():
     with ui.row().classes("max-w-6xl mx-auto mt-4"):
         breadcrumb([("Home", get_dashboard_url()), ("Expired Contracts", None)])
     
-    # Global variables for table and data
-    contracts_table = None
-    contract_rows = []
-    
-    
-    # Fetch expired contracts from database
-    def fetch_expired_contracts():
+    # Fetch one page of expired contracts from database
+    def fetch_expired_contracts_page(db, search=None, **page_params):
         """
-        Fetches expired contracts directly from the database service.
+        Fetches one page of expired contracts directly from the database service.
         This avoids HTTP requests and circular dependencies.
+        Search, sorting and paging are done in SQL.
+        Returns: (rows, total_count, next_cursor)
         """
-        db = SessionLocal()
         try:
             contract_service = ContractService(db)
             
-            # Get expired contracts only (limit 1000 for display)
-            contracts, _ = contract_service.search_and_filter_contracts(
-                skip=0,
-                limit=1000,
+            contracts, total_count, next_cursor = contract_service.get_contracts_page(
                 status=ContractStatusType.EXPIRED,
-                search=None,
-                contract_type=None,
-                department=None,
-                owner_id=None,
-                vendor_id=None,
-                expiring_soon=None
+                search=search,
+                user_id=current_user_id,
+                **page_params
             )
             
-            print(f"Found {len(contracts)} expired contracts from database")
-            
             if not contracts:
-                print("No expired contracts found in database")
-                return []
+                return [], total_count, None
+            
+            # Simulation mode users are the same for every row, load them once
+            sim_users = [] if current_user_id else db.query(User).order_by(User.id).limit(3).all()
             
             # Map contract data to table row format
             rows = []
@@ -170,7 +154,7 @@ def expired_contracts():
                         my_role = "Owner"
                 else:
                     # Simulation mode: Cycle through users to show different roles
-                    all_users = db.query(User).order_by(User.id).limit(3).all()
+                    all_users = sim_users
                     if all_users:
                         user_index = (contract.id - 1) % len(all_users)
                         sim_user_id = all_users[user_index].id
@@ -199,15 +183,13 @@ def expired_contracts():
                     "email_notifications": email_notification_count,
                 })
             
-            return rows
+            return rows, total_count, next_cursor
             
         except Exception as e:
             print(f"Error fetching expired contracts: {str(e)}")
             import traceback
             traceback.print_exc()
-            return []
-        finally:
-            db.close()
+            return [], 0, None
 
     contract_columns = [
         {
@@ -265,7 +247,10 @@ def expired_contracts():
         "headerClasses": "bg-[#144c8e] text-white",
     }
 
-    contract_rows = fetch_expired_contracts()
+    async def fetch_page(**page_params):
+        """Fetch one table page without blocking the event loop"""
+        search = (search_input.value or "").strip() or None
+        return await run_db(fetch_expired_contracts_page, search=search, **page_params)
     
     # Main container
     with ui.element("div").classes("max-w-6xl mt-8 mx-auto w-full"):
@@ -281,54 +266,44 @@ def expired_contracts():
                 "text-sm text-gray-500"
             )
         
-        # Define search functions first
-        def filter_contracts():
-            # Show all contracts regardless of role
-            base_rows = contract_rows
-            
-            search_term = (search_input.value or "").lower()
-            if not search_term:
-                contracts_table.rows = base_rows
-            else:
-                filtered = [
-                    row for row in base_rows
-                    if search_term in (row['contract_id'] or "").lower()
-                    or search_term in (row['vendor_name'] or "").lower()
-                    or search_term in (row['contract_type'] or "").lower()
-                    or search_term in (row['description'] or "").lower()
-                    or search_term in (row['my_role'] or "").lower()
-                ]
-                contracts_table.rows = filtered
-            contracts_table.update()
+        # Define search functions first (search runs server-side)
+        async def filter_contracts():
+            await contracts_server_table.refresh()
         
-        def clear_search():
+        async def clear_search():
             search_input.value = ""
-            filter_contracts()  # Use filter_contracts to respect current role
+            await filter_contracts()
         
         # Search input for filtering contracts (above the table)
         with ui.row().classes('w-full ml-4 mr-4 mb-6 gap-2 px-2'):
-            search_input = ui.input(placeholder='Search by Contract ID, Vendor, Type, Description, or My Role...').classes(
+            search_input = ui.input(placeholder='Search by Contract ID, Vendor, Type, Description, or Manager...').classes(
                 'flex-1'
-            ).props('outlined dense clearable')
+            ).props('outlined dense clearable debounce=400')
             with search_input.add_slot('prepend'):
                 ui.icon('search').classes('text-gray-400')
             ui.button(icon='search', on_click=filter_contracts).props('color=primary')
             ui.button(icon='clear', on_click=clear_search).props('color=secondary')
         
-        # Create table after search bar (showing all contracts)
-        initial_rows = contract_rows
-        contracts_table = ui.table(
+        # Create table after search bar (rows are requested page by page)
+        contracts_server_table = ServerTable(
             columns=contract_columns,
             column_defaults=contract_columns_defaults,
-            rows=initial_rows,
-            pagination=10,
+            fetch_page=fetch_page,
+            rows_per_page=10,
+            sort_by="expiration_date",
+            descending=True,
             row_key="contract_id"
-        ).classes("w-full").props("flat bordered").classes(
+        )
+        contracts_table = contracts_server_table.table
+        contracts_table.classes("w-full").props("flat bordered").classes(
             "contracts-table shadow-lg rounded-lg overflow-hidden"
         )
         
         search_input.on_value_change(filter_contracts)
         
+        # Initial fetch
+        await contracts_server_table.load()
+        
         # Generate button (moved from header to after table)
         ui.button("Generate", icon="description", on_click=lambda: open_generate_dialog()).props('color=primary').classes('ml-4 mt-4')
         
@@ -410,14 +385,9 @@ def expired_contracts():
                 
                 dialog.open()
         
-        def generate_excel_report(start_date_str, end_date_str, dialog):
+        async def generate_excel_report(start_date_str, end_date_str, dialog):
             """Generate Excel report for expired contracts within date range"""
             try:
-                if not PANDAS_AVAILABLE:
-                    ui.notify("Excel export requires pandas library. Please install it: pip install pandas openpyxl", type="negative")
-                    dialog.close()
-                    return
-                
                 # Parse dates
                 start_date = datetime.strptime(start_date_str, "%Y-%m-%d").date()
                 end_date = datetime.strptime(end_date_str, "%Y-%m-%d").date()
@@ -426,20 +396,11 @@ def expired_contracts():
                     ui.notify("Start date must be before end date", type="negative")
                     return
                 
-                # Filter contracts by date range (end_date must be within range) and status must be Expired
-                filtered_contracts = []
-                for contract in contract_rows:
-                    # Check if contract has expiration date within range
-                    exp_date_str = contract.get('expiration_date', '')
-                    if exp_date_str and exp_date_str != 'N/A':
-                        try:
-                            exp_date = datetime.strptime(exp_date_str, "%Y-%m-%d").date()
-                            # Include contracts that expired within the date range
-                            if start_date <= exp_date <= end_date and contract.get('status') == 'Expired':
-                                filtered_contracts.append(contract)
-                        except ValueError:
-                            # Skip contracts with invalid date format
-                            continue
+                # Contracts that expired within the date range (filtered in SQL)
+                filtered_contracts = await contracts_server_table.fetch_all(
+                    end_date_from=start_date,
+                    end_date_to=end_date
+                )
                 
                 if not filtered_contracts:
                     ui.notify("No expired contracts found within the selected date range", type="warning")
@@ -463,48 +424,12 @@ def expired_contracts():
                         "Email Notifications": contract.get('email_notifications', 0),
                     })
                 
-                # Create DataFrame
-                df = pd.DataFrame(report_data)
-                
-                # Create Excel file in memory
-                output = io.BytesIO()
-                with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                    df.to_excel(writer, index=False, sheet_name='Expired Contracts')
-                    
-                    # Get the worksheet
-                    worksheet = writer.sheets['Expired Contracts']
-                    
-                    # Auto-adjust column widths
-                    for column in worksheet.columns:
-                        max_length = 0
-                        column_letter = column[0].column_letter
-                        for cell in column:
-                            try:
-                                if len(str(cell.value)) > max_length:
-                                    max_length = len(str(cell.value))
-                            except (AttributeError, TypeError):
-                                pass
-                        adjusted_width = min(max_length + 2, 50)
-                        worksheet.column_dimensions[column_letter].width = adjusted_width
-                
-                output.seek(0)
-                
-                # Convert to base64 for download
-                excel_data = output.getvalue()
-                b64_data = base64.b64encode(excel_data).decode()
-                
                 # Generate filename
                 filename = f"Expired_Contracts_Report_{start_date_str}_to_{end_date_str}.xlsx"
                 
-                # Trigger download using JavaScript
-                ui.run_javascript(f'''
-                    const link = document.createElement('a');
-                    link.href = 'data:application/vnd.openxmlformats-officedocument.spreadsheetml.sheet;base64,{b64_data}';
-                    link.download = '{filename}';
-                    document.body.appendChild(link);
-                    link.click();
-                    document.body.removeChild(link);
-                ''')
+                # Build the workbook in a report worker process; the browser downloads it when ready
+                if not await export_report(filename, 'Expired Contracts', report_data):
+                    return
                 
                 ui.notify(f"Report generated successfully! {len(filtered_contracts)} contract(s) exported.", type="positive")
                 dialog.close()
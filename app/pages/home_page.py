@@ -1,14 +1,18 @@
 
 from datetime import datetime, timedelta, date
 import asyncio
-import httpx
 
 import requests
+from fastapi import HTTPException
 from nicegui import ui, app, run
 from app.utils.vendor_lookup import get_vendor_id_by_name
 from app.components.breadcrumb import breadcrumb
-from app.db.database import SessionLocal
+from app.db.database import SessionLocal, run_db
 from app.models.contract import Contract, ContractUpdate, ContractUpdateStatus, User, ContractStatusType, ContractTerminationType
+from app.services.async_service import AsyncContractService
+from app.services.contract_service import ContractService
+from app.services.vendor_service import VendorService
+from sqlalchemy import or_
 from sqlalchemy.orm import joinedload
 
 
@@ -53,21 +57,18 @@ def _complete_requiring_attention_blocking(
                 if term_doc_file_content:
                     if not (term_doc_name and term_doc_date):
                         return (False, "Document name and Issue Date are required for the termination document.")
-                    with httpx.Client(timeout=90.0) as client:
-                        r = client.post(
-                            f"http://localhost:8000/api/v1/contracts/{contract_db_id}/termination-documents",
-                            data={"document_name": term_doc_name.strip(), "document_date": term_doc_date.strip()},
-                            files={"file": (term_doc_file_name or "document.pdf", term_doc_file_content, "application/pdf")},
+                    try:
+                        ContractService(db).store_termination_document_bytes(
+                            contract_db_id,
+                            term_doc_file_content,
+                            term_doc_file_name or "document.pdf",
+                            term_doc_name.strip(),
+                            datetime.fromisoformat(term_doc_date.strip()).date(),
                         )
-                    if r.status_code not in (200, 201):
-                        try:
-                            body = r.json()
-                            detail = body.get("detail", "Failed to store termination document")
-                            if isinstance(detail, list):
-                                detail = "; ".join(str(x.get("msg", x)) for x in detail) if detail else "Request failed"
-                            return (False, str(detail))
-                        except Exception:
-                            return (False, r.text or f"Request failed (HTTP {r.status_code})")
+                    except HTTPException as e:
+                        return (False, str(e.detail))
+                    except ValueError as e:
+                        return (False, str(e))
                 upd.has_document = bool(term_doc_file_content)
             db.commit()
             return (True, None)
@@ -77,7 +78,90 @@ def _complete_requiring_attention_blocking(
         return (False, str(e))
 
 
-def home_page():
+def _fetch_home_counts(db) -> dict:
+    """Dashboard counters for the home page. Each counter falls back to 0 on error."""
+    contract_service = ContractService(db)
+    vendor_service = VendorService(db)
+    counts = {}
+
+    def count(name, query):
+        try:
+            counts[name] = query()
+        except Exception as e:
+            db.rollback()
+            print(f"Error fetching {name.replace('_', ' ')}: {e}")
+            counts[name] = 0
+
+    def pending_documents():
+        # No docs + awaiting termination doc, merged and deduped
+        contracts_no_docs, _ = contract_service.get_contracts_with_no_documents(skip=0, limit=1000)
+        contracts_awaiting_term, _ = contract_service.get_contracts_awaiting_termination_document(skip=0, limit=1000)
+        seen_ids = {c.id for c in contracts_no_docs}
+        seen_ids.update(c.id for c in contracts_awaiting_term)
+        return len(seen_ids)
+
+    def pending_reviews():
+        # Same logic as pending_reviews page: PENDING_REVIEW + expiring within 90 days
+        contracts_pending, _ = contract_service.get_contracts_pending_admin_review(skip=0, limit=1000)
+        ids_pending = {c.id for c in contracts_pending}
+        contracts_expiring, _ = contract_service.get_contracts_needing_review(
+            skip=0, limit=1000, days_ahead=90
+        )
+        ids_in_other_workflows = {
+            r[0] for r in db.query(ContractUpdate.contract_id)
+            .filter(
+                or_(
+                    ContractUpdate.status.in_([
+                        ContractUpdateStatus.RETURNED,
+                        ContractUpdateStatus.UPDATED,
+                        ContractUpdateStatus.DRAFT,
+                    ]),
+                    (ContractUpdate.status == ContractUpdateStatus.PENDING_REVIEW)
+                    & (ContractUpdate.returned_date.isnot(None)),
+                )
+            )
+            .distinct()
+            .all()
+        }
+        contracts_expiring_only = [
+            c for c in contracts_expiring
+            if c.id not in ids_pending and c.id not in ids_in_other_workflows
+        ]
+        return len(contracts_pending) + len(contracts_expiring_only)
+
+    status_counts = {}
+
+    def contracts_with_status(status):
+        # Constant-time read from the dashboard_stats read model
+        if not status_counts:
+            status_counts.update(contract_service.get_contract_status_counts())
+        if status is None:
+            return sum(status_counts.values())
+        return status_counts.get(status.value, 0)
+
+    count("vendor_count", lambda: vendor_service.get_vendors_with_filters(skip=0, limit=1)[1])
+    count("active_contracts_count", lambda: contracts_with_status(ContractStatusType.ACTIVE))
+    count(
+        "contracts_requiring_attention_count",
+        lambda: contract_service.get_contracts_requiring_attention(skip=0, limit=1, days_ahead=30)[1],
+    )
+    count("pending_documents_count", pending_documents)
+    count("pending_reviews_count", pending_reviews)
+    # ContractUpdate records not completed
+    count(
+        "contract_updates_count",
+        lambda: db.query(ContractUpdate).filter(ContractUpdate.status != ContractUpdateStatus.COMPLETED).count(),
+    )
+    # Active users
+    count("contract_managers_count", lambda: db.query(User).filter(User.is_active == True).count())
+    count("expired_contracts_count", lambda: contracts_with_status(ContractStatusType.EXPIRED))
+    count("terminated_contracts_count", lambda: contracts_with_status(ContractStatusType.TERMINATED))
+    # Any status
+    count("all_contracts_count", lambda: contracts_with_status(None))
+    return counts
+
+
+async def home_page():
     # Breadcrumb navigation
     with ui.row().classes("max-w-7xl mx-auto mt-4"):
         breadcrumb([("Home", None)])
@@ -86,207 +170,18 @@ def home_page():
     contracts_table = None
     contract_rows = []
     
-    # Fetch vendor count from database
-    vendor_count = 0
-    try:
-        from app.db.database import SessionLocal
-        from app.services.vendor_service import VendorService
-        db = SessionLocal()
-        try:
-            vendor_service = VendorService(db)
-            _, vendor_count = vendor_service.get_vendors_with_filters(skip=0, limit=1, status_filter=None, search=None)
-        finally:
-            db.close()
-    except Exception as e:
-        print(f"Error fetching vendor count: {e}")
-        vendor_count = 0
-    
-    # Fetch active contracts count from database
-    active_contracts_count = 0
-    try:
-        from app.services.contract_service import ContractService
-        from app.models.contract import ContractStatusType
-        db = SessionLocal()
-        try:
-            contract_service = ContractService(db)
-            _, active_contracts_count = contract_service.search_and_filter_contracts(
-                skip=0,
-                limit=1,
-                status=ContractStatusType.ACTIVE,
-                search=None,
-                contract_type=None,
-                department=None,
-                owner_id=None,
-                vendor_id=None,
-                expiring_soon=None
-            )
-        finally:
-            db.close()
-    except Exception as e:
-        print(f"Error fetching active contracts count: {e}")
-        active_contracts_count = 0
-
-    # Fetch contracts requiring attention count (expiring soon or past due)
-    contracts_requiring_attention_count = 0
-    try:
-        from app.db.database import SessionLocal
-        from app.services.contract_service import ContractService
-        db = SessionLocal()
-        try:
-            contract_service = ContractService(db)
-            _, contracts_requiring_attention_count = contract_service.get_contracts_requiring_attention(
-                skip=0, limit=1, days_ahead=30
-            )
-        finally:
-            db.close()
-    except Exception as e:
-        print(f"Error fetching contracts requiring attention count: {e}")
-        contracts_requiring_attention_count = 0
-
-    # Fetch pending documents count (no docs + awaiting termination doc, merged and deduped)
-    pending_documents_count = 0
-    try:
-        db = SessionLocal()
-        try:
-            contract_service = ContractService(db)
-            contracts_no_docs, _ = contract_service.get_contracts_with_no_documents(skip=0, limit=1000)
-            contracts_awaiting_term, _ = contract_service.get_contracts_awaiting_termination_document(skip=0, limit=1000)
-            seen_ids = set()
-            for c in contracts_no_docs:
-                seen_ids.add(c.id)
-            for c in contracts_awaiting_term:
-                if c.id not in seen_ids:
-                    seen_ids.add(c.id)
-            pending_documents_count = len(seen_ids)
-        finally:
-            db.close()
-    except Exception as e:
-        print(f"Error fetching pending documents count: {e}")
-        pending_documents_count = 0
-
-    # Fetch pending reviews count (same logic as pending_reviews page: PENDING_REVIEW + expiring within 90 days)
-    pending_reviews_count = 0
-    try:
-        from sqlalchemy import or_
-        db = SessionLocal()
-        try:
-            contract_service = ContractService(db)
-            contracts_pending, _ = contract_service.get_contracts_pending_admin_review(skip=0, limit=1000)
-            ids_pending = {c.id for c in contracts_pending}
-            contracts_expiring, _ = contract_service.get_contracts_needing_review(
-                skip=0, limit=1000, days_ahead=90
-            )
-            ids_in_other_workflows = {
-                r[0] for r in db.query(ContractUpdate.contract_id)
-                .filter(
-                    or_(
-                        ContractUpdate.status.in_([
-                            ContractUpdateStatus.RETURNED,
-                            ContractUpdateStatus.UPDATED,
-                            ContractUpdateStatus.DRAFT,
-                        ]),
-                        (ContractUpdate.status == ContractUpdateStatus.PENDING_REVIEW)
-                        & (ContractUpdate.returned_date.isnot(None)),
-                    )
-                )
-                .distinct()
-                .all()
-            }
-            contracts_expiring_only = [
-                c for c in contracts_expiring
-                if c.id not in ids_pending and c.id not in ids_in_other_workflows
-            ]
-            pending_reviews_count = len(contracts_pending) + len(contracts_expiring_only)
-        finally:
-            db.close()
-    except Exception as e:
-        print(f"Error fetching pending reviews count: {e}")
-        pending_reviews_count = 0
-
-    # Fetch contract updates count (ContractUpdate records not completed)
-    contract_updates_count = 0
-    try:
-        db = SessionLocal()
-        try:
-            contract_updates_count = db.query(ContractUpdate).filter(
-                ContractUpdate.status != ContractUpdateStatus.COMPLETED
-            ).count()
-        finally:
-            db.close()
-    except Exception as e:
-        print(f"Error fetching contract updates count: {e}")
-        contract_updates_count = 0
-
-    # Fetch user/contract managers count (active users)
-    contract_managers_count = 0
-    try:
-        db = SessionLocal()
-        try:
-            contract_managers_count = db.query(User).filter(User.is_active == True).count()
-        finally:
-            db.close()
-    except Exception as e:
-        print(f"Error fetching contract managers count: {e}")
-        contract_managers_count = 0
-
-    # Fetch expired contracts count
-    expired_contracts_count = 0
-    try:
-        db = SessionLocal()
-        try:
-            contract_service = ContractService(db)
-            _, expired_contracts_count = contract_service.search_and_filter_contracts(
-                skip=0,
-                limit=1,
-                status=ContractStatusType.EXPIRED,
-                search=None,
-                contract_type=None,
-                department=None,
-                owner_id=None,
-                vendor_id=None,
-                expiring_soon=None,
-            )
-        finally:
-            db.close()
-    except Exception as e:
-        print(f"Error fetching expired contracts count: {e}")
-        expired_contracts_count = 0
-
-    # Fetch terminated contracts count
-    terminated_contracts_count = 0
-    try:
-        db = SessionLocal()
-        try:
-            contract_service = ContractService(db)
-            _, terminated_contracts_count = contract_service.get_terminated_contracts(skip=0, limit=1)
-        finally:
-            db.close()
-    except Exception as e:
-        print(f"Error fetching terminated contracts count: {e}")
-        terminated_contracts_count = 0
-
-    # Fetch all contracts count (any status)
-    all_contracts_count = 0
-    try:
-        db = SessionLocal()
-        try:
-            contract_service = ContractService(db)
-            _, all_contracts_count = contract_service.search_and_filter_contracts(
-                skip=0,
-                limit=1,
-                search=None,
-                status=None,
-                contract_type=None,
-                department=None,
-                owner_id=None,
-                vendor_id=None,
-                expiring_soon=None
-            )
-        finally:
-            db.close()
-    except Exception as e:
-        print(f"Error fetching all contracts count: {e}")
-        all_contracts_count = 0
+    # Fetch all dashboard counters in one session, off the event loop
+    counts = await run_db(_fetch_home_counts)
+    vendor_count = counts["vendor_count"]
+    active_contracts_count = counts["active_contracts_count"]
+    contracts_requiring_attention_count = counts["contracts_requiring_attention_count"]
+    pending_documents_count = counts["pending_documents_count"]
+    pending_reviews_count = counts["pending_reviews_count"]
+    contract_updates_count = counts["contract_updates_count"]
+    contract_managers_count = counts["contract_managers_count"]
+    expired_contracts_count = counts["expired_contracts_count"]
+    terminated_contracts_count = counts["terminated_contracts_count"]
+    all_contracts_count = counts["all_contracts_count"]
 
     # Function to show the contracts table
     def show_contracts_table():
@@ -539,64 +434,59 @@ def home_page():
     
     # ===== NEW SECTION: Contracts Requiring Attention =====
 
-    def get_contracts_requiring_attention():
+    def build_attention_row(contract):
         """
-        Fetch contracts that are expiring soon or have reached their end date
-        from the backend. Status logic matches mock: "X days past due" (red)
+        Status logic matches mock: "X days past due" (red)
         or "X days remaining" (yellow).
         """
-        today = date.today()
+        exp_date = contract.end_date
+        days_diff = (date.today() - exp_date).days
+
+        # Calculate status and visual indicators (based on mock logic)
+        if days_diff > 0:
+            # Past due - RED
+            status = f"{days_diff} days past due"
+            status_class = "expired"
+            row_class = "bg-red-50"
+        else:
+            # Approaching expiration - WARNING
+            status = f"{abs(days_diff)} days remaining"
+            status_class = "warning"
+            row_class = "bg-yellow-50"
+
+        vendor_name = contract.vendor.vendor_name if contract.vendor else "Unknown"
+        vendor_id = contract.vendor.id if contract.vendor else None
+        contract_type = contract.contract_type.value if hasattr(contract.contract_type, 'value') else str(contract.contract_type)
+        manager_name = f"{contract.contract_owner.first_name} {contract.contract_owner.last_name}" if contract.contract_owner else "Unknown"
+
+        return {
+            "id": contract.id,
+            "contract_id": contract.contract_id,
+            "vendor_name": vendor_name,
+            "vendor_id": vendor_id,
+            "contract_type": contract_type,
+            "description": contract.contract_description or "",
+            "expiration_date": exp_date.strftime("%Y-%m-%d"),
+            "expiration_timestamp": datetime.combine(exp_date, datetime.min.time()).timestamp(),
+            "status": status,
+            "status_class": status_class,
+            "row_class": row_class,
+            "manager": manager_name,
+        }
+
+    async def get_contracts_requiring_attention():
+        """
+        Fetch contracts that are expiring soon or have reached their end date
+        from the backend.
+        """
         rows = []
         try:
-            from app.db.database import SessionLocal
-            from app.services.contract_service import ContractService
-
-            db = SessionLocal()
-            try:
-                contract_service = ContractService(db)
-                contracts, _ = contract_service.get_contracts_requiring_attention(
-                    skip=0,
-                    limit=1000,
-                    days_ahead=30
-                )
-
-                for contract in contracts:
-                    exp_date = contract.end_date
-                    days_diff = (today - exp_date).days
-
-                    # Calculate status and visual indicators (based on mock logic)
-                    if days_diff > 0:
-                        # Past due - RED
-                        status = f"{days_diff} days past due"
-                        status_class = "expired"
-                        row_class = "bg-red-50"
-                    else:
-                        # Approaching expiration - WARNING
-                        status = f"{abs(days_diff)} days remaining"
-                        status_class = "warning"
-                        row_class = "bg-yellow-50"
-
-                    vendor_name = contract.vendor.vendor_name if contract.vendor else "Unknown"
-                    vendor_id = contract.vendor.id if contract.vendor else None
-                    contract_type = contract.contract_type.value if hasattr(contract.contract_type, 'value') else str(contract.contract_type)
-                    manager_name = f"{contract.contract_owner.first_name} {contract.contract_owner.last_name}" if contract.contract_owner else "Unknown"
-
-                    rows.append({
-                        "id": contract.id,
-                        "contract_id": contract.contract_id,
-                        "vendor_name": vendor_name,
-                        "vendor_id": vendor_id,
-                        "contract_type": contract_type,
-                        "description": contract.contract_description or "",
-                        "expiration_date": exp_date.strftime("%Y-%m-%d"),
-                        "expiration_timestamp": datetime.combine(exp_date, datetime.min.time()).timestamp(),
-                        "status": status,
-                        "status_class": status_class,
-                        "row_class": row_class,
-                        "manager": manager_name,
-                    })
-            finally:
-                db.close()
+            rows, _ = await AsyncContractService().get_contracts_requiring_attention(
+                skip=0,
+                limit=1000,
+                days_ahead=30,
+                build=build_attention_row
+            )
         except Exception as e:
             print(f"Error fetching contracts requiring attention: {e}")
             import traceback
@@ -659,7 +549,7 @@ def home_page():
         "headerClasses": "bg-[#144c8e] text-white",
     }
 
-    contract_rows = get_contracts_requiring_attention()
+    contract_rows = await get_contracts_requiring_attention()
     
     # Container for the contracts table (initially hidden)
     contracts_table_container = ui.element("div").classes("max-w-7xl mt-8 mx-auto w-full")
@@ -994,7 +884,7 @@ def home_page():
                             if result[0]:
                                 ui.notify("Contract sent to Pending Reviews. Complete the review there to apply the decision.", type="positive")
                                 contract_decision_dialog.close()
-                                contract_rows = get_contracts_requiring_attention()
+                                contract_rows = await get_contracts_requiring_attention()
                                 contracts_table.rows = contract_rows
                                 contracts_table.update()
                             else:
@@ -1006,7 +896,7 @@ def home_page():
                     contract_decision_dialog._complete_tasks.add(complete_task)
                     complete_task.add_done_callback(lambda t: contract_decision_dialog._complete_tasks.discard(t))
 
-                def do_save():
+                async def do_save():
                     """Save progress: Renew stays in Contracts Requiring Attention (DRAFT); Terminate (no doc) moves to Pending Documents."""
                     nonlocal contract_rows
                     try:
@@ -1048,7 +938,7 @@ def home_page():
                             upd.updated_at = datetime.utcnow()
                             db3.commit()
                             ui.notify("Progress saved", type="positive")
-                            contract_rows = get_contracts_requiring_attention()
+                            contract_rows = await get_contracts_requiring_attention()
                             contracts_table.rows = contract_rows
                             contracts_table.update()
                         finally:
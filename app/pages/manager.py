@@ -1,18 +1,15 @@
 from datetime import datetime, timedelta, date
 import asyncio
 import requests
+from fastapi import HTTPException
 from nicegui import ui, app, run
 from app.utils.vendor_lookup import get_vendor_id_by_name
 from app.components.breadcrumb import breadcrumb
-from app.core.config import settings
+from app.db.database import SessionLocal, run_db
+from app.services.contract_service import ContractService
 import re
 
 
-def _get_api_base_url() -> str:
-    """Base URL for server-to-server API calls (from API_BASE_URL env or config)."""
-    return settings.api_base_url.rstrip("/")
-
-
 def _manager_complete_blocking(
     contract_db_id: int,
     current_user_id: int,
@@ -24,173 +21,126 @@ def _manager_complete_blocking(
     term_fname: str,
     comments: str,
 ) -> tuple[bool, str]:
-    """Run in thread: upload termination doc (if Terminate + upload), then POST contract-updates. Returns (success, error_message)."""
-    import httpx
-    base = _get_api_base_url()
-    api_prefix = settings.api_v1_prefix
+    """Run in thread: store termination doc (if Terminate + upload), then send the decision for review as a new ContractUpdate. Returns (success, error_message)."""
+    from app.models.contract import Contract, ContractUpdate, ContractUpdateStatus
     try:
         has_upload = bool(term_content)
-        if decision_value == "Terminate" and has_upload:
-            with httpx.Client(timeout=90.0) as client:
-                r = client.post(
-                    f"{base}{api_prefix}/contracts/{contract_db_id}/termination-documents",
-                    data={"document_name": tname, "document_date": tdate},
-                    files={"file": (term_fname or "document.pdf", term_content, "application/pdf")},
-                )
-            if r.status_code not in (200, 201):
+        db = SessionLocal()
+        try:
+            if not db.query(Contract.id).filter(Contract.id == contract_db_id).first():
+                return (False, "Contract not found")
+            if decision_value == "Terminate" and has_upload:
                 try:
-                    detail = r.json().get("detail", "Failed to store termination document")
-                    return (False, str(detail))
-                except Exception:
-                    return (False, r.text or f"HTTP {r.status_code}")
-        with httpx.Client(timeout=30.0) as client:
+                    ContractService(db).store_termination_document_bytes(
+                        contract_db_id,
+                        term_content,
+                        term_fname or "document.pdf",
+                        tname,
+                        datetime.fromisoformat(tdate).date(),
+                    )
+                except HTTPException as e:
+                    return (False, str(e.detail))
+                except ValueError as e:
+                    return (False, str(e))
+            upd = ContractUpdate(
+                contract_id=contract_db_id,
+                status=ContractUpdateStatus.PENDING_REVIEW,
+                response_provided_by_user_id=current_user_id,
+                response_date=datetime.utcnow() if current_user_id else None,
+                decision_comments=comments or "",
+            )
             if decision_value == "Renew":
-                payload = {
-                    "contract_id": contract_db_id,
-                    "status": "pending_review",
-                    "response_provided_by_user_id": current_user_id,
-                    "initial_expiration_date": end_val.replace("/", "-")[:10] if end_val else None,
-                    "decision": "Extend",
-                    "decision_comments": comments or "",
-                }
+                upd.decision = "Extend"
+                if end_val:
+                    upd.initial_expiration_date = datetime.strptime(end_val.replace("/", "-")[:10], "%Y-%m-%d").date()
             else:
-                payload = {
-                    "contract_id": contract_db_id,
-                    "status": "pending_review",
-                    "response_provided_by_user_id": current_user_id,
-                    "has_document": has_upload,
-                    "decision": "Terminate",
-                    "decision_comments": comments or "",
-                }
-            resp = client.post(f"{base}{api_prefix}/contract-updates/", json=payload)
-            if resp.status_code not in (200, 201):
-                try:
-                    return (False, resp.json().get("detail", "Failed to send for review"))
-                except Exception:
-                    return (False, resp.text or f"HTTP {resp.status_code}")
+                upd.decision = "Terminate"
+                upd.has_document = has_upload
+            db.add(upd)
+            db.commit()
+        finally:
+            db.close()
         return (True, "")
     except Exception as e:
         return (False, str(e))
 
 
-def manager():
-    # Get current logged-in user
-    current_username = app.storage.user.get('username', None)
-    current_user_id = None
-    current_user_name = None
-    
-    # Fetch current user from database
+def _fetch_manager_counts(db, current_username) -> dict:
+    """Current user and dashboard counters for the manager page. Each counter falls back to 0 on error."""
+    from app.services.contract_service import ContractService
+    from app.models.contract import User, ContractStatusType, ContractUpdate, ContractUpdateStatus
+
+    counts = {"current_user_id": None, "current_user_name": None}
     try:
-        from app.db.database import SessionLocal
-        from app.models.contract import User
-        db = SessionLocal()
-        try:
-            if current_username:
-                # Try to find user by email or username
-                current_user = db.query(User).filter(
-                    (User.email == current_username) | (User.first_name.ilike(f"%{current_username}%"))
-                ).first()
-                if current_user:
-                    current_user_id = current_user.id
-                    current_user_name = f"{current_user.first_name} {current_user.last_name}"
-        finally:
-            db.close()
+        if current_username:
+            # Try to find user by email or username
+            current_user = db.query(User).filter(
+                (User.email == current_username) | (User.first_name.ilike(f"%{current_username}%"))
+            ).first()
+            if current_user:
+                counts["current_user_id"] = current_user.id
+                counts["current_user_name"] = f"{current_user.first_name} {current_user.last_name}"
     except Exception as e:
+        db.rollback()
         print(f"Error fetching current user: {e}")
-    
-    # Global variables for table and data
-    contracts_table = None
-    contract_rows = []
-    
-    # Fetch active contracts count from database
-    active_contracts_count = 0
-    try:
-        from app.db.database import SessionLocal
-        from app.services.contract_service import ContractService
-        from app.models.contract import ContractStatusType
-        db = SessionLocal()
-        try:
-            contract_service = ContractService(db)
-            _, active_contracts_count = contract_service.search_and_filter_contracts(
-                skip=0,
-                limit=1,
-                status=ContractStatusType.ACTIVE,
-                search=None,
-                contract_type=None,
-                department=None,
-                owner_id=None,
-                vendor_id=None,
-                expiring_soon=None
-            )
-        finally:
-            db.close()
-    except Exception as e:
-        print(f"Error fetching active contracts count: {e}")
-        active_contracts_count = 0
 
-    # Fetch pending documents count (no docs + awaiting termination doc, merged and deduped)
-    pending_documents_count = 0
-    try:
-        from app.db.database import SessionLocal
-        from app.services.contract_service import ContractService
-        db = SessionLocal()
-        try:
-            contract_service = ContractService(db)
-            contracts_no_docs, _ = contract_service.get_contracts_with_no_documents(skip=0, limit=1000)
-            contracts_awaiting_term, _ = contract_service.get_contracts_awaiting_termination_document(skip=0, limit=1000)
-            seen_ids = set()
-            for c in contracts_no_docs:
-                seen_ids.add(c.id)
-            for c in contracts_awaiting_term:
-                if c.id not in seen_ids:
-                    seen_ids.add(c.id)
-            pending_documents_count = len(seen_ids)
-        finally:
-            db.close()
-    except Exception as e:
-        print(f"Error fetching pending documents count: {e}")
-        pending_documents_count = 0
+    contract_service = ContractService(db)
 
-    # Fetch contract updates count (ContractUpdate records not completed)
-    contract_updates_count = 0
-    try:
-        from app.db.database import SessionLocal
-        from app.models.contract import ContractUpdate, ContractUpdateStatus
-        db = SessionLocal()
+    def count(name, query):
         try:
-            contract_updates_count = db.query(ContractUpdate).filter(
-                ContractUpdate.status != ContractUpdateStatus.COMPLETED
-            ).count()
-        finally:
-            db.close()
-    except Exception as e:
-        print(f"Error fetching contract updates count: {e}")
-        contract_updates_count = 0
+            counts[name] = query()
+        except Exception as e:
+            db.rollback()
+            print(f"Error fetching {name.replace('_', ' ')}: {e}")
+            counts[name] = 0
+
+    def pending_documents():
+        # No docs + awaiting termination doc, merged and deduped
+        contracts_no_docs, _ = contract_service.get_contracts_with_no_documents(skip=0, limit=1000)
+        contracts_awaiting_term, _ = contract_service.get_contracts_awaiting_termination_document(skip=0, limit=1000)
+        seen_ids = {c.id for c in contracts_no_docs}
+        seen_ids.update(c.id for c in contracts_awaiting_term)
+        return len(seen_ids)
+
+    status_counts = {}
+
+    def contracts_with_status(status):
+        # Constant-time read from the dashboard_stats read model
+        if not status_counts:
+            status_counts.update(contract_service.get_contract_status_counts())
+        if status is None:
+            return sum(status_counts.values())
+        return status_counts.get(status.value, 0)
+
+    count("active_contracts_count", lambda: contracts_with_status(ContractStatusType.ACTIVE))
+    count("pending_documents_count", pending_documents)
+    # ContractUpdate records not completed
+    count(
+        "contract_updates_count",
+        lambda: db.query(ContractUpdate).filter(ContractUpdate.status != ContractUpdateStatus.COMPLETED).count(),
+    )
+    # Any status
+    count("all_contracts_count", lambda: contracts_with_status(None))
+    return counts
+
+
+async def manager():
+    # Get current logged-in user
+    current_username = app.storage.user.get('username', None)
 
-    # Fetch all contracts count (any status)
-    all_contracts_count = 0
-    try:
-        from app.db.database import SessionLocal
-        from app.services.contract_service import ContractService
-        db = SessionLocal()
-        try:
-            contract_service = ContractService(db)
-            _, all_contracts_count = contract_service.search_and_filter_contracts(
-                skip=0,
-                limit=1,
-                search=None,
-                status=None,
-                contract_type=None,
-                department=None,
-                owner_id=None,
-                vendor_id=None,
-                expiring_soon=None
-            )
-        finally:
-            db.close()
-    except Exception as e:
-        print(f"Error fetching all contracts count: {e}")
-        all_contracts_count = 0
+    # Fetch current user and dashboard counters in one session, off the event loop
+    counts = await run_db(_fetch_manager_counts, current_username)
+    current_user_id = counts["current_user_id"]
+    current_user_name = counts["current_user_name"]
+
+    # Global variables for table and data
+    contracts_table = None
+    contract_rows = []
+
+    active_contracts_count = counts["active_contracts_count"]
+    pending_documents_count = counts["pending_documents_count"]
+    contract_updates_count = counts["contract_updates_count"]
+    all_contracts_count = counts["all_contracts_count"]
 
     # Breadcrumb navigation
     with ui.row().classes("max-w-7xl mx-auto mt-4"):
@@ -260,133 +210,131 @@ def manager():
     
     # ===== NEW SECTION: Contracts Requiring Attention =====
     
-    def get_contracts_requiring_attention():
+    def build_contracts_requiring_attention(db):
         """
-        Fetch contracts that have reached their notification window
+        Contracts that have reached their notification window
         for the current logged-in user (as Contract Manager or Backup).
         """
-        if not current_user_id:
-            print("No current user found, returning empty list")
-            return []
-        
+        from app.models.contract import ContractStatusType, Contract, ContractUpdate, ContractUpdateStatus
+        from sqlalchemy import or_
+        from sqlalchemy.orm import joinedload
+
         today = date.today()
         rows = []
+        # Exclude contracts that have an update already sent (not draft). Keep contracts with no update or status=DRAFT.
+        acted_contract_ids = [
+            r[0] for r in db.query(ContractUpdate.contract_id)
+            .filter(ContractUpdate.status != ContractUpdateStatus.DRAFT)
+            .distinct()
+            .all()
+        ]
+        # Get all active contracts where user is owner or backup
+        contracts = db.query(Contract).options(
+            joinedload(Contract.vendor),
+            joinedload(Contract.contract_owner),
+            joinedload(Contract.contract_owner_backup)
+        ).filter(
+            Contract.status == ContractStatusType.ACTIVE,
+            or_(
+                Contract.contract_owner_id == current_user_id,
+                Contract.contract_owner_backup_id == current_user_id
+            )
+        ).all()
         
-        try:
-            from app.db.database import SessionLocal
-            from app.services.contract_service import ContractService
-            from app.models.contract import ContractStatusType, Contract, ExpirationNoticePeriodType, ContractUpdate, ContractUpdateStatus
-            from sqlalchemy import or_, and_
-            from sqlalchemy.orm import joinedload
+        # Filter contracts that have reached notification window (exclude those sent to Pending Documents)
+        contracts_in_window = []
+        for contract in contracts:
+            if not contract.end_date:
+                continue
+            if contract.id in acted_contract_ids:
+                continue  # Manager already acted - in Pending Documents or Pending Reviews
             
-            db = SessionLocal()
-            try:
-                # Exclude contracts that have an update already sent (not draft). Keep contracts with no update or status=DRAFT.
-                acted_contract_ids = [
-                    r[0] for r in db.query(ContractUpdate.contract_id)
-                    .filter(ContractUpdate.status != ContractUpdateStatus.DRAFT)
-                    .distinct()
-                    .all()
-                ]
-                # Get all active contracts where user is owner or backup
-                contracts = db.query(Contract).options(
-                    joinedload(Contract.vendor),
-                    joinedload(Contract.contract_owner),
-                    joinedload(Contract.contract_owner_backup)
-                ).filter(
-                    Contract.status == ContractStatusType.ACTIVE,
-                    or_(
-                        Contract.contract_owner_id == current_user_id,
-                        Contract.contract_owner_backup_id == current_user_id
-                    )
-                ).all()
-                
-                # Filter contracts that have reached notification window (exclude those sent to Pending Documents)
-                contracts_in_window = []
-                for contract in contracts:
-                    if not contract.end_date:
-                        continue
-                    if contract.id in acted_contract_ids:
-                        continue  # Manager already acted - in Pending Documents or Pending Reviews
-                    
-                    # Parse expiration notice frequency to get days
-                    notice_days = 30  # Default
-                    if contract.expiration_notice_frequency:
-                        freq_str = contract.expiration_notice_frequency.value if hasattr(contract.expiration_notice_frequency, 'value') else str(contract.expiration_notice_frequency)
-                        # Extract number from strings like "30 days", "15 days", etc.
-                        match = re.search(r'(\d+)', freq_str)
-                        if match:
-                            notice_days = int(match.group(1))
-                    
-                    # Calculate notification window start date
-                    notification_window_date = contract.end_date - timedelta(days=notice_days)
-                    
-                    # Check if notification window has been reached
-                    if today >= notification_window_date:
-                        contracts_in_window.append(contract)
-                
-                # Build rows
-                for contract in contracts_in_window:
-                    # Determine user's role for this contract
-                    if contract.contract_owner_id == current_user_id:
-                        my_role = "Contract Manager"
-                        role_color = "blue"
-                        role_class = "text-blue-700"
-                    elif contract.contract_owner_backup_id == current_user_id:
-                        my_role = "Backup"
-                        role_color = "yellow"
-                        role_class = "text-yellow-700"
-                    else:
-                        continue  # Shouldn't happen, but skip just in case
-                    
-                    # Calculate days until/after expiration
-                    days_diff = (contract.end_date - today).days
-                    
-                    # Calculate status and visual indicators
-                    if days_diff < 0:
-                        # Past due - RED
-                        status = f"{abs(days_diff)} days past due"
-                        status_class = "expired"
-                        row_class = "bg-red-50"
-                    else:
-                        # Approaching expiration - WARNING
-                        status = f"{days_diff} days remaining"
-                        status_class = "warning"
-                        row_class = "bg-yellow-50"
-                    
-                    # Get vendor info
-                    vendor_name = contract.vendor.vendor_name if contract.vendor else "Unknown"
-                    vendor_id = contract.vendor.id if contract.vendor else None
-                    
-                    # Get contract type value
-                    contract_type = contract.contract_type.value if hasattr(contract.contract_type, 'value') else str(contract.contract_type)
-                    
-                    # Contract owner (Manager) name - same as admin mode table
-                    manager_name = f"{contract.contract_owner.first_name} {contract.contract_owner.last_name}" if contract.contract_owner else "Unknown"
-                    
-                    rows.append({
-                        "id": contract.id,  # Database ID for linking
-                        "contract_id": contract.contract_id,
-                        "vendor_name": vendor_name,
-                        "vendor_id": vendor_id,
-                        "contract_type": contract_type,
-                        "description": contract.contract_description,
-                        "expiration_date": contract.end_date.strftime("%Y-%m-%d"),
-                        "expiration_timestamp": datetime.combine(contract.end_date, datetime.min.time()).timestamp(),
-                        "status": status,
-                        "status_class": status_class,
-                        "row_class": row_class,
-                        "manager": manager_name,
-                        "my_role": my_role,
-                        "role_color": role_color,
-                        "role_class": role_class,
-                    })
-                
-                print(f"Found {len(rows)} contracts requiring attention for user {current_user_name}")
-                return rows
-                
-            finally:
-                db.close()
+            # Parse expiration notice frequency to get days
+            notice_days = 30  # Default
+            if contract.expiration_notice_frequency:
+                freq_str = contract.expiration_notice_frequency.value if hasattr(contract.expiration_notice_frequency, 'value') else str(contract.expiration_notice_frequency)
+                # Extract number from strings like "30 days", "15 days", etc.
+                match = re.search(r'(\d+)', freq_str)
+                if match:
+                    notice_days = int(match.group(1))
+            
+            # Calculate notification window start date
+            notification_window_date = contract.end_date - timedelta(days=notice_days)
+            
+            # Check if notification window has been reached
+            if today >= notification_window_date:
+                contracts_in_window.append(contract)
+        
+        # Build rows
+        for contract in contracts_in_window:
+            # Determine user's role for this contract
+            if contract.contract_owner_id == current_user_id:
+                my_role = "Contract Manager"
+                role_color = "blue"
+                role_class = "text-blue-700"
+            elif contract.contract_owner_backup_id == current_user_id:
+                my_role = "Backup"
+                role_color = "yellow"
+                role_class = "text-yellow-700"
+            else:
+                continue  # Shouldn't happen, but skip just in case
+            
+            # Calculate days until/after expiration
+            days_diff = (contract.end_date - today).days
+            
+            # Calculate status and visual indicators
+            if days_diff < 0:
+                # Past due - RED
+                status = f"{abs(days_diff)} days past due"
+                status_class = "expired"
+                row_class = "bg-red-50"
+            else:
+                # Approaching expiration - WARNING
+                status = f"{days_diff} days remaining"
+                status_class = "warning"
+                row_class = "bg-yellow-50"
+            
+            # Get vendor info
+            vendor_name = contract.vendor.vendor_name if contract.vendor else "Unknown"
+            vendor_id = contract.vendor.id if contract.vendor else None
+            
+            # Get contract type value
+            contract_type = contract.contract_type.value if hasattr(contract.contract_type, 'value') else str(contract.contract_type)
+            
+            # Contract owner (Manager) name - same as admin mode table
+            manager_name = f"{contract.contract_owner.first_name} {contract.contract_owner.last_name}" if contract.contract_owner else "Unknown"
+            
+            rows.append({
+                "id": contract.id,  # Database ID for linking
+                "contract_id": contract.contract_id,
+                "vendor_name": vendor_name,
+                "vendor_id": vendor_id,
+                "contract_type": contract_type,
+                "description": contract.contract_description,
+                "expiration_date": contract.end_date.strftime("%Y-%m-%d"),
+                "expiration_timestamp": datetime.combine(contract.end_date, datetime.min.time()).timestamp(),
+                "status": status,
+                "status_class": status_class,
+                "row_class": row_class,
+                "manager": manager_name,
+                "my_role": my_role,
+                "role_color": role_color,
+                "role_class": role_class,
+            })
+        
+        print(f"Found {len(rows)} contracts requiring attention for user {current_user_name}")
+        return rows
+
+    async def get_contracts_requiring_attention():
+        """
+        Fetch contracts requiring attention without blocking the event loop.
+        """
+        if not current_user_id:
+            print("No current user found, returning empty list")
+            return []
+
+        try:
+            return await run_db(build_contracts_requiring_attention)
         except Exception as e:
             print(f"Error fetching contracts requiring attention: {e}")
             import traceback
@@ -456,7 +404,7 @@ def manager():
         "headerClasses": "bg-[#144c8e] text-white",
     }
 
-    contract_rows = get_contracts_requiring_attention()
+    contract_rows = await get_contracts_requiring_attention()
     
     # Table section: inside card container to match top cards, visible when manager page loads
     with ui.card().classes("mt-8 w-full min-w-0 shadow-lg rounded-xl border border-gray-200 max-w-7xl mx-auto").props('flat'):
@@ -655,7 +603,6 @@ def manager():
             from app.db.database import SessionLocal
             from app.models.contract import Contract, ContractUpdate, User
             from sqlalchemy.orm import joinedload
-            import httpx
 
             dialog_content.clear()
             contract_db_id = selected_contract.get("id") or selected_contract.get("contract_db_id")
@@ -886,7 +833,7 @@ def manager():
                                         type="positive",
                                     )
                                     nonlocal contract_rows
-                                    contract_rows[:] = get_contracts_requiring_attention()
+                                    contract_rows[:] = await get_contracts_requiring_attention()
                                     contracts_table.rows = contract_rows
                                     contracts_table.update()
                                     contract_decision_dialog.close()
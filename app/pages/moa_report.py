@@ -1,21 +1,15 @@
 from datetime import datetime, timedelta, date
 from nicegui import ui
-from app.db.database import SessionLocal
+from app.db.database import run_db
 from app.utils.navigation import get_dashboard_url
 from app.components.breadcrumb import breadcrumb
+from app.components.report_export import export_report
 from app.services.contract_service import ContractService
 from app.models.contract import ContractStatusType
 from app.models.vendor import MaterialOutsourcingType, DocumentType
-import io
-import base64
-try:
-    import pandas as pd
-    PANDAS_AVAILABLE = True
-except ImportError:
-    PANDAS_AVAILABLE = False
 
 
-def moa_report():
+async def moa_report():
     # Breadcrumb navigation
     with ui.row().classes("max-w-6xl mx-auto mt-4"):
         breadcrumb([("Home", get_dashboard_url()), ("Material Outsourcing Agreement Report", None)])
@@ -26,12 +20,11 @@ def moa_report():
     
     
     # Fetch MOA contracts from database
-    def fetch_moa_contracts():
+    def fetch_moa_contracts(db):
         """
         Fetches active contracts with Material Outsourcing Agreement = YES.
         This avoids HTTP requests and circular dependencies.
         """
-        db = SessionLocal()
         try:
             contract_service = ContractService(db)
             
@@ -154,8 +147,6 @@ def moa_report():
             import traceback
             traceback.print_exc()
             return []
-        finally:
-            db.close()
 
     contract_columns = [
         {
@@ -220,7 +211,7 @@ def moa_report():
         "headerClasses": "bg-[#144c8e] text-white",
     }
 
-    contract_rows = fetch_moa_contracts()
+    contract_rows = await run_db(fetch_moa_contracts)
     
     # Main container
     with ui.element("div").classes("max-w-6xl mt-8 mx-auto w-full"):
@@ -335,14 +326,9 @@ def moa_report():
                 
                 dialog.open()
         
-        def generate_excel_report(dialog):
+        async def generate_excel_report(dialog):
             """Generate Excel report for MOA contracts"""
             try:
-                if not PANDAS_AVAILABLE:
-                    ui.notify("Excel export requires pandas library. Please install it: pip install pandas openpyxl", type="negative")
-                    dialog.close()
-                    return
-                
                 if not contract_rows:
                     ui.notify("No MOA contracts available for export", type="warning")
                     dialog.close()
@@ -367,49 +353,13 @@ def moa_report():
                         "Insurance Policy": contract.get('insurance_policy', 'NO'),
                     })
                 
-                # Create DataFrame
-                df = pd.DataFrame(report_data)
-                
-                # Create Excel file in memory
-                output = io.BytesIO()
-                with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                    df.to_excel(writer, index=False, sheet_name='MOA Contracts')
-                    
-                    # Get the worksheet
-                    worksheet = writer.sheets['MOA Contracts']
-                    
-                    # Auto-adjust column widths
-                    for column in worksheet.columns:
-                        max_length = 0
-                        column_letter = column[0].column_letter
-                        for cell in column:
-                            try:
-                                if len(str(cell.value)) > max_length:
-                                    max_length = len(str(cell.value))
-                            except (AttributeError, TypeError):
-                                pass
-                        adjusted_width = min(max_length + 2, 50)
-                        worksheet.column_dimensions[column_letter].width = adjusted_width
-                
-                output.seek(0)
-                
-                # Convert to base64 for download
-                excel_data = output.getvalue()
-                b64_data = base64.b64encode(excel_data).decode()
-                
                 # Generate filename
                 today = datetime.now().strftime("%Y-%m-%d")
                 filename = f"MOA_Contracts_Report_{today}.xlsx"
                 
-                # Trigger download using JavaScript
-                ui.run_javascript(f'''
-                    const link = document.createElement('a');
-                    link.href = 'data:application/vnd.openxmlformats-officedocument.spreadsheetml.sheet;base64,{b64_data}';
-                    link.download = '{filename}';
-                    document.body.appendChild(link);
-                    link.click();
-                    document.body.removeChild(link);
-                ''')
+                # Build the workbook in a report worker process; the browser downloads it when ready
+                if not await export_report(filename, 'MOA Contracts', report_data):
+                    return
                 
                 ui.notify(f"Report generated successfully! {len(contract_rows)} contract(s) exported.", type="positive")
                 dialog.close()
@@ -1,86 +1,47 @@
 from datetime import datetime, timedelta, date
 from nicegui import ui
-from app.db.database import SessionLocal
+from app.db.database import run_db
 from app.utils.navigation import get_dashboard_url
 from app.components.breadcrumb import breadcrumb
+from app.components.report_export import export_report
 from app.services.contract_service import ContractService
+from app.components.server_table import ServerTable
 from app.models.contract import ContractStatusType
 from decimal import Decimal
-import io
-import base64
-try:
-    import pandas as pd
-    PANDAS_AVAILABLE = True
-except ImportError:
-    PANDAS_AVAILABLE = False
 
 
-def monetary_value_report():
+async def monetary_value_report():
     # Breadcrumb navigation
     with ui.row().classes("max-w-6xl mx-auto mt-4"):
         breadcrumb([("Home", get_dashboard_url()), ("Contracts Monetary Value Report", None)])
     
-    # Global variables for table and data
-    contracts_table = None
-    contract_rows = []
+    # Amount range currently applied to the table
+    amount_filter = {"min_amount": None, "max_amount": None}
     
-    
-    # Fetch active contracts from database, sorted by contract amount
-    def fetch_contracts_by_value(min_amount=None, max_amount=None):
+    # Fetch one page of active contracts from database, sorted by contract amount
+    def fetch_contracts_by_value_page(db, search=None, min_amount=None, max_amount=None, **page_params):
         """
-        Fetches active contracts, optionally filtered by amount range, sorted by contract amount (highest to lowest).
+        Fetches one page of active contracts, optionally filtered by amount range.
+        Amount filtering, search, sorting and paging are done in SQL.
+        Returns: (rows, total_count, next_cursor)
         """
-        db = SessionLocal()
         try:
             contract_service = ContractService(db)
             
-            # Get all active contracts (limit 1000 for display)
-            contracts, _ = contract_service.search_and_filter_contracts(
-                skip=0,
-                limit=1000,
+            contracts, total_count, next_cursor = contract_service.get_contracts_page(
                 status=ContractStatusType.ACTIVE,
-                search=None,
-                contract_type=None,
-                department=None,
-                owner_id=None,
-                vendor_id=None,
-                expiring_soon=None
+                search=search,
+                min_amount=min_amount,
+                max_amount=max_amount,
+                **page_params
             )
             
-            print(f"Found {len(contracts)} active contracts from database")
-            
             if not contracts:
-                print("No active contracts found in database")
-                return []
-            
-            # Filter by amount range if provided
-            filtered_contracts = contracts
-            if min_amount is not None or max_amount is not None:
-                filtered_contracts = []
-                for contract in contracts:
-                    contract_amount = float(contract.contract_amount) if contract.contract_amount else 0.0
-                    
-                    # Check min amount
-                    if min_amount is not None and contract_amount < float(min_amount):
-                        continue
-                    
-                    # Check max amount
-                    if max_amount is not None and contract_amount > float(max_amount):
-                        continue
-                    
-                    filtered_contracts.append(contract)
-            
-            # Sort by contract amount (highest to lowest)
-            filtered_contracts.sort(
-                key=lambda c: float(c.contract_amount) if c.contract_amount else 0.0,
-                reverse=True
-            )
-            
-            print(f"Filtered to {len(filtered_contracts)} contracts")
+                return [], total_count, None
             
             # Map contract data to table row format
             rows = []
-            for contract in filtered_contracts:
+            for contract in contracts:
                 # Get contract owner (manager) name
                 manager_name = f"{contract.contract_owner.first_name} {contract.contract_owner.last_name}"
                 backup_name = f"{contract.contract_owner_backup.first_name} {contract.contract_owner_backup.last_name}"
@@ -148,15 +109,13 @@ def monetary_value_report():
                     "amount_value": amount_value,  # For sorting
                 })
             
-            return rows
+            return rows, total_count, next_cursor
             
         except Exception as e:
             print(f"Error fetching contracts by value: {str(e)}")
             import traceback
             traceback.print_exc()
-            return []
-        finally:
-            db.close()
+            return [], 0, None
 
     contract_columns = [
         {
@@ -229,8 +188,14 @@ def monetary_value_report():
         "headerClasses": "bg-[#144c8e] text-white",
     }
 
-    # Initial load without filters
-    contract_rows = fetch_contracts_by_value()
+    async def fetch_page(**page_params):
+        """Fetch one table page (current search and amount range) without blocking the event loop"""
+        params = {
+            "search": (search_input.value or "").strip() or None,
+            **amount_filter,
+            **page_params,
+        }
+        return await run_db(fetch_contracts_by_value_page, **params)
     
     # Main container
     with ui.element("div").classes("max-w-6xl mt-8 mx-auto w-full"):
@@ -254,9 +219,8 @@ def monetary_value_report():
                     from_amount_filter = ui.input("From Amount", placeholder="Optional - minimum amount").props('type=number').classes('flex-1')
                     to_amount_filter = ui.input("To Amount", placeholder="Optional - maximum amount").props('type=number').classes('flex-1')
                     
-                    def apply_filters():
+                    async def apply_filters():
                         """Apply amount filters and refresh table"""
-                        nonlocal contract_rows
                         from_val = from_amount_filter.value.strip() if from_amount_filter.value else None
                         to_val = to_amount_filter.value.strip() if to_amount_filter.value else None
                         
@@ -273,21 +237,18 @@ def monetary_value_report():
                             return
                         
                         # Refresh data with filters
-                        contract_rows = fetch_contracts_by_value(min_amount, max_amount)
-                        contracts_table.rows = contract_rows
-                        contracts_table.update()
-                        count_label.text = f"Total: {len(contract_rows)} contract(s)"
-                        ui.notify(f"Filtered to {len(contract_rows)} contract(s)", type="positive")
+                        amount_filter["min_amount"] = min_amount
+                        amount_filter["max_amount"] = max_amount
+                        await contracts_server_table.refresh()
+                        ui.notify(f"Filtered to {contracts_server_table.total_count} contract(s)", type="positive")
                     
-                    def clear_filters():
+                    async def clear_filters():
                         """Clear filters and show all contracts"""
-                        nonlocal contract_rows
                         from_amount_filter.value = ""
                         to_amount_filter.value = ""
-                        contract_rows = fetch_contracts_by_value()
-                        contracts_table.rows = contract_rows
-                        contracts_table.update()
-                        count_label.text = f"Total: {len(contract_rows)} contract(s)"
+                        amount_filter["min_amount"] = None
+                        amount_filter["max_amount"] = None
+                        await contracts_server_table.refresh()
                         ui.notify("Filters cleared", type="info")
                     
                     ui.button("Apply Filters", icon="filter_list", on_click=apply_filters).props('color=primary')
@@ -295,55 +256,50 @@ def monetary_value_report():
         
         # Count label row
         with ui.row().classes('ml-4 mb-2'):
-            count_label = ui.label(f"Total: {len(contract_rows)} contract(s)").classes("text-sm text-gray-500")
+            count_label = ui.label("Total: 0 contract(s)").classes("text-sm text-gray-500")
         
-        # Define search functions first
-        def filter_contracts():
-            base_rows = contract_rows
-            
-            search_term = (search_input.value or "").lower()
-            if not search_term:
-                contracts_table.rows = base_rows
-            else:
-                filtered = [
-                    row for row in base_rows
-                    if search_term in (row['contract_id'] or "").lower()
-                    or search_term in (row['vendor_name'] or "").lower()
-                    or search_term in (row['contract_type'] or "").lower()
-                    or search_term in (row['description'] or "").lower()
-                    or search_term in (row['manager'] or "").lower()
-                ]
-                contracts_table.rows = filtered
-            contracts_table.update()
+        # Define search functions first (search runs server-side)
+        async def filter_contracts():
+            await contracts_server_table.refresh()
         
-        def clear_search():
+        async def clear_search():
             search_input.value = ""
-            filter_contracts()
+            await filter_contracts()
         
         # Search input for filtering contracts (above the table)
         with ui.row().classes('w-full ml-4 mr-4 mb-6 gap-2 px-2'):
             search_input = ui.input(placeholder='Search by Contract ID, Vendor, Type, Description, or Manager...').classes(
                 'flex-1'
-            ).props('outlined dense clearable')
+            ).props('outlined dense clearable debounce=400')
             with search_input.add_slot('prepend'):
                 ui.icon('search').classes('text-gray-400')
             ui.button(icon='search', on_click=filter_contracts).props('color=primary')
             ui.button(icon='clear', on_click=clear_search).props('color=secondary')
         
-        # Create table after search bar
-        initial_rows = contract_rows
-        contracts_table = ui.table(
+        # Create table after search bar (rows are requested page by page)
+        contracts_server_table = ServerTable(
             columns=contract_columns,
             column_defaults=contract_columns_defaults,
-            rows=initial_rows,
-            pagination=10,
+            fetch_page=fetch_page,
+            rows_per_page=10,
+            sort_by="contract_amount",
+            descending=True,
             row_key="contract_id"
-        ).classes("w-full").props("flat bordered").classes(
+        )
+        contracts_table = contracts_server_table.table
+        contracts_table.classes("w-full").props("flat bordered").classes(
             "contracts-table shadow-lg rounded-lg overflow-hidden"
         )
         
+        def on_contracts_loaded(total_count):
+            count_label.text = f"Total: {total_count} contract(s)"
+        contracts_server_table.on_loaded = on_contracts_loaded
+        
         search_input.on_value_change(filter_contracts)
         
+        # Initial load without filters
+        await contracts_server_table.load()
+        
         # Generate button (moved from header to after table)
         ui.button("Generate", icon="description", on_click=lambda: open_generate_dialog()).props('color=primary').classes('ml-4 mt-4')
         
@@ -405,14 +361,9 @@ def monetary_value_report():
                 
                 dialog.open()
         
-        def generate_excel_report(from_amount_str, to_amount_str, dialog):
+        async def generate_excel_report(from_amount_str, to_amount_str, dialog):
             """Generate Excel report for contracts by monetary value"""
             try:
-                if not PANDAS_AVAILABLE:
-                    ui.notify("Excel export requires pandas library. Please install it: pip install pandas openpyxl", type="negative")
-                    dialog.close()
-                    return
-                
                 # Parse amount range if provided
                 min_amount = None
                 max_amount = None
@@ -437,7 +388,11 @@ def monetary_value_report():
                     return
                 
                 # Fetch contracts with amount filter
-                filtered_contract_rows = fetch_contracts_by_value(min_amount, max_amount)
+                filtered_contract_rows = await contracts_server_table.fetch_all(
+                    search=None,
+                    min_amount=min_amount,
+                    max_amount=max_amount
+                )
                 
                 if not filtered_contract_rows:
                     ui.notify("No contracts found matching the specified criteria.", type="warning")
@@ -464,54 +419,6 @@ def monetary_value_report():
                         "Contract Amount": amount_value,
                     })
                 
-                # Create DataFrame
-                df = pd.DataFrame(report_data)
-                
-                # Create Excel file in memory
-                output = io.BytesIO()
-                with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                    df.to_excel(writer, index=False, sheet_name='Monetary Value Report')
-                    
-                    # Get the worksheet
-                    worksheet = writer.sheets['Monetary Value Report']
-                    
-                    # Auto-adjust column widths
-                    for column in worksheet.columns:
-                        max_length = 0
-                        column_letter = column[0].column_letter
-                        for cell in column:
-                            try:
-                                if len(str(cell.value)) > max_length:
-                                    max_length = len(str(cell.value))
-                            except (AttributeError, TypeError):
-                                pass
-                        adjusted_width = min(max_length + 2, 50)
-                        worksheet.column_dimensions[column_letter].width = adjusted_width
-                    
-                    # Format Contract Amount column as currency (right-aligned)
-                    try:
-                        from openpyxl.styles import Alignment
-                        amount_col = None
-                        for idx, col in enumerate(worksheet.columns, 1):
-                            if worksheet.cell(1, idx).value == "Contract Amount":
-                                amount_col = idx
-                                break
-                        
-                        if amount_col:
-                            for row in range(2, len(report_data) + 2):
-                                cell = worksheet.cell(row, amount_col)
-                                cell.number_format = '#,##0.00'  # Number format with thousands separator
-                                cell.alignment = Alignment(horizontal='right')
-                    except ImportError:
-                        # If openpyxl styles not available, skip formatting
-                        pass
-                
-                output.seek(0)
-                
-                # Convert to base64 for download
-                excel_data = output.getvalue()
-                b64_data = base64.b64encode(excel_data).decode()
-                
                 # Generate filename
                 today = datetime.now().strftime("%Y-%m-%d")
                 range_text = ""
@@ -519,15 +426,15 @@ def monetary_value_report():
                     range_text = f"_Range_{min_amount or 0}-{max_amount or 'unlimited'}"
                 filename = f"Monetary_Value_Report_{today}{range_text}.xlsx"
                 
-                # Trigger download using JavaScript
-                ui.run_javascript(f'''
-                    const link = document.createElement('a');
-                    link.href = 'data:application/vnd.openxmlformats-officedocument.spreadsheetml.sheet;base64,{b64_data}';
-                    link.download = '{filename}';
-                    document.body.appendChild(link);
-                    link.click();
-                    document.body.removeChild(link);
-                ''')
+                # Build the workbook in a report worker process; the browser downloads it when ready
+                if not await export_report(
+                    filename,
+                    'Monetary Value Report',
+                    report_data,
+                    number_formats={"Contract Amount": "#,##0.00"},  # thousands separator, right-aligned
+                    filters={"min_amount": min_amount, "max_amount": max_amount},
+                ):
+                    return
                 
                 ui.notify(f"Report generated successfully! {len(filtered_contract_rows)} contract(s) exported.", type="positive")
                 dialog.close()
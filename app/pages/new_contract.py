@@ -33,18 +33,16 @@ def new_contract():
     try:
         vendor_service = VendorService(db)
         # Only load Active vendors for contract creation (exclude Terminated and Inactive vendors)
-        vendors_list, _ = vendor_service.get_vendors_with_filters(
-            skip=0, limit=1000, status_filter="Active", search=None
-        )
-        vendor_options = {vendor.vendor_name: vendor.id for vendor in vendors_list}
+        vendors_list = vendor_service.get_active_vendor_options()
+        vendor_options = {vendor["vendor_name"]: vendor["id"] for vendor in vendors_list}
         vendor_names = (
             list(vendor_options.keys()) if vendor_options else ["No vendors available"]
         )
 
         contract_service = ContractService(db)
-        users_list = contract_service.get_users(active_only=True)
+        users_list = contract_service.get_active_user_options()
         users_map = {
-            f"{user.first_name} {user.last_name}": user.id for user in users_list
+            f"{user['first_name']} {user['last_name']}": user["id"] for user in users_list
         }
     except Exception as e:
         print(f"Error loading initial data: {e}")
@@ -58,10 +56,10 @@ def new_contract():
     # Contract Manager / Owner / Backup data with email addresses
     contract_managers_data = {"Please select": ""}
     for user in users_list:
-        full_name = f"{user.first_name} {user.last_name}"
+        full_name = f"{user['first_name']} {user['last_name']}"
         # Avoid overwriting if duplicate names exist
         if full_name not in contract_managers_data:
-            contract_managers_data[full_name] = getattr(user, "email", "") or ""
+            contract_managers_data[full_name] = user["email"]
     
     # Vendor Contract: each upload is one row (name + signed date + bytes)
     vendor_contract_docs = []
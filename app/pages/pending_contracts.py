@@ -1,10 +1,8 @@
 from datetime import datetime, timedelta, date
 import asyncio
+from fastapi import HTTPException
 from nicegui import ui, app, run
-import io
 import re
-import base64
-import httpx
 from app.db.database import SessionLocal
 from app.services.contract_service import ContractService
 from app.models.contract import (
@@ -18,11 +16,7 @@ from app.models.contract import (
 from sqlalchemy.orm import joinedload
 from app.utils.navigation import get_dashboard_url
 from app.components.breadcrumb import breadcrumb
-try:
-    import pandas as pd
-    PANDAS_AVAILABLE = True
-except ImportError:
-    PANDAS_AVAILABLE = False
+from app.components.report_export import export_report
 
 
 def _complete_pending_contract_blocking(
@@ -37,7 +31,7 @@ def _complete_pending_contract_blocking(
     comments: str,
     renew_has_document: bool = False,
 ) -> tuple[bool, str | None]:
-    """Runs in background thread: upload (if Terminate+file) and DB update. Returns (success, error_message)."""
+    """Runs in background thread: store document (if Terminate+file) and DB update. Returns (success, error_message)."""
     try:
         if decision_value == "Renew":
             if not end_val or not end_val.strip():
@@ -72,21 +66,21 @@ def _complete_pending_contract_blocking(
             if term_doc_file_content:
                 if not (term_doc_name and term_doc_date):
                     return (False, "Document name and Issue Date are required for the uploaded termination document.")
-                with httpx.Client(timeout=90.0) as client:
-                    r = client.post(
-                        f"http://localhost:8000/api/v1/contracts/{contract_db_id}/termination-documents",
-                        data={"document_name": term_doc_name.strip(), "document_date": term_doc_date.strip()},
-                        files={"file": (term_doc_file_name or "document.pdf", term_doc_file_content, "application/pdf")},
+                db_doc = SessionLocal()
+                try:
+                    ContractService(db_doc).store_termination_document_bytes(
+                        contract_db_id,
+                        term_doc_file_content,
+                        term_doc_file_name or "document.pdf",
+                        term_doc_name.strip(),
+                        datetime.fromisoformat(term_doc_date.strip()).date(),
                     )
-                if r.status_code not in (200, 201):
-                    try:
-                        body = r.json()
-                        detail = body.get("detail", "Failed to store termination document")
-                        if isinstance(detail, list):
-                            detail = "; ".join(str(x.get("msg", x)) for x in detail) if detail else "Request failed"
-                        return (False, str(detail))
-                    except Exception:
-                        return (False, r.text or f"Request failed (HTTP {r.status_code})")
+                except HTTPException as e:
+                    return (False, str(e.detail))
+                except ValueError as e:
+                    return (False, str(e))
+                finally:
+                    db_doc.close()
             db3 = SessionLocal()
             try:
                 upd = (
@@ -854,14 +848,9 @@ def pending_contracts():
                 
                 dialog.open()
         
-        def generate_excel_report(start_date_str, end_date_str, dialog):
+        async def generate_excel_report(start_date_str, end_date_str, dialog):
             """Generate Excel report for pending contracts"""
             try:
-                if not PANDAS_AVAILABLE:
-                    ui.notify("Excel export requires pandas library. Please install it: pip install pandas openpyxl", type="negative")
-                    dialog.close()
-                    return
-                
                 if not contract_rows:
                     ui.notify("No pending contracts available for export", type="warning")
                     dialog.close()
@@ -880,48 +869,12 @@ def pending_contracts():
                         "My Role": contract.get('my_role', ''),
                     })
                 
-                # Create DataFrame
-                df = pd.DataFrame(report_data)
-                
-                # Create Excel file in memory
-                output = io.BytesIO()
-                with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                    df.to_excel(writer, index=False, sheet_name='Pending Documents')
-                    
-                    # Get the worksheet
-                    worksheet = writer.sheets['Pending Documents']
-                    
-                    # Auto-adjust column widths
-                    for column in worksheet.columns:
-                        max_length = 0
-                        column_letter = column[0].column_letter
-                        for cell in column:
-                            try:
-                                if len(str(cell.value)) > max_length:
-                                    max_length = len(str(cell.value))
-                            except (AttributeError, TypeError):
-                                pass
-                        adjusted_width = min(max_length + 2, 50)
-                        worksheet.column_dimensions[column_letter].width = adjusted_width
-                
-                output.seek(0)
-                
-                # Convert to base64 for download
-                excel_data = output.getvalue()
-                b64_data = base64.b64encode(excel_data).decode()
-                
                 # Generate filename
                 filename = f"Pending_Documents_Report_{start_date_str}_to_{end_date_str}.xlsx"
                 
-                # Trigger download using JavaScript
-                ui.run_javascript(f'''
-                    const link = document.createElement('a');
-                    link.href = 'data:application/vnd.openxmlformats-officedocument.spreadsheetml.sheet;base64,{b64_data}';
-                    link.download = '{filename}';
-                    document.body.appendChild(link);
-                    link.click();
-                    document.body.removeChild(link);
-                ''')
+                # Build the workbook in a report worker process; the browser downloads it when ready
+                if not await export_report(filename, 'Pending Documents', report_data):
+                    return
                 
                 ui.notify(f"Report generated successfully! {len(contract_rows)} contract(s) exported.", type="positive")
                 dialog.close()
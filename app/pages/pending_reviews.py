@@ -1,56 +1,51 @@
 from datetime import datetime, timedelta, date
 from nicegui import ui, app
-import io
-import base64
 import re
-from app.db.database import SessionLocal
+from app.db.database import SessionLocal, run_db
 from app.services.contract_service import ContractService
 from app.models.contract import ContractStatusType, ContractTerminationType, User, Contract, ContractUpdate, ContractUpdateStatus
 from app.utils.navigation import get_dashboard_url
 from app.components.breadcrumb import breadcrumb
+from app.components.report_export import export_report
+from app.components.live_updates import live_updates
+from app.core.events import CONTRACT_UPDATES_TOPIC, CONTRACTS_TOPIC
 from sqlalchemy.orm import joinedload
 from sqlalchemy import or_
-try:
-    import pandas as pd
-    PANDAS_AVAILABLE = True
-except ImportError:
-    PANDAS_AVAILABLE = False
 
 
-def pending_reviews():
+async def pending_reviews():
     # Get current logged-in user - use stored user_id first (from login)
     current_user_id = app.storage.user.get('user_id', None)
     
     # If user_id is not stored, try to look it up by username
     if not current_user_id:
         current_username = app.storage.user.get('username', None)
+        def lookup_current_user(db):
+            nonlocal current_user_id
+            if current_username:
+                # Try multiple matching strategies
+                current_user = db.query(User).filter(User.email == current_username).first()
+                if not current_user:
+                    current_user = db.query(User).filter(User.email.ilike(f"%{current_username}%")).first()
+                if not current_user:
+                    current_user = db.query(User).filter(User.first_name.ilike(f"%{current_username}%")).first()
+                if not current_user:
+                    current_user = db.query(User).filter(User.last_name.ilike(f"%{current_username}%")).first()
+                if not current_user and ' ' in current_username:
+                    parts = current_username.split()
+                    if len(parts) >= 2:
+                        current_user = db.query(User).filter(
+                            User.first_name.ilike(f"%{parts[0]}%"),
+                            User.last_name.ilike(f"%{parts[-1]}%")
+                        ).first()
+                
+                if current_user:
+                    current_user_id = current_user.id
+                    print(f"Found current user: {current_user.first_name} {current_user.last_name} (ID: {current_user_id})")
+                else:
+                    print(f"Could not find user matching: {current_username}")
         try:
-            db = SessionLocal()
-            try:
-                if current_username:
-                    # Try multiple matching strategies
-                    current_user = db.query(User).filter(User.email == current_username).first()
-                    if not current_user:
-                        current_user = db.query(User).filter(User.email.ilike(f"%{current_username}%")).first()
-                    if not current_user:
-                        current_user = db.query(User).filter(User.first_name.ilike(f"%{current_username}%")).first()
-                    if not current_user:
-                        current_user = db.query(User).filter(User.last_name.ilike(f"%{current_username}%")).first()
-                    if not current_user and ' ' in current_username:
-                        parts = current_username.split()
-                        if len(parts) >= 2:
-                            current_user = db.query(User).filter(
-                                User.first_name.ilike(f"%{parts[0]}%"),
-                                User.last_name.ilike(f"%{parts[-1]}%")
-                            ).first()
-                    
-                    if current_user:
-                        current_user_id = current_user.id
-                        print(f"Found current user: {current_user.first_name} {current_user.last_name} (ID: {current_user_id})")
-                    else:
-                        print(f"Could not find user matching: {current_username}")
-            finally:
-                db.close()
+            await run_db(lookup_current_user)
         except Exception as e:
             print(f"Error fetching current user: {e}")
             import traceback
@@ -68,14 +63,13 @@ def pending_reviews():
     
     
     # Fetch contracts pending admin review from database
-    def fetch_contracts_needing_review():
+    def fetch_contracts_needing_review(db):
         """
         Fetches contracts for admin review by merging two sources:
         1. Contracts with ContractUpdate status=PENDING_REVIEW (sent for review by manager/admin).
         2. Contracts expiring within 90 days (for visibility), excluding those already in (1).
         This way moving one contract to Pending Reviews does not hide the expiring-soon list.
         """
-        db = SessionLocal()
         try:
             contract_service = ContractService(db)
             
@@ -197,8 +191,6 @@ def pending_reviews():
             traceback.print_exc()
             ui.notify(error_msg, type="negative")
             return []
-        finally:
-            db.close()
 
     contract_columns = [
         {
@@ -259,7 +251,7 @@ def pending_reviews():
     contract_rows = []
     
     # Initial fetch
-    contract_rows = fetch_contracts_needing_review()
+    contract_rows = await run_db(fetch_contracts_needing_review)
     
     # Debug: Check if we have data
     print(f"Total contract rows fetched: {len(contract_rows)}")
@@ -349,6 +341,15 @@ def pending_reviews():
         
         search_input.on_value_change(filter_contracts)
         
+        async def refresh_pending_reviews():
+            """Re-read the review queue after another user changed a contract or update"""
+            nonlocal contract_rows
+            contract_rows = await run_db(fetch_contracts_needing_review)
+            count_label.text = f"Total: {len(contract_rows)} contracts"
+            filter_contracts()
+        
+        live_updates([CONTRACT_UPDATES_TOPIC, CONTRACTS_TOPIC], refresh_pending_reviews)
+        
         # Add custom CSS for visual highlighting and toggle styling
         ui.add_css("""
             .contracts-table thead tr {
@@ -535,7 +536,7 @@ def pending_reviews():
                 
                 # Actions
                 with ui.row().classes("gap-3 justify-end mt-4 w-full"):
-                    def do_complete():
+                    async def do_complete():
                         """Complete review:
                         - If decision Extend: update Contract.end_date using manager-provided date
                         - If decision Terminate: set Contract.status to Terminated (inactive)
@@ -593,7 +594,7 @@ def pending_reviews():
                                 db3.commit()
                                 ui.notify("Review completed", type="positive")
                                 # Refresh the table
-                                contract_rows = fetch_contracts_needing_review()
+                                contract_rows = await run_db(fetch_contracts_needing_review)
                                 contracts_table.rows = contract_rows
                                 contracts_table.update()
                             finally:
@@ -602,7 +603,7 @@ def pending_reviews():
                             ui.notify(f"Error completing review: {e}", type="negative")
                         contract_decision_dialog.close()
                     
-                    def do_send_back():
+                    async def do_send_back():
                         """Send back: mark update returned and save admin remarks."""
                         nonlocal contract_rows
                         try:
@@ -626,7 +627,7 @@ def pending_reviews():
                                 db3.commit()
                                 ui.notify("Sent back to Contract Manager / Backup / Owner", type="info")
                                 # Refresh the table
-                                contract_rows = fetch_contracts_needing_review()
+                                contract_rows = await run_db(fetch_contracts_needing_review)
                                 contracts_table.rows = contract_rows
                                 contracts_table.update()
                             finally:
@@ -725,14 +726,9 @@ def pending_reviews():
                 
                 dialog.open()
         
-        def generate_excel_report(start_date_str, end_date_str, dialog):
+        async def generate_excel_report(start_date_str, end_date_str, dialog):
             """Generate Excel report for pending reviews"""
             try:
-                if not PANDAS_AVAILABLE:
-                    ui.notify("Excel export requires pandas library. Please install it: pip install pandas openpyxl", type="negative")
-                    dialog.close()
-                    return
-                
                 if not contract_rows:
                     ui.notify("No pending reviews available for export", type="warning")
                     dialog.close()
@@ -751,48 +747,12 @@ def pending_reviews():
                         "My Role": contract.get('my_role', ''),
                     })
                 
-                # Create DataFrame
-                df = pd.DataFrame(report_data)
-                
-                # Create Excel file in memory
-                output = io.BytesIO()
-                with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                    df.to_excel(writer, index=False, sheet_name='Pending Reviews')
-                    
-                    # Get the worksheet
-                    worksheet = writer.sheets['Pending Reviews']
-                    
-                    # Auto-adjust column widths
-                    for column in worksheet.columns:
-                        max_length = 0
-                        column_letter = column[0].column_letter
-                        for cell in column:
-                            try:
-                                if len(str(cell.value)) > max_length:
-                                    max_length = len(str(cell.value))
-                            except (AttributeError, TypeError):
-                                pass
-                        adjusted_width = min(max_length + 2, 50)
-                        worksheet.column_dimensions[column_letter].width = adjusted_width
-                
-                output.seek(0)
-                
-                # Convert to base64 for download
-                excel_data = output.getvalue()
-                b64_data = base64.b64encode(excel_data).decode()
-                
                 # Generate filename
                 filename = f"Pending_Reviews_Report_{start_date_str}_to_{end_date_str}.xlsx"
                 
-                # Trigger download using JavaScript
-                ui.run_javascript(f'''
-                    const link = document.createElement('a');
-                    link.href = 'data:application/vnd.openxmlformats-officedocument.spreadsheetml.sheet;base64,{b64_data}';
-                    link.download = '{filename}';
-                    document.body.appendChild(link);
-                    link.click();
-                    document.body.removeChild(link);
-                ''')
+                # Build the workbook in a report worker process; the browser downloads it when ready
+                if not await export_report(filename, 'Pending Reviews', report_data):
+                    return
                 
                 ui.notify(f"Report generated successfully! {len(contract_rows)} contract(s) exported.", type="positive")
                 dialog.close()
@@ -1,56 +1,49 @@
 from datetime import datetime, timedelta
 from nicegui import ui, app
-import io
 from app.utils.navigation import get_dashboard_url
 from app.components.breadcrumb import breadcrumb
-import base64
-from app.db.database import SessionLocal
+from app.components.report_export import export_report
+from app.db.database import run_db
 from app.models.contract import User
 from app.services.contract_service import ContractService
-try:
-    import pandas as pd
-    PANDAS_AVAILABLE = True
-except ImportError:
-    PANDAS_AVAILABLE = False
 
 
-def terminated_contracts():
+async def terminated_contracts():
     # Get current logged-in user
     current_username = app.storage.user.get('username', None)
     current_user_id = None
     
     # Fetch current user from database
+    def lookup_current_user(db):
+        nonlocal current_user_id
+        if current_username:
+            # Try multiple matching strategies
+            current_user = db.query(User).filter(User.email == current_username).first()
+            if not current_user:
+                current_user = db.query(User).filter(User.email.ilike(f"%{current_username}%")).first()
+            if not current_user:
+                current_user = db.query(User).filter(User.first_name.ilike(f"%{current_username}%")).first()
+            if not current_user:
+                current_user = db.query(User).filter(User.last_name.ilike(f"%{current_username}%")).first()
+            if not current_user and ' ' in current_username:
+                parts = current_username.split()
+                if len(parts) >= 2:
+                    current_user = db.query(User).filter(
+                        User.first_name.ilike(f"%{parts[0]}%"),
+                        User.last_name.ilike(f"%{parts[-1]}%")
+                    ).first()
+            
+            if current_user:
+                current_user_id = current_user.id
+                print(f"Found current user: {current_user.first_name} {current_user.last_name} (ID: {current_user_id})")
+            else:
+                print(f"Could not find user matching: {current_username}")
+                default_user = db.query(User).first()
+                if default_user:
+                    current_user_id = default_user.id
+                    print(f"Using default user for simulation: {default_user.first_name} {default_user.last_name} (ID: {current_user_id})")
     try:
-        db = SessionLocal()
-        try:
-            if current_username:
-                # Try multiple matching strategies
-                current_user = db.query(User).filter(User.email == current_username).first()
-                if not current_user:
-                    current_user = db.query(User).filter(User.email.ilike(f"%{current_username}%")).first()
-                if not current_user:
-                    current_user = db.query(User).filter(User.first_name.ilike(f"%{current_username}%")).first()
-                if not current_user:
-                    current_user = db.query(User).filter(User.last_name.ilike(f"%{current_username}%")).first()
-                if not current_user and ' ' in current_username:
-                    parts = current_username.split()
-                    if len(parts) >= 2:
-                        current_user = db.query(User).filter(
-                            User.first_name.ilike(f"%{parts[0]}%"),
-                            User.last_name.ilike(f"%{parts[-1]}%")
-                        ).first()
-                
-                if current_user:
-                    current_user_id = current_user.id
-                    print(f"Found current user: {current_user.first_name} {current_user.last_name} (ID: {current_user_id})")
-                else:
-                    print(f"Could not find user matching: {current_username}")
-                    default_user = db.query(User).first()
-                    if default_user:
-                        current_user_id = default_user.id
-                        print(f"Using default user for simulation: {default_user.first_name} {default_user.last_name} (ID: {current_user_id})")
-        finally:
-            db.close()
+        await run_db(lookup_current_user)
     except Exception as e:
         print(f"Error fetching current user: {e}")
         import traceback
@@ -64,9 +57,8 @@ def terminated_contracts():
     contract_rows = []
 
     # Fetch terminated contracts from backend
-    def fetch_terminated_contracts():
+    def fetch_terminated_contracts(db):
         """Load contracts with status Terminated from the database."""
-        db = SessionLocal()
         try:
             contract_service = ContractService(db)
             contracts, _ = contract_service.get_terminated_contracts(skip=0, limit=1000)
@@ -121,8 +113,6 @@ def terminated_contracts():
             import traceback
             traceback.print_exc()
             return []
-        finally:
-            db.close()
 
     contract_columns = [
         {
@@ -180,7 +170,7 @@ def terminated_contracts():
         "headerClasses": "bg-[#144c8e] text-white",
     }
 
-    contract_rows = fetch_terminated_contracts()
+    contract_rows = await run_db(fetch_terminated_contracts)
     
     # Main container
     with ui.element("div").classes("max-w-6xl mt-8 mx-auto w-full"):
@@ -325,7 +315,7 @@ def terminated_contracts():
                 
                 dialog.open()
         
-        def generate_excel_report(start_date_str, end_date_str, dialog):
+        async def generate_excel_report(start_date_str, end_date_str, dialog):
             """Generate Excel report for terminated contracts within date range"""
             try:
                 # Parse dates
@@ -354,11 +344,6 @@ def terminated_contracts():
                     dialog.close()
                     return
                 
-                if not PANDAS_AVAILABLE:
-                    ui.notify("Excel export requires pandas library. Please install it: pip install pandas openpyxl", type="negative")
-                    dialog.close()
-                    return
-                
                 # Prepare data for Excel
                 report_data = []
                 for contract in filtered_contracts:
@@ -375,48 +360,12 @@ def terminated_contracts():
                         "Date Terminated in system": contract.get('date_terminated', ''),
                     })
                 
-                # Create DataFrame
-                df = pd.DataFrame(report_data)
-                
-                # Create Excel file in memory
-                output = io.BytesIO()
-                with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                    df.to_excel(writer, index=False, sheet_name='Terminated Contracts')
-                    
-                    # Get the worksheet
-                    worksheet = writer.sheets['Terminated Contracts']
-                    
-                    # Auto-adjust column widths
-                    for column in worksheet.columns:
-                        max_length = 0
-                        column_letter = column[0].column_letter
-                        for cell in column:
-                            try:
-                                if len(str(cell.value)) > max_length:
-                                    max_length = len(str(cell.value))
-                            except (AttributeError, TypeError):
-                                pass
-                        adjusted_width = min(max_length + 2, 50)
-                        worksheet.column_dimensions[column_letter].width = adjusted_width
-                
-                output.seek(0)
-                
-                # Convert to base64 for download
-                excel_data = output.getvalue()
-                b64_data = base64.b64encode(excel_data).decode()
-                
                 # Generate filename
                 filename = f"Terminated_Contracts_Report_{start_date_str}_to_{end_date_str}.xlsx"
                 
-                # Trigger download using JavaScript
-                ui.run_javascript(f'''
-                    const link = document.createElement('a');
-                    link.href = 'data:application/vnd.openxmlformats-officedocument.spreadsheetml.sheet;base64,{b64_data}';
-                    link.download = '{filename}';
-                    document.body.appendChild(link);
-                    link.click();
-                    document.body.removeChild(link);
-                ''')
+                # Build the workbook in a report worker process; the browser downloads it when ready
+                if not await export_report(filename, 'Terminated Contracts', report_data):
+                    return
                 
                 ui.notify(f"Report generated successfully! {len(filtered_contracts)} contract(s) exported.", type="positive")
                 dialog.close()
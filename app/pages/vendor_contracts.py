@@ -6,8 +6,7 @@ from app.components.breadcrumb import breadcrumb
 from app.services.contract_service import ContractService
 from app.models.contract import ContractStatusType, ContractType, DepartmentType
 from sqlalchemy.orm import joinedload
-import base64
-import os
+from app.pages.document_files import contract_document_url
 
 
 def vendor_contracts(vendor_id: int):
@@ -263,23 +262,15 @@ def vendor_contracts(vendor_id: int):
             details_container = ui.column().classes("w-full")
             
             # View/Download document handlers
-            def make_download_handler(doc_path, doc_name, file_name):
+            def make_view_handler(contract_id, doc_id):
+                def view_document():
+                    ui.navigate.to(contract_document_url(contract_id, doc_id, inline=True), new_tab=True)
+                return view_document
+
+            def make_download_handler(contract_id, doc_id, file_name):
                 def download_document():
-                    if os.path.exists(doc_path):
-                        with open(doc_path, 'rb') as f:
-                            file_content = f.read()
-                        b64_content = base64.b64encode(file_content).decode()
-                        ui.run_javascript(f'''
-                            const link = document.createElement('a');
-                            link.href = 'data:application/pdf;base64,{b64_content}';
-                            link.download = '{file_name}';
-                            document.body.appendChild(link);
-                            link.click();
-                            document.body.removeChild(link);
-                        ''')
-                        ui.notify(f"Downloaded {doc_name}", type="positive")
-                    else:
-                        ui.notify(f"File not found: {doc_name}", type="negative")
+                    # Browser fetches the file itself (Range/ETag capable), not over the websocket
+                    ui.download(contract_document_url(contract_id, doc_id), filename=file_name)
                 return download_document
             
             def show_contract_details(contract_obj):
@@ -354,13 +345,8 @@ def vendor_contracts(vendor_id: int):
                                     view_btn = ui.button("View", icon="visibility").props('color=primary flat size=sm')
                                     download_btn = ui.button("Download", icon="download").props('color=secondary flat size=sm')
                                     
-                                    def make_view_handler(doc_path, doc_name, file_name):
-                                        def view_document():
-                                            make_download_handler(doc_path, doc_name, file_name)()
-                                        return view_document
-                                    
-                                    view_btn.on_click(make_view_handler(doc.file_path, doc.custom_document_name, doc.file_name))
-                                    download_btn.on_click(make_download_handler(doc.file_path, doc.custom_document_name, doc.file_name))
+                                    view_btn.on_click(make_view_handler(contract.id, doc.id))
+                                    download_btn.on_click(make_download_handler(contract.id, doc.id, doc.file_name))
             
             # Close button
             with ui.row().classes("justify-end mt-4 w-full"):
@@ -2,6 +2,7 @@ from nicegui import ui
 from datetime import datetime, date
 from app.utils.navigation import get_dashboard_url
 from app.components.breadcrumb import breadcrumb
+from app.pages.document_files import vendor_document_url
 from app.models.vendor import DocumentType
 
 def vendor_info(vendor_id: int):
@@ -639,31 +640,15 @@ def vendor_info(vendor_id: int):
                                                 edit_btn = ui.button(icon="edit").props('color=orange flat round size=sm').tooltip('Edit')
                                                 delete_btn = ui.button(icon="delete").props('color=negative flat round size=sm').tooltip('Delete')
                                                 
-                                                def make_view_handler(doc_path, doc_name, file_name):
+                                                def make_view_handler(doc_id):
                                                     def view_document():
-                                                        ui.notify(f"Opening {doc_name}...", type="info")
-                                                        make_download_handler(doc_path, doc_name, file_name)()
+                                                        ui.navigate.to(vendor_document_url(vendor.id, doc_id, inline=True), new_tab=True)
                                                     return view_document
                                                 
-                                                def make_download_handler(doc_path, doc_name, file_name):
+                                                def make_download_handler(doc_id, file_name):
                                                     def download_document():
-                                                        import os
-                                                        if os.path.exists(doc_path):
-                                                            with open(doc_path, 'rb') as f:
-                                                                file_content = f.read()
-                                                            import base64
-                                                            b64_content = base64.b64encode(file_content).decode()
-                                                            ui.run_javascript(f'''
-                                                                const link = document.createElement('a');
-                                                                link.href = 'data:application/pdf;base64,{b64_content}';
-                                                                link.download = '{file_name}';
-                                                                document.body.appendChild(link);
-                                                                link.click();
-                                                                document.body.removeChild(link);
-                                                            ''')
-                                                            ui.notify(f"Downloaded {doc_name}", type="positive")
-                                                        else:
-                                                            ui.notify(f"File not found: {doc_name}", type="negative")
+                                                        # Browser fetches the file itself (Range/ETag capable), not over the websocket
+                                                        ui.download(vendor_document_url(vendor.id, doc_id), filename=file_name)
                                                     return download_document
                                                 
                                                 def open_edit_dialog(doc_obj):
@@ -754,8 +739,8 @@ def vendor_info(vendor_id: int):
                                                         
                                                         confirm_dialog.open()
                                                 
-                                                view_btn.on_click(make_view_handler(doc.file_path, doc.custom_document_name, doc.file_name))
-                                                download_btn.on_click(make_download_handler(doc.file_path, doc.custom_document_name, doc.file_name))
+                                                view_btn.on_click(make_view_handler(doc.id))
+                                                download_btn.on_click(make_download_handler(doc.id, doc.file_name))
                                                 edit_btn.on_click(lambda d=doc: open_edit_dialog(d))
                                                 delete_btn.on_click(lambda d=doc: confirm_delete(d))
                                 else:
@@ -1,22 +1,16 @@
 from nicegui import ui
-import io
 from app.utils.navigation import get_dashboard_url
 from app.components.breadcrumb import breadcrumb
-import base64
+from app.components.report_export import export_report
 from datetime import date, datetime
-from app.db.database import SessionLocal
+from app.db.database import run_db
 from app.services.vendor_service import VendorService
 from app.models.vendor import VendorStatusType
 from app.models.contract import ContractType, DepartmentType, ContractStatusType
 from sqlalchemy.orm import joinedload
-try:
-    import pandas as pd
-    PANDAS_AVAILABLE = True
-except ImportError:
-    PANDAS_AVAILABLE = False
 
 
-def vendors_list():
+async def vendors_list():
     # Breadcrumb navigation
     with ui.row().classes("max-w-6xl mx-auto mt-4"):
         breadcrumb([("Home", get_dashboard_url()), ("Vendors", None)])
@@ -29,12 +23,11 @@ def vendors_list():
     
     
     # Fetch vendors directly from database service
-    def fetch_vendors():
+    def fetch_vendors(db):
         """
         Fetches vendors directly from the database service.
         This avoids HTTP requests and circular dependencies.
         """
-        db = SessionLocal()
         try:
             vendor_service = VendorService(db)
             
@@ -142,8 +135,6 @@ def vendors_list():
             traceback.print_exc()
             ui.notify(error_msg, type="negative")
             return []
-        finally:
-            db.close()
     
     # Define table columns
     vendor_columns = [
@@ -207,7 +198,7 @@ def vendors_list():
     vendor_rows = []
     
     # Initial fetch
-    vendor_rows = fetch_vendors()
+    vendor_rows = await run_db(fetch_vendors)
     
     # Debug: Check if we have data
     print(f"Total vendor rows fetched: {len(vendor_rows)}")
@@ -377,17 +368,9 @@ def vendors_list():
 
                 dialog.open()
 
-        def generate_excel_report(dialog):
+        async def generate_excel_report(dialog):
             """Generate an Excel report for the currently visible vendor rows."""
             try:
-                if not PANDAS_AVAILABLE:
-                    ui.notify(
-                        "Excel export requires pandas. Please install: pip install pandas openpyxl",
-                        type="negative",
-                    )
-                    dialog.close()
-                    return
-
                 if not vendors_table:
                     ui.notify("Table is not ready yet", type="warning")
                     dialog.close()
@@ -412,37 +395,12 @@ def vendors_list():
                         "Active Contracts": v.get("active_contracts", 0),
                     })
 
-                df = pd.DataFrame(report_data)
-
-                output = io.BytesIO()
-                with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                    df.to_excel(writer, index=False, sheet_name='Vendors Report')
-
-                    worksheet = writer.sheets['Vendors Report']
-                    for column in worksheet.columns:
-                        max_length = 0
-                        column_letter = column[0].column_letter
-                        for cell in column:
-                            try:
-                                max_length = max(max_length, len(str(cell.value)))
-                            except (AttributeError, TypeError):
-                                pass
-                        worksheet.column_dimensions[column_letter].width = min(max_length + 2, 50)
-
-                output.seek(0)
-                b64_data = base64.b64encode(output.getvalue()).decode()
-
                 today = datetime.now().strftime("%Y-%m-%d")
                 filename = f"Vendors_Report_{today}.xlsx"
 
-                ui.run_javascript(f'''
-                    const link = document.createElement('a');
-                    link.href = 'data:application/vnd.openxmlformats-officedocument.spreadsheetml.sheet;base64,{b64_data}';
-                    link.download = '{filename}';
-                    document.body.appendChild(link);
-                    link.click();
-                    document.body.removeChild(link);
-                ''')
+                # Build the workbook in a report worker process; the browser downloads it when ready
+                if not await export_report(filename, 'Vendors Report', report_data):
+                    return
 
                 ui.notify(f"Report generated successfully! {len(visible_rows)} vendor(s) exported.", type="positive")
                 dialog.close()
@@ -451,7 +409,7 @@ def vendors_list():
                 import traceback
                 traceback.print_exc()
         
-        def clear_filters():
+        async def clear_filters():
             """Clear both search and all filters"""
             nonlocal status_filter, vendor_rows
             search_input.value = ""
@@ -462,7 +420,7 @@ def vendors_list():
             status_filter = None
             
             # Refresh vendors without filters
-            vendor_rows = fetch_vendors()
+            vendor_rows = await run_db(fetch_vendors)
             apply_filters()  # This will update count and show/hide no results message
             ui.notify("All filters and search cleared", type="info")
         
@@ -205,6 +205,20 @@ class ContractCreate(ContractBase):
     pass
 
 
+class ContractImportRowError(BaseModel):
+    row: int = Field(..., description="Row number in the uploaded file (header is row 1 for CSV / XLSX)")
+    errors: List[str]
+
+
+class ContractImportResponse(BaseModel):
+    total_rows: int
+    created: int
+    failed: int
+    dry_run: bool
+    contract_ids: List[str] = []
+    errors: List[ContractImportRowError] = []
+
+
 class ContractUpdate(BaseModel):
     contract_description: Optional[str] = Field(None, min_length=1, max_length=100)
     contract_type: Optional[ContractType] = None
@@ -419,8 +419,20 @@ class UserSession(UserSessionBase):
 
 
 # Health check schema
+class ScheduledJobStatus(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    job_name: str
+    status: str
+    affected_count: int = 0
+    error: Optional[str] = None
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+
+
 class HealthCheck(BaseModel):
     status: str = "healthy"
     timestamp: datetime
     version: str
-    database: str = "connected"
\ No newline at end of file
+    database: str = "connected"
+    expiry_sweep: Optional[ScheduledJobStatus] = None
\ No newline at end of file
@@ -0,0 +1,194 @@
+from typing import Any, Callable, List, Optional, TypeVar
+
+from sqlalchemy.orm import Session
+
+from app.db.database import run_db
+from app.models.contract import ContractStatusType
+from app.schemas.contract import ContractSummary
+from app.services.contract_service import ContractService
+from app.services.vendor_service import VendorService
+
+T = TypeVar("T")
+
+# Optional callable applied to each returned ORM object while the session is
+# still open, so pages can touch relationships (vendor, owners, ...) safely.
+RowBuilder = Optional[Callable[[Any], Any]]
+
+
+def _build_rows(items: List[Any], build: RowBuilder) -> List[Any]:
+    if build is None:
+        return items
+    return [build(item) for item in items]
+
+
+def _build_page(result: tuple, build: RowBuilder) -> tuple:
+    items, total_count = result
+    return _build_rows(items, build), total_count
+
+
+class AsyncContractService:
+    """
+    Awaitable read paths of ContractService for NiceGUI pages.
+
+    Every call runs in its own session via run_db, so a slow query no longer
+    blocks the event loop (and every other connected client's websocket).
+    """
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run fn(service, *args, **kwargs) with a ContractService bound to a fresh session
+        """
+        def call(db: Session) -> T:
+            return fn(ContractService(db), *args, **kwargs)
+        return await run_db(call)
+
+    async def get_contract_by_id(self, contract_id: int, build: RowBuilder = None, profile: Optional[str] = "detail"):
+        def call(service: ContractService):
+            contract = service.get_contract_by_id(contract_id, profile=profile)
+            if contract is None or build is None:
+                return contract
+            return build(contract)
+        return await self.run(call)
+
+    async def search_and_filter_contracts(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        search: Optional[str] = None,
+        status: Optional[ContractStatusType] = None,
+        contract_type: Optional[str] = None,
+        department: Optional[str] = None,
+        owner_id: Optional[int] = None,
+        vendor_id: Optional[int] = None,
+        expiring_soon: Optional[bool] = None,
+        build: RowBuilder = None
+    ) -> tuple[List[Any], int]:
+        """
+        Async search_and_filter_contracts
+        Returns: (contracts or built rows, total_count)
+        """
+        def call(service: ContractService):
+            return _build_page(
+                service.search_and_filter_contracts(
+                    skip=skip,
+                    limit=limit,
+                    search=search,
+                    status=status,
+                    contract_type=contract_type,
+                    department=department,
+                    owner_id=owner_id,
+                    vendor_id=vendor_id,
+                    expiring_soon=expiring_soon
+                ),
+                build
+            )
+        return await self.run(call)
+
+    async def get_contracts_page(self, build: RowBuilder = None, **filters) -> tuple[List[Any], int, Optional[tuple]]:
+        """
+        Async get_contracts_page (same keyword arguments)
+        Returns: (contracts or built rows, total_count, next_cursor)
+        """
+        def call(service: ContractService):
+            contracts, total_count, next_cursor = service.get_contracts_page(**filters)
+            return _build_rows(contracts, build), total_count, next_cursor
+        return await self.run(call)
+
+    async def get_contracts_needing_review(
+        self, skip: int = 0, limit: int = 1000, days_ahead: int = 90, build: RowBuilder = None
+    ) -> tuple[List[Any], int]:
+        return await self.run(
+            lambda service: _build_page(service.get_contracts_needing_review(skip, limit, days_ahead), build)
+        )
+
+    async def get_contracts_requiring_attention(
+        self, skip: int = 0, limit: int = 1000, days_ahead: int = 30, build: RowBuilder = None
+    ) -> tuple[List[Any], int]:
+        return await self.run(
+            lambda service: _build_page(service.get_contracts_requiring_attention(skip, limit, days_ahead), build)
+        )
+
+    async def get_contracts_pending_admin_review(
+        self, skip: int = 0, limit: int = 1000, build: RowBuilder = None
+    ) -> tuple[List[Any], int]:
+        return await self.run(
+            lambda service: _build_page(service.get_contracts_pending_admin_review(skip, limit), build)
+        )
+
+    async def get_contracts_awaiting_termination_document(
+        self, skip: int = 0, limit: int = 1000, build: RowBuilder = None
+    ) -> tuple[List[Any], int]:
+        return await self.run(
+            lambda service: _build_page(service.get_contracts_awaiting_termination_document(skip, limit), build)
+        )
+
+    async def get_terminated_contracts(
+        self, skip: int = 0, limit: int = 1000, build: RowBuilder = None
+    ) -> tuple[List[Any], int]:
+        return await self.run(
+            lambda service: _build_page(service.get_terminated_contracts(skip, limit), build)
+        )
+
+    async def get_users(self, active_only: bool = True, build: RowBuilder = None) -> List[Any]:
+        return await self.run(lambda service: _build_rows(service.get_users(active_only), build))
+
+    async def get_contract_summary(self) -> ContractSummary:
+        return await self.run(lambda service: service.get_contract_summary())
+
+    async def get_manager_dashboard_data(self, user_id: int) -> dict:
+        """
+        Manager dashboard counters (contract lists are left out, they would be detached)
+        """
+        def call(service: ContractService) -> dict:
+            data = service.get_manager_dashboard_data(user_id, include_lists=False)
+            return {key: value for key, value in data.items() if not isinstance(value, list)}
+        return await self.run(call)
+
+    async def get_admin_dashboard_data(self) -> dict:
+        """
+        Admin dashboard counters (contract lists are left out, they would be detached)
+        """
+        def call(service: ContractService) -> dict:
+            data = service.get_admin_dashboard_data(include_lists=False)
+            return {key: value for key, value in data.items() if not isinstance(value, list)}
+        return await self.run(call)
+
+
+class AsyncVendorService:
+    """
+    Awaitable read paths of VendorService for NiceGUI pages.
+    """
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run fn(service, *args, **kwargs) with a VendorService bound to a fresh session
+        """
+        def call(db: Session) -> T:
+            return fn(VendorService(db), *args, **kwargs)
+        return await run_db(call)
+
+    async def get_vendor_by_id(self, vendor_id: int, build: RowBuilder = None):
+        def call(service: VendorService):
+            vendor = service.get_vendor_by_id(vendor_id)
+            if vendor is None or build is None:
+                return vendor
+            return build(vendor)
+        return await self.run(call)
+
+    async def get_active_vendors(self, skip: int = 0, limit: int = 1000, build: RowBuilder = None) -> List[Any]:
+        return await self.run(lambda service: _build_rows(service.get_active_vendors(skip, limit), build))
+
+    async def get_vendors(self, skip: int = 0, limit: int = 100, build: RowBuilder = None) -> List[Any]:
+        return await self.run(lambda service: _build_rows(service.get_vendors(skip, limit), build))
+
+    async def get_vendors_with_filters(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        status_filter: Optional[str] = None,
+        search: Optional[str] = None,
+        build: RowBuilder = None
+    ) -> tuple[List[Any], int]:
+        return await self.run(
+            lambda service: _build_page(service.get_vendors_with_filters(skip, limit, status_filter, search), build)
+        )
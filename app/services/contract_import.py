@@ -0,0 +1,132 @@
+"""
+Bulk contract import (POST /contracts/bulk).
+
+All rows are parsed with ContractCreate first, then vendor / user existence is
+checked for the whole file with a few IN queries, contract IDs are allocated
+as one block from id_counters and the contracts are inserted with executemany
+in contract_import_batch_size chunks, all in one transaction. Per-row errors
+are reported with the row number from the file.
+"""
+from datetime import datetime
+from typing import Dict, Iterable, List, Tuple
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.constants import ErrorMessages, HTTPStatus
+from app.core.events import CONTRACTS_TOPIC, event_bus
+from app.core.imports import ImportRow
+from app.models.contract import Contract, ContractStatusType
+from app.schemas.contract import ContractCreate
+from app.services.contract_service import ContractService
+from app.services.dashboard_stats_service import DashboardStatsService, stats_entry
+from app.services.id_allocator import IdAllocator
+from app.services.search_index import reindex_contracts
+
+
+def _validation_messages(error: ValidationError) -> List[str]:
+    messages = []
+    for detail in error.errors():
+        field = ".".join(str(part) for part in detail.get("loc", ()))
+        messages.append(f"{field}: {detail['msg']}" if field else detail["msg"])
+    return messages
+
+
+class ContractImportService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.contract_service = ContractService(db)
+
+    def import_rows(self, rows: Iterable[ImportRow], dry_run: bool = False, partial: bool = False) -> dict:
+        """
+        Validate and insert contracts from parsed file rows.
+
+        Nothing is inserted if any row fails unless partial=True (then the
+        valid rows are), and nothing at all with dry_run=True.
+        """
+        parsed: List[Tuple[int, ContractCreate]] = []
+        errors: List[Dict] = []
+        total_rows = 0
+        for row_number, values in rows:
+            total_rows += 1
+            if total_rows > settings.contract_import_max_rows:
+                raise HTTPException(
+                    status_code=HTTPStatus.PAYLOAD_TOO_LARGE,
+                    detail=f"{ErrorMessages.TOO_MANY_IMPORT_ROWS} ({settings.contract_import_max_rows})",
+                )
+            if "__error__" in values:
+                errors.append({"row": row_number, "errors": [values["__error__"]]})
+                continue
+            try:
+                parsed.append((row_number, ContractCreate(**values)))
+            except ValidationError as e:
+                errors.append({"row": row_number, "errors": _validation_messages(e)})
+
+        requirement_errors = self.contract_service.validate_contract_creation_requirements_bulk(
+            [contract for _, contract in parsed]
+        )
+        valid = []
+        for (row_number, contract), row_errors in zip(parsed, requirement_errors):
+            if row_errors:
+                errors.append({"row": row_number, "errors": row_errors})
+            else:
+                valid.append(contract)
+        errors.sort(key=lambda error: error["row"])
+
+        to_create = [] if dry_run or (errors and not partial) else valid
+        contract_ids = self._insert_contracts(to_create) if to_create else []
+        return {
+            "total_rows": total_rows,
+            "created": len(contract_ids),
+            "failed": len(errors),
+            "dry_run": dry_run,
+            "contract_ids": contract_ids,
+            "errors": errors,
+        }
+
+    def _insert_contracts(self, contracts: List[ContractCreate]) -> List[str]:
+        """
+        Insert validated contracts in one transaction; returns their contract IDs
+        """
+        contract_ids = IdAllocator(self.db).next_ids("CT", len(contracts))
+        now = datetime.utcnow()
+        batch_size = max(1, settings.contract_import_batch_size)
+        new_ids: List[int] = []
+        try:
+            for start in range(0, len(contracts), batch_size):
+                batch_ids = contract_ids[start:start + batch_size]
+                self.db.execute(
+                    insert(Contract),
+                    [
+                        {
+                            **contract.model_dump(),
+                            "contract_id": contract_id,
+                            "status": ContractStatusType.ACTIVE,
+                            "created_at": now,
+                            "updated_at": now,
+                        }
+                        for contract_id, contract in zip(batch_ids, contracts[start:start + batch_size])
+                    ],
+                )
+                batch_pks = list(self.db.scalars(select(Contract.id).where(Contract.contract_id.in_(batch_ids))))
+                # Bulk inserts bypass the per-object flush hooks: index and count the rows here
+                reindex_contracts(self.db.connection(), batch_pks)
+                new_ids.extend(batch_pks)
+
+            DashboardStatsService(self.db).apply_changes(added=[
+                stats_entry(
+                    ContractStatusType.ACTIVE, contract.department, contract.contract_currency,
+                    contract.contract_amount, contract.end_date,
+                )
+                for contract in contracts
+            ])
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        event_bus.publish(CONTRACTS_TOPIC, {"ids": sorted(new_ids)})
+        return contract_ids
@@ -1,18 +1,73 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import or_, and_, case, cast, func, BigInteger, String
 from typing import List, Optional
 from datetime import datetime, date, timedelta
 from decimal import Decimal
 import os
-import uuid
 from fastapi import UploadFile, HTTPException
 
-from app.models.contract import Contract, User, ContractDocument, TerminationDocument, ContractStatusType, ContractUpdateStatus
+from app.models.contract import Contract, User, UserRole, ContractDocument, TerminationDocument, ContractStatusType, ContractUpdateStatus
 from app.models.contract import ContractUpdate as ContractUpdateModel
-import shutil
 from app.models.vendor import Vendor
 from app.schemas.contract import ContractCreate, ContractUpdate, UserCreate, ContractSummary
 from app.services.vendor_service import VendorService
+from app.services.id_allocator import IdAllocator
+from app.services import document_store
+from app.services.upload_storage import StoredUpload, store_pdf_upload
+from app.services.dashboard_stats_service import DashboardStatsService
+from app.services.expiry_sweeper import ExpirySweeper
+from app.services.search_index import CONTRACT, search_index
+from app.core.cache import reference_cache, USERS_NAMESPACE
+from app.core.constants import FileConstants
+
+# Named eager-loading profiles: the relationships a caller is going to touch,
+# loaded with the parent query instead of one lazy SELECT per row.
+#   list_row  - table rows (vendor name, contract manager and backup names)
+#   detail    - contract info (all people plus documents)
+#   dashboard - dashboard summary items (vendor name, contract manager name)
+CONTRACT_LOAD_PROFILES = {
+    "list_row": lambda: [
+        joinedload(Contract.vendor),
+        joinedload(Contract.contract_owner),
+        joinedload(Contract.contract_owner_backup),
+    ],
+    "detail": lambda: [
+        joinedload(Contract.vendor),
+        joinedload(Contract.contract_owner),
+        joinedload(Contract.contract_owner_backup),
+        joinedload(Contract.contract_owner_manager),
+        selectinload(Contract.documents),
+        selectinload(Contract.termination_documents),
+    ],
+    "dashboard": lambda: [
+        joinedload(Contract.vendor),
+        joinedload(Contract.contract_owner),
+    ],
+}
+
+
+def contract_load_options(profile: Optional[str]) -> list:
+    """
+    Loader options for a named profile (None = plain lazy loading)
+    """
+    if profile is None:
+        return []
+    if profile not in CONTRACT_LOAD_PROFILES:
+        raise ValueError(f"Unknown contract load profile: {profile}")
+    return CONTRACT_LOAD_PROFILES[profile]()
+
+
+# Column headers of iter_contract_export_rows / GET /contracts/export
+CONTRACT_EXPORT_COLUMNS = (
+    "id", "contract_id", "vendor_name", "contract_description", "contract_type",
+    "start_date", "end_date", "contract_amount", "contract_currency", "department",
+    "status", "contract_owner_name", "created_at",
+)
+
+
+def _export_value(value):
+    """Enum members as their value, everything else unchanged"""
+    return value.value if hasattr(value, "value") else value
 
 
 class ContractService:
@@ -25,123 +80,78 @@ class ContractService:
         Generate unique contract ID with CT prefix
         Format: CT1, CT2, CT3, etc.
         """
-        # Get all existing contract IDs with CT prefix
-        existing_contracts = (
-            self.db.query(Contract.contract_id)
-            .filter(Contract.contract_id.like("CT%"))
-            .all()
-        )
-        
-        # Extract numeric parts and find the maximum
-        existing_numbers = []
-        for (contract_id,) in existing_contracts:
-            try:
-                number = int(contract_id[2:])  # Remove CT prefix
-                existing_numbers.append(number)
-            except ValueError:
-                continue
-        
-        # Generate next number
-        if existing_numbers:
-            next_number = max(existing_numbers) + 1
-        else:
-            next_number = 1
-        
-        new_contract_id = f"CT{next_number}"
-        
-        # Verify it doesn't exist (safety check)
-        existing = self.db.query(Contract).filter(
-            Contract.contract_id == new_contract_id
-        ).first()
-        
-        if existing:
-            # If somehow it exists, keep incrementing until we find a free one
-            while existing:
-                next_number += 1
-                new_contract_id = f"CT{next_number}"
-                existing = self.db.query(Contract).filter(
-                    Contract.contract_id == new_contract_id
-                ).first()
-        
-        return new_contract_id
+        return IdAllocator(self.db).next_id("CT")
 
     def generate_user_id(self) -> str:
         """
         Generate unique user ID with U prefix
         Format: U1, U2, U3, etc.
         """
-        # Get all existing user IDs with U prefix
-        existing_users = (
-            self.db.query(User.user_id)
-            .filter(User.user_id.like("U%"))
-            .all()
-        )
-        
-        # Extract numeric parts and find the maximum
-        existing_numbers = []
-        for (user_id,) in existing_users:
-            try:
-                number = int(user_id[1:])  # Remove U prefix
-                existing_numbers.append(number)
-            except ValueError:
-                continue
-        
-        # Generate next number
-        if existing_numbers:
-            next_number = max(existing_numbers) + 1
-        else:
-            next_number = 1
-        
-        new_user_id = f"U{next_number}"
-        
-        # Verify it doesn't exist (safety check)
-        existing = self.db.query(User).filter(
-            User.user_id == new_user_id
-        ).first()
-        
-        if existing:
-            # If somehow it exists, keep incrementing until we find a free one
-            while existing:
-                next_number += 1
-                new_user_id = f"U{next_number}"
-                existing = self.db.query(User).filter(
-                    User.user_id == new_user_id
-                ).first()
-        
-        return new_user_id
+        return IdAllocator(self.db).next_id("U")
 
     def validate_contract_creation_requirements(self, contract_data: ContractCreate) -> List[str]:
         """
         Validate all contract creation requirements and return list of errors
         """
-        errors = []
-        
-        # Check if vendor exists
-        vendor = self.db.query(Vendor).filter(Vendor.id == contract_data.vendor_id).first()
-        if not vendor:
-            errors.append("Selected vendor does not exist")
-        
-        # Check if users exist
-        users_to_check = [
-            (contract_data.contract_owner_id, "Contract Owner"),
-            (contract_data.contract_owner_backup_id, "Contract Owner Backup"),
-            (contract_data.contract_owner_manager_id, "Contract Owner Manager")
-        ]
-        
-        for user_id, role in users_to_check:
-            user = self.db.query(User).filter(User.id == user_id, User.is_active == True).first()
-            if not user:
-                errors.append(f"{role} does not exist or is inactive")
-        
-        # Check date logic
-        if contract_data.end_date <= contract_data.start_date:
-            errors.append("Contract end date must be after start date")
-        
-        # Check if start date is not too far in the past (optional business rule)
-        if contract_data.start_date < date.today() - timedelta(days=365):
-            errors.append("Contract start date cannot be more than 1 year in the past")
-        
-        return errors
+        return self.validate_contract_creation_requirements_bulk([contract_data])[0]
+
+    def validate_contract_creation_requirements_bulk(self, contracts: List[ContractCreate]) -> List[List[str]]:
+        """
+        validate_contract_creation_requirements for many contracts at once:
+        vendors and users are looked up with IN queries instead of per row.
+        Returns one list of errors per contract.
+        """
+        existing_vendor_ids = self._existing_ids(Vendor.id, {c.vendor_id for c in contracts})
+        active_user_ids = self._existing_ids(
+            User.id,
+            {
+                user_id
+                for c in contracts
+                for user_id in (c.contract_owner_id, c.contract_owner_backup_id, c.contract_owner_manager_id)
+            },
+            User.is_active == True,
+        )
+        earliest_start = date.today() - timedelta(days=365)
+
+        all_errors = []
+        for contract_data in contracts:
+            errors = []
+            
+            # Check if vendor exists
+            if contract_data.vendor_id not in existing_vendor_ids:
+                errors.append("Selected vendor does not exist")
+            
+            # Check if users exist
+            users_to_check = [
+                (contract_data.contract_owner_id, "Contract Owner"),
+                (contract_data.contract_owner_backup_id, "Contract Owner Backup"),
+                (contract_data.contract_owner_manager_id, "Contract Owner Manager")
+            ]
+            for user_id, role in users_to_check:
+                if user_id not in active_user_ids:
+                    errors.append(f"{role} does not exist or is inactive")
+            
+            # Check date logic
+            if contract_data.end_date <= contract_data.start_date:
+                errors.append("Contract end date must be after start date")
+            
+            # Check if start date is not too far in the past (optional business rule)
+            if contract_data.start_date < earliest_start:
+                errors.append("Contract start date cannot be more than 1 year in the past")
+            
+            all_errors.append(errors)
+        return all_errors
+
+    def _existing_ids(self, column, ids, *criteria, chunk_size: int = 1000) -> set:
+        """
+        Subset of ids present in column (IN queries of chunk_size; MSSQL allows ~2100 parameters)
+        """
+        ids = sorted(ids)
+        found = set()
+        for start in range(0, len(ids), chunk_size):
+            chunk = ids[start:start + chunk_size]
+            found.update(value for (value,) in self.db.query(column).filter(column.in_(chunk), *criteria))
+        return found
 
     def create_contract(self, contract_data: ContractCreate) -> Contract:
         """
@@ -201,22 +211,10 @@ class ContractService:
     def check_and_update_expired_contracts(self) -> int:
         """
         Auto-update contracts that have passed end_date to Expired status
+        (set-based, in batches - see ExpirySweeper)
         Returns number of contracts updated
         """
-        expired_contracts = self.db.query(Contract).filter(
-            Contract.end_date < date.today(),
-            Contract.status == ContractStatusType.ACTIVE
-        ).all()
-        
-        for contract in expired_contracts:
-            contract.status = ContractStatusType.EXPIRED
-            contract.last_modified_by = "SYSTEM"
-            contract.last_modified_date = datetime.utcnow()
-        
-        if expired_contracts:
-            self.db.commit()
-        
-        return len(expired_contracts)
+        return ExpirySweeper(self.db).expire_overdue_contracts()
 
     async def upload_contract_document(
         self,
@@ -228,8 +226,8 @@ class ContractService:
         """
         Upload and save contract document with custom name and signed date
         """
-        # Validate PDF file
-        if not self.vendor_service.validate_pdf_file(file):
+        # Validate upload metadata; the content is checked while it is stored
+        if not self.vendor_service.is_pdf_upload(file):
             raise HTTPException(status_code=400, detail="Only valid PDF files are allowed")
         
         # Validate custom document name
@@ -249,7 +247,7 @@ class ContractService:
             raise HTTPException(status_code=404, detail="Contract not found")
         
         # Save file
-        file_path = await self.save_uploaded_file(file, contract.contract_id, "contract")
+        stored = await self.save_uploaded_file(file, contract.contract_id, "contract")
         
         # Create document record
         document = ContractDocument(
@@ -257,8 +255,9 @@ class ContractService:
             file_name=file.filename,
             custom_document_name=custom_document_name.strip(),
             document_signed_date=document_signed_date,
-            file_path=file_path,
-            file_size=file.size,
+            file_path=stored.file_path,
+            file_size=stored.file_size,
+            sha256=stored.sha256,
             content_type=file.content_type
         )
         
@@ -268,6 +267,14 @@ class ContractService:
         
         return document
 
+    def get_contract_document(self, contract_id: int, doc_id: int) -> Optional[ContractDocument]:
+        """Get a single contract document by contract and document id."""
+        return (
+            self.db.query(ContractDocument)
+            .filter(ContractDocument.contract_id == contract_id, ContractDocument.id == doc_id)
+            .first()
+        )
+
     # --- Termination documents (separate from contract documents) ---
     async def upload_termination_document(
         self,
@@ -277,8 +284,38 @@ class ContractService:
         document_date: date
     ) -> TerminationDocument:
         """Upload and save a termination document for a contract."""
-        if not self.vendor_service.validate_pdf_file(file):
+        if not self.vendor_service.is_pdf_upload(file):
+            raise HTTPException(status_code=400, detail="Only valid PDF files are allowed")
+        contract = self._termination_document_contract(contract_id, document_name, document_date)
+        stored = await self.save_uploaded_file(file, contract.contract_id, "termination")
+        return self._add_termination_document(
+            contract_id, file.filename, document_name, document_date, stored, file.content_type
+        )
+
+    def store_termination_document_bytes(
+        self,
+        contract_id: int,
+        content: bytes,
+        filename: str,
+        document_name: str,
+        document_date: date,
+        content_type: str = "application/pdf",
+    ) -> TerminationDocument:
+        """
+        Validate and save an in-memory termination document for a contract.
+        UI pages call this directly; the upload endpoint streams the file instead.
+        """
+        if not self.vendor_service.validate_pdf_bytes(content):
             raise HTTPException(status_code=400, detail="Only valid PDF files are allowed")
+        self._termination_document_contract(contract_id, document_name, document_date)
+        filename = filename or "document.pdf"
+        stored = document_store.put_bytes(content, filename)
+        return self._add_termination_document(
+            contract_id, filename, document_name, document_date, stored, content_type or "application/pdf"
+        )
+
+    def _termination_document_contract(self, contract_id: int, document_name: str, document_date: date) -> Contract:
+        """Validate termination document fields and return the contract they belong to."""
         if not self.vendor_service.validate_custom_document_name(document_name):
             raise HTTPException(
                 status_code=400,
@@ -289,15 +326,26 @@ class ContractService:
         contract = self.db.query(Contract).filter(Contract.id == contract_id).first()
         if not contract:
             raise HTTPException(status_code=404, detail="Contract not found")
-        file_path = await self.save_uploaded_file(file, contract.contract_id, "termination")
+        return contract
+
+    def _add_termination_document(
+        self,
+        contract_id: int,
+        filename: str,
+        document_name: str,
+        document_date: date,
+        stored: StoredUpload,
+        content_type: str,
+    ) -> TerminationDocument:
         doc = TerminationDocument(
             contract_id=contract_id,
-            file_name=file.filename,
+            file_name=filename,
             document_name=document_name.strip(),
             document_date=document_date,
-            file_path=file_path,
-            file_size=file.size,
-            content_type=file.content_type
+            file_path=stored.file_path,
+            file_size=stored.file_size,
+            sha256=stored.sha256,
+            content_type=content_type
         )
         self.db.add(doc)
         self.db.commit()
@@ -335,18 +383,12 @@ class ContractService:
         return doc
 
     def delete_termination_document(self, contract_id: int, doc_id: int) -> bool:
-        """Delete a termination document and optionally remove file from disk."""
+        """Delete a termination document; its file is removed once no document references it."""
         doc = self.get_termination_document(contract_id, doc_id)
         if not doc:
             return False
-        file_path = doc.file_path
         self.db.delete(doc)
         self.db.commit()
-        if os.path.exists(file_path):
-            try:
-                os.remove(file_path)
-            except OSError:
-                pass
         return True
 
     def add_termination_document_from_contract_document(
@@ -354,7 +396,8 @@ class ContractService:
     ) -> TerminationDocument:
         """
         Copy an existing contract document into the Termination Documents section
-        (e.g. when completing a review with decision Terminate).
+        (e.g. when completing a review with decision Terminate). The copy shares
+        the contract document's stored file.
         """
         contract = self.db.query(Contract).filter(Contract.id == contract_id).first()
         if not contract:
@@ -373,21 +416,19 @@ class ContractService:
             raise HTTPException(status_code=400, detail="Document date cannot be in the future")
         if not os.path.exists(contract_doc.file_path):
             raise HTTPException(status_code=404, detail="Contract document file not found")
-        # Copy file to termination folder
-        upload_dir = os.path.join("uploads", "contracts", contract.contract_id)
-        os.makedirs(upload_dir, exist_ok=True)
-        ext = os.path.splitext(contract_doc.file_name)[1] or ".pdf"
-        new_filename = f"termination_{uuid.uuid4()}{ext}"
-        new_path = os.path.join(upload_dir, new_filename)
-        shutil.copy2(contract_doc.file_path, new_path)
-        file_size = os.path.getsize(new_path)
+        if not contract_doc.sha256:
+            # Stored before hashing: move it into the document store first
+            stored = document_store.import_file(contract_doc.file_path)
+            contract_doc.file_path = stored.file_path
+            contract_doc.sha256 = stored.sha256
         term_doc = TerminationDocument(
             contract_id=contract_id,
             file_name=contract_doc.file_name,
             document_name=contract_doc.custom_document_name,
             document_date=document_date,
-            file_path=new_path,
-            file_size=file_size,
+            file_path=contract_doc.file_path,
+            file_size=contract_doc.file_size,
+            sha256=contract_doc.sha256,
             content_type=contract_doc.content_type or "application/pdf",
         )
         self.db.add(term_doc)
@@ -395,52 +436,46 @@ class ContractService:
         self.db.refresh(term_doc)
         return term_doc
 
-    async def save_uploaded_file(self, file: UploadFile, contract_id: str, document_type: str) -> str:
+    def _contract_upload_dir(self, contract_id: str) -> str:
+        return os.path.join(FileConstants.CONTRACT_DOCS_DIR, contract_id)
+
+    async def save_uploaded_file(self, file: UploadFile, contract_id: str, document_type: str) -> StoredUpload:
         """
-        Save uploaded file to disk and return file path
+        Stream uploaded file to disk (validated as PDF) and return its blob in the document store
         """
-        # Create uploads directory if it doesn't exist
-        upload_dir = os.path.join("uploads", "contracts", contract_id)
-        os.makedirs(upload_dir, exist_ok=True)
-        
-        # Generate unique filename
-        file_extension = os.path.splitext(file.filename)[1]
-        unique_filename = f"{document_type}_{uuid.uuid4()}{file_extension}"
-        file_path = os.path.join(upload_dir, unique_filename)
-        
-        # Save file
-        with open(file_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
-        
-        return file_path
+        stored = await store_pdf_upload(file, self._contract_upload_dir(contract_id), document_type)
+        return document_store.adopt(stored)
 
-    def get_contract_by_id(self, contract_id: int) -> Optional[Contract]:
+    def get_contract_by_id(self, contract_id: int, profile: Optional[str] = None) -> Optional[Contract]:
         """
         Get contract by ID with all related data
         """
         return (
             self.db.query(Contract)
+            .options(*contract_load_options(profile))
             .filter(Contract.id == contract_id)
             .first()
         )
 
-    def get_contract_by_contract_id(self, contract_id: str) -> Optional[Contract]:
+    def get_contract_by_contract_id(self, contract_id: str, profile: Optional[str] = None) -> Optional[Contract]:
         """
         Get contract by contract_id (CT1, CT2, etc.) with all related data
         """
         return (
             self.db.query(Contract)
+            .options(*contract_load_options(profile))
             .filter(Contract.contract_id == contract_id)
             .first()
         )
 
-    def get_contracts(self, skip: int = 0, limit: int = 100) -> List[Contract]:
+    def get_contracts(self, skip: int = 0, limit: int = 100, profile: Optional[str] = "list_row") -> List[Contract]:
         """
         Get list of contracts with pagination
         """
         return (
             self.db.query(Contract)
+            .options(*contract_load_options(profile))
+            .order_by(Contract.id)
             .offset(skip)
             .limit(limit)
             .all()
@@ -456,15 +491,47 @@ class ContractService:
         department: Optional[str] = None,
         owner_id: Optional[int] = None,
         vendor_id: Optional[int] = None,
-        expiring_soon: Optional[bool] = None
+        expiring_soon: Optional[bool] = None,
+        profile: Optional[str] = "list_row"
     ) -> tuple[List[Contract], int]:
         """
         Advanced search and filter contracts with pagination
         Returns: (contracts, total_count)
         """
-        query = self.db.query(Contract)
+        query = self._apply_contract_filters(
+            self.db.query(Contract), search, status, contract_type, department,
+            owner_id, vendor_id, expiring_soon,
+        )
         
-        # Apply filters
+        # Get total count before pagination
+        total_count = query.count()
+        
+       # Apply pagination - MSSQL requires ORDER BY when using OFFSET
+        # Searches are ordered by relevance, ties (and plain listings) by id
+        order_by = [Contract.id]
+        if search:
+            order_by.insert(0, search_index.rank(self.db, CONTRACT, Contract.id, search).desc())
+        contracts = (
+            query.options(*contract_load_options(profile))
+            .order_by(*order_by).offset(skip).limit(limit).all()
+        )
+        
+        return contracts, total_count
+
+    def _apply_contract_filters(
+        self,
+        query,
+        search: Optional[str] = None,
+        status: Optional[ContractStatusType] = None,
+        contract_type: Optional[str] = None,
+        department: Optional[str] = None,
+        owner_id: Optional[int] = None,
+        vendor_id: Optional[int] = None,
+        expiring_soon: Optional[bool] = None,
+    ):
+        """
+        search_and_filter_contracts filters
+        """
         if status:
             query = query.filter(Contract.status == status)
         
@@ -487,24 +554,180 @@ class ContractService:
                 Contract.end_date >= date.today()
             )
         
-        # Apply search (keyword search across multiple fields)
+        # Apply search (keyword prefix search over contract id, description,
+        # vendor and owner names via the search index)
         if search:
-            search_term = f"%{search}%"
-            query = query.join(Contract.vendor).join(Contract.contract_owner).filter(
-                (Contract.contract_id.ilike(search_term)) |
-                (Contract.contract_description.ilike(search_term)) |
-                (Vendor.vendor_name.ilike(search_term)) |
-                (User.first_name.ilike(search_term)) |
-                (User.last_name.ilike(search_term))
+            query = search_index.filter(self.db, query, CONTRACT, Contract.id, search)
+        return query
+
+    def iter_contract_export_rows(self, batch_size: int = 1000, **filters):
+        """
+        Yield CONTRACT_EXPORT_COLUMNS tuples for every contract matching the
+        search_and_filter_contracts filters. Selects plain columns (no ORM
+        objects) and streams them from a server-side cursor in batch_size chunks.
+        """
+        query = self.db.query(
+            Contract.id,
+            Contract.contract_id,
+            Vendor.vendor_name,
+            Contract.contract_description,
+            Contract.contract_type,
+            Contract.start_date,
+            Contract.end_date,
+            Contract.contract_amount,
+            Contract.contract_currency,
+            Contract.department,
+            Contract.status,
+            User.first_name,
+            User.last_name,
+            Contract.created_at,
+        ).join(Vendor, Contract.vendor_id == Vendor.id).join(User, Contract.contract_owner_id == User.id)
+        query = self._apply_contract_filters(query, **filters)
+        rows = query.order_by(Contract.id).yield_per(batch_size)
+        for row in rows:
+            values = [_export_value(value) for value in row]
+            first_name, last_name = values[11], values[12]
+            owner_name = f"{first_name or ''} {last_name or ''}".strip()
+            yield tuple(values[:11]) + (owner_name, values[13])
+
+    def _contract_sort_expression(self, sort_by: Optional[str], owner, user_id: Optional[int]):
+        """
+        SQL expression for a server-side table column (UI column name -> sort key).
+        Unknown columns sort by Contract.id.
+        """
+        if sort_by == "contract_id":
+            return Contract.contract_id
+        if sort_by == "vendor_name":
+            return Vendor.vendor_name
+        if sort_by == "contract_type":
+            return cast(Contract.contract_type, String)
+        if sort_by == "department":
+            return cast(Contract.department, String)
+        if sort_by in ("expiration_date", "end_date"):
+            return Contract.end_date
+        if sort_by == "start_date":
+            return Contract.start_date
+        if sort_by == "contract_amount":
+            return Contract.contract_amount
+        if sort_by == "manager":
+            return owner.first_name + " " + owner.last_name
+        if sort_by == "my_role" and user_id:
+            return case(
+                (Contract.contract_owner_id == user_id, "Contract Manager"),
+                (Contract.contract_owner_backup_id == user_id, "Backup"),
+                (Contract.contract_owner_manager_id == user_id, "Owner"),
+                else_="N/A",
             )
-        
+        return Contract.id
+
+    def get_contracts_page(
+        self,
+        limit: int = 10,
+        skip: int = 0,
+        after: Optional[tuple] = None,
+        sort_by: Optional[str] = None,
+        descending: bool = False,
+        search: Optional[str] = None,
+        status: Optional[ContractStatusType] = None,
+        user_role: Optional[str] = None,
+        user_id: Optional[int] = None,
+        min_amount: Optional[float] = None,
+        max_amount: Optional[float] = None,
+        end_date_from: Optional[date] = None,
+        end_date_to: Optional[date] = None
+    ) -> tuple[List[Contract], int, Optional[tuple]]:
+        """
+        One page of contracts for server-side tables, with role scoping,
+        amount/date range, search and sort done in SQL.
+
+        Keyset pagination on (sort_key, id): pass the cursor returned for the
+        previous page as `after`; without a cursor `skip` is used instead.
+        user_role scopes the rows (None = no scoping; Contract Admin sees all,
+        Contract Manager/Backup/Owner only contracts assigned to user_id).
+        Returns: (contracts, total_count, next_cursor)
+        """
+        from sqlalchemy.orm import aliased, contains_eager
+
+        owner = aliased(User)
+        query = (
+            self.db.query(Contract)
+            .join(Vendor, Contract.vendor_id == Vendor.id)
+            .join(owner, Contract.contract_owner_id == owner.id)
+        )
+
+        if status:
+            query = query.filter(Contract.status == status)
+
+        if user_role is not None and user_role != UserRole.CONTRACT_ADMIN.value:
+            if user_id and user_role in (
+                UserRole.CONTRACT_MANAGER.value,
+                UserRole.CONTRACT_MANAGER_BACKUP.value,
+                UserRole.CONTRACT_MANAGER_OWNER.value,
+            ):
+                query = query.filter(
+                    or_(
+                        Contract.contract_owner_id == user_id,
+                        Contract.contract_owner_backup_id == user_id,
+                        Contract.contract_owner_manager_id == user_id,
+                    )
+                )
+            else:
+                # Unknown role or no user - show nothing
+                return [], 0, None
+
+        if min_amount is not None:
+            query = query.filter(Contract.contract_amount >= min_amount)
+        if max_amount is not None:
+            query = query.filter(Contract.contract_amount <= max_amount)
+        if end_date_from:
+            query = query.filter(Contract.end_date >= end_date_from)
+        if end_date_to:
+            query = query.filter(Contract.end_date <= end_date_to)
+
+        # Keyword search through the search index (contract id, description, type, vendor and owner names)
+        query = search_index.filter(self.db, query, CONTRACT, Contract.id, search)
+
         # Get total count before pagination
         total_count = query.count()
-        
-       # Apply pagination - MSSQL requires ORDER BY when using OFFSET
-        contracts = query.order_by(Contract.id).offset(skip).limit(limit).all()
-        
-        return contracts, total_count
+
+        if search and not sort_by:
+            # Searches without a chosen column are ordered by relevance. The rank is a
+            # float on PostgreSQL; keyset cursors need exact equality, so page on the
+            # rank in fixed point (millionths) instead
+            rank = search_index.rank(self.db, CONTRACT, Contract.id, search)
+            sort_key = cast(rank * 1_000_000, BigInteger)
+            descending = True
+        else:
+            sort_key = self._contract_sort_expression(sort_by, owner, user_id)
+        if after is not None:
+            after_value, after_id = after
+            if descending:
+                query = query.filter(or_(sort_key < after_value, and_(sort_key == after_value, Contract.id < after_id)))
+            else:
+                query = query.filter(or_(sort_key > after_value, and_(sort_key == after_value, Contract.id > after_id)))
+            skip = 0
+
+        order = (sort_key.desc(), Contract.id.desc()) if descending else (sort_key.asc(), Contract.id.asc())
+        results = (
+            query.add_columns(sort_key.label("sort_key"))
+            .options(
+                contains_eager(Contract.vendor),
+                contains_eager(Contract.contract_owner.of_type(owner)),
+                joinedload(Contract.contract_owner_backup),
+            )
+            .order_by(*order)
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+
+        contracts = [contract for contract, _ in results]
+        next_cursor = None
+        if len(results) == limit:
+            last_contract, last_key = results[-1]
+            next_cursor = (last_key, last_contract.id)
+
+        return contracts, total_count, next_cursor
 
     def get_contracts_by_vendor(self, vendor_id: int) -> List[Contract]:
         """
@@ -558,7 +781,8 @@ class ContractService:
         self,
         skip: int = 0,
         limit: int = 1000,
-        days_ahead: int = 90
+        days_ahead: int = 90,
+        profile: Optional[str] = "list_row"
     ) -> tuple[List[Contract], int]:
         """
         Get active contracts expiring within specified days that need review
@@ -578,7 +802,10 @@ class ContractService:
         total_count = query.count()
         
         # Apply pagination - MSSQL requires ORDER BY when using OFFSET
-        contracts = query.order_by(Contract.id).offset(skip).limit(limit).all()
+        contracts = (
+            query.options(*contract_load_options(profile))
+            .order_by(Contract.id).offset(skip).limit(limit).all()
+        )
         
         return contracts, total_count
 
@@ -586,7 +813,8 @@ class ContractService:
         self,
         skip: int = 0,
         limit: int = 1000,
-        days_ahead: int = 30
+        days_ahead: int = 30,
+        profile: Optional[str] = "list_row"
     ) -> tuple[List[Contract], int]:
         """
         Get contracts that are expiring soon or have reached their end date.
@@ -626,14 +854,18 @@ class ContractService:
         total_count = query.count()
 
         # Apply pagination - MSSQL requires ORDER BY when using OFFSET
-        contracts = query.order_by(Contract.id).offset(skip).limit(limit).all()
+        contracts = (
+            query.options(*contract_load_options(profile))
+            .order_by(Contract.id).offset(skip).limit(limit).all()
+        )
 
         return contracts, total_count
 
     def get_contracts_pending_admin_review(
         self,
         skip: int = 0,
-        limit: int = 1000
+        limit: int = 1000,
+        profile: Optional[str] = "list_row"
     ) -> tuple[List[Contract], int]:
         """
         Get contracts with ContractUpdate status=PENDING_REVIEW that are ready for admin review.
@@ -644,7 +876,6 @@ class ContractService:
         Returns: (contracts, total_count)
         """
         from sqlalchemy import or_
-        from sqlalchemy.orm import joinedload
 
         # Subquery: get contract_ids from ContractUpdate where status=PENDING_REVIEW,
         # never sent back (returned_date is NULL), and (decision Extend/Renew OR has_document=true)
@@ -665,11 +896,7 @@ class ContractService:
 
         query = (
             self.db.query(Contract)
-            .options(
-                joinedload(Contract.vendor),
-                joinedload(Contract.contract_owner),
-                joinedload(Contract.contract_owner_backup),
-            )
+            .options(*contract_load_options(profile))
             .filter(Contract.id.in_(contract_ids))
             .filter(
                 Contract.status.in_([
@@ -685,15 +912,14 @@ class ContractService:
     def get_contracts_awaiting_termination_document(
         self,
         skip: int = 0,
-        limit: int = 1000
+        limit: int = 1000,
+        profile: Optional[str] = "list_row"
     ) -> tuple[List[Contract], int]:
         """
         Get contracts where manager chose Terminate but has_document=false.
         These appear in Pending Documents until manager uploads termination doc.
         Returns: (contracts, total_count)
         """
-        from sqlalchemy.orm import joinedload
-
         from sqlalchemy import or_
         updates_query = (
             self.db.query(ContractUpdateModel.contract_id)
@@ -707,11 +933,7 @@ class ContractService:
 
         query = (
             self.db.query(Contract)
-            .options(
-                joinedload(Contract.vendor),
-                joinedload(Contract.contract_owner),
-                joinedload(Contract.contract_owner_backup),
-            )
+            .options(*contract_load_options(profile))
             .filter(Contract.id.in_(contract_ids))
             .filter(
                 Contract.status.in_([
@@ -727,21 +949,16 @@ class ContractService:
     def get_terminated_contracts(
         self,
         skip: int = 0,
-        limit: int = 1000
+        limit: int = 1000,
+        profile: Optional[str] = "list_row"
     ) -> tuple[List[Contract], int]:
         """
         Get contracts with status TERMINATED (from backend).
         Returns: (contracts, total_count)
         """
-        from sqlalchemy.orm import joinedload
-
         query = (
             self.db.query(Contract)
-            .options(
-                joinedload(Contract.vendor),
-                joinedload(Contract.contract_owner),
-                joinedload(Contract.contract_owner_backup),
-            )
+            .options(*contract_load_options(profile))
             .filter(Contract.status == ContractStatusType.TERMINATED)
         )
         total_count = query.count()
@@ -768,6 +985,7 @@ class ContractService:
         self.db.add(user)
         self.db.commit()
         self.db.refresh(user)
+        reference_cache.invalidate(USERS_NAMESPACE)
         
         return user
 
@@ -781,61 +999,69 @@ class ContractService:
         
         return query.all()
 
+    def get_active_user_options(self) -> List[dict]:
+        """
+        Active users as plain dicts for the contract manager/owner/backup dropdowns.
+        Cached; create_user invalidates it.
+        """
+        def build() -> List[dict]:
+            return [
+                {
+                    "id": user.id,
+                    "first_name": user.first_name,
+                    "last_name": user.last_name,
+                    "email": user.email or "",
+                }
+                for user in self.get_users(active_only=True)
+            ]
+        return reference_cache.get_or_set(f"{USERS_NAMESPACE}:active_options", build)
+
     def get_user_by_id(self, user_id: int) -> Optional[User]:
         """
         Get user by ID
         """
         return self.db.query(User).filter(User.id == user_id).first()
 
+    def _contract_stats_groups(self, today: date) -> list:
+        """
+        Dashboard counters per (status, department, currency) from the dashboard_stats
+        read model; every dashboard counter and breakdown is folded from these rows.
+        """
+        return DashboardStatsService(self.db).groups(today)
+
+    def get_contract_status_counts(self) -> dict:
+        """
+        Number of contracts per status value (from the dashboard_stats read model)
+        """
+        counts = {}
+        for row in self._contract_stats_groups(date.today()):
+            counts[row.status] = counts.get(row.status, 0) + row.total
+        return counts
+
     def get_contract_summary(self) -> ContractSummary:
         """
         Get contract summary statistics
         """
         today = date.today()
         
-        # Total contracts
-        total_contracts = self.db.query(func.count(Contract.id)).scalar()
-        
-        # Active contracts (not expired)
-        active_contracts = (
-            self.db.query(func.count(Contract.id))
-            .filter(Contract.end_date >= today)
-            .scalar()
-        )
-        
-        # Expiring soon (within 30 days)
-        expiring_soon = (
-            self.db.query(func.count(Contract.id))
-            .filter(Contract.end_date >= today)
-            .filter(Contract.end_date <= today + timedelta(days=30))
-            .scalar()
-        )
-        
-        # Total contract value (active contracts only)
-        total_value_result = (
-            self.db.query(func.sum(Contract.contract_amount))
-            .filter(Contract.end_date >= today)
-            .scalar()
-        )
-        total_contract_value = total_value_result or Decimal('0')
-        
-        # Contracts by department
-        dept_stats = (
-            self.db.query(Contract.department, func.count(Contract.id))
-            .filter(Contract.end_date >= today)
-            .group_by(Contract.department)
-            .all()
-        )
-        contracts_by_department = {dept.value: count for dept, count in dept_stats}
-        
-        # Contracts by currency
-        currency_stats = (
-            self.db.query(Contract.contract_currency, func.count(Contract.id))
-            .filter(Contract.end_date >= today)
-            .group_by(Contract.contract_currency)
-            .all()
-        )
-        contracts_by_currency = {curr.value: count for curr, count in currency_stats}
+        total_contracts = 0
+        active_contracts = 0
+        expiring_soon = 0
+        total_contract_value = Decimal('0')
+        contracts_by_department = {}
+        contracts_by_currency = {}
+        
+        # "Active" here means not past end_date, regardless of status
+        for row in self._contract_stats_groups(today):
+            total_contracts += row.total
+            active_contracts += row.current
+            expiring_soon += row.expiring_30
+            total_contract_value += Decimal(str(row.current_amount))
+            if row.current:
+                dept = row.department
+                curr = row.currency
+                contracts_by_department[dept] = contracts_by_department.get(dept, 0) + row.current
+                contracts_by_currency[curr] = contracts_by_currency.get(curr, 0) + row.current
         
         return ContractSummary(
             total_contracts=total_contracts,
@@ -846,156 +1072,124 @@ class ContractService:
             contracts_by_currency=contracts_by_currency
         )
 
-    def get_manager_dashboard_data(self, user_id: int) -> dict:
+    def get_manager_dashboard_data(
+        self, user_id: int, profile: Optional[str] = "dashboard", include_lists: bool = True
+    ) -> dict:
         """
         Get dashboard data for Contract Manager (DSA-90, DSA-91)
+        include_lists=False skips the owned/expiring contract lists (counters only)
         """
         today = date.today()
         cutoff_30_days = today + timedelta(days=30)
-        
-        # Get all contracts owned by this manager
-        owned_contracts = (
-            self.db.query(Contract)
-            .filter(Contract.contract_owner_id == user_id)
-            .all()
+        owned = Contract.contract_owner_id == user_id
+        expiring_soon = and_(
+            Contract.status == ContractStatusType.ACTIVE,
+            Contract.end_date >= today,
+            Contract.end_date <= cutoff_30_days,
         )
         
-        # Statistics
-        total_owned = len(owned_contracts)
-        active = len([c for c in owned_contracts if c.status == ContractStatusType.ACTIVE])
-        expired = len([c for c in owned_contracts if c.status == ContractStatusType.EXPIRED])
-        
-        # Expiring soon (within 30 days)
-        expiring_contracts = [
-            c for c in owned_contracts
-            if c.end_date <= cutoff_30_days and c.end_date >= today
-            and c.status == ContractStatusType.ACTIVE
-        ]
-        
-        return {
-            "total_owned_contracts": total_owned,
-            "active_contracts": active,
-            "expiring_soon_contracts": len(expiring_contracts),
-            "expired_contracts": expired,
-            "expiring_contracts": expiring_contracts,
-            "owned_contracts": owned_contracts
+        # Counters per status in one grouped query
+        by_status = {}
+        expiring_count = 0
+        counts = (
+            self.db.query(
+                Contract.status,
+                func.count(Contract.id),
+                func.coalesce(func.sum(case((expiring_soon, 1), else_=0)), 0),
+            )
+            .filter(owned)
+            .group_by(Contract.status)
+        )
+        for status, count, expiring in counts:
+            by_status[status] = count
+            expiring_count += expiring
+        
+        data = {
+            "total_owned_contracts": sum(by_status.values()),
+            "active_contracts": by_status.get(ContractStatusType.ACTIVE, 0),
+            "expiring_soon_contracts": expiring_count,
+            "expired_contracts": by_status.get(ContractStatusType.EXPIRED, 0),
+            "expiring_contracts": [],
+            "owned_contracts": []
         }
+        if include_lists:
+            owned_contracts = (
+                self.db.query(Contract)
+                .options(*contract_load_options(profile))
+                .filter(owned)
+                .all()
+            )
+            data["owned_contracts"] = owned_contracts
+            data["expiring_contracts"] = [
+                c for c in owned_contracts
+                if c.end_date <= cutoff_30_days and c.end_date >= today
+                and c.status == ContractStatusType.ACTIVE
+            ]
+        return data
 
-    def get_admin_dashboard_data(self) -> dict:
+    def get_admin_dashboard_data(self, profile: Optional[str] = "dashboard", include_lists: bool = True) -> dict:
         """
         Get dashboard data for Contract Admin (DSA-96)
+        include_lists=False skips the recent/expiring contract lists (counters only)
         """
         today = date.today()
         
-        # Overall statistics
-        total_contracts = self.db.query(func.count(Contract.id)).scalar()
-        
-        active_contracts = (
-            self.db.query(func.count(Contract.id))
-            .filter(Contract.status == ContractStatusType.ACTIVE.value)
-            .scalar()
-        )
-        
-        expired_contracts = (
-            self.db.query(func.count(Contract.id))
-            .filter(Contract.status == ContractStatusType.EXPIRED.value)
-            .scalar()
-        )
-        
-        terminated_contracts = (
-            self.db.query(func.count(Contract.id))
-            .filter(Contract.status == ContractStatusType.TERMINATED.value)
-            .scalar()
-        )
-        
-        # Expiring contracts by timeframe
-        expiring_30 = (
-            self.db.query(func.count(Contract.id))
-            .filter(
-                Contract.end_date >= today,
-                Contract.end_date <= today + timedelta(days=30),
-                Contract.status == ContractStatusType.ACTIVE.value
+        # Overall statistics, expiring windows, financial overview and breakdowns
+        # all come from one grouped query
+        total_contracts = 0
+        total_contract_value = Decimal('0')
+        total_active_value = Decimal('0')
+        expiring_30 = expiring_60 = expiring_90 = 0
+        contracts_by_department = {}
+        contracts_by_status = {}
+        contracts_by_currency = {}
+        
+        for row in self._contract_stats_groups(today):
+            status = row.status
+            dept = row.department
+            curr = row.currency
+            
+            total_contracts += row.total
+            total_contract_value += Decimal(str(row.amount))
+            contracts_by_department[dept] = contracts_by_department.get(dept, 0) + row.total
+            contracts_by_status[status] = contracts_by_status.get(status, 0) + row.total
+            contracts_by_currency[curr] = contracts_by_currency.get(curr, 0) + row.total
+            
+            # Expiring windows and active value only count active contracts
+            if row.status == ContractStatusType.ACTIVE.value:
+                total_active_value += Decimal(str(row.amount))
+                expiring_30 += row.expiring_30
+                expiring_60 += row.expiring_60
+                expiring_90 += row.expiring_90
+        
+        active_contracts = contracts_by_status.get(ContractStatusType.ACTIVE.value, 0)
+        expired_contracts = contracts_by_status.get(ContractStatusType.EXPIRED.value, 0)
+        terminated_contracts = contracts_by_status.get(ContractStatusType.TERMINATED.value, 0)
+        
+        recent_contracts = []
+        expiring_soon = []
+        if include_lists:
+            # Recent contracts (last 10)
+            recent_contracts = (
+                self.db.query(Contract)
+                .options(*contract_load_options(profile))
+                .order_by(Contract.created_at.desc())
+                .limit(10)
+                .all()
             )
-            .scalar()
-        )
-        
-        expiring_60 = (
-            self.db.query(func.count(Contract.id))
-            .filter(
-                Contract.end_date >= today,
-                Contract.end_date <= today + timedelta(days=60),
-                Contract.status == ContractStatusType.ACTIVE.value
-            )
-            .scalar()
-        )
-        
-        expiring_90 = (
-            self.db.query(func.count(Contract.id))
-            .filter(
-                Contract.end_date >= today,
-                Contract.end_date <= today + timedelta(days=90),
-                Contract.status == ContractStatusType.ACTIVE.value
-            )
-            .scalar()
-        )
-        
-        # Financial overview
-        total_value_result = (
-            self.db.query(func.sum(Contract.contract_amount))
-            .scalar()
-        )
-        total_contract_value = total_value_result or Decimal('0')
-        
-        active_value_result = (
-            self.db.query(func.sum(Contract.contract_amount))
-            .filter(Contract.status == ContractStatusType.ACTIVE.value)
-            .scalar()
-        )
-        total_active_value = active_value_result or Decimal('0')
-        
-        # Breakdown by department
-        dept_stats = (
-            self.db.query(Contract.department, func.count(Contract.id))
-            .group_by(Contract.department)
-            .all()
-        )
-        contracts_by_department = {dept.value: count for dept, count in dept_stats}
-        
-        # Breakdown by status
-        status_stats = (
-            self.db.query(Contract.status, func.count(Contract.id))
-            .group_by(Contract.status)
-            .all()
-        )
-        contracts_by_status = {status.value: count for status, count in status_stats}
-        
-        # Breakdown by currency
-        currency_stats = (
-            self.db.query(Contract.contract_currency, func.count(Contract.id))
-            .group_by(Contract.contract_currency)
-            .all()
-        )
-        contracts_by_currency = {curr.value: count for curr, count in currency_stats}
-        
-        # Recent contracts (last 10)
-        recent_contracts = (
-            self.db.query(Contract)
-            .order_by(Contract.created_at.desc())
-            .limit(10)
-            .all()
-        )
-        
-        # Expiring soon
-        expiring_soon = (
-            self.db.query(Contract)
-            .filter(
-                Contract.end_date >= today,
-                Contract.end_date <= today + timedelta(days=30),
-                Contract.status == ContractStatusType.ACTIVE.value
+            
+            # Expiring soon
+            expiring_soon = (
+                self.db.query(Contract)
+                .options(*contract_load_options(profile))
+                .filter(
+                    Contract.end_date >= today,
+                    Contract.end_date <= today + timedelta(days=30),
+                    Contract.status == ContractStatusType.ACTIVE.value
+                )
+                .order_by(Contract.end_date)
+                .all()
             )
-            .order_by(Contract.end_date)
-            .all()
-        )
         
         return {
             "total_contracts": total_contracts,
@@ -0,0 +1,293 @@
+from collections import defaultdict
+from decimal import Decimal
+from sqlalchemy.orm import Session
+from sqlalchemy import func, and_, case, delete, event, exists, insert, inspect, select, update
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from datetime import datetime, date, timedelta
+
+from app.models.contract import Contract
+from app.models.dashboard_stats import DashboardStat, DashboardStatsState
+
+# (status, department, currency) values of one dashboard_stats row
+StatsKey = Tuple[str, str, str]
+
+_COUNTER_FIELDS = (
+    "total", "amount", "current", "current_amount",
+    "expiring_30", "expiring_60", "expiring_90",
+)
+
+# Contract columns the counters depend on
+_COUNTED_ATTRIBUTES = ("status", "department", "contract_currency", "contract_amount", "end_date")
+
+# Primary key of the single dashboard_stats_state row
+_STATE_ID = 1
+
+
+def _value(field) -> Optional[str]:
+    if field is None:
+        return None
+    return field.value if hasattr(field, "value") else str(field)
+
+
+class StatsEntry(NamedTuple):
+    """
+    What one contract contributes to its dashboard_stats group
+    """
+    status: str
+    department: str
+    currency: str
+    amount: Decimal
+    end_date: Optional[date]
+
+    @property
+    def key(self) -> StatsKey:
+        return self.status, self.department, self.currency
+
+
+def stats_entry(status, department, currency, amount, end_date: Optional[date]) -> StatsEntry:
+    return StatsEntry(
+        _value(status), _value(department), _value(currency),
+        Decimal(str(amount)) if amount is not None else Decimal("0"), end_date,
+    )
+
+
+def contract_stats_entry(contract: Contract) -> StatsEntry:
+    return stats_entry(
+        contract.status, contract.department, contract.contract_currency,
+        contract.contract_amount, contract.end_date,
+    )
+
+
+def _contribution(entry: StatsEntry, day: date) -> Dict[str, object]:
+    current = entry.end_date is not None and entry.end_date >= day
+
+    def expiring(days: int) -> int:
+        return int(current and entry.end_date <= day + timedelta(days=days))
+
+    return {
+        "total": 1,
+        "amount": entry.amount,
+        "current": int(current),
+        "current_amount": entry.amount if current else Decimal("0"),
+        "expiring_30": expiring(30),
+        "expiring_60": expiring(60),
+        "expiring_90": expiring(90),
+    }
+
+
+def apply_contract_changes(connection, removed: Iterable[StatsEntry], added: Iterable[StatsEntry]) -> None:
+    """
+    Move contracts between groups with +/- delta UPDATEs. The deltas are taken
+    relative to the date the rows were rebuilt for; rows not built yet are left
+    to the first read.
+    """
+    computed_for = connection.execute(
+        select(DashboardStatsState.rebuilt_on).where(DashboardStatsState.id == _STATE_ID)
+    ).scalar()
+    if computed_for is None:
+        return
+
+    deltas: Dict[StatsKey, Dict[str, object]] = defaultdict(lambda: dict.fromkeys(_COUNTER_FIELDS, 0))
+    for entries, sign in ((removed, -1), (added, 1)):
+        for entry in entries:
+            delta = deltas[entry.key]
+            for field, value in _contribution(entry, computed_for).items():
+                delta[field] += sign * value
+
+    table = DashboardStat.__table__
+    now = datetime.utcnow()
+    for (status, department, currency), delta in deltas.items():
+        if not any(delta.values()):
+            continue
+        group = and_(table.c.status == status, table.c.department == department, table.c.currency == currency)
+        increment = (
+            update(table)
+            .where(group)
+            .values({**{table.c[field]: table.c[field] + delta[field] for field in _COUNTER_FIELDS}, table.c.updated_at: now})
+        )
+        if connection.execute(increment).rowcount:
+            if delta["total"] < 0:
+                # The group's last contract may have left it
+                connection.execute(delete(table).where(group, table.c.total <= 0))
+            continue
+        if delta["total"] <= 0:
+            continue
+        try:
+            with connection.begin_nested():
+                connection.execute(
+                    insert(table).values(
+                        status=status, department=department, currency=currency,
+                        computed_for=computed_for, updated_at=now, **delta,
+                    )
+                )
+        except IntegrityError:
+            # Created concurrently by another session
+            connection.execute(increment)
+
+
+class DashboardStatsService:
+    """
+    Maintains the dashboard_stats read model.
+
+    Readers get one row per (status, department, currency), so dashboards cost
+    the same whatever the number of contracts. Every ORM write to a contract
+    applies +/- deltas to the groups it left and entered (flush hook below);
+    bulk writes call apply_changes. A full rebuild happens only on date
+    rollover (the expiring buckets are relative to today), tracked by the
+    dashboard_stats_state row.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def compute_groups(self, today: date) -> list:
+        """
+        Aggregate contracts per (status, department, currency) in one grouped query
+        """
+        def count_when(condition):
+            return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+        def window(days: int):
+            return and_(Contract.end_date >= today, Contract.end_date <= today + timedelta(days=days))
+
+        query = self.db.query(
+            Contract.status.label("status"),
+            Contract.department.label("department"),
+            Contract.contract_currency.label("currency"),
+            func.count(Contract.id).label("total"),
+            func.coalesce(func.sum(Contract.contract_amount), 0).label("amount"),
+            count_when(Contract.end_date >= today).label("current"),
+            func.coalesce(
+                func.sum(case((Contract.end_date >= today, Contract.contract_amount), else_=0)), 0
+            ).label("current_amount"),
+            count_when(window(30)).label("expiring_30"),
+            count_when(window(60)).label("expiring_60"),
+            count_when(window(90)).label("expiring_90"),
+        )
+        return query.group_by(Contract.status, Contract.department, Contract.contract_currency).all()
+
+    def groups(self, today: Optional[date] = None) -> List[DashboardStat]:
+        """
+        All dashboard_stats rows, rebuilt first if they are stale
+        """
+        today = today or date.today()
+        # The rows only come back when rebuilt for today, so a fresh read is one statement
+        rebuilt_today = exists().where(DashboardStatsState.id == _STATE_ID, DashboardStatsState.rebuilt_on == today)
+        rows = self.db.query(DashboardStat).filter(rebuilt_today).all()
+        if rows or not self._is_stale(today):
+            return rows
+        return self._rebuild_committed(today)
+
+    def _rebuild_committed(self, today: date) -> List[DashboardStat]:
+        """
+        Rebuild in a separate session and commit it, so a read path (which never
+        commits its own session) does not have to rebuild again on the next request
+        """
+        rebuild_db = Session(bind=self.db.get_bind(), expire_on_commit=False)
+        try:
+            rows = DashboardStatsService(rebuild_db).refresh_all(today)
+            rebuild_db.commit()
+            return rows
+        except SQLAlchemyError as e:
+            rebuild_db.rollback()
+            print(f"Error rebuilding dashboard stats: {e}")
+            return [self._to_row(group, today) for group in self.compute_groups(today)]
+        finally:
+            rebuild_db.close()
+
+    def refresh_all(self, today: Optional[date] = None) -> List[DashboardStat]:
+        """
+        Rebuild every row (date rollover, initial load)
+        """
+        today = today or date.today()
+        computed = self.compute_groups(today)
+        try:
+            with self.db.begin_nested():
+                self.db.query(DashboardStat).delete(synchronize_session=False)
+                rows = [self._to_row(group, today) for group in computed]
+                self.db.add_all(rows)
+                state = self.db.get(DashboardStatsState, _STATE_ID)
+                if state is None:
+                    self.db.add(DashboardStatsState(id=_STATE_ID, rebuilt_on=today, rebuilt_at=datetime.utcnow()))
+                else:
+                    state.rebuilt_on = today
+                    state.rebuilt_at = datetime.utcnow()
+        except SQLAlchemyError as e:
+            # Another worker rebuilt concurrently; serve the freshly computed numbers
+            print(f"Dashboard stats rebuild skipped: {e}")
+            return [self._to_row(group, today) for group in computed]
+        return rows
+
+    def apply_changes(self, removed: Iterable[StatsEntry] = (), added: Iterable[StatsEntry] = ()) -> None:
+        """
+        Count contracts written without the ORM (bulk inserts and UPDATEs bypass
+        the flush hook). Call before commit, so the counters commit with the write.
+        """
+        apply_contract_changes(self.db.connection(), removed, added)
+
+    def _is_stale(self, today: date) -> bool:
+        """
+        True until the counters have been rebuilt for today
+        """
+        rebuilt_on = (
+            self.db.query(DashboardStatsState.rebuilt_on)
+            .filter(DashboardStatsState.id == _STATE_ID)
+            .scalar()
+        )
+        return rebuilt_on != today
+
+    def _to_row(self, group, today: date) -> DashboardStat:
+        status, department, currency = (
+            field.value if hasattr(field, "value") else str(field)
+            for field in (group.status, group.department, group.currency)
+        )
+        return DashboardStat(
+            status=status,
+            department=department,
+            currency=currency,
+            total=group.total,
+            amount=group.amount,
+            current=group.current,
+            current_amount=group.current_amount,
+            expiring_30=group.expiring_30,
+            expiring_60=group.expiring_60,
+            expiring_90=group.expiring_90,
+            computed_for=today,
+            updated_at=datetime.utcnow(),
+        )
+
+
+# Maintenance on write
+
+def _previous_entry(contract: Contract) -> StatsEntry:
+    state = inspect(contract)
+
+    def previous(attribute: str):
+        history = state.attrs[attribute].history
+        return history.deleted[0] if history.deleted else getattr(contract, attribute)
+
+    return stats_entry(*(previous(attribute) for attribute in _COUNTED_ATTRIBUTES))
+
+
+def _counters_changed(contract: Contract) -> bool:
+    state = inspect(contract)
+    return any(state.attrs[attribute].history.has_changes() for attribute in _COUNTED_ATTRIBUTES)
+
+
+@event.listens_for(Session, "after_flush")
+def _count_contract_changes(session: Session, flush_context) -> None:
+    removed: List[StatsEntry] = []
+    added: List[StatsEntry] = []
+    for obj in session.new:
+        if isinstance(obj, Contract):
+            added.append(contract_stats_entry(obj))
+    for obj in session.deleted:
+        if isinstance(obj, Contract):
+            removed.append(_previous_entry(obj))
+    for obj in session.dirty:
+        if isinstance(obj, Contract) and _counters_changed(obj):
+            removed.append(_previous_entry(obj))
+            added.append(contract_stats_entry(obj))
+    if removed or added:
+        apply_contract_changes(session.connection(), removed, added)
@@ -0,0 +1,291 @@
+"""
+Content-addressed document store.
+
+Document files live once per SHA-256 under FileConstants.BLOB_DIR
+(<sha256[:2]>/<sha256><ext>) and every ContractDocument / TerminationDocument /
+VendorDocument row with that hash points its file_path at the shared blob.
+Copying a document is therefore a new row, not a new file.
+
+stored_blobs.ref_count is kept in step with the document rows by an ORM
+after_flush hook that counts inserted / deleted / re-hashed rows per hash. A
+blob whose count reaches zero is only marked released (released_at); its file
+is deleted by the periodic sweep once it has stayed unreferenced for
+document_blob_grace_seconds, re-checked under a row lock. Deleting on commit
+could race an upload of the same content that found the file and is about to
+reference it. Storing content that is already present refreshes the file's
+mtime, and the sweep also skips files used within the grace period. Files of
+legacy unhashed rows are left on disk, as migration 017 leaves them.
+Files that have to be duplicated on disk are hardlinked, or reflinked where the
+filesystem supports it, before falling back to a byte copy.
+"""
+import hashlib
+import os
+import shutil
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import case, delete, event, insert, inspect, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.constants import FileConstants
+from app.models.contract import ContractDocument, TerminationDocument
+from app.models.scheduled_job_run import ScheduledJobRun
+from app.models.stored_blob import StoredBlob
+from app.models.vendor import VendorDocument
+from app.services.scheduled_jobs import PeriodicJob, run_scheduled_job
+from app.services.upload_storage import CHUNK_SIZE, StoredUpload, store_pdf_bytes
+
+try:
+    import fcntl
+except ImportError:  # Windows: no reflinks
+    fcntl = None
+
+DOCUMENT_MODELS = (ContractDocument, TerminationDocument, VendorDocument)
+
+# linux/fs.h FICLONE: share the source extents (btrfs, xfs, overlayfs on those)
+_FICLONE = 0x40049409
+
+DOCUMENT_SWEEP_JOB_NAME = "document_blob_sweep"
+# Arbitrary application-wide key for the job lock (advisory lock / applock)
+DOCUMENT_SWEEP_LOCK_KEY = 7_316_902_453
+
+
+def blob_path(sha256: str, extension: str = ".pdf") -> str:
+    return os.path.join(FileConstants.BLOB_DIR, sha256[:2], f"{sha256}{extension or '.pdf'}")
+
+
+def _reflink(source: str, target: str) -> None:
+    if fcntl is None:
+        raise OSError("reflink not supported")
+    with open(source, "rb") as src, open(target, "wb") as dst:
+        fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+
+
+def link_or_copy(source: str, target: str) -> None:
+    """
+    Make target a copy of source without duplicating data where possible:
+    hardlink, then reflink, then a plain copy. target appears atomically.
+    """
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    temp_path = f"{target}.part"
+    try:
+        try:
+            os.link(source, temp_path)
+        except OSError:
+            try:
+                _reflink(source, temp_path)
+            except OSError:
+                shutil.copyfile(source, temp_path)
+        # A hardlink keeps the source's old mtime; the sweep reads mtime as "last stored"
+        os.utime(temp_path)
+        os.replace(temp_path, target)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _reuse(target: str) -> bool:
+    """
+    Mark an existing blob as just stored so the sweep leaves it alone;
+    False when there is no file to reuse
+    """
+    try:
+        os.utime(target)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def adopt(stored: StoredUpload) -> StoredUpload:
+    """
+    Move a freshly written upload into the store. If the content is already
+    stored the new file is dropped; either way the returned file_path is the blob.
+    """
+    target = blob_path(stored.sha256, os.path.splitext(stored.file_path)[1])
+    if os.path.abspath(stored.file_path) == os.path.abspath(target):
+        return stored
+    if _reuse(target):
+        os.remove(stored.file_path)
+    else:
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.replace(stored.file_path, target)
+    return StoredUpload(file_path=target, file_size=stored.file_size, sha256=stored.sha256)
+
+
+def put_bytes(content: bytes, filename: str = "document.pdf") -> StoredUpload:
+    """
+    Store already validated in-memory content and return its blob
+    """
+    extension = os.path.splitext(filename or "")[1] or ".pdf"
+    stored = store_pdf_bytes(content, FileConstants.BLOB_DIR, f"upload{extension}", "incoming")
+    return adopt(stored)
+
+
+def file_sha256(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as stream:
+        for chunk in iter(lambda: stream.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def import_file(file_path: str) -> StoredUpload:
+    """
+    Store an existing file (left in place) by linking it into the store
+    """
+    sha256 = file_sha256(file_path)
+    target = blob_path(sha256, os.path.splitext(file_path)[1])
+    if not _reuse(target):
+        link_or_copy(file_path, target)
+    return StoredUpload(file_path=target, file_size=os.path.getsize(target), sha256=sha256)
+
+
+# Reference counting
+
+def _count_references(objects: Iterable) -> Dict[str, Dict]:
+    counts: Counter = Counter()
+    blobs: Dict[str, Dict] = {}
+    for obj in objects:
+        if isinstance(obj, DOCUMENT_MODELS) and obj.sha256:
+            counts[obj.sha256] += 1
+            blobs.setdefault(obj.sha256, {"file_path": obj.file_path, "file_size": obj.file_size})
+    return {sha256: dict(blobs[sha256], count=count) for sha256, count in counts.items()}
+
+
+def _retain(connection, sha256: str, blob: Dict) -> None:
+    increment = (
+        update(StoredBlob.__table__)
+        .where(StoredBlob.sha256 == sha256)
+        .values(ref_count=StoredBlob.ref_count + blob["count"], released_at=None)
+    )
+    if connection.execute(increment).rowcount:
+        return
+    try:
+        with connection.begin_nested():
+            connection.execute(
+                insert(StoredBlob.__table__).values(
+                    sha256=sha256, file_path=blob["file_path"], file_size=blob["file_size"], ref_count=blob["count"]
+                )
+            )
+    except IntegrityError:
+        # Inserted concurrently by another session
+        connection.execute(increment)
+
+
+def _release(connection, sha256: str, count: int) -> None:
+    """
+    Drop count references; a blob left unreferenced is marked released for the sweep
+    """
+    remaining = StoredBlob.ref_count - count
+    connection.execute(
+        update(StoredBlob.__table__)
+        .where(StoredBlob.sha256 == sha256)
+        .values(ref_count=remaining, released_at=case((remaining <= 0, datetime.utcnow()), else_=None))
+    )
+
+
+def retain_many(connection, stored: StoredUpload, count: int) -> None:
+    """
+    Add count references to a blob for rows inserted without the ORM
+    (bulk loads bypass the flush hook)
+    """
+    if count > 0:
+        _retain(connection, stored.sha256, {"file_path": stored.file_path, "file_size": stored.file_size, "count": count})
+
+
+def _rehashed(objects: Iterable):
+    """
+    (old sha256, document) for updated documents whose sha256 changed
+    """
+    for obj in objects:
+        if not isinstance(obj, DOCUMENT_MODELS):
+            continue
+        state = inspect(obj)
+        sha256_history = state.attrs.sha256.history
+        if not sha256_history.has_changes():
+            continue
+        yield (sha256_history.deleted[0] if sha256_history.deleted else None), obj
+
+
+@event.listens_for(Session, "after_flush")
+def _update_reference_counts(session: Session, flush_context) -> None:
+    rehashed = list(_rehashed(session.dirty))
+    added = _count_references(list(session.new) + [obj for _, obj in rehashed])
+    removed = _count_references(session.deleted)
+    for old_sha256, _ in rehashed:
+        if old_sha256:
+            removed.setdefault(old_sha256, {"count": 0})["count"] += 1
+    if not (added or removed):
+        return
+
+    connection = session.connection()
+    for sha256, blob in added.items():
+        _retain(connection, sha256, blob)
+    for sha256, blob in removed.items():
+        _release(connection, sha256, blob["count"])
+
+
+# Sweep
+
+def _remove_blob_file(file_path: str, cutoff: float) -> bool:
+    """
+    Delete a released blob's file unless it was stored again after cutoff (a
+    timestamp). The file is first renamed aside: an upload that reuses it
+    either touched it before the rename (the renamed file is recent and goes
+    back) or finds it missing and writes its own.
+    """
+    tombstone = f"{file_path}.deleting"
+    try:
+        os.replace(file_path, tombstone)
+    except FileNotFoundError:
+        return True
+    if os.path.getmtime(tombstone) >= cutoff:
+        os.replace(tombstone, file_path)
+        return False
+    os.remove(tombstone)
+    return True
+
+
+def sweep_released_blobs(db: Session, grace_seconds: Optional[int] = None) -> int:
+    """
+    Delete blobs unreferenced for longer than the grace period; returns how many
+    """
+    grace = settings.document_blob_grace_seconds if grace_seconds is None else grace_seconds
+    released_before = datetime.utcnow() - timedelta(seconds=grace)
+    stale = (StoredBlob.ref_count <= 0, StoredBlob.released_at < released_before)
+    candidates = db.scalars(select(StoredBlob.sha256).where(*stale)).all()
+    db.commit()
+
+    removed = 0
+    for sha256 in candidates:
+        # Re-check under a row lock: an upload may have referenced the blob again since
+        blob = db.execute(
+            select(StoredBlob.file_path).where(StoredBlob.sha256 == sha256, *stale).with_for_update()
+        ).first()
+        try:
+            if blob is not None and _remove_blob_file(blob.file_path, time.time() - grace):
+                db.execute(delete(StoredBlob.__table__).where(StoredBlob.sha256 == sha256))
+                removed += 1
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"Error removing document file for blob {sha256}: {e}")
+    return removed
+
+
+def run_document_sweep() -> Optional[ScheduledJobRun]:
+    return run_scheduled_job(DOCUMENT_SWEEP_JOB_NAME, DOCUMENT_SWEEP_LOCK_KEY, sweep_released_blobs)
+
+
+document_sweep_scheduler = PeriodicJob(
+    DOCUMENT_SWEEP_JOB_NAME,
+    run_document_sweep,
+    settings.document_blob_sweep_interval_seconds,
+)
@@ -0,0 +1,97 @@
+from typing import List
+
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.contract import Contract, User
+from app.models.id_counter import IdCounter
+from app.models.vendor import Vendor
+
+# Prefix -> business ID column the counter is seeded from
+ID_SOURCES = {
+    "CT": Contract.contract_id,
+    "U": User.user_id,
+    "AB": Vendor.vendor_id,
+    "OB": Vendor.vendor_id,
+}
+
+
+class IdAllocator:
+    """
+    Business ID allocation (CT1, U1, AB1, OB1, ...) backed by the id_counters table.
+
+    Each call is a single UPDATE ... RETURNING (OUTPUT on MSSQL). The updated
+    counter row stays locked until the caller's transaction ends, so two
+    concurrent creates can never get the same number, and a rolled back
+    create gives its number back.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def next_value(self, prefix: str) -> int:
+        """
+        Allocate the next number for prefix
+        """
+        prefix = getattr(prefix, "value", prefix)
+        value = self._increment(prefix)
+        if value is None:
+            value = self._seed(prefix)
+        return value
+
+    def next_id(self, prefix: str) -> str:
+        """
+        Allocate the next business ID for prefix, e.g. "CT42"
+        """
+        prefix = getattr(prefix, "value", prefix)
+        return f"{prefix}{self.next_value(prefix)}"
+
+    def next_ids(self, prefix: str, count: int) -> List[str]:
+        """
+        Allocate count consecutive business IDs with a single counter update (bulk imports)
+        """
+        prefix = getattr(prefix, "value", prefix)
+        if count <= 0:
+            return []
+        last = self._increment(prefix, count)
+        if last is None:
+            last = self._seed(prefix, count)
+        return [f"{prefix}{value}" for value in range(last - count + 1, last + 1)]
+
+    def _increment(self, prefix: str, count: int = 1):
+        return self.db.execute(
+            update(IdCounter)
+            .where(IdCounter.prefix == prefix)
+            .values(last_value=IdCounter.last_value + count)
+            .returning(IdCounter.last_value)
+        ).scalar()
+
+    def _seed(self, prefix: str, count: int = 1) -> int:
+        """
+        First allocation for a prefix without a counter row (migration not run
+        or a new prefix): start after the highest existing ID.
+        Returns the last allocated number.
+        """
+        last_number = self._max_existing(prefix) + count
+        try:
+            with self.db.begin_nested():
+                self.db.add(IdCounter(prefix=prefix, last_value=last_number))
+            return last_number
+        except IntegrityError:
+            # Another transaction created the row first
+            value = self._increment(prefix, count)
+            if value is None:
+                raise
+            return value
+
+    def _max_existing(self, prefix: str) -> int:
+        if prefix not in ID_SOURCES:
+            raise ValueError(f"Unknown business ID prefix: {prefix}")
+        column = ID_SOURCES[prefix]
+        highest = 0
+        for (business_id,) in self.db.query(column).filter(column.like(f"{prefix}%")):
+            suffix = business_id[len(prefix):]
+            if suffix.isdigit():
+                highest = max(highest, int(suffix))
+        return highest
@@ -0,0 +1,346 @@
+"""
+Persisted notification inbox (user_notifications).
+
+Notifications are written ahead of time instead of being recomputed on every
+page load:
+- the daily refresh job reconciles expiry notifications (contract managers /
+  backups and the admin overview) and pending review notifications;
+- an after_flush hook adds or removes the admins' pending review notifications
+  as soon as a ContractUpdate enters or leaves PENDING_REVIEW.
+Readers only run an indexed COUNT for the badge and a paginated fetch when the
+inbox is opened.
+"""
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import case, delete, event, insert, inspect, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.contract import (
+    Contract,
+    ContractStatusType,
+    ContractUpdate,
+    ContractUpdateStatus,
+    ExpirationNoticePeriodType,
+    User,
+    UserRole,
+)
+from app.models.scheduled_job_run import ScheduledJobRun
+from app.models.user_notification import UserNotification
+from app.models.vendor import Vendor
+from app.services.scheduled_jobs import PeriodicJob, run_scheduled_job
+
+NOTIFICATION_REFRESH_JOB_NAME = "notification_refresh"
+# Arbitrary application-wide key for the job lock (advisory lock / applock)
+NOTIFICATION_REFRESH_LOCK_KEY = 7_316_902_452
+
+# Notification types owned by the refresh job
+EXPIRING_SOON = "expiring_soon"
+PAST_DUE = "past_due"
+PENDING_REVIEW = "pending_review"
+GENERATED_TYPES = (EXPIRING_SOON, PAST_DUE, PENDING_REVIEW)
+
+# "30 days" -> 30, parsed once instead of per contract
+NOTICE_DAYS = {period: int(period.value.split()[0]) for period in ExpirationNoticePeriodType}
+DEFAULT_NOTICE_DAYS = 30
+
+# Admin overview: soonest Active contracts expiring within the window
+ADMIN_EXPIRING_DAYS = 30
+ADMIN_EXPIRING_LIMIT = 5
+
+MANAGER_ROLES = (UserRole.CONTRACT_MANAGER, UserRole.CONTRACT_MANAGER_BACKUP, UserRole.CONTRACT_MANAGER_OWNER)
+
+PRIORITY_RANK = {"high": 0, "medium": 1, "low": 2}
+
+# (user_id, dedupe_key)
+NotificationKey = Tuple[int, str]
+
+
+def _notification(user_id: int, type_: str, dedupe_key: str, title: str, message: str, link: str,
+                  priority: str, contract_id: int, contract_update_id: Optional[int] = None,
+                  created_at: Optional[datetime] = None) -> dict:
+    return {
+        "user_id": user_id,
+        "type": type_,
+        "dedupe_key": dedupe_key,
+        "title": title,
+        "message": message,
+        "link": link,
+        "priority": priority,
+        "contract_id": contract_id,
+        "contract_update_id": contract_update_id,
+        "is_read": False,
+        "created_at": created_at or datetime.utcnow(),
+    }
+
+
+def _pending_review_notification(admin_id: int, update_id: int, contract_db_id: int, contract_code: str,
+                                 vendor_name: Optional[str], created_at: Optional[datetime]) -> dict:
+    return _notification(
+        admin_id,
+        PENDING_REVIEW,
+        f"{PENDING_REVIEW}:{update_id}",
+        "Contract Update Pending Review",
+        f"Update for {contract_code} ({vendor_name or 'Unknown'}) requires your review.",
+        "/pending-reviews",
+        "high",
+        contract_db_id,
+        contract_update_id=update_id,
+        created_at=created_at,
+    )
+
+
+def _expiry_notification(user_id: int, contract_db_id: int, contract_code: str, vendor_name: Optional[str],
+                         end_date: date, today: date, role_text: Optional[str] = None) -> dict:
+    vendor_name = vendor_name or "Unknown"
+    # Messages use the end date rather than "in N days" so the row stays correct between refreshes
+    if end_date < today:
+        return _notification(
+            user_id,
+            PAST_DUE,
+            f"{PAST_DUE}:{contract_db_id}:{end_date.isoformat()}",
+            f"Contract {contract_code} is Past Due",
+            f"{contract_code} with {vendor_name} expired on {end_date.strftime('%b %d, %Y')}. Action required.",
+            f"/contract-info/{contract_db_id}",
+            "high",
+            contract_db_id,
+        )
+    message = f"{contract_code} with {vendor_name} expires on {end_date.strftime('%b %d, %Y')}."
+    if role_text:
+        message += f" Your role: {role_text}."
+    return _notification(
+        user_id,
+        EXPIRING_SOON,
+        f"{EXPIRING_SOON}:{contract_db_id}:{end_date.isoformat()}",
+        f"Contract {contract_code} Expiring Soon",
+        message,
+        f"/contract-info/{contract_db_id}",
+        "medium",
+        contract_db_id,
+    )
+
+
+class NotificationService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    # Reading
+
+    def unread_count(self, user_id: int) -> int:
+        return self.db.query(UserNotification).filter(
+            UserNotification.user_id == user_id,
+            UserNotification.is_read == False  # noqa: E712
+        ).count()
+
+    def list_notifications(self, user_id: int, limit: Optional[int] = None, offset: int = 0) -> List[UserNotification]:
+        """
+        One page of a user's inbox: unread first, then by priority, newest first
+        """
+        priority_rank = case(
+            *[(UserNotification.priority == priority, rank) for priority, rank in PRIORITY_RANK.items()],
+            else_=len(PRIORITY_RANK),
+        )
+        return (
+            self.db.query(UserNotification)
+            .filter(UserNotification.user_id == user_id)
+            .order_by(UserNotification.is_read, priority_rank, UserNotification.created_at.desc(), UserNotification.id.desc())
+            .offset(offset)
+            .limit(limit or settings.notification_page_size)
+            .all()
+        )
+
+    def mark_read(self, user_id: int, notification_ids: Optional[Iterable[int]] = None) -> int:
+        """
+        Mark the given notifications (default: all) of a user as read
+        """
+        statement = update(UserNotification).where(
+            UserNotification.user_id == user_id,
+            UserNotification.is_read == False  # noqa: E712
+        )
+        if notification_ids is not None:
+            statement = statement.where(UserNotification.id.in_(list(notification_ids)))
+        result = self.db.execute(
+            statement.values(is_read=True, read_at=datetime.utcnow()).execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+        return result.rowcount
+
+    # Refresh job
+
+    def expected_notifications(self, today: date) -> Dict[NotificationKey, dict]:
+        """
+        Every notification that should currently exist for the generated types
+        """
+        expected: Dict[NotificationKey, dict] = {}
+
+        def add(row: dict) -> None:
+            expected[(row["user_id"], row["dedupe_key"])] = row
+
+        users = self.db.query(User.id, User.role).filter(User.is_active == True).all()  # noqa: E712
+        manager_ids = {user_id for user_id, role in users if role in MANAGER_ROLES}
+        admin_ids = [user_id for user_id, role in users if role == UserRole.CONTRACT_ADMIN]
+
+        # Contract managers / backups: their Active contracts inside the notice window or past due
+        contracts = (
+            self.db.query(
+                Contract.id,
+                Contract.contract_id,
+                Contract.end_date,
+                Contract.expiration_notice_frequency,
+                Contract.contract_owner_id,
+                Contract.contract_owner_backup_id,
+                Vendor.vendor_name,
+            )
+            .outerjoin(Vendor, Contract.vendor_id == Vendor.id)
+            .filter(
+                Contract.status == ContractStatusType.ACTIVE,
+                Contract.end_date <= today + timedelta(days=max(NOTICE_DAYS.values())),
+            )
+            .all()
+        )
+        for contract in contracts:
+            notice_days = NOTICE_DAYS.get(contract.expiration_notice_frequency, DEFAULT_NOTICE_DAYS)
+            if contract.end_date >= today and today < contract.end_date - timedelta(days=notice_days):
+                continue
+            for user_id, role_text in (
+                (contract.contract_owner_id, "Contract Manager"),
+                (contract.contract_owner_backup_id, "Backup"),
+            ):
+                if user_id in manager_ids:
+                    add(_expiry_notification(
+                        user_id, contract.id, contract.contract_id, contract.vendor_name,
+                        contract.end_date, today, role_text,
+                    ))
+
+        if not admin_ids:
+            return expected
+
+        # Contract admins: updates waiting for review
+        pending_updates = (
+            self.db.query(ContractUpdate.id, ContractUpdate.created_at, Contract.id.label("contract_db_id"),
+                          Contract.contract_id, Vendor.vendor_name)
+            .join(Contract, ContractUpdate.contract_id == Contract.id)
+            .outerjoin(Vendor, Contract.vendor_id == Vendor.id)
+            .filter(ContractUpdate.status == ContractUpdateStatus.PENDING_REVIEW)
+            .all()
+        )
+        # Contract admins: overview of the soonest expiring Active contracts
+        expiring = (
+            self.db.query(Contract.id, Contract.contract_id, Contract.end_date, Vendor.vendor_name)
+            .outerjoin(Vendor, Contract.vendor_id == Vendor.id)
+            .filter(
+                Contract.status == ContractStatusType.ACTIVE,
+                Contract.end_date >= today,
+                Contract.end_date <= today + timedelta(days=ADMIN_EXPIRING_DAYS),
+            )
+            .order_by(Contract.end_date, Contract.id)
+            .limit(ADMIN_EXPIRING_LIMIT)
+            .all()
+        )
+        for admin_id in admin_ids:
+            for pending in pending_updates:
+                add(_pending_review_notification(
+                    admin_id, pending.id, pending.contract_db_id, pending.contract_id,
+                    pending.vendor_name, pending.created_at,
+                ))
+            for contract in expiring:
+                add(_expiry_notification(
+                    admin_id, contract.id, contract.contract_id, contract.vendor_name, contract.end_date, today,
+                ))
+        return expected
+
+    def refresh(self, today: Optional[date] = None) -> int:
+        """
+        Reconcile generated notifications with the current contracts / updates:
+        insert the missing ones, delete those whose condition no longer holds.
+        Read state of notifications that still apply is kept.
+        Returns the number of rows inserted + deleted.
+        """
+        expected = self.expected_notifications(today or date.today())
+        existing = {
+            (user_id, dedupe_key): notification_id
+            for notification_id, user_id, dedupe_key in self.db.query(
+                UserNotification.id, UserNotification.user_id, UserNotification.dedupe_key
+            ).filter(UserNotification.type.in_(GENERATED_TYPES))
+        }
+
+        stale_ids = [notification_id for key, notification_id in existing.items() if key not in expected]
+        new_rows = [row for key, row in expected.items() if key not in existing]
+        if stale_ids:
+            self.db.execute(
+                delete(UserNotification).where(UserNotification.id.in_(stale_ids))
+                .execution_options(synchronize_session=False)
+            )
+        if new_rows:
+            self.db.execute(insert(UserNotification), new_rows)
+        self.db.commit()
+        return len(stale_ids) + len(new_rows)
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_pending_review_notifications(session: Session, flush_context) -> None:
+    """
+    Keep the admins' pending review notifications in step with ContractUpdate.status,
+    in the same transaction as the status change
+    """
+    changed = [
+        obj for obj in session.new if isinstance(obj, ContractUpdate)
+    ] + [
+        obj for obj in session.dirty
+        if isinstance(obj, ContractUpdate) and inspect(obj).attrs.status.history.has_changes()
+    ]
+    if not changed:
+        return
+
+    connection = session.connection()
+    existing_ids = [obj.id for obj in changed if obj not in session.new]
+    if existing_ids:
+        connection.execute(
+            delete(UserNotification.__table__).where(
+                UserNotification.contract_update_id.in_(existing_ids),
+                UserNotification.type == PENDING_REVIEW,
+            )
+        )
+
+    pending = [obj for obj in changed if obj.status == ContractUpdateStatus.PENDING_REVIEW]
+    if not pending:
+        return
+    admin_ids = connection.execute(
+        select(User.id).where(User.role == UserRole.CONTRACT_ADMIN, User.is_active == True)  # noqa: E712
+    ).scalars().all()
+    if not admin_ids:
+        return
+    contracts = {
+        row.id: row
+        for row in connection.execute(
+            select(Contract.id, Contract.contract_id, Vendor.vendor_name)
+            .outerjoin(Vendor, Contract.vendor_id == Vendor.id)
+            .where(Contract.id.in_({obj.contract_id for obj in pending}))
+        )
+    }
+    rows = [
+        _pending_review_notification(
+            admin_id, obj.id, obj.contract_id, contracts[obj.contract_id].contract_id,
+            contracts[obj.contract_id].vendor_name, obj.created_at,
+        )
+        for obj in pending if obj.contract_id in contracts
+        for admin_id in admin_ids
+    ]
+    if rows:
+        connection.execute(insert(UserNotification.__table__), rows)
+
+
+def run_notification_refresh() -> Optional[ScheduledJobRun]:
+    return run_scheduled_job(
+        NOTIFICATION_REFRESH_JOB_NAME,
+        NOTIFICATION_REFRESH_LOCK_KEY,
+        lambda db: NotificationService(db).refresh(),
+    )
+
+
+notification_refresh_scheduler = PeriodicJob(
+    NOTIFICATION_REFRESH_JOB_NAME,
+    run_notification_refresh,
+    settings.notification_refresh_interval_seconds,
+)
@@ -0,0 +1,166 @@
+"""
+Background report jobs.
+
+Pages still query and build the report rows themselves (off the event loop via
+run_db / ServerTable) and submit them here. Only the workbook write is
+offloaded: app.services.report_writer runs it in a process pool, the file is
+stored under settings.report_dir and served to its owner from
+/files/reports/{job_id}, so writing a large export no longer blocks other users
+on the same worker.
+"""
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.services.report_writer import write_xlsx_report
+
+
+class ReportJobStatus:
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class ReportJob:
+    """
+    One submitted report; status and error are updated when the worker finishes
+    """
+
+    def __init__(self, job_id: str, filename: str, file_path: str, owner_id: Optional[int]):
+        self.id = job_id
+        self.filename = filename
+        self.file_path = file_path
+        self.owner_id = owner_id
+        self.status = ReportJobStatus.RUNNING
+        self.error: Optional[str] = None
+        self.row_count: Optional[int] = None
+        self.created_at = time.time()
+        self.future: Optional[Future] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (ReportJobStatus.DONE, ReportJobStatus.FAILED)
+
+
+class ReportJobRunner:
+    """
+    Process pool plus an in-memory registry of report jobs.
+    The pool and the progress manager start lazily on the first submit.
+    """
+
+    def __init__(self, max_workers: int, report_dir: str, retention_seconds: int):
+        self.max_workers = max_workers
+        self.report_dir = report_dir
+        self.retention_seconds = retention_seconds
+        self._jobs: Dict[str, ReportJob] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._manager = None
+        self._progress = None
+
+    def _ensure_pool(self) -> None:
+        if self._executor is not None:
+            return
+        # spawn: never fork a process that is running the event loop and DB pools
+        context = multiprocessing.get_context("spawn")
+        self._manager = context.Manager()
+        self._progress = self._manager.dict()
+        self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+
+    def submit(
+        self,
+        filename: str,
+        sheet_name: str,
+        rows: List[Dict[str, Any]],
+        number_formats: Optional[Dict[str, str]] = None,
+        owner_id: Optional[int] = None,
+    ) -> ReportJob:
+        """
+        Write a one-sheet Excel report in the pool; rows are dicts keyed by column header
+        """
+        self.purge_expired()
+        os.makedirs(self.report_dir, exist_ok=True)
+
+        job_id = uuid.uuid4().hex
+        job = ReportJob(job_id, filename, os.path.join(self.report_dir, f"{job_id}.xlsx"), owner_id)
+        columns = list(rows[0].keys()) if rows else []
+        values = [[row.get(column) for column in columns] for row in rows]
+
+        with self._lock:
+            self._ensure_pool()
+            self._jobs[job_id] = job
+            self._progress[job_id] = 0.0
+            job.future = self._executor.submit(
+                write_xlsx_report,
+                job.file_path,
+                sheet_name,
+                columns,
+                values,
+                number_formats,
+                self._progress,
+                job_id,
+            )
+        job.future.add_done_callback(lambda future: self._finish(job, future))
+        print(f"Report job {job_id} submitted: {filename} ({len(values)} rows)")
+        return job
+
+    def _finish(self, job: ReportJob, future: Future) -> None:
+        error = future.exception() if not future.cancelled() else RuntimeError("Report job cancelled")
+        if error is not None:
+            job.error = str(error)
+            job.status = ReportJobStatus.FAILED
+            print(f"Report job {job.id} failed: {error}")
+        else:
+            job.row_count = future.result()
+            job.status = ReportJobStatus.DONE
+
+    def get(self, job_id: str) -> Optional[ReportJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def progress(self, job: ReportJob) -> float:
+        if job.status == ReportJobStatus.DONE:
+            return 1.0
+        try:
+            return float(self._progress.get(job.id, 0.0)) if self._progress is not None else 0.0
+        except Exception:
+            return 0.0
+
+    def purge_expired(self) -> None:
+        """
+        Forget finished jobs older than the retention period and delete their files
+        """
+        cutoff = time.time() - self.retention_seconds
+        with self._lock:
+            expired = [job for job in self._jobs.values() if job.finished and job.created_at < cutoff]
+            for job in expired:
+                del self._jobs[job.id]
+                if self._progress is not None:
+                    self._progress.pop(job.id, None)
+        for job in expired:
+            if os.path.exists(job.file_path):
+                try:
+                    os.remove(job.file_path)
+                except OSError:
+                    pass
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
+            self._progress = None
+
+
+report_jobs = ReportJobRunner(
+    max_workers=settings.report_workers,
+    report_dir=settings.report_dir,
+    retention_seconds=settings.report_retention_seconds,
+)
@@ -0,0 +1,79 @@
+"""
+Excel writer executed inside the report job process pool.
+
+Kept free of application imports (database, NiceGUI) so spawned worker
+processes start quickly. Uses openpyxl write-only mode: rows are streamed to
+the file instead of building the whole worksheet in memory.
+"""
+from typing import Any, Dict, List, Optional, Sequence
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Font
+from openpyxl.utils import get_column_letter
+
+MAX_COLUMN_WIDTH = 50
+PROGRESS_EVERY_ROWS = 500
+
+
+def _column_widths(columns: Sequence[str], rows: Sequence[Sequence[Any]]) -> List[int]:
+    widths = [len(str(column)) for column in columns]
+    for row in rows:
+        for index, value in enumerate(row):
+            if value is not None:
+                widths[index] = max(widths[index], len(str(value)))
+    return [min(width + 2, MAX_COLUMN_WIDTH) for width in widths]
+
+
+def write_xlsx_report(
+    file_path: str,
+    sheet_name: str,
+    columns: Sequence[str],
+    rows: Sequence[Sequence[Any]],
+    number_formats: Optional[Dict[str, str]] = None,
+    progress=None,
+    job_id: Optional[str] = None,
+) -> int:
+    """
+    Write rows to a single-sheet workbook and return the number of data rows.
+    progress, if given, is a shared dict that receives job_id -> fraction written.
+    """
+    number_formats = number_formats or {}
+    total = len(rows)
+
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet(title=sheet_name[:31])
+
+    # Write-only sheets need column widths before the first row is appended
+    for index, width in enumerate(_column_widths(columns, rows), 1):
+        worksheet.column_dimensions[get_column_letter(index)].width = width
+
+    header_font = Font(bold=True)
+    header = []
+    for column in columns:
+        cell = WriteOnlyCell(worksheet, value=column)
+        cell.font = header_font
+        header.append(cell)
+    worksheet.append(header)
+
+    formats = [number_formats.get(column) for column in columns]
+    right_aligned = Alignment(horizontal="right")
+    for written, row in enumerate(rows, 1):
+        if any(formats):
+            cells = []
+            for value, number_format in zip(row, formats):
+                cell = WriteOnlyCell(worksheet, value=value)
+                if number_format:
+                    cell.number_format = number_format
+                    cell.alignment = right_aligned
+                cells.append(cell)
+            worksheet.append(cells)
+        else:
+            worksheet.append(list(row))
+        if progress is not None and written % PROGRESS_EVERY_ROWS == 0:
+            progress[job_id] = written / total
+
+    workbook.save(file_path)
+    if progress is not None:
+        progress[job_id] = 1.0
+    return total
@@ -0,0 +1,174 @@
+"""
+Periodic background jobs started from main.lifespan.
+
+run_scheduled_job() runs one job on a dedicated connection, records it in
+scheduled_job_runs and holds a job lock so only one worker runs a given job at
+a time: a session-level advisory lock on PostgreSQL, a session-owned
+sp_getapplock on SQL Server, and on other databases a lease row in
+scheduled_job_leases claimed with a conditional UPDATE (it expires after
+SCHEDULED_JOB_LEASE_SECONDS should the worker die). PeriodicJob repeats a job
+on an asyncio task.
+"""
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from sqlalchemy import insert, text, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.db.database import engine
+from app.models.scheduled_job_run import ScheduledJobLease, ScheduledJobRun
+
+
+class _JobLock:
+    """
+    Exclusive lock on one job for the connection the session is bound to
+    """
+
+    def __init__(self, db: Session, job_name: str, lock_key: int):
+        self.db = db
+        self.job_name = job_name
+        self.lock_key = lock_key
+        self.dialect = db.get_bind().dialect.name
+        self.holder = uuid.uuid4().hex
+
+    def acquire(self) -> bool:
+        if self.dialect == "postgresql":
+            locked = self.db.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": self.lock_key}).scalar()
+        elif self.dialect == "mssql":
+            locked = self.db.execute(
+                text(
+                    "SET NOCOUNT ON; DECLARE @result int; "
+                    "EXEC @result = sp_getapplock @Resource = :resource, @LockMode = 'Exclusive', "
+                    "@LockOwner = 'Session', @LockTimeout = 0; "
+                    "SELECT @result"
+                ),
+                {"resource": self._resource},
+            ).scalar() >= 0
+        else:
+            locked = self._claim_lease()
+        self.db.commit()
+        return bool(locked)
+
+    def release(self) -> None:
+        if self.dialect == "postgresql":
+            self.db.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": self.lock_key})
+        elif self.dialect == "mssql":
+            self.db.execute(
+                text("EXEC sp_releaseapplock @Resource = :resource, @LockOwner = 'Session'"),
+                {"resource": self._resource},
+            )
+        else:
+            self.db.execute(
+                update(ScheduledJobLease)
+                .where(ScheduledJobLease.job_name == self.job_name, ScheduledJobLease.holder == self.holder)
+                .values(expires_at=datetime.utcnow())
+            )
+        self.db.commit()
+
+    @property
+    def _resource(self) -> str:
+        return f"scheduled_job_{self.lock_key}"
+
+    def _claim_lease(self) -> bool:
+        now = datetime.utcnow()
+        lease = {"holder": self.holder, "expires_at": now + timedelta(seconds=settings.scheduled_job_lease_seconds)}
+        # Take over a lease that was released or whose worker died
+        claimed = self.db.execute(
+            update(ScheduledJobLease)
+            .where(ScheduledJobLease.job_name == self.job_name, ScheduledJobLease.expires_at <= now)
+            .values(**lease)
+        ).rowcount
+        if claimed:
+            return True
+        try:
+            with self.db.begin_nested():
+                self.db.execute(insert(ScheduledJobLease).values(job_name=self.job_name, **lease))
+            return True
+        except IntegrityError:
+            # Held by another worker
+            return False
+
+
+def run_scheduled_job(job_name: str, lock_key: int, work: Callable[[Session], int]) -> Optional[ScheduledJobRun]:
+    """
+    Run work(db) -> affected row count as one audited job run.
+    Returns the recorded run, or None when another worker holds the job lock.
+    """
+    # Advisory and application locks belong to the connection, so the session
+    # must not switch connections between the commits work() makes
+    with engine.connect() as connection:
+        db = Session(bind=connection, expire_on_commit=False)
+        try:
+            lock = _JobLock(db, job_name, lock_key)
+            if not lock.acquire():
+                return None
+            job_run = ScheduledJobRun(job_name=job_name, status="success", affected_count=0, started_at=datetime.utcnow())
+            try:
+                try:
+                    job_run.affected_count = work(db)
+                except Exception as e:
+                    db.rollback()
+                    job_run.status = "failed"
+                    job_run.error = str(e)
+                    print(f"Error in scheduled job {job_name}: {e}")
+                job_run.finished_at = datetime.utcnow()
+                db.add(job_run)
+                db.commit()
+                return job_run
+            finally:
+                lock.release()
+        finally:
+            db.close()
+
+
+def latest_job_run(db: Session, job_name: str) -> Optional[ScheduledJobRun]:
+    """
+    Most recent recorded run of a job
+    """
+    return (
+        db.query(ScheduledJobRun)
+        .filter(ScheduledJobRun.job_name == job_name)
+        .order_by(ScheduledJobRun.started_at.desc())
+        .first()
+    )
+
+
+class PeriodicJob:
+    """
+    asyncio task that calls func every interval_seconds.
+    func is sync ORM code (typically a run_scheduled_job wrapper) and runs in the threadpool.
+    """
+
+    def __init__(self, name: str, func: Callable[[], Optional[ScheduledJobRun]], interval_seconds: int):
+        self.name = name
+        self.func = func
+        self.interval_seconds = interval_seconds
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                job_run = await run_in_threadpool(self.func)
+                if job_run is not None:
+                    print(f"Scheduled job {self.name} {job_run.status}: {job_run.affected_count} row(s)")
+            except Exception as e:
+                print(f"Error scheduling job {self.name}: {e}")
+            await asyncio.sleep(self.interval_seconds)
@@ -0,0 +1,364 @@
+"""
+Keyword search over contracts and vendors.
+
+Searchable text (contract id, description, type, vendor and owner names;
+vendor id, name, contact person and emails) is denormalized into
+search_documents and kept current by an after_flush hook, so a search reads
+one indexed table instead of ILIKE '%term%' across joins. Every word of the search term must
+match the start of a word in the document (type-ahead), and results are
+ranked:
+
+- PostgreSQL: prefix tsquery on the generated content_tsv column plus pg_trgm
+  substring matches, ranked by ts_rank + similarity (GIN indexes, migration 016)
+- SQLite: pure-Python inverted index loaded from search_documents, for test runs
+- other dialects (MSSQL): LIKE on search_documents.content
+"""
+import bisect
+import re
+import threading
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, case, delete, event, func, insert, inspect, literal, literal_column, or_, select
+from sqlalchemy.orm import Session
+
+from app.models.contract import Contract, User
+from app.models.search_document import SearchDocument
+from app.models.vendor import Vendor, VendorEmail
+
+CONTRACT = "contract"
+VENDOR = "vendor"
+
+_WORD = re.compile(r"\w+")
+
+
+def normalize(*values) -> str:
+    """
+    Lowercased words of the given field values joined by single spaces
+    """
+    return " ".join(word for value in values if value for word in _WORD.findall(str(value).lower()))
+
+
+def search_tokens(term: Optional[str]) -> List[str]:
+    return _WORD.findall((term or "").lower())
+
+
+# Building documents
+
+def contract_documents(bind, contract_ids=None, vendor_ids=None, owner_ids=None) -> List[dict]:
+    """
+    search_documents rows for the given contracts, the contracts of the given
+    vendors / owners, or every contract when no ids are given
+    """
+    statement = (
+        select(
+            Contract.id,
+            Contract.contract_id,
+            Contract.contract_description,
+            Contract.contract_type,
+            Vendor.vendor_name,
+            User.first_name,
+            User.last_name,
+        )
+        .outerjoin(Vendor, Contract.vendor_id == Vendor.id)
+        .outerjoin(User, Contract.contract_owner_id == User.id)
+    )
+    conditions = []
+    if contract_ids:
+        conditions.append(Contract.id.in_(list(contract_ids)))
+    if vendor_ids:
+        conditions.append(Contract.vendor_id.in_(list(vendor_ids)))
+    if owner_ids:
+        conditions.append(Contract.contract_owner_id.in_(list(owner_ids)))
+    if conditions:
+        statement = statement.where(or_(*conditions))
+    elif contract_ids is not None or vendor_ids is not None or owner_ids is not None:
+        return []
+
+    now = datetime.utcnow()
+    return [
+        {
+            "entity_type": CONTRACT,
+            "entity_id": row.id,
+            "content": normalize(
+                row.contract_id,
+                row.contract_description,
+                row.contract_type.value if row.contract_type else None,
+                row.vendor_name,
+                row.first_name,
+                row.last_name,
+            ),
+            "updated_at": now,
+        }
+        for row in bind.execute(statement)
+    ]
+
+
+def vendor_documents(bind, vendor_ids=None) -> List[dict]:
+    """
+    search_documents rows for the given vendors (every vendor when None)
+    """
+    if vendor_ids is not None and not vendor_ids:
+        return []
+    vendors = select(Vendor.id, Vendor.vendor_id, Vendor.vendor_name, Vendor.vendor_contact_person)
+    emails = select(VendorEmail.vendor_id, VendorEmail.email)
+    if vendor_ids is not None:
+        vendors = vendors.where(Vendor.id.in_(list(vendor_ids)))
+        emails = emails.where(VendorEmail.vendor_id.in_(list(vendor_ids)))
+
+    emails_by_vendor: Dict[int, List[str]] = defaultdict(list)
+    for vendor_id, email in bind.execute(emails):
+        emails_by_vendor[vendor_id].append(email)
+
+    now = datetime.utcnow()
+    return [
+        {
+            "entity_type": VENDOR,
+            "entity_id": row.id,
+            "content": normalize(row.vendor_id, row.vendor_name, row.vendor_contact_person, *emails_by_vendor[row.id]),
+            "updated_at": now,
+        }
+        for row in bind.execute(vendors)
+    ]
+
+
+def _replace_documents(bind, entity_type: str, entity_ids: Iterable[int], documents: List[dict]) -> None:
+    entity_ids = set(entity_ids) | {document["entity_id"] for document in documents}
+    if not entity_ids:
+        return
+    bind.execute(
+        delete(SearchDocument.__table__).where(
+            SearchDocument.entity_type == entity_type,
+            SearchDocument.entity_id.in_(list(entity_ids)),
+        )
+    )
+    if documents:
+        bind.execute(insert(SearchDocument.__table__), documents)
+
+
+def reindex_contracts(bind, contract_ids=(), vendor_ids=(), owner_ids=()) -> None:
+    documents = contract_documents(bind, set(contract_ids), set(vendor_ids), set(owner_ids))
+    _replace_documents(bind, CONTRACT, contract_ids, documents)
+
+
+def reindex_vendors(bind, vendor_ids) -> None:
+    _replace_documents(bind, VENDOR, vendor_ids, vendor_documents(bind, set(vendor_ids)))
+
+
+# Backends
+
+class SqlSearchBackend:
+    """
+    Word-prefix LIKE on search_documents.content (MSSQL and other dialects)
+    """
+
+    def _word_prefix(self, token: str):
+        escaped = token.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return or_(
+            SearchDocument.content.like(f"{escaped}%", escape="\\"),
+            SearchDocument.content.like(f"% {escaped}%", escape="\\"),
+        )
+
+    def match(self, tokens: List[str]):
+        return and_(*[self._word_prefix(token) for token in tokens])
+
+    def filter(self, db: Session, query, entity_type: str, id_column, tokens: List[str]):
+        return query.join(
+            SearchDocument,
+            and_(SearchDocument.entity_type == entity_type, SearchDocument.entity_id == id_column),
+        ).filter(self.match(tokens))
+
+    def rank(self, db: Session, entity_type: str, id_column, tokens: List[str]):
+        # Documents starting with a term word (e.g. the contract / vendor id) first
+        return sum(
+            (case((SearchDocument.content.like(f"{token}%"), 2), else_=1) for token in tokens),
+            literal(0),
+        )
+
+
+class PostgresSearchBackend(SqlSearchBackend):
+    """
+    Prefix tsquery on content_tsv plus pg_trgm substring match, both GIN indexed
+    """
+
+    content_tsv = literal_column("search_documents.content_tsv")
+
+    @staticmethod
+    def _prefix_query(tokens: List[str]):
+        return func.to_tsquery("simple", " & ".join(f"{token}:*" for token in tokens))
+
+    def match(self, tokens: List[str]):
+        return or_(
+            self.content_tsv.op("@@")(self._prefix_query(tokens)),
+            # Substrings inside words (e.g. "1234" in a contract id), via the trigram index
+            and_(*[SearchDocument.content.ilike(f"%{token}%") for token in tokens]),
+        )
+
+    def rank(self, db: Session, entity_type: str, id_column, tokens: List[str]):
+        return func.ts_rank(self.content_tsv, self._prefix_query(tokens)) + func.similarity(
+            SearchDocument.content, " ".join(tokens)
+        )
+
+
+class MemorySearchBackend:
+    """
+    Pure-Python inverted index over search_documents, for SQLite test runs.
+    Loaded on first use and reloaded after any commit that reindexed documents.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loaded = False
+        # entity_type -> sorted vocabulary, and (entity_type, word) -> entity ids
+        self._vocabulary: Dict[str, List[str]] = {}
+        self._postings: Dict[Tuple[str, str], Set[int]] = {}
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._loaded = False
+
+    def _load(self, db: Session) -> None:
+        vocabulary: Dict[str, Set[str]] = defaultdict(set)
+        postings: Dict[Tuple[str, str], Set[int]] = defaultdict(set)
+        for entity_type, entity_id, content in db.execute(
+            select(SearchDocument.entity_type, SearchDocument.entity_id, SearchDocument.content)
+        ):
+            for word in content.split():
+                vocabulary[entity_type].add(word)
+                postings[(entity_type, word)].add(entity_id)
+        self._vocabulary = {entity_type: sorted(words) for entity_type, words in vocabulary.items()}
+        self._postings = dict(postings)
+        self._loaded = True
+
+    def scores(self, db: Session, entity_type: str, tokens: List[str]) -> Dict[int, int]:
+        """
+        entity id -> score for documents where every token prefixes a word
+        (exact word match scores 2, prefix match 1)
+        """
+        with self._lock:
+            if not self._loaded:
+                self._load(db)
+            vocabulary = self._vocabulary.get(entity_type, [])
+            result: Optional[Dict[int, int]] = None
+            for token in tokens:
+                token_scores: Dict[int, int] = {}
+                position = bisect.bisect_left(vocabulary, token)
+                while position < len(vocabulary) and vocabulary[position].startswith(token):
+                    word = vocabulary[position]
+                    for entity_id in self._postings[(entity_type, word)]:
+                        token_scores[entity_id] = max(token_scores.get(entity_id, 0), 2 if word == token else 1)
+                    position += 1
+                if result is None:
+                    result = token_scores
+                else:
+                    result = {
+                        entity_id: score + token_scores[entity_id]
+                        for entity_id, score in result.items() if entity_id in token_scores
+                    }
+                if not result:
+                    return {}
+            return result or {}
+
+    def filter(self, db: Session, query, entity_type: str, id_column, tokens: List[str]):
+        return query.filter(id_column.in_(list(self.scores(db, entity_type, tokens))))
+
+    def rank(self, db: Session, entity_type: str, id_column, tokens: List[str]):
+        scores = self.scores(db, entity_type, tokens)
+        if not scores:
+            return literal(0)
+        return case(scores, value=id_column, else_=0)
+
+
+class SearchIndex:
+    """
+    Picks the backend for the session's dialect
+    """
+
+    def __init__(self):
+        self.sql = SqlSearchBackend()
+        self.postgres = PostgresSearchBackend()
+        self.memory = MemorySearchBackend()
+
+    def backend(self, db: Session):
+        dialect = db.get_bind().dialect.name
+        if dialect == "postgresql":
+            return self.postgres
+        if dialect == "sqlite":
+            return self.memory
+        return self.sql
+
+    def filter(self, db: Session, query, entity_type: str, id_column, term: Optional[str]):
+        """
+        Restrict query to entities matching term (unchanged when term has no words)
+        """
+        tokens = search_tokens(term)
+        if not tokens:
+            return query
+        return self.backend(db).filter(db, query, entity_type, id_column, tokens)
+
+    def rank(self, db: Session, entity_type: str, id_column, term: Optional[str]):
+        """
+        Relevance expression (higher is better) for a query passed through filter()
+        """
+        tokens = search_tokens(term)
+        if not tokens:
+            return literal(0)
+        return self.backend(db).rank(db, entity_type, id_column, tokens)
+
+
+search_index = SearchIndex()
+
+
+# Maintenance on write
+
+_DIRTY_KEY = "search_index_dirty"
+
+
+def _changed(obj, *attributes) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[attribute].history.has_changes() for attribute in attributes)
+
+
+@event.listens_for(Session, "after_flush")
+def _reindex_changed_documents(session: Session, flush_context) -> None:
+    contract_ids: Set[int] = set()
+    vendor_ids: Set[int] = set()
+    renamed_vendor_ids: Set[int] = set()
+    renamed_owner_ids: Set[int] = set()
+
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        is_new_or_deleted = obj in session.new or obj in session.deleted
+        if isinstance(obj, Contract):
+            contract_ids.add(obj.id)
+        elif isinstance(obj, Vendor):
+            vendor_ids.add(obj.id)
+            if not is_new_or_deleted and _changed(obj, "vendor_name"):
+                renamed_vendor_ids.add(obj.id)
+        elif isinstance(obj, VendorEmail):
+            vendor_ids.add(obj.vendor_id)
+        elif isinstance(obj, User) and not is_new_or_deleted and _changed(obj, "first_name", "last_name"):
+            renamed_owner_ids.add(obj.id)
+
+    contract_ids.discard(None)
+    vendor_ids.discard(None)
+    if not (contract_ids or vendor_ids or renamed_owner_ids):
+        return
+
+    connection = session.connection()
+    if contract_ids or renamed_vendor_ids or renamed_owner_ids:
+        reindex_contracts(connection, contract_ids, renamed_vendor_ids, renamed_owner_ids)
+    if vendor_ids:
+        reindex_vendors(connection, vendor_ids)
+    session.info[_DIRTY_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _refresh_memory_index(session: Session) -> None:
+    if session.info.pop(_DIRTY_KEY, False):
+        search_index.memory.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_dirty_flag(session: Session) -> None:
+    session.info.pop(_DIRTY_KEY, None)
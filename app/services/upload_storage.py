@@ -0,0 +1,144 @@
+"""
+Streaming storage for uploaded PDF documents.
+
+Uploads are copied to a temporary file next to their destination in fixed-size
+chunks, hashed on the fly, sniffed with libmagic on the first few KB and
+structurally checked with PyPDF2 in a worker thread before being renamed into
+place. Memory use per upload is bounded by CHUNK_SIZE, not the file size.
+"""
+import hashlib
+import os
+import uuid
+from dataclasses import dataclass
+from typing import Optional
+
+import aiofiles
+import magic
+import PyPDF2
+from fastapi import HTTPException, UploadFile
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.constants import FileConstants, HTTPStatus
+
+CHUNK_SIZE = 64 * 1024
+# libmagic only needs the file header to recognise a PDF
+SNIFF_SIZE = 4 * 1024
+
+INVALID_PDF_DETAIL = "Only valid PDF files are allowed"
+
+
+@dataclass
+class StoredUpload:
+    """Result of streaming an upload to disk"""
+    file_path: str
+    file_size: int
+    sha256: str
+
+
+def sniff_content_type(head: bytes) -> Optional[str]:
+    """
+    MIME type libmagic reports for the first bytes of a file (None if unknown)
+    """
+    try:
+        return magic.from_buffer(head, mime=True)
+    except Exception:
+        return None
+
+
+def is_valid_pdf_stream(stream) -> bool:
+    """
+    True if the seekable stream parses as a PDF with at least one page.
+    PyPDF2 seeks to the xref table instead of loading the whole file.
+    """
+    try:
+        return len(PyPDF2.PdfReader(stream).pages) > 0
+    except Exception:
+        return False
+
+
+def is_valid_pdf_path(file_path: str) -> bool:
+    with open(file_path, "rb") as stream:
+        return is_valid_pdf_stream(stream)
+
+
+def _remove_quietly(file_path: str) -> None:
+    try:
+        os.remove(file_path)
+    except OSError:
+        pass
+
+
+async def store_pdf_upload(
+    file: UploadFile,
+    upload_dir: str,
+    document_type: str,
+    max_size: Optional[int] = None,
+) -> StoredUpload:
+    """
+    Stream a PDF upload into upload_dir as <document_type>_<uuid><ext>.
+
+    Raises HTTPException 400 if the content is not a valid PDF and 413 if it
+    exceeds max_size (settings.max_file_size by default). Nothing is left in
+    upload_dir on failure.
+    """
+    max_size = settings.max_file_size if max_size is None else max_size
+    os.makedirs(upload_dir, exist_ok=True)
+
+    file_extension = os.path.splitext(file.filename or "")[1]
+    file_path = os.path.join(upload_dir, f"{document_type}_{uuid.uuid4()}{file_extension}")
+    # Same directory as the destination, so the final rename is atomic
+    temp_path = f"{file_path}.part"
+
+    digest = hashlib.sha256()
+    file_size = 0
+    head = b""
+    try:
+        async with aiofiles.open(temp_path, "wb") as out:
+            while True:
+                chunk = await file.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                file_size += len(chunk)
+                if file_size > max_size:
+                    raise HTTPException(
+                        status_code=HTTPStatus.PAYLOAD_TOO_LARGE,
+                        detail=f"File exceeds the maximum size of {max_size // (1024 * 1024)} MB",
+                    )
+                if len(head) < SNIFF_SIZE:
+                    head += chunk[:SNIFF_SIZE - len(head)]
+                    if len(head) >= SNIFF_SIZE and sniff_content_type(head) not in FileConstants.ALLOWED_FILE_TYPES:
+                        # Reject early instead of spooling the rest of a non-PDF
+                        raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail=INVALID_PDF_DETAIL)
+                digest.update(chunk)
+                await out.write(chunk)
+
+        if file_size == 0 or sniff_content_type(head) not in FileConstants.ALLOWED_FILE_TYPES:
+            raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail=INVALID_PDF_DETAIL)
+        if not await run_in_threadpool(is_valid_pdf_path, temp_path):
+            raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail=INVALID_PDF_DETAIL)
+
+        os.replace(temp_path, file_path)
+    except BaseException:
+        _remove_quietly(temp_path)
+        raise
+
+    return StoredUpload(file_path=file_path, file_size=file_size, sha256=digest.hexdigest())
+
+
+def store_pdf_bytes(content: bytes, upload_dir: str, filename: str, document_type: str) -> StoredUpload:
+    """
+    Write already validated in-memory content with the same naming and atomic rename
+    """
+    os.makedirs(upload_dir, exist_ok=True)
+    file_extension = os.path.splitext(filename or "")[1]
+    file_path = os.path.join(upload_dir, f"{document_type}_{uuid.uuid4()}{file_extension}")
+    temp_path = f"{file_path}.part"
+    try:
+        with open(temp_path, "wb") as out:
+            out.write(content)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        _remove_quietly(temp_path)
+        raise
+    return StoredUpload(file_path=file_path, file_size=len(content), sha256=hashlib.sha256(content).hexdigest())
@@ -4,10 +4,7 @@ from typing import List, Optional
 from datetime import datetime, timedelta
 from dateutil.relativedelta import relativedelta
 import os
-import uuid
 from fastapi import UploadFile, HTTPException
-import magic
-import PyPDF2
 import io
 
 from app.models.vendor import (
@@ -15,6 +12,13 @@ from app.models.vendor import (
     MaterialOutsourcingType, DueDiligenceRequiredType, DocumentType, VendorStatusType
 )
 from app.schemas.vendor import VendorCreate, VendorUpdate
+from app.services import document_store
+from app.services.id_allocator import IdAllocator
+from app.services.search_index import VENDOR, search_index
+from app.services.upload_storage import (
+    SNIFF_SIZE, StoredUpload, is_valid_pdf_stream, sniff_content_type, store_pdf_upload
+)
+from app.core.cache import reference_cache, VENDORS_NAMESPACE
 from app.core.constants import (
     ErrorMessages,
     HTTPStatus,
@@ -25,6 +29,13 @@ from app.core.constants import (
 )
 
 
+# Column headers of iter_vendor_export_rows / GET /vendors/export
+VENDOR_EXPORT_COLUMNS = (
+    "id", "vendor_id", "vendor_name", "vendor_contact_person", "email",
+    "vendor_country", "next_required_due_diligence_date", "status", "is_due_diligence_overdue",
+)
+
+
 class VendorService:
     def __init__(self, db: Session):
         self.db = db
@@ -34,43 +45,7 @@ class VendorService:
         Generate unique vendor ID with proper numeric ordering.
         Format: AB1, AB2, AB3, etc. (for Aruba Bank) or OB1, OB2, OB3, etc. (for Orco Bank)
         """
-        # Get all existing vendor IDs with this bank prefix
-        existing_vendors = (
-            self.db.query(Vendor.vendor_id)
-            .filter(Vendor.vendor_id.like(f"{bank_type}%"))
-            .all()
-        )
-        
-        # Extract numeric parts and find the maximum
-        existing_numbers = []
-        for (vendor_id,) in existing_vendors:
-            try:
-                number = int(vendor_id[2:])  # Remove AB or OB prefix
-                existing_numbers.append(number)
-            except ValueError:
-                continue
-        
-        # Generate next number
-        if existing_numbers:
-            next_number = max(existing_numbers) + 1
-        else:
-            next_number = 1
-        
-        new_vendor_id = f"{bank_type}{next_number}"
-        
-        # Verify it doesn't exist (safety check)
-        existing = self.db.query(Vendor).filter(
-            Vendor.vendor_id == new_vendor_id
-        ).first()
-        
-        if existing:
-            # If somehow it exists, keep incrementing until we find a free ID
-            while existing:
-                next_number += 1
-                new_vendor_id = f"{bank_type}{next_number}"
-                existing = self.db.query(Vendor).filter(
-                    Vendor.vendor_id == new_vendor_id
-                ).first()
+        new_vendor_id = IdAllocator(self.db).next_id(bank_type)
         
         print(f"Generated vendor ID: {new_vendor_id}")
         return new_vendor_id
@@ -85,41 +60,42 @@ class VendorService:
                 else DueDiligenceConstants.NON_MATERIAL_OUTSOURCING_YEARS)
         return last_due_diligence_date + relativedelta(years=years)
 
-    def validate_pdf_file(self, file: UploadFile) -> bool:
+    def is_pdf_upload(self, file: UploadFile) -> bool:
+        """
+        Cheap checks on the upload metadata; content is validated while it is stored
+        """
         if not file or not file.filename:
             return False
-        
-        if file.content_type not in FileConstants.ALLOWED_FILE_TYPES:
+        return file.content_type in FileConstants.ALLOWED_FILE_TYPES
+
+    def validate_pdf_file(self, file: UploadFile) -> bool:
+        if not self.is_pdf_upload(file):
             return False
         
-        # Read file content for validation
+        # Sniff the header and parse the spooled upload in place instead of reading it into memory
         try:
-            file_content = file.file.read()
+            head = file.file.read(SNIFF_SIZE)
+            file.file.seek(0)
+            if not head or sniff_content_type(head) not in FileConstants.ALLOWED_FILE_TYPES:
+                return False
+            valid = is_valid_pdf_stream(file.file)
             file.file.seek(0)  # Reset file pointer
+            return valid
         except Exception:
             return False
-        
+
+    def validate_pdf_bytes(self, file_content: bytes) -> bool:
+        """
+        Validate in-memory file content as a non-empty PDF with at least one page
+        """
         # Check if file is empty
-        if len(file_content) == 0:
+        if not file_content:
             return False
         
-        try:
-            file_type = magic.from_buffer(file_content, mime=True)
-            if file_type not in FileConstants.ALLOWED_FILE_TYPES:
-                return False
-        except Exception:
+        if sniff_content_type(file_content[:SNIFF_SIZE]) not in FileConstants.ALLOWED_FILE_TYPES:
             return False
         
-        # Try to read PDF with PyPDF2
-        try:
-            pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content))
-            # Check if PDF has at least one page
-            if len(pdf_reader.pages) == 0:
-                return False
-        except Exception:
-            return False
-        
-        return True
+        return is_valid_pdf_stream(io.BytesIO(file_content))
 
     def validate_custom_document_name(self, name: str) -> bool:
         import re
@@ -128,21 +104,10 @@ class VendorService:
             return False
         return bool(re.match(ValidationPatterns.DOCUMENT_NAME, name.strip()))
 
-    async def save_uploaded_file(self, file: UploadFile, vendor_id: str, document_type: str) -> str:
+    async def save_uploaded_file(self, file: UploadFile, vendor_id: str, document_type: str) -> StoredUpload:
         upload_dir = os.path.join(FileConstants.VENDOR_DOCS_DIR, vendor_id)
-        os.makedirs(upload_dir, exist_ok=True)
-        
-        # Generate unique filename
-        file_extension = os.path.splitext(file.filename)[1]
-        unique_filename = f"{document_type}_{uuid.uuid4()}{file_extension}"
-        file_path = os.path.join(upload_dir, unique_filename)
-        
-        # Save file
-        with open(file_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
-        
-        return file_path
+        stored = await store_pdf_upload(file, upload_dir, document_type)
+        return document_store.adopt(stored)
 
     def create_vendor(self, vendor_data: VendorCreate, bank_type: str = VendorPrefix.ARUBA_BANK.value) -> Vendor:
         vendor_id = self.generate_vendor_id(bank_type)
@@ -209,6 +174,7 @@ class VendorService:
         
         self.db.commit()
         self.db.refresh(vendor)
+        reference_cache.invalidate(VENDORS_NAMESPACE)
         
         return vendor
 
@@ -231,6 +197,7 @@ class VendorService:
         
         self.db.commit()
         self.db.refresh(vendor)
+        reference_cache.invalidate(VENDORS_NAMESPACE)
         return vendor
     
     def update_vendor_primary_email(self, vendor_id: int, new_email: str) -> VendorEmail:
@@ -354,7 +321,7 @@ class VendorService:
         print(f"      Signed date: {document_signed_date}")
         print(f"      Current date: {datetime.now()}")
         
-        if not self.validate_pdf_file(file):
+        if not self.is_pdf_upload(file):
             print(f"    ❌ Invalid PDF file")
             raise HTTPException(
                 status_code=HTTPStatus.BAD_REQUEST,
@@ -384,7 +351,7 @@ class VendorService:
             )
         
         # Save file
-        file_path = await self.save_uploaded_file(file, vendor.vendor_id, document_type.value)
+        stored = await self.save_uploaded_file(file, vendor.vendor_id, document_type.value)
         
         # Create document record
         document = VendorDocument(
@@ -393,8 +360,9 @@ class VendorService:
             file_name=file.filename,
             custom_document_name=custom_document_name.strip(),
             document_signed_date=document_signed_date,
-            file_path=file_path,
-            file_size=file.size,
+            file_path=stored.file_path,
+            file_size=stored.file_size,
+            sha256=stored.sha256,
             content_type=file.content_type
         )
         
@@ -426,6 +394,33 @@ class VendorService:
             .all()
         )
 
+    def get_vendor_dropdown_options(self) -> List[dict]:
+        """
+        All vendors (up to 1000) as plain dicts for dropdowns.
+        Cached; create_vendor/update_vendor invalidate it.
+        """
+        def build() -> List[dict]:
+            return [
+                {
+                    "id": vendor.id,
+                    "vendor_id": vendor.vendor_id,
+                    "vendor_name": vendor.vendor_name,
+                    "vendor_country": vendor.vendor_country
+                }
+                for vendor in self.get_vendors(skip=0, limit=1000)
+            ]
+        return reference_cache.get_or_set(f"{VENDORS_NAMESPACE}:dropdown_options", build)
+
+    def get_active_vendor_options(self) -> List[dict]:
+        """
+        Active vendors (up to 1000) as plain dicts for contract forms.
+        Cached; create_vendor/update_vendor invalidate it.
+        """
+        def build() -> List[dict]:
+            vendors, _ = self.get_vendors_with_filters(skip=0, limit=1000, status_filter="Active", search=None)
+            return [{"id": vendor.id, "vendor_name": vendor.vendor_name} for vendor in vendors]
+        return reference_cache.get_or_set(f"{VENDORS_NAMESPACE}:active_options", build)
+
     def validate_vendor_creation_requirements(self, vendor_data: VendorCreate) -> List[str]:
         errors = []
         
@@ -525,12 +520,24 @@ class VendorService:
         Get vendors with advanced filtering and search.
         Returns tuple of (vendors, total_count)
         """
-        from app.models.vendor import VendorEmail
-        from sqlalchemy import or_
+        query = self._apply_vendor_filters(self.db.query(Vendor), status_filter, search)
+        
+        # Get total count
+        total_count = query.count()
         
-        # Base query
-        query = self.db.query(Vendor)
+         # Apply pagination - MSSQL requires ORDER BY when using OFFSET
+        # Searches are ordered by relevance, ties (and plain listings) by id
+        order_by = [Vendor.id]
+        if search:
+            order_by.insert(0, search_index.rank(self.db, VENDOR, Vendor.id, search).desc())
+        vendors = query.order_by(*order_by).offset(skip).limit(limit).all()
         
+        return vendors, total_count
+
+    def _apply_vendor_filters(self, query, status_filter: Optional[str] = None, search: Optional[str] = None):
+        """
+        Status filter and keyword search shared by the vendor list and export
+        """
         # Apply status filter
         if status_filter:
             if status_filter.lower() == "active":
@@ -538,34 +545,53 @@ class VendorService:
             elif status_filter.lower() == "inactive":
                 query = query.filter(Vendor.status == VendorStatusType.INACTIVE)
         
-        # Apply search
+        # Apply search (keyword prefix search over vendor id, name, contact
+        # person and emails via the search index)
         if search:
-            search_term = f"%{search}%"
-            vendor_search = or_(
-                Vendor.vendor_id.ilike(search_term),
-                Vendor.vendor_name.ilike(search_term),
-                Vendor.vendor_contact_person.ilike(search_term)
-            )
-            
-            # Also search in emails
-            email_subquery = self.db.query(VendorEmail.vendor_id).filter(
-                VendorEmail.email.ilike(search_term)
-            ).subquery()
-            
-            query = query.filter(
-                or_(
-                    vendor_search,
-                    Vendor.id.in_(email_subquery)
-                )
-            )
-        
-        # Get total count
-        total_count = query.count()
-        
-         # Apply pagination - MSSQL requires ORDER BY when using OFFSET
-        vendors = query.order_by(Vendor.id).offset(skip).limit(limit).all()
+            query = search_index.filter(self.db, query, VENDOR, Vendor.id, search)
+        return query
+
+    def iter_vendor_export_rows(
+        self,
+        status_filter: Optional[str] = None,
+        search: Optional[str] = None,
+        batch_size: int = 1000
+    ):
+        """
+        Yield VENDOR_EXPORT_COLUMNS tuples for every vendor matching the list filters,
+        streamed from a server-side cursor in batch_size chunks
+        """
+        from app.models.vendor import VendorEmail
         
-        return vendors, total_count
+        # Primary email (or the first one) as a correlated subquery instead of loading vendor.emails
+        primary_email = (
+            self.db.query(VendorEmail.email)
+            .filter(VendorEmail.vendor_id == Vendor.id)
+            .order_by(VendorEmail.is_primary.desc(), VendorEmail.id)
+            .limit(1)
+            .scalar_subquery()
+        )
+        query = self.db.query(
+            Vendor.id,
+            Vendor.vendor_id,
+            Vendor.vendor_name,
+            Vendor.vendor_contact_person,
+            primary_email.label("email"),
+            Vendor.vendor_country,
+            Vendor.next_required_due_diligence_date,
+            Vendor.status,
+        )
+        query = self._apply_vendor_filters(query, status_filter, search)
+        
+        today = datetime.now().date()
+        for row in query.order_by(Vendor.id).yield_per(batch_size):
+            next_due = row.next_required_due_diligence_date
+            is_overdue = bool(next_due and next_due.date() < today)
+            status = row.status.value if hasattr(row.status, "value") else row.status
+            yield (
+                row.id, row.vendor_id, row.vendor_name, row.vendor_contact_person, row.email,
+                row.vendor_country, next_due, status, is_overdue,
+            )
 
     def get_vendor_profile_with_details(self, vendor_id: int):
         """
@@ -599,6 +625,16 @@ class VendorService:
             'due_diligence_highlight_color': 'red' if is_overdue else None
         }
 
+    def get_vendor_document(self, vendor_id: int, doc_id: int) -> Optional[VendorDocument]:
+        """
+        Get a single vendor document by vendor and document id
+        """
+        return (
+            self.db.query(VendorDocument)
+            .filter(VendorDocument.vendor_id == vendor_id, VendorDocument.id == doc_id)
+            .first()
+        )
+
     def get_vendor_documents_grouped(self, vendor_id: int):
         """
         Get vendor documents grouped by document type
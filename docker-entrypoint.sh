@@ -27,5 +27,6 @@ echo "✅ Initialization complete!"
 echo "🌐 Starting application server..."
 
 # Start the application with newrelic and timestamps
-exec newrelic-admin run-program uvicorn main:root_app --host 0.0.0.0 --port 8000 2>&1 | ts '[%Y-%m-%d %H:%M:%S]'
+# WEB_WORKERS=1 (default) runs a single uvicorn process; see serve.py for multi-worker mode
+exec newrelic-admin run-program python serve.py 2>&1 | ts '[%Y-%m-%d %H:%M:%S]'
 
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Script to verify that ContractService queries use the workflow indexes (migration 012)
+and that table searches use the search index (migration 016).
+
+Runs each service call against a seeded database, captures the SQL it issues,
+EXPLAINs every statement and checks that the plan mentions one of the expected
+indexes. Supports PostgreSQL and SQLite.
+
+    python seed_users.py && python seed_vendors_contracts.py
+    python explain_indexes.py
+"""
+import sys
+
+from sqlalchemy import event
+
+from app.db.database import SessionLocal, engine
+from app.models.contract import Contract, User
+from app.services.contract_service import ContractService
+
+
+class StatementRecorder:
+    """
+    Records (statement, parameters) for every SELECT run on the engine while active
+    """
+
+    def __init__(self):
+        self.statements = []
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            self.statements.append((statement, parameters))
+
+    def __enter__(self):
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        event.remove(engine, "before_cursor_execute", self._before_cursor_execute)
+
+
+def explain(db, statement, parameters) -> str:
+    """
+    Query plan for one captured statement, as text
+    """
+    dialect = engine.dialect.name
+    if dialect == "postgresql":
+        rows = db.connection().exec_driver_sql(f"EXPLAIN {statement}", parameters).fetchall()
+        return "\n".join(row[0] for row in rows)
+    if dialect == "sqlite":
+        rows = db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+        return "\n".join(str(row[-1]) for row in rows)
+    raise RuntimeError(f"EXPLAIN verification is not supported for {dialect}")
+
+
+def build_checks(db):
+    """
+    (label, service call, expected index names) for each hot ContractService query
+    """
+    contract = db.query(Contract).order_by(Contract.id).first()
+    user = db.query(User).order_by(User.id).first()
+    if contract is None or user is None:
+        raise RuntimeError("Database has no contracts/users - run the seed scripts first")
+
+    return [
+        (
+            "get_contracts_by_vendor",
+            lambda service: service.get_contracts_by_vendor(contract.vendor_id),
+            {"ix_contracts_vendor_id"},
+        ),
+        (
+            "get_manager_dashboard_data",
+            lambda service: service.get_manager_dashboard_data(user.id),
+            {"ix_contracts_contract_owner_id"},
+        ),
+        (
+            "get_contracts_page (role scoped)",
+            lambda service: service.get_contracts_page(user_role="Contract Manager", user_id=user.id),
+            {
+                "ix_contracts_contract_owner_id",
+                "ix_contracts_contract_owner_backup_id",
+                "ix_contracts_contract_owner_manager_id",
+            },
+        ),
+        (
+            "get_contracts_needing_review",
+            lambda service: service.get_contracts_needing_review(),
+            {"ix_contracts_status_end_date", "ix_contracts_active_end_date"},
+        ),
+        (
+            "get_contracts_requiring_attention",
+            lambda service: service.get_contracts_requiring_attention(),
+            {"ix_contracts_status_end_date", "ix_contract_updates_contract_status_created"},
+        ),
+        (
+            "get_contracts_page (search)",
+            lambda service: service.get_contracts_page(search=contract.contract_id),
+            # SQLite resolves the search from the in-memory index and looks the ids up by primary key
+            {"SEARCH contracts USING INTEGER PRIMARY KEY"} if engine.dialect.name == "sqlite" else {
+                "ix_search_documents_content_tsv",
+                "ix_search_documents_content_trgm",
+            },
+        ),
+        (
+            "get_contract_by_id (detail)",
+            lambda service: service.get_contract_by_id(contract.id, profile="detail"),
+            {"ix_contract_documents_contract_id", "ix_termination_documents_contract_id"},
+        ),
+    ]
+
+
+def verify_indexes() -> bool:
+    db = SessionLocal()
+    failures = []
+    try:
+        if engine.dialect.name == "postgresql":
+            # Seeded tables are tiny; make the planner show whether an index is usable at all
+            db.connection().exec_driver_sql("SET enable_seqscan = off")
+
+        service = ContractService(db)
+        for label, call, expected in build_checks(db):
+            with StatementRecorder() as recorder:
+                call(service)
+            plans = [explain(db, statement, parameters) for statement, parameters in recorder.statements]
+            used = {name for name in expected if any(name in plan for plan in plans)}
+            if used:
+                print(f"  ✓ {label}: {', '.join(sorted(used))}")
+            else:
+                print(f"  ❌ {label}: none of {', '.join(sorted(expected))} used")
+                for plan in plans:
+                    print("      " + plan.replace("\n", "\n      "))
+                failures.append(label)
+    finally:
+        db.rollback()
+        db.close()
+
+    if failures:
+        print(f"\n❌ {len(failures)} query(ies) without index usage: {', '.join(failures)}")
+        return False
+    print("\n✅ All checked queries use the workflow indexes")
+    return True
+
+
+if __name__ == "__main__":
+    print("🔍 Verifying index usage for ContractService queries...")
+    sys.exit(0 if verify_indexes() else 1)
@@ -0,0 +1,552 @@
+#!/usr/bin/env python3
+"""
+Synthetic data generator for load and scale testing.
+
+Generates users, vendors (email, phone, address, documents), contracts,
+contract updates and contract documents at a configurable scale and bulk-loads
+them: COPY FROM STDIN on PostgreSQL, executemany on other databases. Status,
+end_date, department, currency and vendor size follow skewed, production-like
+distributions. Business IDs are allocated from id_counters, so the data can be
+added to a seeded or restored database; the search index and dashboard stats
+are updated for the new rows.
+
+    python generate_synthetic_data.py --scale 1       # 100 vendors, 1k contracts
+    python generate_synthetic_data.py --scale 10      # 10k contracts
+    python generate_synthetic_data.py --scale 100     # 100k contracts
+    python generate_synthetic_data.py --scale 1000 --files none   # 1M contracts
+
+Document files (--files):
+    none    rows only; file_path points at a file that does not exist
+    shared  one dummy PDF in the document store referenced by every row
+    sparse  one sparse placeholder file per document (realistic sizes, no disk use)
+"""
+import argparse
+import csv
+import io
+import math
+import os
+import random
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import func, select
+
+from app.core.constants import FileConstants
+from app.db.database import SessionLocal
+from app.models.contract import (
+    AutomaticRenewalType, Contract, ContractDocument, ContractStatusType, ContractTerminationType,
+    ContractType, ContractUpdate, ContractUpdateStatus, CurrencyType, DepartmentType,
+    ExpirationNoticePeriodType, NoticePeriodType, PaymentMethodType, RenewalPeriodType, User, UserRole,
+)
+from app.models.vendor import (
+    AlertFrequencyType, BankCustomerType, DocumentType, DueDiligenceRequiredType,
+    MaterialOutsourcingType, Vendor, VendorAddress, VendorDocument, VendorEmail, VendorPhone,
+    VendorStatusType,
+)
+from app.services import document_store
+from app.services.dashboard_stats_service import DashboardStatsService
+from app.services.id_allocator import IdAllocator
+from app.services.search_index import reindex_contracts, reindex_vendors
+
+FIRST_NAMES = [
+    "Maria", "Jose", "Ana", "Luis", "Carmen", "Juan", "Elena", "Carlos", "Sofia", "Miguel",
+    "Laura", "David", "Isabel", "Pedro", "Lucia", "Jan", "Anouk", "Pieter", "Femke", "Ruben",
+]
+LAST_NAMES = [
+    "Croes", "Kock", "Maduro", "Werleman", "Tromp", "Geerman", "Arends", "Lacle", "Dijkhoff", "Wever",
+    "Henriquez", "Ras", "Oduber", "Eman", "Figaroa", "Vrolijk", "Martinez", "de Cuba", "Thijsen", "Rasmijn",
+]
+COMPANY_WORDS = [
+    "Caribbean", "Island", "Digital", "Global", "Atlantic", "Sun", "Coral", "Trade", "Data", "Secure",
+    "Harbor", "Prime", "Blue", "Pacific", "United", "Smart", "Alpha", "Royal", "Delta", "Nova",
+]
+COMPANY_SUFFIXES = ["N.V.", "B.V.", "Inc.", "LLC", "Ltd.", "Solutions", "Services", "Group"]
+COUNTRIES = [("Aruba", 50), ("Curacao", 15), ("United States", 20), ("Netherlands", 10), ("Bonaire", 5)]
+# Production currency mix: local currency first, then USD
+CURRENCIES = [(CurrencyType.AWG, 45), (CurrencyType.USD, 35), (CurrencyType.EUR, 12), (CurrencyType.XCG, 8)]
+UPDATE_STATUSES = [
+    (ContractUpdateStatus.COMPLETED, 40),
+    (ContractUpdateStatus.PENDING_REVIEW, 25),
+    (ContractUpdateStatus.RETURNED, 10),
+    (ContractUpdateStatus.UPDATED, 10),
+    (ContractUpdateStatus.DRAFT, 15),
+]
+VENDOR_DOCUMENT_TYPES = list(DocumentType)
+
+
+def zipf_weights(count: int, exponent: float = 0.8) -> list:
+    """
+    Cumulative weights for rank 1..count, so a few items get most of the picks
+    """
+    cumulative, total = [], 0.0
+    for rank in range(1, count + 1):
+        total += 1.0 / rank ** exponent
+        cumulative.append(total)
+    return cumulative
+
+
+class Picker:
+    """
+    Weighted random choice with precomputed cumulative weights
+    """
+
+    def __init__(self, rng: random.Random, weighted):
+        self.rng = rng
+        weighted = list(weighted)
+        self.values = [value for value, _ in weighted]
+        self.cum_weights = []
+        total = 0
+        for _, weight in weighted:
+            total += weight
+            self.cum_weights.append(total)
+
+    def __call__(self):
+        return self.rng.choices(self.values, cum_weights=self.cum_weights)[0]
+
+
+def _copy_value(value) -> str:
+    if value is None:
+        return "\\N"
+    if hasattr(value, "value"):
+        return str(value.value)
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+class BulkLoader:
+    """
+    Inserts row dicts in batches: COPY FROM STDIN on PostgreSQL, executemany elsewhere
+    """
+
+    def __init__(self, db, batch_size: int):
+        self.db = db
+        self.batch_size = batch_size
+        self.use_copy = db.get_bind().dialect.name == "postgresql"
+
+    def load(self, model, rows) -> int:
+        table = model.__table__
+        total, batch = 0, []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                self._flush(table, batch)
+                total += len(batch)
+                batch = []
+        if batch:
+            self._flush(table, batch)
+            total += len(batch)
+        return total
+
+    def _flush(self, table, rows) -> None:
+        if self.use_copy:
+            self._copy(table, rows)
+        else:
+            self.db.execute(table.insert(), rows)
+
+    def _copy(self, table, rows) -> None:
+        columns = list(rows[0])
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow([_copy_value(row[column]) for column in columns])
+        buffer.seek(0)
+        cursor = self.db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+                buffer,
+            )
+        finally:
+            cursor.close()
+
+
+class PlaceholderFiles:
+    """
+    (file_path, file_size, sha256) for generated documents, per --files mode
+    """
+
+    def __init__(self, mode: str, size_kb: int, rng: random.Random):
+        self.mode = mode
+        self.size_kb = size_kb
+        self.rng = rng
+        self.shared = None
+        self.shared_references = 0
+        if mode == "shared":
+            from seed_vendors_contracts import seed_document
+            self.shared = seed_document()
+
+    def __call__(self, folder: str, name: str):
+        if self.mode == "shared":
+            self.shared_references += 1
+            return self.shared.file_path, self.shared.file_size, self.shared.sha256
+        size = max(1024, int(self.rng.lognormvariate(math.log(self.size_kb * 1024), 0.6)))
+        file_path = os.path.join(FileConstants.UPLOAD_DIR, "synthetic", folder, f"{name}.pdf")
+        if self.mode == "sparse":
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            with open(file_path, "wb") as placeholder:
+                placeholder.truncate(size)
+        return file_path, size, None
+
+
+def _max_id(db, column) -> int:
+    return db.scalar(select(func.max(column))) or 0
+
+
+def _new_rows(db, columns, id_column, after_id: int, batch_size: int):
+    """
+    Rows with id_column > after_id in id order, read in keyset-paginated batches
+    """
+    last_id = after_id
+    while True:
+        rows = db.execute(
+            select(*columns).where(id_column > last_id).order_by(id_column).limit(batch_size)
+        ).all()
+        if not rows:
+            return
+        yield from rows
+        last_id = rows[-1][0]
+
+
+def _chunks(values, size: int):
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+class SyntheticDataGenerator:
+    def __init__(self, db, args):
+        self.db = db
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.today = date.today()
+        self.now = datetime.utcnow()
+        self.loader = BulkLoader(db, args.batch_size)
+        self.files = PlaceholderFiles(args.files, args.file_size_kb, self.rng)
+        self.department = Picker(self.rng, zip(DepartmentType, (1.0 / rank ** 0.8 for rank in range(1, 100))))
+        self.currency = Picker(self.rng, CURRENCIES)
+        self.country = Picker(self.rng, COUNTRIES)
+        self.contract_type = Picker(self.rng, zip(ContractType, (1.0 / rank ** 0.5 for rank in range(1, 100))))
+        self.update_status = Picker(self.rng, UPDATE_STATUSES)
+
+    def _stage(self, label: str, load) -> None:
+        started = time.perf_counter()
+        count = load()
+        self.db.commit()
+        elapsed = time.perf_counter() - started
+        rate = count / elapsed if elapsed else 0
+        print(f"  {label}: {count:,} rows in {elapsed:.1f}s ({rate:,.0f} rows/s)")
+
+    # Users
+
+    def user_rows(self, user_ids):
+        admins = max(1, len(user_ids) // 50)
+        for index, user_id in enumerate(user_ids):
+            first_name, last_name = self.rng.choice(FIRST_NAMES), self.rng.choice(LAST_NAMES)
+            yield {
+                "user_id": user_id,
+                "first_name": first_name,
+                "last_name": last_name,
+                "email": f"{first_name}.{last_name.replace(' ', '')}.{user_id}@synthetic.example".lower(),
+                "department": self.department(),
+                "position": "Contract Admin" if index < admins else "Contract Manager",
+                "is_active": index < admins or self.rng.random() > 0.03,
+                "hashed_password": None,
+                "role": UserRole.CONTRACT_ADMIN if index < admins else UserRole.CONTRACT_MANAGER,
+                "created_at": self.now,
+                "updated_at": self.now,
+            }
+
+    # Vendors
+
+    def vendor_rows(self, vendor_ids):
+        for vendor_id in vendor_ids:
+            material = self.rng.random() < 0.2
+            bank_customer = (
+                BankCustomerType.ARUBA_BANK if vendor_id.startswith("AB") else BankCustomerType.ORCO_BANK
+            ) if self.rng.random() < 0.3 else BankCustomerType.NONE
+            last_due_diligence = datetime.combine(
+                self.today - timedelta(days=self.rng.randint(0, 3 * 365)), datetime.min.time()
+            ) if material else None
+            yield {
+                "vendor_id": vendor_id,
+                "vendor_name": (
+                    f"{self.rng.choice(COMPANY_WORDS)} {self.rng.choice(COMPANY_WORDS)} "
+                    f"{self.rng.choice(COMPANY_SUFFIXES)} {vendor_id}"
+                ),
+                "vendor_contact_person": f"{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}",
+                "vendor_country": self.country(),
+                "material_outsourcing_arrangement": MaterialOutsourcingType.YES if material else MaterialOutsourcingType.NO,
+                "bank_customer": bank_customer,
+                "cif": f"{self.rng.randint(0, 999999):06d}" if bank_customer != BankCustomerType.NONE else None,
+                "due_diligence_required": DueDiligenceRequiredType.YES if material else DueDiligenceRequiredType.NO,
+                "last_due_diligence_date": last_due_diligence,
+                "next_required_due_diligence_date": last_due_diligence + timedelta(days=3 * 365) if material else None,
+                "next_required_due_diligence_alert_frequency": AlertFrequencyType.SIXTY_DAYS if material else None,
+                "status": self.rng.choices(
+                    [VendorStatusType.ACTIVE, VendorStatusType.INACTIVE, VendorStatusType.TERMINATED], [90, 8, 2]
+                )[0],
+                "last_modified_by": None,
+                "last_modified_date": None,
+                "created_at": self.now,
+                "updated_at": self.now,
+            }
+
+    def vendor_child_rows(self, vendors, kind: str):
+        for vendor_pk, vendor_id in vendors:
+            if kind == "email":
+                yield {
+                    "vendor_id": vendor_pk,
+                    "email": f"contact.{vendor_id.lower()}@vendor.example",
+                    "is_primary": True,
+                    "created_at": self.now,
+                }
+            elif kind == "phone":
+                yield {
+                    "vendor_id": vendor_pk,
+                    "area_code": "+297",
+                    "phone_number": f"{self.rng.randint(5000000, 7999999)}",
+                    "is_primary": True,
+                    "created_at": self.now,
+                }
+            elif kind == "address":
+                yield {
+                    "vendor_id": vendor_pk,
+                    "address": f"{self.rng.randint(1, 300)} {self.rng.choice(COMPANY_WORDS)} Street",
+                    "city": None,
+                    "state": None,
+                    "zip_code": None,
+                    "is_primary": True,
+                    "created_at": self.now,
+                }
+            else:
+                for index in range(self.args.documents_per_vendor):
+                    document_type = VENDOR_DOCUMENT_TYPES[index % len(VENDOR_DOCUMENT_TYPES)]
+                    file_path, file_size, sha256 = self.files(os.path.join("vendors", vendor_id), f"{index}")
+                    yield {
+                        "vendor_id": vendor_pk,
+                        "document_type": document_type,
+                        "file_name": "document.pdf",
+                        "custom_document_name": f"{document_type.value} {vendor_id}",
+                        "document_signed_date": datetime.combine(
+                            self.today - timedelta(days=self.rng.randint(0, 3 * 365)), datetime.min.time()
+                        ),
+                        "file_path": file_path,
+                        "file_size": file_size,
+                        "sha256": sha256,
+                        "content_type": "application/pdf",
+                        "created_at": self.now,
+                    }
+
+    # Contracts
+
+    def _contract_status(self, end_date: date) -> ContractStatusType:
+        if end_date < self.today:
+            return self.rng.choices(
+                [ContractStatusType.EXPIRED, ContractStatusType.TERMINATED, ContractStatusType.PENDING_TERMINATION],
+                [85, 10, 5],
+            )[0]
+        return self.rng.choices(
+            [ContractStatusType.ACTIVE, ContractStatusType.TERMINATED, ContractStatusType.PENDING_TERMINATION],
+            [95, 3, 2],
+        )[0]
+
+    def contract_rows(self, contract_ids, vendor_pks, owner_pks):
+        vendor_weights = zipf_weights(len(vendor_pks))
+        for batch in _chunks(contract_ids, self.args.batch_size):
+            vendors = self.rng.choices(vendor_pks, cum_weights=vendor_weights, k=len(batch))
+            for contract_id, vendor_pk in zip(batch, vendors):
+                # Starts spread over the last 5 years; most contracts run 1-3 years
+                start_date = self.today - timedelta(days=self.rng.randint(0, 5 * 365))
+                end_date = start_date + timedelta(days=self.rng.choices([365, 730, 1095, 1825], [45, 30, 20, 5])[0])
+                status = self._contract_status(end_date)
+                renews = self.rng.random() < 0.3
+                owner, backup, manager = self.rng.sample(owner_pks, 3)
+                amount = min(Decimal("9999999999.99"), Decimal(str(round(100 + self.rng.lognormvariate(9.5, 1.3), 2))))
+                yield {
+                    "contract_id": contract_id,
+                    "vendor_id": vendor_pk,
+                    "contract_description": f"{self.rng.choice(COMPANY_WORDS)} services {contract_id}",
+                    "contract_type": self.contract_type(),
+                    "start_date": start_date,
+                    "end_date": end_date,
+                    "automatic_renewal": AutomaticRenewalType.YES if renews else AutomaticRenewalType.NO,
+                    "renewal_period": self.rng.choice(list(RenewalPeriodType)) if renews else None,
+                    "department": self.department(),
+                    "contract_amount": amount,
+                    "contract_currency": self.currency(),
+                    "payment_method": self.rng.choice(list(PaymentMethodType)),
+                    "termination_notice_period": self.rng.choice(list(NoticePeriodType)),
+                    "expiration_notice_frequency": self.rng.choice(list(ExpirationNoticePeriodType)),
+                    "contract_owner_id": owner,
+                    "contract_owner_backup_id": backup,
+                    "contract_owner_manager_id": manager,
+                    "status": status,
+                    "contract_termination": (
+                        ContractTerminationType.YES if status == ContractStatusType.TERMINATED else None
+                    ),
+                    "last_modified_by": None,
+                    "last_modified_date": None,
+                    "created_at": self.now,
+                    "updated_at": self.now,
+                }
+
+    def _count(self, mean: float) -> int:
+        """
+        Non-negative integer with the given mean (whole part + Bernoulli remainder)
+        """
+        whole = int(mean)
+        return whole + (1 if self.rng.random() < mean - whole else 0)
+
+    def contract_update_rows(self, contracts):
+        for contract_pk, contract_id, owner_pk, end_date in contracts:
+            for _ in range(self._count(self.args.updates_per_contract)):
+                status = self.update_status()
+                created_at = datetime.combine(
+                    end_date - timedelta(days=self.rng.randint(0, 120)), datetime.min.time()
+                )
+                responded = status != ContractUpdateStatus.DRAFT
+                returned = status == ContractUpdateStatus.RETURNED
+                yield {
+                    "contract_id": contract_pk,
+                    "status": status,
+                    "response_provided_by_user_id": owner_pk if responded else None,
+                    "response_date": created_at + timedelta(days=self.rng.randint(0, 14)) if responded else None,
+                    "has_document": False,
+                    "decision": self.rng.choices(["Extend", "Terminate"], [80, 20])[0] if responded else None,
+                    "decision_comments": None,
+                    "admin_comments": None,
+                    "returned_reason": "Please attach the signed extension" if returned else None,
+                    "returned_date": created_at + timedelta(days=15) if returned else None,
+                    "previous_update_id": None,
+                    "correction_date": None,
+                    "initial_vendor_name": None,
+                    "initial_contract_type": None,
+                    "initial_description": None,
+                    "initial_expiration_date": None,
+                    "created_at": created_at,
+                    "updated_at": created_at,
+                }
+
+    def contract_document_rows(self, contracts):
+        for contract_pk, contract_id, _, end_date in contracts:
+            for index in range(self._count(self.args.documents_per_contract)):
+                file_path, file_size, sha256 = self.files(os.path.join("contracts", contract_id), f"{index}")
+                yield {
+                    "contract_id": contract_pk,
+                    "file_name": "contract.pdf",
+                    "custom_document_name": f"{contract_id} Agreement {index + 1}",
+                    "document_signed_date": end_date - timedelta(days=365),
+                    "file_path": file_path,
+                    "file_size": file_size,
+                    "sha256": sha256,
+                    "content_type": "application/pdf",
+                    "created_at": self.now,
+                }
+
+    # Run
+
+    def run(self) -> None:
+        args = self.args
+        vendor_count = max(1, round(args.vendors * args.scale))
+        user_count = max(3, round(args.users * args.scale))
+        contract_count = vendor_count * args.contracts_per_vendor
+        print(
+            f"Generating {user_count:,} users, {vendor_count:,} vendors and {contract_count:,} contracts "
+            f"({'COPY' if self.loader.use_copy else 'executemany'}, files={args.files})"
+        )
+
+        # Allocate every business ID up front and release the counter rows
+        allocator = IdAllocator(self.db)
+        user_ids = allocator.next_ids("U", user_count)
+        aruba_count = round(vendor_count * 0.7)
+        vendor_ids = allocator.next_ids("AB", aruba_count) + allocator.next_ids("OB", vendor_count - aruba_count)
+        contract_ids = allocator.next_ids("CT", contract_count)
+        self.db.commit()
+
+        users_after = _max_id(self.db, User.id)
+        self._stage("users", lambda: self.loader.load(User, self.user_rows(user_ids)))
+        owner_pks = [
+            user_pk for user_pk, is_active in _new_rows(self.db, [User.id, User.is_active], User.id, users_after, 10000)
+            if is_active
+        ]
+        if len(owner_pks) < 3:
+            raise RuntimeError("Need at least 3 active users - increase --users")
+
+        vendors_after = _max_id(self.db, Vendor.id)
+        self._stage("vendors", lambda: self.loader.load(Vendor, self.vendor_rows(vendor_ids)))
+        vendors = list(_new_rows(self.db, [Vendor.id, Vendor.vendor_id], Vendor.id, vendors_after, 10000))
+        for label, model, kind in (
+            ("vendor emails", VendorEmail, "email"),
+            ("vendor phones", VendorPhone, "phone"),
+            ("vendor addresses", VendorAddress, "address"),
+            ("vendor documents", VendorDocument, "document"),
+        ):
+            self._stage(label, lambda model=model, kind=kind: self.loader.load(model, self.vendor_child_rows(vendors, kind)))
+
+        contracts_after = _max_id(self.db, Contract.id)
+        vendor_pks = [vendor_pk for vendor_pk, _ in vendors]
+        self.rng.shuffle(vendor_pks)
+        self._stage("contracts", lambda: self.loader.load(Contract, self.contract_rows(contract_ids, vendor_pks, owner_pks)))
+
+        def new_contracts():
+            return _new_rows(
+                self.db,
+                [Contract.id, Contract.contract_id, Contract.contract_owner_id, Contract.end_date],
+                Contract.id,
+                contracts_after,
+                args.batch_size,
+            )
+
+        self._stage("contract updates", lambda: self.loader.load(ContractUpdate, self.contract_update_rows(new_contracts())))
+        self._stage(
+            "contract documents", lambda: self.loader.load(ContractDocument, self.contract_document_rows(new_contracts()))
+        )
+        if self.files.shared is not None:
+            document_store.retain_many(self.db.connection(), self.files.shared, self.files.shared_references)
+            self.db.commit()
+
+        # Bulk loads bypass the ORM hooks that maintain these read models
+        def reindex() -> int:
+            count = 0
+            for chunk in _chunks(vendor_pks, 1000):
+                reindex_vendors(self.db.connection(), chunk)
+            contract_pks = [row[0] for row in _new_rows(self.db, [Contract.id], Contract.id, contracts_after, 10000)]
+            for chunk in _chunks(contract_pks, 1000):
+                reindex_contracts(self.db.connection(), chunk)
+                count += len(chunk)
+            return count + len(vendor_pks)
+
+        self._stage("search documents", reindex)
+        self._stage("dashboard stats", lambda: len(DashboardStatsService(self.db).refresh_all()))
+        print("Done. The notification inbox is rebuilt by its scheduled refresh job.")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Bulk-load synthetic vendors and contracts for scale testing")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiplier for --vendors and --users")
+    parser.add_argument("--vendors", type=int, default=100, help="Vendors at scale 1")
+    parser.add_argument("--users", type=int, default=20, help="Users at scale 1 (about 2%% are admins)")
+    parser.add_argument("--contracts-per-vendor", type=int, default=10, help="Average contracts per vendor (skewed)")
+    parser.add_argument("--updates-per-contract", type=float, default=0.3, help="Average contract updates per contract")
+    parser.add_argument("--documents-per-contract", type=float, default=1.0, help="Average documents per contract")
+    parser.add_argument("--documents-per-vendor", type=int, default=2, help="Documents per vendor")
+    parser.add_argument("--files", choices=["none", "shared", "sparse"], default="none", help="Document files to create")
+    parser.add_argument("--file-size-kb", type=int, default=250, help="Typical placeholder file size (sparse)")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Rows per COPY / executemany batch")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed (same seed, same data)")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    db = SessionLocal()
+    try:
+        SyntheticDataGenerator(db, args).run()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
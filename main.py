@@ -4,12 +4,22 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 from app.core.config import settings
+import os
+
+# NiceGUI keeps app.storage.user in Redis when NICEGUI_REDIS_URL is set, which
+# lets every worker see the same browser sessions; set before NiceGUI is imported
+if settings.redis_url:
+    os.environ.setdefault("NICEGUI_REDIS_URL", settings.redis_url)
+
 from app.api.v1.api import api_router
+from app.services.report_jobs import report_jobs
+from app.services.expiry_sweeper import expiry_sweep_scheduler
+from app.services.notification_service import notification_refresh_scheduler
+from app.services.document_store import document_sweep_scheduler
 import traceback
 import logging
 import subprocess
 import sys
-import os
 from nicegui import app as nicegui_app, ui
 
 # Configure logging
@@ -39,6 +49,9 @@ from app.pages.moa_report import moa_report
 from app.pages.monetary_value_report import monetary_value_report
 from app.pages.due_diligence_report import due_diligence_report
 from app.pages.all_contracts import all_contracts
+from app.pages import document_files  # noqa: F401  registers the /files/... document routes
+from app.db import change_events  # noqa: F401  publishes committed contract changes to the event bus
+from app.db.query_metrics import begin_request, end_request
 
 
 # Serve static assets (logos, etc.) from app/public
@@ -55,25 +68,26 @@ async def lifespan(root_app: FastAPI):
     logger.info("Starting Aruba Bank Contract Management Application")
     logger.info("=" * 60)
     
-    # Run database migrations on startup
-    logger.info("Running database migrations...")
-    try:
-        result = subprocess.run(
-            [sys.executable, "-m", "alembic", "upgrade", "head"],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        logger.info("Database migrations completed successfully")
-        if result.stdout:
-            logger.info(result.stdout)
-    except subprocess.CalledProcessError as e:
-        logger.error(f"Migration failed: {e}")
-        logger.error(f"stdout: {e.stdout}")
-        logger.error(f"stderr: {e.stderr}")
-        # Don't exit - let the app start and show the error
-    except Exception as e:
-        logger.error(f"Error running migrations: {e}")
+    # Run database migrations on startup (serve.py runs them once for multi-worker mode)
+    if settings.run_migrations_on_startup:
+        logger.info("Running database migrations...")
+        try:
+            result = subprocess.run(
+                [sys.executable, "-m", "alembic", "upgrade", "head"],
+                capture_output=True,
+                text=True,
+                check=True
+            )
+            logger.info("Database migrations completed successfully")
+            if result.stdout:
+                logger.info(result.stdout)
+        except subprocess.CalledProcessError as e:
+            logger.error(f"Migration failed: {e}")
+            logger.error(f"stdout: {e.stdout}")
+            logger.error(f"stderr: {e.stderr}")
+            # Don't exit - let the app start and show the error
+        except Exception as e:
+            logger.error(f"Error running migrations: {e}")
     
     logger.info(f"Server: http://0.0.0.0:8000")
     logger.info(f"Web UI: http://0.0.0.0:8000/")
@@ -81,10 +95,20 @@ async def lifespan(root_app: FastAPI):
     logger.info(f"API Health Check: http://0.0.0.0:8000{settings.api_v1_prefix}/health")
     logger.info("=" * 60)
 
+    if settings.expiry_sweep_enabled:
+        logger.info(f"Contract expiry sweep every {settings.expiry_sweep_interval_seconds}s")
+        expiry_sweep_scheduler.start()
+    notification_refresh_scheduler.start()
+    document_sweep_scheduler.start()
+
     yield
 
     # Shutdown
     logger.info("Shutting down application...")
+    await expiry_sweep_scheduler.stop()
+    await notification_refresh_scheduler.stop()
+    await document_sweep_scheduler.stop()
+    report_jobs.shutdown()
 
 
 # Create FastAPI application with lifespan
@@ -120,6 +144,16 @@ async def catch_exceptions_middleware(request: Request, call_next):
             content={"detail": f"Internal server error: {str(exc)}"}
         )
 
+# Attribute SQL statements to the matched route / page (served at /api/v1/metrics)
+if settings.db_metrics_enabled:
+    @root_app.middleware("http")
+    async def query_metrics_middleware(request: Request, call_next):
+        token = begin_request(request.scope)
+        try:
+            return await call_next(request)
+        finally:
+            end_request(token)
+
 # Include API router
 root_app.include_router(api_router, prefix=settings.api_v1_prefix)
 
@@ -132,13 +166,13 @@ if os.path.exists(_public_dir):
 # ============================================================================
 
 @ui.page("/")
-def main_page():
+async def main_page():
     """Home page with authentication check"""
     if not nicegui_app.storage.user.get('logged_in'):
         ui.navigate.to('/login')
         return
     header('/')
-    home_page()
+    await home_page()
 
 
 @ui.page("/login")
@@ -168,13 +202,13 @@ def new_vendor_page():
 
 
 @ui.page("/active-contracts")
-def active_contracts_page():
+async def active_contracts_page():
     """Active contracts page"""
     if not nicegui_app.storage.user.get('logged_in'):
         ui.navigate.to('/login')
         return
     header()
-    active_contracts()
+    await active_contracts()
 
 
 @ui.page("/pending-contracts")
@@ -188,43 +222,43 @@ def pending_contracts_page():
 
 
 @ui.page("/expired-contracts")
-def expired_contracts_page():
+async def expired_contracts_page():
     """Expired contracts page"""
     if not nicegui_app.storage.user.get('logged_in'):
         ui.navigate.to('/login')
         return
     header()
-    expired_contracts()
+    await expired_contracts()
 
 
 @ui.page("/terminated-contracts")
-def terminated_contracts_page():
+async def terminated_contracts_page():
     """Terminated contracts page"""
     if not nicegui_app.storage.user.get('logged_in'):
         ui.navigate.to('/login')
         return
     header()
-    terminated_contracts()
+    await terminated_contracts()
 
 
 @ui.page("/all-contracts")
-def all_contracts_page():
+async def all_contracts_page():
     """All contracts page - lists contracts of any status"""
     if not nicegui_app.storage.user.get('logged_in'):
         ui.navigate.to('/login')
         return
     header()
-    all_contracts()
+    await all_contracts()
 
 
 @ui.page("/vendors")
-def vendors_list_page():
+async def vendors_list_page():
     """Vendors list page"""
     if not nicegui_app.storage.user.get('logged_in'):
         ui.navigate.to('/login')
         return
     header()
-    vendors_list()
+    await vendors_list()
 
 
 @ui.page("/vendor-info/{vendor_id}")
@@ -268,73 +302,78 @@ def contract_managers_page():
 
 
 @ui.page("/manager")
-def manager_page():
+async def manager_page():
     """Manager dashboard page"""
     if not nicegui_app.storage.user.get('logged_in'):
         ui.navigate.to('/login')
         return
     header('/manager')
-    manager()
+    await manager()
 
 
 @ui.page("/pending-reviews")
-def pending_reviews_page():
+async def pending_reviews_page():
     """Pending reviews page"""
     if not nicegui_app.storage.user.get('logged_in'):
         ui.navigate.to('/login')
         return
     header()
-    pending_reviews()
+    await pending_reviews()
 
 
 @ui.page("/contract-updates")
-def contract_updates_page():
+async def contract_updates_page():
     """Contract updates page"""
     if not nicegui_app.storage.user.get('logged_in'):
         ui.navigate.to('/login')
         return
     header()
-    contract_updates()
+    await contract_updates()
 
 
 @ui.page("/moa-report")
-def moa_report_page():
+async def moa_report_page():
     """Material Outsourcing Agreement Report page"""
     if not nicegui_app.storage.user.get('logged_in'):
         ui.navigate.to('/login')
         return
     header()
-    moa_report()
+    await moa_report()
 
 
 @ui.page("/monetary-value-report")
-def monetary_value_report_page():
+async def monetary_value_report_page():
     """Contracts Monetary Value Report page"""
     if not nicegui_app.storage.user.get('logged_in'):
         ui.navigate.to('/login')
         return
     header()
-    monetary_value_report()
+    await monetary_value_report()
 
 
 @ui.page("/due-diligence-report")
-def due_diligence_report_page():
+async def due_diligence_report_page():
     """Vendors Due Diligence Report page"""
     if not nicegui_app.storage.user.get('logged_in'):
         ui.navigate.to('/login')
         return
     header()
-    due_diligence_report()
+    await due_diligence_report()
 
 
 # ============================================================================
 # Initialize NiceGUI with FastAPI - Monolithic Application
 # ============================================================================
 
+if settings.web_workers > 1:
+    # Workers sit behind a sticky load balancer; websocket-only transport keeps each
+    # client on one connection instead of long-polling requests that may be balanced apart
+    nicegui_app.config.socket_io_js_transports = ['websocket']
+
 ui.run_with(
     root_app,
     mount_path='/',
-    storage_secret='jhdshd-d287y487f-ISUd-jsd92-287yds'
+    storage_secret=settings.storage_secret
 )
 
 if __name__ == '__main__':
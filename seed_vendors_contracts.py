@@ -15,6 +15,8 @@ from app.models.contract import (
     NoticePeriodType, ExpirationNoticePeriodType, CurrencyType,
     PaymentMethodType, ContractStatusType, ContractUpdateStatus
 )
+from app.core.constants import FileConstants
+from app.services import document_store
 from datetime import datetime, date, timedelta, timezone
 from dateutil.relativedelta import relativedelta
 import os
@@ -156,76 +158,37 @@ startxref
     return output_path
 
 
+_seed_document = None
+
+
+def seed_document():
+    """
+    The dummy PDF in the document store; every seeded document shares it
+    """
+    global _seed_document
+    if _seed_document is None:
+        temp_path = create_dummy_pdf(os.path.join(FileConstants.BLOB_DIR, f"seed_{uuid.uuid4()}.pdf"))
+        try:
+            _seed_document = document_store.import_file(temp_path)
+        finally:
+            os.remove(temp_path)
+    return _seed_document
+
+
 def save_vendor_document(vendor, document_type, doc_name, signed_date):
     """
-    Save a vendor document by creating a dummy PDF
+    Save a vendor document; returns (file_path, file_size, sha256) of the shared dummy PDF
     """
-    upload_dir = os.path.join("uploads", "vendors", vendor.vendor_id)
-    # Create directory and all parent directories with proper permissions
-    os.makedirs(upload_dir, exist_ok=True, mode=0o755)
-    # Fix permissions on existing directories
-    try:
-        os.chmod(upload_dir, 0o755)
-        # Also ensure parent directories have proper permissions
-        parent = os.path.dirname(upload_dir)
-        while parent and parent != upload_dir and os.path.exists(parent):
-            try:
-                os.chmod(parent, 0o755)
-            except (OSError, PermissionError):
-                pass
-            parent = os.path.dirname(parent)
-            if not parent or parent == '/':
-                break
-    except (OSError, PermissionError):
-        pass
-    
-    # Generate unique filename
-    unique_filename = f"{document_type.value}_{uuid.uuid4()}.pdf"
-    file_path = os.path.join(upload_dir, unique_filename)
-    
-    # Create dummy PDF
-    create_dummy_pdf(file_path)
-    
-    # Get file size
-    file_size = os.path.getsize(file_path)
-    
-    return file_path, file_size
+    stored = seed_document()
+    return stored.file_path, stored.file_size, stored.sha256
 
 
 def save_contract_document(contract, doc_name, signed_date):
     """
-    Save a contract document by creating a dummy PDF
+    Save a contract document; returns (file_path, file_size, sha256) of the shared dummy PDF
     """
-    upload_dir = os.path.join("uploads", "contracts", contract.contract_id)
-    # Create directory and all parent directories with proper permissions
-    os.makedirs(upload_dir, exist_ok=True, mode=0o755)
-    # Fix permissions on existing directories
-    try:
-        os.chmod(upload_dir, 0o755)
-        # Also ensure parent directories have proper permissions
-        parent = os.path.dirname(upload_dir)
-        while parent and parent != upload_dir and os.path.exists(parent):
-            try:
-                os.chmod(parent, 0o755)
-            except (OSError, PermissionError):
-                pass
-            parent = os.path.dirname(parent)
-            if not parent or parent == '/':
-                break
-    except (OSError, PermissionError):
-        pass
-    
-    # Generate unique filename
-    unique_filename = f"contract_{uuid.uuid4()}.pdf"
-    file_path = os.path.join(upload_dir, unique_filename)
-    
-    # Create dummy PDF
-    create_dummy_pdf(file_path)
-    
-    # Get file size
-    file_size = os.path.getsize(file_path)
-    
-    return file_path, file_size
+    stored = seed_document()
+    return stored.file_path, stored.file_size, stored.sha256
 
 
 def ensure_uploads_permissions():
@@ -778,7 +741,7 @@ def seed_vendors_and_contracts():
                 db.add(phone)
                 
                 # Create vendor documents (Due Diligence and NDA - always required)
-                dd_path, dd_size = save_vendor_document(
+                dd_path, dd_size, dd_sha256 = save_vendor_document(
                     vendor,
                     DocumentType.DUE_DILIGENCE,
                     f"{vendor_data['vendor_name']} Due Diligence",
@@ -793,12 +756,13 @@ def seed_vendors_and_contracts():
                     document_signed_date=last_dd_date,
                     file_path=dd_path,
                     file_size=dd_size,
+                    sha256=dd_sha256,
                     content_type="application/pdf",
                     created_at=datetime.now(timezone.utc)
                 )
                 db.add(dd_doc)
                 
-                nda_path, nda_size = save_vendor_document(
+                nda_path, nda_size, nda_sha256 = save_vendor_document(
                     vendor,
                     DocumentType.NON_DISCLOSURE_AGREEMENT,
                     f"{vendor_data['vendor_name']} NDA",
@@ -813,6 +777,7 @@ def seed_vendors_and_contracts():
                     document_signed_date=last_dd_date,
                     file_path=nda_path,
                     file_size=nda_size,
+                    sha256=nda_sha256,
                     content_type="application/pdf",
                     created_at=datetime.now(timezone.utc)
                 )
@@ -822,7 +787,7 @@ def seed_vendors_and_contracts():
                 if vendor_data["material_outsourcing_arrangement"] == MaterialOutsourcingType.YES:
                     # Risk Assessment Form (required for MOA)
                     risk_assessment_date = last_dd_date + timedelta(days=random.randint(0, 30))
-                    ra_path, ra_size = save_vendor_document(
+                    ra_path, ra_size, ra_sha256 = save_vendor_document(
                         vendor,
                         DocumentType.RISK_ASSESSMENT_FORM,
                         f"{vendor_data['vendor_name']} Risk Assessment",
@@ -837,6 +802,7 @@ def seed_vendors_and_contracts():
                         document_signed_date=risk_assessment_date,
                         file_path=ra_path,
                         file_size=ra_size,
+                        sha256=ra_sha256,
                         content_type="application/pdf",
                         created_at=datetime.now(timezone.utc)
                     )
@@ -845,7 +811,7 @@ def seed_vendors_and_contracts():
                     # Optional MOA documents (60% chance for each)
                     if random.random() < 0.6:  # 60% chance
                         bcp_date = last_dd_date + timedelta(days=random.randint(0, 60))
-                        bcp_path, bcp_size = save_vendor_document(
+                        bcp_path, bcp_size, bcp_sha256 = save_vendor_document(
                             vendor,
                             DocumentType.BUSINESS_CONTINUITY_PLAN,
                             f"{vendor_data['vendor_name']} Business Continuity Plan",
@@ -859,6 +825,7 @@ def seed_vendors_and_contracts():
                             document_signed_date=bcp_date,
                             file_path=bcp_path,
                             file_size=bcp_size,
+                            sha256=bcp_sha256,
                             content_type="application/pdf",
                             created_at=datetime.now(timezone.utc)
                         )
@@ -866,7 +833,7 @@ def seed_vendors_and_contracts():
                     
                     if random.random() < 0.6:  # 60% chance
                         drp_date = last_dd_date + timedelta(days=random.randint(0, 60))
-                        drp_path, drp_size = save_vendor_document(
+                        drp_path, drp_size, drp_sha256 = save_vendor_document(
                             vendor,
                             DocumentType.DISASTER_RECOVERY_PLAN,
                             f"{vendor_data['vendor_name']} Disaster Recovery Plan",
@@ -880,6 +847,7 @@ def seed_vendors_and_contracts():
                             document_signed_date=drp_date,
                             file_path=drp_path,
                             file_size=drp_size,
+                            sha256=drp_sha256,
                             content_type="application/pdf",
                             created_at=datetime.now(timezone.utc)
                         )
@@ -887,7 +855,7 @@ def seed_vendors_and_contracts():
                     
                     if random.random() < 0.6:  # 60% chance
                         ip_date = last_dd_date + timedelta(days=random.randint(0, 60))
-                        ip_path, ip_size = save_vendor_document(
+                        ip_path, ip_size, ip_sha256 = save_vendor_document(
                             vendor,
                             DocumentType.INSURANCE_POLICY,
                             f"{vendor_data['vendor_name']} Insurance Policy",
@@ -901,6 +869,7 @@ def seed_vendors_and_contracts():
                             document_signed_date=ip_date,
                             file_path=ip_path,
                             file_size=ip_size,
+                            sha256=ip_sha256,
                             content_type="application/pdf",
                             created_at=datetime.now(timezone.utc)
                         )
@@ -1234,7 +1203,7 @@ def seed_vendors_and_contracts():
             # Create contract document for some contracts (every other contract gets a document)
             # This creates a mix: some with documents, some without (for testing pending_contracts page)
             if i % 2 == 0:
-                doc_path, doc_size = save_contract_document(
+                doc_path, doc_size, doc_sha256 = save_contract_document(
                     contract,
                     f"{contract_data['description']} - Signed",
                     start_date
@@ -1247,6 +1216,7 @@ def seed_vendors_and_contracts():
                     document_signed_date=start_date,
                     file_path=doc_path,
                     file_size=doc_size,
+                    sha256=doc_sha256,
                     content_type="application/pdf",
                     created_at=datetime.now(timezone.utc)
                 )
@@ -1444,7 +1414,7 @@ def update_existing_vendors_and_contracts():
                 # Add Risk Assessment if missing
                 if DocumentType.RISK_ASSESSMENT_FORM not in existing_doc_types:
                     risk_assessment_date = last_dd_date + timedelta(days=random.randint(0, 30))
-                    ra_path, ra_size = save_vendor_document(
+                    ra_path, ra_size, ra_sha256 = save_vendor_document(
                         vendor,
                         DocumentType.RISK_ASSESSMENT_FORM,
                         f"{vendor.vendor_name} Risk Assessment",
@@ -1458,6 +1428,7 @@ def update_existing_vendors_and_contracts():
                         document_signed_date=risk_assessment_date,
                         file_path=ra_path,
                         file_size=ra_size,
+                        sha256=ra_sha256,
                         content_type="application/pdf",
                         created_at=datetime.now(timezone.utc)
                     )
@@ -1466,7 +1437,7 @@ def update_existing_vendors_and_contracts():
                 # Add optional MOA documents (60% chance for each)
                 if DocumentType.BUSINESS_CONTINUITY_PLAN not in existing_doc_types and random.random() < 0.6:
                     bcp_date = last_dd_date + timedelta(days=random.randint(0, 60))
-                    bcp_path, bcp_size = save_vendor_document(
+                    bcp_path, bcp_size, bcp_sha256 = save_vendor_document(
                         vendor,
                         DocumentType.BUSINESS_CONTINUITY_PLAN,
                         f"{vendor.vendor_name} Business Continuity Plan",
@@ -1480,6 +1451,7 @@ def update_existing_vendors_and_contracts():
                         document_signed_date=bcp_date,
                         file_path=bcp_path,
                         file_size=bcp_size,
+                        sha256=bcp_sha256,
                         content_type="application/pdf",
                         created_at=datetime.now(timezone.utc)
                     )
@@ -1487,7 +1459,7 @@ def update_existing_vendors_and_contracts():
                 
                 if DocumentType.DISASTER_RECOVERY_PLAN not in existing_doc_types and random.random() < 0.6:
                     drp_date = last_dd_date + timedelta(days=random.randint(0, 60))
-                    drp_path, drp_size = save_vendor_document(
+                    drp_path, drp_size, drp_sha256 = save_vendor_document(
                         vendor,
                         DocumentType.DISASTER_RECOVERY_PLAN,
                         f"{vendor.vendor_name} Disaster Recovery Plan",
@@ -1501,6 +1473,7 @@ def update_existing_vendors_and_contracts():
                         document_signed_date=drp_date,
                         file_path=drp_path,
                         file_size=drp_size,
+                        sha256=drp_sha256,
                         content_type="application/pdf",
                         created_at=datetime.now(timezone.utc)
                     )
@@ -1508,7 +1481,7 @@ def update_existing_vendors_and_contracts():
                 
                 if DocumentType.INSURANCE_POLICY not in existing_doc_types and random.random() < 0.6:
                     ip_date = last_dd_date + timedelta(days=random.randint(0, 60))
-                    ip_path, ip_size = save_vendor_document(
+                    ip_path, ip_size, ip_sha256 = save_vendor_document(
                         vendor,
                         DocumentType.INSURANCE_POLICY,
                         f"{vendor.vendor_name} Insurance Policy",
@@ -1522,6 +1495,7 @@ def update_existing_vendors_and_contracts():
                         document_signed_date=ip_date,
                         file_path=ip_path,
                         file_size=ip_size,
+                        sha256=ip_sha256,
                         content_type="application/pdf",
                         created_at=datetime.now(timezone.utc)
                     )
@@ -0,0 +1,70 @@
+"""
+Application launcher.
+
+    python serve.py
+
+With WEB_WORKERS=1 (default) this is a single uvicorn process on WEB_PORT,
+as before. With more workers, database migrations run once here and worker i
+listens on WEB_PORT + i. A NiceGUI page and its socket.io connection must be
+served by the process that rendered the page, so put a sticky load balancer
+in front of the workers (see README, "Multi-worker deployment"). Set REDIS_URL
+as well so app.storage.user (logins) is shared by all workers.
+"""
+import os
+import signal
+import subprocess
+import sys
+import time
+
+from app.core.config import settings
+
+
+def worker_command(port: int) -> list:
+    return [
+        sys.executable, "-m", "uvicorn", "main:root_app",
+        "--host", settings.web_host,
+        "--port", str(port),
+        "--proxy-headers",
+        # Only the load balancer may set the client address (the per-IP login limit reads it)
+        "--forwarded-allow-ips", settings.forwarded_allow_ips,
+    ]
+
+
+def main() -> None:
+    workers = max(1, settings.web_workers)
+    if workers == 1:
+        os.execv(sys.executable, worker_command(settings.web_port))
+
+    if not settings.redis_url:
+        print("⚠️  WEB_WORKERS > 1 without REDIS_URL: each worker keeps its own login sessions")
+
+    print("🔄 Running database migrations...")
+    subprocess.run([sys.executable, "-m", "alembic", "upgrade", "head"], check=True)
+
+    env = dict(os.environ, RUN_MIGRATIONS_ON_STARTUP="false")
+    processes = []
+    for index in range(workers):
+        port = settings.web_port + index
+        print(f"🌐 Starting worker {index} on port {port}")
+        processes.append(subprocess.Popen(worker_command(port), env=env))
+
+    def stop(signum=None, frame=None) -> None:
+        for process in processes:
+            if process.poll() is None:
+                process.terminate()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    # One worker exiting stops the others so the container / supervisor restarts cleanly
+    exit_code = 0
+    while all(process.poll() is None for process in processes):
+        time.sleep(1)
+    stop()
+    for process in processes:
+        exit_code = process.wait() or exit_code
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
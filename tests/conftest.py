@@ -0,0 +1,77 @@
+"""
+Shared fixtures: a throwaway SQLite database per seeded size, migrated with
+alembic and filled by generate_synthetic_data.py like benchmark.py does.
+"""
+import argparse
+import os
+import tempfile
+from unittest import mock
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The app creates its engine at import time; never let the tests reach a configured server
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.gettempdir(), 'contracts_tests_default.db')}"
+# Minimum bcrypt cost for the hashes the tests create
+os.environ["BCRYPT_ROUNDS"] = "4"
+
+from alembic import command  # noqa: E402
+from alembic.config import Config  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from generate_synthetic_data import SyntheticDataGenerator  # noqa: E402
+
+CONTRACTS_PER_VENDOR = 10
+
+
+class SeededDatabase:
+    def __init__(self, url: str, contracts: int):
+        self.url = url
+        self.contracts = contracts
+        self.engine = create_engine(url)
+        self.Session = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+
+
+def _migrate(url: str) -> None:
+    config = Config(os.path.join(ROOT_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(ROOT_DIR, "alembic"))
+    config.set_main_option("prepend_sys_path", ROOT_DIR)
+    # alembic/env.py reads DATABASE_URL
+    with mock.patch.dict(os.environ, {"DATABASE_URL": url}):
+        command.upgrade(config, "head")
+
+
+def _seed(database: SeededDatabase) -> None:
+    db = database.Session()
+    try:
+        SyntheticDataGenerator(db, argparse.Namespace(
+            scale=1,
+            vendors=database.contracts // CONTRACTS_PER_VENDOR,
+            users=20,
+            contracts_per_vendor=CONTRACTS_PER_VENDOR,
+            updates_per_contract=0.3,
+            documents_per_contract=1.0,
+            documents_per_vendor=1,
+            files="none",
+            file_size_kb=1,
+            batch_size=5000,
+            seed=42,
+        )).run()
+        db.commit()
+    finally:
+        db.close()
+
+
+@pytest.fixture(scope="module", params=[20, 200], ids=lambda contracts: f"{contracts}_contracts")
+def seeded_db(request, tmp_path_factory) -> SeededDatabase:
+    """
+    Database with request.param contracts; tests using it run once per size
+    """
+    path = tmp_path_factory.mktemp("db") / "contracts.db"
+    database = SeededDatabase(f"sqlite:///{path}", request.param)
+    _migrate(database.url)
+    _seed(database)
+    yield database
+    database.engine.dispose()
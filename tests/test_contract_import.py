@@ -0,0 +1,169 @@
+"""
+POST /contracts/bulk: per-row error report with file row numbers, all-or-nothing
+by default, the valid rows only with partial=true, nothing with dry_run=true.
+"""
+import csv
+import io
+import json
+from datetime import date, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1.api import api_router
+from app.core.config import settings
+from app.core.security import UserPrincipal, require_contract_admin
+from app.db.database import get_db
+from app.models.contract import (
+    AutomaticRenewalType,
+    Contract,
+    ContractStatusType,
+    ContractType,
+    CurrencyType,
+    DepartmentType,
+    ExpirationNoticePeriodType,
+    NoticePeriodType,
+    PaymentMethodType,
+    User,
+    UserRole,
+)
+from app.models.vendor import Vendor
+
+BULK_URL = f"{settings.api_v1_prefix}/contracts/bulk"
+
+
+@pytest.fixture
+def client(seeded_db):
+    app = FastAPI()
+    app.include_router(api_router, prefix=settings.api_v1_prefix)
+
+    def get_seeded_db():
+        db = seeded_db.Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    def admin() -> UserPrincipal:
+        return UserPrincipal(
+            id=1, email="admin@example.com", role=UserRole.CONTRACT_ADMIN,
+            is_active=True, first_name="Test", last_name="Admin",
+        )
+
+    app.dependency_overrides[get_db] = get_seeded_db
+    app.dependency_overrides[require_contract_admin] = admin
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def db(seeded_db):
+    session = seeded_db.Session()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def valid_row(db) -> dict:
+    vendor_id = db.query(Vendor.id).order_by(Vendor.id).first()[0]
+    user_ids = [user_id for (user_id,) in db.query(User.id).filter(User.is_active == True).order_by(User.id).limit(3)]
+    start = date.today()
+    return {
+        "vendor_id": vendor_id,
+        "contract_description": "Imported services",
+        "contract_type": list(ContractType)[0].value,
+        "start_date": start.isoformat(),
+        "end_date": (start + timedelta(days=365)).isoformat(),
+        "automatic_renewal": AutomaticRenewalType.NO.value,
+        "department": list(DepartmentType)[0].value,
+        "contract_amount": "1250.00",
+        "contract_currency": list(CurrencyType)[0].value,
+        "payment_method": list(PaymentMethodType)[0].value,
+        "termination_notice_period": list(NoticePeriodType)[0].value,
+        "expiration_notice_frequency": list(ExpirationNoticePeriodType)[0].value,
+        "contract_owner_id": user_ids[0],
+        "contract_owner_backup_id": user_ids[1],
+        "contract_owner_manager_id": user_ids[2],
+    }
+
+
+def _jsonl(rows) -> bytes:
+    return "\n".join(row if isinstance(row, str) else json.dumps(row) for row in rows).encode()
+
+
+def _mixed_file(valid_row) -> bytes:
+    return _jsonl([
+        valid_row,                                                   # line 1
+        dict(valid_row, contract_description="Bad <description>"),   # line 2: schema
+        valid_row,                                                   # line 3
+        dict(valid_row, vendor_id=10_000_000),                       # line 4: unknown vendor
+        "{not json",                                                 # line 5
+    ])
+
+
+def _upload(client, content: bytes, filename: str = "contracts.jsonl", **params):
+    return client.post(BULK_URL, params=params, files={"file": (filename, content)})
+
+
+def _contract_count(db) -> int:
+    db.expire_all()
+    return db.query(Contract).count()
+
+
+def test_reports_errors_per_row_and_creates_nothing(client, db, valid_row):
+    before = _contract_count(db)
+
+    response = _upload(client, _mixed_file(valid_row))
+
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["total_rows"], report["created"], report["failed"]) == (5, 0, 3)
+    assert report["contract_ids"] == []
+    errors = {error["row"]: error["errors"] for error in report["errors"]}
+    assert sorted(errors) == [2, 4, 5]
+    assert any(message.startswith("contract_description") for message in errors[2])
+    assert errors[4] == ["Selected vendor does not exist"]
+    assert errors[5][0].startswith("Invalid JSON")
+    assert _contract_count(db) == before
+
+
+def test_partial_creates_valid_rows(client, db, valid_row):
+    before = _contract_count(db)
+
+    report = _upload(client, _mixed_file(valid_row), partial=True).json()
+
+    assert (report["created"], report["failed"]) == (2, 3)
+    assert len(set(report["contract_ids"])) == 2
+    assert _contract_count(db) == before + 2
+    created = db.query(Contract).filter(Contract.contract_id.in_(report["contract_ids"])).all()
+    assert {contract.status for contract in created} == {ContractStatusType.ACTIVE}
+
+
+def test_dry_run_creates_nothing(client, db, valid_row):
+    before = _contract_count(db)
+
+    report = _upload(client, _jsonl([valid_row, valid_row]), dry_run=True).json()
+
+    assert (report["total_rows"], report["created"], report["failed"], report["dry_run"]) == (2, 0, 0, True)
+    assert _contract_count(db) == before
+
+
+def test_csv_rows_numbered_after_header(client, valid_row):
+    stream = io.StringIO()
+    writer = csv.DictWriter(stream, fieldnames=list(valid_row))
+    writer.writeheader()
+    writer.writerow(valid_row)
+    writer.writerow(dict(valid_row, end_date=valid_row["start_date"]))
+
+    report = _upload(client, stream.getvalue().encode(), filename="contracts.csv", dry_run=True).json()
+
+    assert [error["row"] for error in report["errors"]] == [3]
+
+
+def test_unknown_format_rejected(client, valid_row):
+    response = _upload(client, _jsonl([valid_row]), filename="contracts.txt")
+
+    assert response.status_code == 400
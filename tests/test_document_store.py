@@ -0,0 +1,138 @@
+"""
+Document store reference counting: stored_blobs.ref_count follows the document
+rows through the flush hook, and the sweep deletes only blobs that have stayed
+unreferenced past the grace period.
+"""
+import os
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from unittest import mock
+
+import pytest
+
+from app.core.constants import FileConstants
+from app.models.contract import Contract, ContractDocument
+from app.models.stored_blob import StoredBlob
+from app.services import document_store
+
+GRACE_SECONDS = 60
+
+
+@pytest.fixture
+def db(seeded_db, tmp_path):
+    session = seeded_db.Session()
+    with mock.patch.object(FileConstants, "BLOB_DIR", str(tmp_path / "blobs")):
+        try:
+            yield session
+        finally:
+            session.close()
+
+
+def _put_document(db, contract_id: int, content: bytes) -> ContractDocument:
+    stored = document_store.put_bytes(content, "contract.pdf")
+    document = ContractDocument(
+        contract_id=contract_id,
+        file_name="contract.pdf",
+        custom_document_name="Contract",
+        document_signed_date=date.today(),
+        file_path=stored.file_path,
+        file_size=stored.file_size,
+        sha256=stored.sha256,
+        content_type="application/pdf",
+    )
+    db.add(document)
+    db.commit()
+    return document
+
+
+def _pdf() -> bytes:
+    return b"%PDF-1.4\n" + uuid.uuid4().bytes + b"\n%%EOF\n"
+
+
+def _blob(db, sha256: str) -> StoredBlob:
+    db.expire_all()
+    return db.get(StoredBlob, sha256)
+
+
+def _age(db, sha256: str, seconds: int) -> None:
+    """
+    Pretend the blob was released and its file last stored seconds ago
+    """
+    blob = db.get(StoredBlob, sha256)
+    blob.released_at = datetime.utcnow() - timedelta(seconds=seconds)
+    db.commit()
+    past = time.time() - seconds
+    os.utime(blob.file_path, (past, past))
+
+
+def test_reference_counts_follow_document_rows(db):
+    contract_ids = [contract_id for (contract_id,) in db.query(Contract.id).limit(2)]
+    content = _pdf()
+    first = _put_document(db, contract_ids[0], content)
+    second = _put_document(db, contract_ids[1], content)
+
+    blob = _blob(db, first.sha256)
+    assert blob.ref_count == 2
+    assert first.file_path == second.file_path == blob.file_path
+    assert len(os.listdir(os.path.dirname(blob.file_path))) == 1
+
+    db.delete(first)
+    db.commit()
+    blob = _blob(db, second.sha256)
+    assert blob.ref_count == 1
+    assert blob.released_at is None
+
+    db.delete(second)
+    db.commit()
+    blob = _blob(db, second.sha256)
+    assert blob.ref_count == 0
+    assert blob.released_at is not None
+    # Released, not deleted: the file stays until the sweep
+    assert os.path.exists(blob.file_path)
+
+
+def test_sweep_keeps_referenced_blobs(db):
+    contract_id = db.query(Contract.id).first()[0]
+    kept = _put_document(db, contract_id, _pdf())
+    released = _put_document(db, contract_id, _pdf())
+    released_sha256, released_path = released.sha256, released.file_path
+    db.delete(released)
+    db.commit()
+    _age(db, released_sha256, GRACE_SECONDS * 2)
+
+    assert document_store.sweep_released_blobs(db, grace_seconds=GRACE_SECONDS) == 1
+
+    assert _blob(db, released_sha256) is None
+    assert not os.path.exists(released_path)
+    assert _blob(db, kept.sha256).ref_count == 1
+    assert os.path.exists(kept.file_path)
+
+
+def test_sweep_waits_for_grace_period(db):
+    contract_id = db.query(Contract.id).first()[0]
+    document = _put_document(db, contract_id, _pdf())
+    sha256 = document.sha256
+    db.delete(document)
+    db.commit()
+
+    assert document_store.sweep_released_blobs(db, grace_seconds=GRACE_SECONDS) == 0
+    assert os.path.exists(_blob(db, sha256).file_path)
+
+
+def test_referenced_again_before_sweep(db):
+    contract_id = db.query(Contract.id).first()[0]
+    content = _pdf()
+    document = _put_document(db, contract_id, content)
+    sha256 = document.sha256
+    db.delete(document)
+    db.commit()
+    _age(db, sha256, GRACE_SECONDS * 2)
+
+    _put_document(db, contract_id, content)
+
+    assert document_store.sweep_released_blobs(db, grace_seconds=GRACE_SECONDS) == 0
+    blob = _blob(db, sha256)
+    assert blob.ref_count == 1
+    assert blob.released_at is None
+    assert os.path.exists(blob.file_path)
@@ -0,0 +1,69 @@
+"""
+Business ID allocation from the id_counters table: seeding from the IDs already
+in the database and uniqueness when several sessions allocate at once.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+from app.models.contract import Contract
+from app.models.id_counter import IdCounter
+from app.services.id_allocator import IdAllocator
+
+WORKERS = 8
+IDS_PER_WORKER = 10
+
+
+def _highest_contract_number(db) -> int:
+    return max(int(contract_id[2:]) for (contract_id,) in db.query(Contract.contract_id))
+
+
+def test_seeds_after_highest_existing_id(seeded_db):
+    db = seeded_db.Session()
+    try:
+        db.query(IdCounter).filter(IdCounter.prefix == "CT").delete()
+        db.commit()
+        highest = _highest_contract_number(db)
+
+        assert IdAllocator(db).next_id("CT") == f"CT{highest + 1}"
+        assert IdAllocator(db).next_ids("CT", 3) == [f"CT{highest + number}" for number in (2, 3, 4)]
+        db.commit()
+        assert db.get(IdCounter, "CT").last_value == highest + 4
+    finally:
+        db.close()
+
+
+def test_rolled_back_allocation_is_reused(seeded_db):
+    db = seeded_db.Session()
+    try:
+        allocated = IdAllocator(db).next_id("U")
+        db.rollback()
+        assert IdAllocator(db).next_id("U") == allocated
+        db.rollback()
+    finally:
+        db.close()
+
+
+def test_concurrent_allocations_are_unique(seeded_db):
+    def allocate(_) -> list:
+        db = seeded_db.Session()
+        try:
+            allocated = []
+            for _ in range(IDS_PER_WORKER):
+                allocated.append(IdAllocator(db).next_id("CT"))
+                db.commit()
+            return allocated
+        finally:
+            db.close()
+
+    db = seeded_db.Session()
+    try:
+        before = db.get(IdCounter, "CT").last_value
+    finally:
+        db.close()
+
+    with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+        allocated = [business_id for ids in pool.map(allocate, range(WORKERS)) for business_id in ids]
+
+    assert len(allocated) == len(set(allocated)) == WORKERS * IDS_PER_WORKER
+    assert sorted(int(business_id[2:]) for business_id in allocated) == list(
+        range(before + 1, before + WORKERS * IDS_PER_WORKER + 1)
+    )
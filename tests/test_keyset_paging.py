@@ -0,0 +1,64 @@
+"""
+Keyset pagination of ContractService.get_contracts_page: following next_cursor
+from the first page to the last returns every matching contract exactly once,
+including sort columns with many ties and descending sorts.
+"""
+import pytest
+
+from app.models.contract import Contract
+from app.services.contract_service import ContractService
+
+PAGE_SIZE = 7
+
+
+@pytest.fixture
+def service(seeded_db):
+    db = seeded_db.Session()
+    try:
+        yield ContractService(db)
+    finally:
+        db.close()
+
+
+def _walk(service, **filters):
+    """
+    Ids of every page in order, following the keyset cursor
+    """
+    contracts, total_count, after = service.get_contracts_page(limit=PAGE_SIZE, **filters)
+    ids = [contract.id for contract in contracts]
+    pages = 1
+    while after is not None:
+        contracts, _, after = service.get_contracts_page(limit=PAGE_SIZE, after=after, **filters)
+        ids.extend(contract.id for contract in contracts)
+        pages += 1
+        assert pages <= total_count + 1, "cursor does not advance"
+    return ids, total_count
+
+
+@pytest.mark.parametrize("descending", [False, True], ids=["ascending", "descending"])
+@pytest.mark.parametrize("sort_by", ["department", "contract_type", "vendor_name", "manager", "contract_amount", "end_date", None])
+def test_walk_returns_every_contract_once(seeded_db, service, sort_by, descending):
+    ids, total_count = _walk(service, sort_by=sort_by, descending=descending)
+
+    assert len(ids) == len(set(ids))
+    assert total_count == seeded_db.contracts
+    assert set(ids) == {contract_id for (contract_id,) in service.db.query(Contract.id)}
+
+
+def test_walk_follows_sort_order_on_ties(service):
+    ids, _ = _walk(service, sort_by="department", descending=True)
+
+    departments = dict(service.db.query(Contract.id, Contract.department))
+    keys = [(departments[contract_id].value, contract_id) for contract_id in ids]
+    # Ties on the sort column are broken by id in the same direction
+    assert keys == sorted(keys, reverse=True)
+
+
+def test_walk_of_relevance_ordered_search(service):
+    vendor_name = service.db.query(Contract).first().vendor.vendor_name
+    term = vendor_name.split()[0]
+
+    ids, total_count = _walk(service, search=term)
+
+    assert total_count > 0
+    assert len(ids) == len(set(ids)) == total_count
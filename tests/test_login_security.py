@@ -0,0 +1,168 @@
+"""
+Failed-login rate limiting and principal cache invalidation: lockout after the
+allowed failures, reopening once they leave the window, and cached API
+principals dropped when a user's password changes.
+"""
+import uuid
+from unittest import mock
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app.api.v1.api import api_router
+from app.core.config import settings
+from app.core.rate_limit import LoginRateLimiter
+from app.core.security import get_password_hash
+from app.db.database import get_db
+from app.models.contract import DepartmentType, User, UserRole
+
+WINDOW_SECONDS = 60
+EMAIL_LIMIT = 3
+PASSWORD = "correct-horse-battery"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    fake = FakeClock()
+    with mock.patch("app.core.rate_limit.time.monotonic", fake):
+        yield fake
+
+
+@pytest.fixture
+def limiter(clock):
+    return LoginRateLimiter(limits={"email": EMAIL_LIMIT, "ip": 10}, window_seconds=WINDOW_SECONDS)
+
+
+def _fail(limiter, keys, times: int) -> None:
+    for _ in range(times):
+        limiter.check(keys)
+        limiter.record_failure(keys)
+
+
+def test_locks_out_after_limit(limiter):
+    keys = LoginRateLimiter.keys("User@Example.com", "10.0.0.1")
+    _fail(limiter, keys, EMAIL_LIMIT)
+
+    with pytest.raises(HTTPException) as raised:
+        limiter.check(keys)
+    assert raised.value.status_code == 429
+    assert int(raised.value.headers["Retry-After"]) > 0
+    # Email keys are case-insensitive; other addresses from the same IP still get through
+    with pytest.raises(HTTPException):
+        limiter.check(LoginRateLimiter.keys("user@example.com", None))
+    limiter.check(LoginRateLimiter.keys("other@example.com", "10.0.0.1"))
+
+
+def test_reopens_when_failures_leave_window(limiter, clock):
+    keys = LoginRateLimiter.keys("user@example.com", None)
+    _fail(limiter, keys, 1)
+    clock.now += WINDOW_SECONDS / 2
+    _fail(limiter, keys, EMAIL_LIMIT - 1)
+
+    clock.now += WINDOW_SECONDS / 2
+    # The first failure has left the window: one attempt is free again
+    limiter.check(keys)
+    limiter.record_failure(keys)
+    with pytest.raises(HTTPException):
+        limiter.check(keys)
+
+    clock.now += WINDOW_SECONDS
+    limiter.check(keys)
+
+
+def test_reset_clears_lockout(limiter):
+    keys = LoginRateLimiter.keys("user@example.com", "10.0.0.1")
+    _fail(limiter, keys, EMAIL_LIMIT)
+
+    limiter.reset(keys[:1])
+
+    limiter.check(keys)
+
+
+# API
+
+@pytest.fixture
+def client(seeded_db, limiter):
+    app = FastAPI()
+    app.include_router(api_router, prefix=settings.api_v1_prefix)
+
+    def get_seeded_db():
+        db = seeded_db.Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = get_seeded_db
+    with mock.patch("app.api.v1.auth.login_rate_limiter", limiter), TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def admin(seeded_db) -> str:
+    email = f"admin-{uuid.uuid4().hex[:8]}@example.com"
+    db = seeded_db.Session()
+    try:
+        db.add(User(
+            user_id=f"T{uuid.uuid4().hex[:8]}",
+            first_name="Test",
+            last_name="Admin",
+            email=email,
+            department=DepartmentType.IT_OPERATIONS,
+            position="Tester",
+            role=UserRole.CONTRACT_ADMIN,
+            is_active=True,
+            hashed_password=get_password_hash(PASSWORD),
+        ))
+        db.commit()
+    finally:
+        db.close()
+    return email
+
+
+def _login(client, email: str, password: str):
+    return client.post(f"{settings.api_v1_prefix}/auth/login", data={"username": email, "password": password})
+
+
+def test_login_locked_out_after_failures(client, admin):
+    for _ in range(EMAIL_LIMIT):
+        assert _login(client, admin, "wrong-password").status_code == 401
+
+    response = _login(client, admin, PASSWORD)
+
+    assert response.status_code == 429
+    assert "Retry-After" in response.headers
+
+
+def test_password_change_drops_cached_principal(seeded_db, client, admin):
+    token = _login(client, admin, PASSWORD).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    admin_only = f"{settings.api_v1_prefix}/dashboards/pending-documents"
+    assert client.get(admin_only, headers=headers).status_code == 200
+
+    db = seeded_db.Session()
+    try:
+        db.query(User).filter(User.email == admin).update({User.role: UserRole.CONTRACT_MANAGER})
+        db.commit()
+    finally:
+        db.close()
+    # The principal is cached per token, so the demotion is not seen yet
+    assert client.get(admin_only, headers=headers).status_code == 200
+
+    response = client.post(
+        f"{settings.api_v1_prefix}/auth/change-password",
+        json={"current_password": PASSWORD, "new_password": "new-correct-horse"},
+        headers=headers,
+    )
+    assert response.status_code == 200
+
+    assert client.get(admin_only, headers=headers).status_code == 403
@@ -0,0 +1,83 @@
+"""
+Statement ceilings for the contract list paths. The ceilings hold at every
+seeded size, so a relationship that falls back to lazy loading (one SELECT
+per row) fails here.
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1.api import api_router
+from app.core.config import settings
+from app.db.database import get_db
+from app.db.query_counter import assert_max_queries
+from app.services.contract_service import ContractService
+
+
+def _read_list_row(contracts) -> None:
+    # What the list pages and API responses read from each row
+    for contract in contracts:
+        contract.vendor.vendor_name
+        contract.contract_owner.first_name
+        if contract.contract_owner_backup is not None:
+            contract.contract_owner_backup.first_name
+
+
+@pytest.fixture
+def client(seeded_db):
+    app = FastAPI()
+    app.include_router(api_router, prefix=settings.api_v1_prefix)
+
+    def get_seeded_db():
+        db = seeded_db.Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = get_seeded_db
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def service(seeded_db):
+    db = seeded_db.Session()
+    try:
+        yield ContractService(db)
+    finally:
+        db.close()
+
+
+def test_contract_list_endpoint(seeded_db, client):
+    with assert_max_queries(2, bind=seeded_db.engine):
+        response = client.get(f"{settings.api_v1_prefix}/contracts/", params={"limit": 1000})
+    assert response.status_code == 200
+    assert len(response.json()["contracts"]) == seeded_db.contracts
+
+
+def test_get_contracts(seeded_db, service):
+    with assert_max_queries(1, bind=seeded_db.engine):
+        contracts = service.get_contracts(limit=1000)
+        _read_list_row(contracts)
+    assert len(contracts) == seeded_db.contracts
+
+
+def test_search_and_filter_contracts(seeded_db, service):
+    with assert_max_queries(2, bind=seeded_db.engine):
+        contracts, total_count = service.search_and_filter_contracts(limit=1000)
+        _read_list_row(contracts)
+    assert total_count == len(contracts) == seeded_db.contracts
+
+
+def test_get_contracts_page(seeded_db, service):
+    with assert_max_queries(2, bind=seeded_db.engine):
+        contracts, total_count, _ = service.get_contracts_page(limit=1000)
+        _read_list_row(contracts)
+    assert total_count == len(contracts) == seeded_db.contracts
+
+
+def test_get_contracts_requiring_attention(seeded_db, service):
+    with assert_max_queries(3, bind=seeded_db.engine):
+        contracts, _ = service.get_contracts_requiring_attention()
+        _read_list_row(contracts)